@@ -2,13 +2,14 @@ from logging.config import fileConfig
 
 from aioia_core.models import Base
 from aioia_core.settings import DatabaseSettings
-from sqlalchemy import create_engine
+from sqlalchemy import Column, create_engine
 from sqlalchemy.orm import configure_mappers
 
 from alembic import context  # pylint: disable=no-name-in-module
 from trade_safety.models import (
     DBTradeSafetyCheck,  # Import models to register with Base
 )
+from trade_safety.retention import is_partition_table
 
 database_settings = DatabaseSettings()
 database_url = database_settings.url
@@ -25,6 +26,40 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata  # Use Base.metadata from aioia_core
 
 
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Skip objects autogenerate cannot compare on this database.
+
+    Month partitions of trade_safety_checks (PostgreSQL) are managed by
+    trade_safety.retention, not by the models; they and their indexes are
+    skipped.
+
+    Objects whose ddl_if() condition excludes the database are skipped: e.g.
+    the GIN index on llm_analysis only exists on PostgreSQL. On SQLite,
+    expression indexes (review_priority DESC) are skipped too: batch
+    migrations rebuild tables from reflection, which drops the expressions.
+
+    """
+    if reflected and (
+        (type_ == "table" and is_partition_table(name))
+        or (type_ == "index" and is_partition_table(obj.table.name))
+    ):
+        return False
+    model_obj = compare_to if reflected else obj
+    if (
+        type_ == "index"
+        and model_obj is not None
+        and context.get_bind().dialect.name == "sqlite"
+        and any(not isinstance(expr, Column) for expr in model_obj.expressions)
+    ):
+        return False
+    ddl_if = getattr(obj, "_ddl_if", None)
+    if ddl_if is None:
+        return True
+    return ddl_if._should_execute(  # pylint: disable=protected-access
+        None, obj, context.get_bind()
+    )
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -65,6 +100,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             render_as_batch=True,  # Enable batch mode for SQLite constraints handling.
             transaction_per_migration=True,  # Ensure each revision commits separately
         )
@@ -0,0 +1,165 @@
+"""add offered_price_usd to trade_safety_checks
+
+Revision ID: 3f8a2c6d9b14
+Revises: 7e3b5d9f2a61
+Create Date: 2026-10-19 16:05:21.740318
+
+"""
+
+import json
+import logging
+import os
+from decimal import Decimal
+from pathlib import Path
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a2c6d9b14"
+down_revision: Union[str, None] = "7e3b5d9f2a61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("llm_analysis", sa.JSON()),
+    sa.column("offered_price_usd", sa.Float()),
+)
+
+logger = logging.getLogger(f"alembic.runtime.migration.{revision}")
+
+# Frozen copy of trade_safety.currency (aliases, bundled rates, normalization)
+# and trade_safety.repositories.trade_safety_repository.offered_price_usd as
+# of this revision: the backfill must convert prices as the code did when it
+# was written
+_CURRENCY_ALIASES: dict[str, str] = {
+    "₩": "KRW",
+    "원": "KRW",
+    "won": "KRW",
+    "krw": "KRW",
+    "$": "USD",
+    "usd": "USD",
+    "달러": "USD",
+    "dollar": "USD",
+    "dollars": "USD",
+    "¥": "JPY",
+    "円": "JPY",
+    "엔": "JPY",
+    "yen": "JPY",
+    "jpy": "JPY",
+    "€": "EUR",
+    "eur": "EUR",
+    "euro": "EUR",
+    "euros": "EUR",
+    "£": "GBP",
+    "gbp": "GBP",
+    "php": "PHP",
+    "₱": "PHP",
+    "cad": "CAD",
+    "aud": "AUD",
+    "sgd": "SGD",
+}
+_BUNDLED_USD_RATES: dict[str, float] = {
+    "USD": 1.0,
+    "KRW": 1390.0,
+    "JPY": 149.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "CNY": 7.2,
+    "TWD": 32.0,
+    "HKD": 7.8,
+    "SGD": 1.34,
+    "PHP": 57.5,
+    "THB": 35.5,
+    "IDR": 16000.0,
+    "VND": 25000.0,
+    "MYR": 4.6,
+    "INR": 84.0,
+    "CAD": 1.37,
+    "AUD": 1.52,
+    "MXN": 18.5,
+    "BRL": 5.4,
+}
+
+
+def _normalize_currency(currency: str | None) -> str | None:
+    """Map a currency code, symbol or word to its ISO 4217 code."""
+    if not currency:
+        return None
+    cleaned = currency.strip()
+    return _CURRENCY_ALIASES.get(cleaned.casefold()) or (
+        cleaned.upper()
+        if len(cleaned) == 3 and cleaned.isalpha() and cleaned.isascii()
+        else None
+    )
+
+
+def _usd_rates() -> dict[str, float]:
+    """Rates of the shared rate file, or the bundled rates; never fetched."""
+    rates_path = os.environ.get("TRADE_SAFETY_FX_RATES_PATH")
+    if rates_path and Path(rates_path).exists():
+        try:
+            table = json.loads(Path(rates_path).read_text(encoding="utf-8"))
+            return {code: float(rate) for code, rate in table["rates"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Failed to read FX rate file %s: %s", rates_path, e)
+    return dict(_BUNDLED_USD_RATES)
+
+
+def _offered_price_usd(
+    llm_analysis: dict | None, rates: dict[str, float]
+) -> float | None:
+    """USD equivalent of the offered price of a stored analysis."""
+    price_analysis = (llm_analysis or {}).get("price_analysis") or {}
+    price = price_analysis.get("offered_price")
+    if price is None or isinstance(price, bool):
+        return None
+    code = _normalize_currency(price_analysis.get("currency"))
+    rate = rates.get(code) if code else None
+    try:
+        return float(Decimal(str(price))) / rate if rate else None
+    except ArithmeticError:
+        return None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("offered_price_usd", sa.Float(), nullable=True))
+
+    # Backfill with the rate file (or bundled rates); never fetch during a migration
+    rates = _usd_rates()
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks.c.id, trade_safety_checks.c.llm_analysis)
+            .where(trade_safety_checks.c.id > last_id)
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = [
+            {"check_id": row.id, "usd": usd}
+            for row in rows
+            if (usd := _offered_price_usd(row.llm_analysis, rates)) is not None
+        ]
+        if updates:
+            connection.execute(
+                trade_safety_checks.update()
+                .where(trade_safety_checks.c.id == sa.bindparam("check_id"))
+                .values(offered_price_usd=sa.bindparam("usd")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_column("offered_price_usd")
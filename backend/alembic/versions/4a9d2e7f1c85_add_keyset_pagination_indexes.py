@@ -0,0 +1,44 @@
+"""add (created_at, id) indexes for keyset pagination of the admin list
+
+Revision ID: 4a9d2e7f1c85
+Revises: e1c7a9f3b260
+Create Date: 2026-10-19 19:02:14.587903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a9d2e7f1c85"
+down_revision: Union[str, None] = "e1c7a9f3b260"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The expert_reviewed index is superseded by the composite index it leads
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_trade_safety_checks_created_at_id",
+            ["created_at", "id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_trade_safety_checks_expert_reviewed_created_at_id",
+            ["expert_reviewed", "created_at", "id"],
+            unique=False,
+        )
+        batch_op.drop_index(batch_op.f("ix_trade_safety_checks_expert_reviewed"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_trade_safety_checks_expert_reviewed"),
+            ["expert_reviewed"],
+            unique=False,
+        )
+        batch_op.drop_index("ix_trade_safety_checks_expert_reviewed_created_at_id")
+        batch_op.drop_index("ix_trade_safety_checks_created_at_id")
@@ -0,0 +1,35 @@
+"""add schema_version to trade_safety_checks
+
+Revision ID: 5b1d7e0c9a24
+Revises: 143655370e43
+Create Date: 2026-10-19 10:12:41.518302
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1d7e0c9a24"
+down_revision: Union[str, None] = "143655370e43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows predate versioning and are marked as schema v1;
+    # they are upgraded lazily on read (see trade_safety.analysis_versions)
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "schema_version", sa.Integer(), server_default="1", nullable=False
+            )
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_column("schema_version")
@@ -0,0 +1,52 @@
+"""add post author to trade_safety_checks and author reputation table
+
+Revision ID: 7e3b5d9f2a61
+Revises: d2a8b6c41e07
+Create Date: 2026-10-19 14:12:38.506217
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e3b5d9f2a61"
+down_revision: Union[str, None] = "d2a8b6c41e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Authors of existing checks are unknown (posts were not stored), so the
+    # reputation table starts empty and fills as new checks come in
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("platform", sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column("author", sa.String(length=255), nullable=True))
+
+    op.create_table(
+        "trade_safety_author_reputations",
+        sa.Column("platform", sa.String(length=16), nullable=False),
+        sa.Column("author", sa.String(length=255), nullable=False),
+        sa.Column("check_count", sa.Integer(), nullable=False),
+        sa.Column("risky_check_count", sa.Integer(), nullable=False),
+        sa.Column("safe_score_sum", sa.Integer(), nullable=False),
+        sa.Column("min_safe_score", sa.Integer(), nullable=True),
+        sa.Column("reviewed_count", sa.Integer(), nullable=False),
+        sa.Column("reviewed_risky_count", sa.Integer(), nullable=False),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "platform", "author", name=op.f("pk_trade_safety_author_reputations")
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trade_safety_author_reputations")
+
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_column("author")
+        batch_op.drop_column("platform")
@@ -0,0 +1,108 @@
+"""add review priority and claim lease columns for the expert review queue
+
+Revision ID: 8b5f3e2a7d49
+Revises: 4a9d2e7f1c85
+Create Date: 2026-10-19 19:48:33.906127
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b5f3e2a7d49"
+down_revision: Union[str, None] = "4a9d2e7f1c85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("safe_score", sa.Integer()),
+    sa.column("max_risk_severity", sa.String(length=8)),
+    sa.column("expert_reviewed", sa.Boolean()),
+    sa.column("review_priority", sa.Integer()),
+)
+
+# Frozen copy of trade_safety.review_queue.review_priority (score and severity
+# terms) as of this revision: the backfill must rank checks exactly as the
+# code did when it was written
+_SEVERITY_PRIORITY = {"high": 30, "medium": 10, "low": 0}
+
+
+def _review_priority(safe_score: int, max_risk_severity: str | None) -> int:
+    """Review priority of a pending check from its score and severity."""
+    return (100 - safe_score) + _SEVERITY_PRIORITY.get(max_risk_severity or "", 0)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "review_priority", sa.Integer(), server_default="0", nullable=False
+            )
+        )
+        batch_op.add_column(
+            sa.Column("review_claimed_by", sa.String(length=255), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("review_claimed_until", sa.DateTime(), nullable=True)
+        )
+
+    # Pending checks are ranked by score and severity; author and duplicate
+    # bonuses apply to checks created from now on
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(
+                trade_safety_checks.c.id,
+                trade_safety_checks.c.safe_score,
+                trade_safety_checks.c.max_risk_severity,
+            )
+            .where(
+                trade_safety_checks.c.id > last_id,
+                trade_safety_checks.c.expert_reviewed.is_(False),
+            )
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            trade_safety_checks.update()
+            .where(trade_safety_checks.c.id == sa.bindparam("check_id"))
+            .values(review_priority=sa.bindparam("priority")),
+            [
+                {
+                    "check_id": row.id,
+                    "priority": _review_priority(row.safe_score, row.max_risk_severity),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_trade_safety_checks_review_queue",
+        "trade_safety_checks",
+        [sa.text("review_priority DESC"), "created_at"],
+        unique=False,
+        postgresql_where=sa.text("NOT expert_reviewed"),
+        sqlite_where=sa.text("expert_reviewed = 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_trade_safety_checks_review_queue", table_name="trade_safety_checks"
+    )
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_column("review_claimed_until")
+        batch_op.drop_column("review_claimed_by")
+        batch_op.drop_column("review_priority")
@@ -0,0 +1,98 @@
+"""add input_hash and output_language to trade_safety_checks
+
+Revision ID: 9c3e4f7a1d58
+Revises: 5b1d7e0c9a24
+Create Date: 2026-10-19 11:03:27.904115
+
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Sequence, Union
+from urllib.parse import urlparse
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3e4f7a1d58"
+down_revision: Union[str, None] = "5b1d7e0c9a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("input_text", sa.Text()),
+    sa.column("input_hash", sa.String(length=64)),
+)
+
+# Frozen copy of trade_safety.input_normalization as of this revision: the
+# backfill must hash exactly as the code did when it was written, whatever
+# the normalization becomes later
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _normalize_input(input_text: str) -> str:
+    """Canonical URL for links, NFKC-folded text with collapsed whitespace else."""
+    text = input_text.strip()
+    parsed = urlparse(text)
+    if parsed.scheme in {"http", "https"} and parsed.netloc:
+        host = (parsed.hostname or "").lower().removeprefix("www.")
+        return f"{parsed.scheme.lower()}://{host}{parsed.path.rstrip('/')}"
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def _compute_input_hash(input_text: str) -> str:
+    """SHA-256 hex digest of the normalized input."""
+    return hashlib.sha256(_normalize_input(input_text).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("input_hash", sa.String(length=64), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("output_language", sa.String(length=8), nullable=True)
+        )
+
+    # Backfill input_hash in batches (output_language is unknown for old rows,
+    # so they are never reused but still participate in hash lookups)
+    connection = op.get_bind()
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks.c.id, trade_safety_checks.c.input_text)
+            .where(trade_safety_checks.c.input_hash.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            trade_safety_checks.update()
+            .where(trade_safety_checks.c.id == sa.bindparam("check_id"))
+            .values(input_hash=sa.bindparam("hash")),
+            [
+                {"check_id": row.id, "hash": _compute_input_hash(row.input_text)}
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_trade_safety_checks_input_hash"),
+            ["input_hash"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_trade_safety_checks_input_hash"))
+        batch_op.drop_column("output_language")
+        batch_op.drop_column("input_hash")
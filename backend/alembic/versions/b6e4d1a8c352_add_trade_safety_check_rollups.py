@@ -0,0 +1,150 @@
+"""add trade_safety_check_rollups for analytics
+
+Revision ID: b6e4d1a8c352
+Revises: 3f8a2c6d9b14
+Create Date: 2026-10-19 17:31:46.092115
+
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e4d1a8c352"
+down_revision: Union[str, None] = "3f8a2c6d9b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("created_at", sa.DateTime()),
+    sa.column("platform", sa.String(length=16)),
+    sa.column("output_language", sa.String(length=8)),
+    sa.column("safe_score", sa.Integer()),
+    sa.column("llm_analysis", sa.JSON()),
+)
+
+# Frozen copy of trade_safety.repositories.check_rollup_repository.rollup_keys
+# as of this revision: the backfill must bucket checks exactly as the code did
+# when it was written
+_ALL_CATEGORIES = "*"
+_SCORE_BUCKET_SIZE = 20
+_GRANULARITIES = ("hour", "day")
+
+# (granularity, bucket_start, platform, output_language, score_bucket, risk_category)
+_RollupKey = tuple[str, datetime, str, str, int, str]
+
+
+def _bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Truncate a time to the start of its UTC bucket."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _rollup_keys(
+    created_at: datetime,
+    platform: str | None,
+    output_language: str | None,
+    safe_score: int,
+    risk_categories: Iterable[str],
+) -> list[_RollupKey]:
+    """One rollup key per granularity for all checks and per risk category."""
+    score_bucket = min(safe_score // _SCORE_BUCKET_SIZE, 100 // _SCORE_BUCKET_SIZE - 1)
+    categories = [_ALL_CATEGORIES, *sorted(set(risk_categories))]
+    return [
+        (
+            granularity,
+            _bucket_start(created_at, granularity),
+            platform or "",
+            output_language or "",
+            score_bucket * _SCORE_BUCKET_SIZE,
+            category,
+        )
+        for granularity in _GRANULARITIES
+        for category in categories
+    ]
+
+
+def upgrade() -> None:
+    rollups = op.create_table(
+        "trade_safety_check_rollups",
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("platform", sa.String(length=16), nullable=False),
+        sa.Column("output_language", sa.String(length=8), nullable=False),
+        sa.Column("score_bucket", sa.Integer(), nullable=False),
+        sa.Column("risk_category", sa.String(length=16), nullable=False),
+        sa.Column("check_count", sa.Integer(), nullable=False),
+        sa.Column("safe_score_sum", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "granularity",
+            "bucket_start",
+            "platform",
+            "output_language",
+            "score_bucket",
+            "risk_category",
+            name=op.f("pk_trade_safety_check_rollups"),
+        ),
+    )
+
+    # Aggregate existing checks in memory (one entry per bucket, not per row)
+    counts: Counter[_RollupKey] = Counter()
+    score_sums: Counter[_RollupKey] = Counter()
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks)
+            .where(trade_safety_checks.c.id > last_id)
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            signals = (row.llm_analysis or {}).get("risk_signals") or []
+            for key in _rollup_keys(
+                row.created_at,
+                row.platform,
+                row.output_language,
+                row.safe_score,
+                (signal["category"] for signal in signals if signal.get("category")),
+            ):
+                counts[key] += 1
+                score_sums[key] += row.safe_score
+        last_id = rows[-1].id
+
+    if counts:
+        op.bulk_insert(
+            rollups,
+            [
+                {
+                    "granularity": key[0],
+                    "bucket_start": key[1],
+                    "platform": key[2],
+                    "output_language": key[3],
+                    "score_bucket": key[4],
+                    "risk_category": key[5],
+                    "check_count": count,
+                    "safe_score_sum": score_sums[key],
+                }
+                for key, count in counts.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("trade_safety_check_rollups")
@@ -0,0 +1,109 @@
+"""add trade_safety_expert_advice and the advice source of copied reviews
+
+Revision ID: c5d1f8a3b7e2
+Revises: 8b5f3e2a7d49
+Create Date: 2026-10-19 21:06:17.448209
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d1f8a3b7e2"
+down_revision: Union[str, None] = "8b5f3e2a7d49"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("input_hash", sa.String(length=64)),
+    sa.column("expert_advice", sa.Text()),
+    sa.column("expert_reviewed", sa.Boolean()),
+    sa.column("expert_reviewed_at", sa.DateTime()),
+    sa.column("expert_reviewed_by", sa.String(length=255)),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("expert_advice_source_id", sa.String(), nullable=True)
+        )
+        batch_op.create_index(
+            batch_op.f("ix_trade_safety_checks_expert_advice_source_id"),
+            ["expert_advice_source_id"],
+            unique=False,
+        )
+
+    expert_advice = op.create_table(
+        "trade_safety_expert_advice",
+        sa.Column("input_hash", sa.String(length=64), nullable=False),
+        sa.Column("check_id", sa.String(), nullable=False),
+        sa.Column("expert_advice", sa.Text(), nullable=False),
+        sa.Column("expert_reviewed_at", sa.DateTime(), nullable=True),
+        sa.Column("expert_reviewed_by", sa.String(length=255), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "input_hash", name=op.f("pk_trade_safety_expert_advice")
+        ),
+    )
+
+    # Keep the latest existing review per input (one entry per input, not per row)
+    latest: dict[str, sa.Row] = {}
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks)
+            .where(
+                trade_safety_checks.c.id > last_id,
+                trade_safety_checks.c.expert_reviewed.is_(True),
+                trade_safety_checks.c.expert_advice.is_not(None),
+                trade_safety_checks.c.input_hash.is_not(None),
+            )
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            current = latest.get(row.input_hash)
+            if current is None or (row.expert_reviewed_at or datetime.min) > (
+                current.expert_reviewed_at or datetime.min
+            ):
+                latest[row.input_hash] = row
+        last_id = rows[-1].id
+
+    if latest:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        op.bulk_insert(
+            expert_advice,
+            [
+                {
+                    "input_hash": input_hash,
+                    "check_id": row.id,
+                    "expert_advice": row.expert_advice,
+                    "expert_reviewed_at": row.expert_reviewed_at,
+                    "expert_reviewed_by": row.expert_reviewed_by,
+                    "updated_at": now,
+                }
+                for input_hash, row in latest.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("trade_safety_expert_advice")
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_index(
+            batch_op.f("ix_trade_safety_checks_expert_advice_source_id")
+        )
+        batch_op.drop_column("expert_advice_source_id")
@@ -0,0 +1,112 @@
+"""rehash post URL inputs with canonical platform keys
+
+Revision ID: d2a8b6c41e07
+Revises: 9c3e4f7a1d58
+Create Date: 2026-10-19 11:47:09.215634
+
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Sequence, Union
+from urllib.parse import urlparse
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a8b6c41e07"
+down_revision: Union[str, None] = "9c3e4f7a1d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("input_text", sa.Text()),
+    sa.column("input_hash", sa.String(length=64)),
+)
+
+# Frozen copy of trade_safety.input_normalization and
+# trade_safety.url_canonicalization as of this revision: the rehash must key
+# posts exactly as the code did when it was written
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TWEET_PATH_PATTERN = re.compile(r"/status(?:es)?/(\d+)")
+_REDDIT_PATH_PATTERN = re.compile(r"/comments/([a-zA-Z0-9]+)")
+_REDDIT_SHORT_PATH_PATTERN = re.compile(r"^/([a-zA-Z0-9]+)/?$")
+
+
+def _host_matches(host: str, *domains: str) -> bool:
+    """Check if host is one of the domains or one of their subdomains."""
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+def _post_key(host: str, path: str) -> str | None:
+    """Platform + post id key of a Twitter/X or Reddit post URL."""
+    if _host_matches(host, "twitter.com", "x.com"):
+        match = _TWEET_PATH_PATTERN.search(path)
+        return f"twitter:{match.group(1)}" if match else None
+    if _host_matches(host, "redd.it"):
+        match = _REDDIT_SHORT_PATH_PATTERN.match(path)
+    elif _host_matches(host, "reddit.com"):
+        match = _REDDIT_PATH_PATTERN.search(path)
+    else:
+        return None
+    return f"reddit:{match.group(1).lower()}" if match else None
+
+
+def _normalize_input(input_text: str) -> str:
+    """Post key or canonical URL for links, NFKC-folded text otherwise."""
+    text = input_text.strip()
+    parsed = urlparse(text)
+    if parsed.scheme in {"http", "https"} and parsed.netloc:
+        host = (parsed.hostname or "").lower()
+        key = _post_key(host, parsed.path)
+        if key is not None:
+            return key
+        host = host.removeprefix("www.")
+        return f"{parsed.scheme.lower()}://{host}{parsed.path.rstrip('/')}"
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def _compute_input_hash(input_text: str) -> str:
+    """SHA-256 hex digest of the normalized input."""
+    return hashlib.sha256(_normalize_input(input_text).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    # URL inputs now hash by platform + post id; text inputs are unchanged
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks.c.id, trade_safety_checks.c.input_text)
+            .where(
+                trade_safety_checks.c.id > last_id,
+                trade_safety_checks.c.input_text.like("http%"),
+            )
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            trade_safety_checks.update()
+            .where(trade_safety_checks.c.id == sa.bindparam("check_id"))
+            .values(input_hash=sa.bindparam("hash")),
+            [
+                {"check_id": row.id, "hash": _compute_input_hash(row.input_text)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # Canonical hashes remain valid lookup keys; nothing to revert
+    pass
@@ -0,0 +1,256 @@
+"""partition trade_safety_checks by month of created_at on PostgreSQL
+
+Revision ID: d9a4c2e6f813
+Revises: c5d1f8a3b7e2
+Create Date: 2026-10-19 22:41:05.517380
+
+No rows are copied: the existing table becomes the legacy partition of the
+new partitioned table, holding every check created before the first month
+partition. The primary key index and a CHECK constraint proving the
+partition bound are prepared beforehand without blocking writes (CREATE
+INDEX CONCURRENTLY, VALIDATE CONSTRAINT), so the swap itself only takes
+brief catalog locks. The legacy partition is emptied month by month by
+trade_safety.retention.
+
+The foreign key of trade_safety_risk_signals.check_id cannot reference the
+partitioned table (its primary key is (id, created_at)), so it is replaced
+by triggers: a signal row must reference an existing check, and deleting a
+check deletes its signal rows at commit (unless the check was moved to
+another partition, as trade_safety.retention does). Detaching and dropping a month partition does
+not fire them; trade_safety.retention deletes the signal rows first.
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a4c2e6f813"
+down_revision: Union[str, None] = "c5d1f8a3b7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the partition helpers of trade_safety.retention as of this
+# revision: the table must be partitioned exactly as the code did when it was
+# written. Months are created ahead as with the default partitions_ahead.
+CHECKS_TABLE = "trade_safety_checks"
+DEFAULT_PARTITION = f"{CHECKS_TABLE}_default"
+LEGACY_PARTITION = f"{CHECKS_TABLE}_legacy"
+PARTITIONS_AHEAD = 3
+# The legacy partition also takes next month's checks, so checks created
+# while the bound is being validated never fall outside it
+LEGACY_MONTHS_AHEAD = 2
+LEGACY_BOUND_CHECK = f"ck_{LEGACY_PARTITION}_bound"
+LEGACY_PK_INDEX = f"pk_{LEGACY_PARTITION}"
+SIGNALS_TABLE = "trade_safety_risk_signals"
+SIGNALS_FK = "fk_trade_safety_risk_signals_check_id_trade_safety_checks"
+SIGNALS_CHECK_TRIGGER = "trg_trade_safety_risk_signals_check_exists"
+CHECKS_DELETE_TRIGGER = "trg_trade_safety_checks_delete_risk_signals"
+
+
+def _month_start(moment: datetime) -> datetime:
+    """Naive UTC first day of the month of a time (naive times are UTC)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    """Shift the first day of a month by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_partitions(first_month: datetime, last_month: datetime) -> None:
+    """Create one partition per month of a range (both ends inclusive).
+
+    The months start after the legacy partition, so the default partition is
+    still empty and no rows have to be moved out of it.
+
+    """
+    month = first_month
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {CHECKS_TABLE}_p{month:%Y%m} PARTITION OF {CHECKS_TABLE} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+        )
+        month = next_month
+
+
+def _secondary_indexes(connection: sa.Connection) -> list[tuple[str, str]]:
+    """(name, CREATE INDEX statement) of the checks table, except the primary key."""
+    return [
+        (name, definition)
+        for name, definition in connection.execute(
+            sa.text(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = :table "
+                "AND indexname <> :pk"
+            ),
+            {"table": CHECKS_TABLE, "pk": f"pk_{CHECKS_TABLE}"},
+        )
+    ]
+
+
+def _create_signal_triggers() -> None:
+    """Enforce the check references of signal rows in place of a foreign key."""
+    op.execute(
+        f"""
+        CREATE FUNCTION {SIGNALS_CHECK_TRIGGER}() RETURNS trigger AS $$
+        BEGIN
+            -- Locks the check like a foreign key does, so it cannot be
+            -- deleted before this transaction commits
+            PERFORM 1 FROM {CHECKS_TABLE} WHERE id = NEW.check_id FOR KEY SHARE;
+            IF NOT FOUND THEN
+                RAISE foreign_key_violation USING MESSAGE = format(
+                    'check %s of a risk signal does not exist', NEW.check_id
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"CREATE TRIGGER {SIGNALS_CHECK_TRIGGER} "
+        f"BEFORE INSERT OR UPDATE OF check_id ON {SIGNALS_TABLE} "
+        f"FOR EACH ROW EXECUTE FUNCTION {SIGNALS_CHECK_TRIGGER}()"
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION {CHECKS_DELETE_TRIGGER}() RETURNS trigger AS $$
+        BEGIN
+            -- Checks moved between partitions are deleted and inserted again
+            DELETE FROM {SIGNALS_TABLE} s WHERE s.check_id = OLD.id
+                AND NOT EXISTS (SELECT 1 FROM {CHECKS_TABLE} c WHERE c.id = OLD.id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Checked at commit, once moved checks are back. Row triggers of a
+    # partitioned table apply to every partition.
+    op.execute(
+        f"CREATE CONSTRAINT TRIGGER {CHECKS_DELETE_TRIGGER} "
+        f"AFTER DELETE ON {CHECKS_TABLE} DEFERRABLE INITIALLY DEFERRED "
+        f"FOR EACH ROW EXECUTE FUNCTION {CHECKS_DELETE_TRIGGER}()"
+    )
+
+
+def _drop_signal_triggers() -> None:
+    """Drop the triggers standing in for the signal foreign key."""
+    op.execute(f"DROP TRIGGER {CHECKS_DELETE_TRIGGER} ON {CHECKS_TABLE}")
+    op.execute(f"DROP FUNCTION {CHECKS_DELETE_TRIGGER}()")
+    op.execute(f"DROP TRIGGER {SIGNALS_CHECK_TRIGGER} ON {SIGNALS_TABLE}")
+    op.execute(f"DROP FUNCTION {SIGNALS_CHECK_TRIGGER}()")
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        # SQLite has no declarative partitioning: the table stays as is and
+        # trade_safety.retention archives it with batched deletes
+        return
+
+    this_month = _month_start(datetime.now(timezone.utc))
+    legacy_end = _add_months(this_month, LEGACY_MONTHS_AHEAD)
+    index_definitions = _secondary_indexes(connection)
+
+    # Prepare the legacy partition while the table stays writable: build the
+    # index of the future primary key and prove the partition bound, so that
+    # attaching scans nothing and adding the primary key builds nothing
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {LEGACY_PK_INDEX} "
+            f"ON {CHECKS_TABLE} (id, created_at)"
+        )
+        op.execute(
+            f"ALTER TABLE {CHECKS_TABLE} "
+            f"DROP CONSTRAINT IF EXISTS {LEGACY_BOUND_CHECK}, "
+            f"ADD CONSTRAINT {LEGACY_BOUND_CHECK} "
+            f"CHECK (created_at < '{legacy_end:%Y-%m-%d}') NOT VALID"
+        )
+        op.execute(
+            f"ALTER TABLE {CHECKS_TABLE} VALIDATE CONSTRAINT {LEGACY_BOUND_CHECK}"
+        )
+
+    op.drop_constraint(SIGNALS_FK, SIGNALS_TABLE, type_="foreignkey")
+    op.execute(f"ALTER TABLE {CHECKS_TABLE} RENAME TO {LEGACY_PARTITION}")
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT pk_{CHECKS_TABLE}")
+    op.execute(
+        f"ALTER TABLE {LEGACY_PARTITION} ADD CONSTRAINT {LEGACY_PK_INDEX} "
+        f"PRIMARY KEY USING INDEX {LEGACY_PK_INDEX}"
+    )
+    # Free the index names for the partitioned table
+    for name, _ in index_definitions:
+        op.execute(
+            f"ALTER INDEX {name} RENAME TO "
+            f"{name.replace(CHECKS_TABLE, LEGACY_PARTITION, 1)}"
+        )
+
+    op.execute(
+        f"CREATE TABLE {CHECKS_TABLE} "
+        f"(LIKE {LEGACY_PARTITION} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"ALTER TABLE {CHECKS_TABLE} DROP CONSTRAINT {LEGACY_BOUND_CHECK}")
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {CHECKS_TABLE} DEFAULT")
+    _create_partitions(legacy_end, _add_months(this_month, PARTITIONS_AHEAD))
+    op.execute(
+        f"ALTER TABLE {CHECKS_TABLE} ATTACH PARTITION {LEGACY_PARTITION} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{legacy_end:%Y-%m-%d}')"
+    )
+    op.execute(f"ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT {LEGACY_BOUND_CHECK}")
+
+    # Unique keys of a partitioned table must include the partition key.
+    # Indexes created on the parent are created on every partition; the
+    # matching indexes of the legacy partition are attached instead of built.
+    op.execute(
+        f"ALTER TABLE {CHECKS_TABLE} "
+        f"ADD CONSTRAINT pk_{CHECKS_TABLE} PRIMARY KEY (id, created_at)"
+    )
+    for _, definition in index_definitions:
+        op.execute(definition)
+
+    _create_signal_triggers()
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        return
+
+    _drop_signal_triggers()
+    index_definitions = _secondary_indexes(connection)
+    partitioned_table = f"{CHECKS_TABLE}_partitioned"
+    op.execute(f"ALTER TABLE {CHECKS_TABLE} RENAME TO {partitioned_table}")
+    op.execute(
+        f"CREATE TABLE {CHECKS_TABLE} "
+        f"(LIKE {partitioned_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute(f"INSERT INTO {CHECKS_TABLE} SELECT * FROM {partitioned_table}")
+    op.execute(f"DROP TABLE {partitioned_table}")
+    op.execute(
+        f"ALTER TABLE {CHECKS_TABLE} ADD CONSTRAINT pk_{CHECKS_TABLE} PRIMARY KEY (id)"
+    )
+    for _, definition in index_definitions:
+        op.execute(definition)
+
+    # Signal rows of checks deleted without the foreign key would violate it
+    op.execute(
+        f"DELETE FROM {SIGNALS_TABLE} s WHERE NOT EXISTS "
+        f"(SELECT 1 FROM {CHECKS_TABLE} c WHERE c.id = s.check_id)"
+    )
+    op.create_foreign_key(
+        SIGNALS_FK,
+        SIGNALS_TABLE,
+        CHECKS_TABLE,
+        ["check_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
@@ -0,0 +1,217 @@
+"""promote filtered llm_analysis fields to columns and a risk signal table
+
+Revision ID: e1c7a9f3b260
+Revises: b6e4d1a8c352
+Create Date: 2026-10-19 18:20:57.318406
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1c7a9f3b260"
+down_revision: Union[str, None] = "b6e4d1a8c352"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("llm_analysis", sa.JSON()),
+    sa.column("currency", sa.String(length=3)),
+    sa.column("max_risk_severity", sa.String(length=8)),
+)
+
+# Frozen copy of trade_safety.currency.normalize_currency and of
+# promoted_fields/risk_signal_rows of
+# trade_safety.repositories.trade_safety_repository as of this revision: the
+# backfill must extract fields exactly as the code did when it was written
+_SEVERITY_ORDER = ["low", "medium", "high"]
+_CURRENCY_ALIASES: dict[str, str] = {
+    "₩": "KRW",
+    "원": "KRW",
+    "won": "KRW",
+    "krw": "KRW",
+    "$": "USD",
+    "usd": "USD",
+    "달러": "USD",
+    "dollar": "USD",
+    "dollars": "USD",
+    "¥": "JPY",
+    "円": "JPY",
+    "엔": "JPY",
+    "yen": "JPY",
+    "jpy": "JPY",
+    "€": "EUR",
+    "eur": "EUR",
+    "euro": "EUR",
+    "euros": "EUR",
+    "£": "GBP",
+    "gbp": "GBP",
+    "php": "PHP",
+    "₱": "PHP",
+    "cad": "CAD",
+    "aud": "AUD",
+    "sgd": "SGD",
+}
+
+
+def _normalize_currency(currency: str | None) -> str | None:
+    """Map a currency code, symbol or word to its ISO 4217 code."""
+    if not currency:
+        return None
+    cleaned = currency.strip()
+    return _CURRENCY_ALIASES.get(cleaned.casefold()) or (
+        cleaned.upper()
+        if len(cleaned) == 3 and cleaned.isalpha() and cleaned.isascii()
+        else None
+    )
+
+
+def _risk_signal_rows(llm_analysis: dict | None) -> list[tuple[str, str]]:
+    """(category, severity) per risk signal of a stored analysis."""
+    signals = (llm_analysis or {}).get("risk_signals") or []
+    return [
+        (str(signal["category"]), str(signal["severity"]))
+        for signal in signals
+        if signal.get("category") and signal.get("severity")
+    ]
+
+
+def _promoted_fields(llm_analysis: dict | None) -> dict:
+    """Column values of currency and max_risk_severity of a stored analysis."""
+    price_analysis = (llm_analysis or {}).get("price_analysis") or {}
+    severities = [
+        severity
+        for _, severity in _risk_signal_rows(llm_analysis)
+        if severity in _SEVERITY_ORDER
+    ]
+    return {
+        "currency": _normalize_currency(price_analysis.get("currency")),
+        "max_risk_severity": (
+            max(severities, key=_SEVERITY_ORDER.index) if severities else None
+        ),
+    }
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("currency", sa.String(length=3), nullable=True))
+        batch_op.add_column(
+            sa.Column("max_risk_severity", sa.String(length=8), nullable=True)
+        )
+
+    risk_signals = op.create_table(
+        "trade_safety_risk_signals",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("check_id", sa.String(), nullable=False),
+        sa.Column("category", sa.String(length=16), nullable=False),
+        sa.Column("severity", sa.String(length=8), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["check_id"],
+            ["trade_safety_checks.id"],
+            name=op.f("fk_trade_safety_risk_signals_check_id_trade_safety_checks"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_trade_safety_risk_signals")),
+    )
+
+    # Backfill in batches; rows are only read once, in primary key order
+    connection = op.get_bind()
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(trade_safety_checks.c.id, trade_safety_checks.c.llm_analysis)
+            .where(trade_safety_checks.c.id > last_id)
+            .order_by(trade_safety_checks.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            trade_safety_checks.update()
+            .where(trade_safety_checks.c.id == sa.bindparam("check_id"))
+            .values(
+                currency=sa.bindparam("new_currency"),
+                max_risk_severity=sa.bindparam("new_max_risk_severity"),
+            ),
+            [
+                {
+                    "check_id": row.id,
+                    **{
+                        f"new_{name}": value
+                        for name, value in _promoted_fields(row.llm_analysis).items()
+                    },
+                }
+                for row in rows
+            ],
+        )
+        signal_rows = [
+            {"check_id": row.id, "category": category, "severity": severity}
+            for row in rows
+            for category, severity in _risk_signal_rows(row.llm_analysis)
+        ]
+        if signal_rows:
+            op.bulk_insert(risk_signals, signal_rows)
+        last_id = rows[-1].id
+
+    # Indexes are built after the backfill, in one pass each
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        for column in ("currency", "max_risk_severity", "platform", "output_language"):
+            batch_op.create_index(
+                batch_op.f(f"ix_trade_safety_checks_{column}"), [column], unique=False
+            )
+    with op.batch_alter_table("trade_safety_risk_signals", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_trade_safety_risk_signals_check_id"),
+            ["check_id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_trade_safety_risk_signals_category_severity",
+            ["category", "severity", "check_id"],
+            unique=False,
+        )
+
+    if connection.dialect.name == "postgresql":
+        op.alter_column(
+            "trade_safety_checks",
+            "llm_analysis",
+            type_=postgresql.JSONB(),
+            postgresql_using="llm_analysis::jsonb",
+        )
+        op.create_index(
+            "ix_trade_safety_checks_llm_analysis",
+            "trade_safety_checks",
+            ["llm_analysis"],
+            postgresql_using="gin",
+            postgresql_ops={"llm_analysis": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index(
+            "ix_trade_safety_checks_llm_analysis", table_name="trade_safety_checks"
+        )
+        op.alter_column(
+            "trade_safety_checks",
+            "llm_analysis",
+            type_=sa.JSON(),
+            postgresql_using="llm_analysis::json",
+        )
+
+    op.drop_table("trade_safety_risk_signals")
+
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        for column in ("output_language", "platform", "max_risk_severity", "currency"):
+            batch_op.drop_index(batch_op.f(f"ix_trade_safety_checks_{column}"))
+        batch_op.drop_column("max_risk_severity")
+        batch_op.drop_column("currency")
@@ -0,0 +1,91 @@
+"""add compressed llm_analysis storage and trade_safety_analysis_dictionaries
+
+Revision ID: f3b7c1d5e924
+Revises: d9a4c2e6f813
+Create Date: 2026-10-19 23:52:38.140925
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b7c1d5e924"
+down_revision: Union[str, None] = "d9a4c2e6f813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+trade_safety_checks = sa.table(
+    "trade_safety_checks",
+    sa.column("id", sa.String()),
+    sa.column("llm_analysis_zstd", sa.LargeBinary()),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trade_safety_analysis_dictionaries",
+        sa.Column("dict_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("output_language", sa.String(length=8), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "dict_id", name=op.f("pk_trade_safety_analysis_dictionaries")
+        ),
+    )
+    with op.batch_alter_table(
+        "trade_safety_analysis_dictionaries", schema=None
+    ) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_trade_safety_analysis_dictionaries_output_language"),
+            ["output_language"],
+            unique=False,
+        )
+
+    # Existing rows keep their JSON; `python -m trade_safety.analysis_storage
+    # compress` rewrites them
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("llm_analysis_zstd", sa.LargeBinary(), nullable=True)
+        )
+        batch_op.alter_column("llm_analysis", existing_type=sa.JSON(), nullable=True)
+        batch_op.create_check_constraint(
+            "analysis_stored",
+            "llm_analysis IS NOT NULL OR llm_analysis_zstd IS NOT NULL",
+        )
+
+
+def downgrade() -> None:
+    compressed = (
+        op.get_bind()
+        .execute(
+            sa.select(trade_safety_checks.c.id)
+            .where(trade_safety_checks.c.llm_analysis_zstd.is_not(None))
+            .limit(1)
+        )
+        .first()
+    )
+    if compressed is not None:
+        raise RuntimeError(
+            "Compressed analyses would be lost: run "
+            "`python -m trade_safety.analysis_storage decompress` first"
+        )
+
+    with op.batch_alter_table("trade_safety_checks", schema=None) as batch_op:
+        batch_op.drop_constraint(
+            op.f("ck_trade_safety_checks_analysis_stored"), type_="check"
+        )
+        batch_op.alter_column("llm_analysis", existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column("llm_analysis_zstd")
+
+    with op.batch_alter_table(
+        "trade_safety_analysis_dictionaries", schema=None
+    ) as batch_op:
+        batch_op.drop_index(
+            batch_op.f("ix_trade_safety_analysis_dictionaries_output_language")
+        )
+    op.drop_table("trade_safety_analysis_dictionaries")
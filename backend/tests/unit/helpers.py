@@ -0,0 +1,57 @@
+"""Shared builders of databases and stored checks for unit tests."""
+
+from collections.abc import Sequence
+
+from aioia_core.models import Base
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from trade_safety.schemas import TradeSafetyCheckCreate
+
+
+def create_db_session() -> Session:
+    """Create in-memory SQLite database session."""
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def build_risk_signal(category: str = "payment") -> dict:
+    """Build a high-severity risk signal payload."""
+    return {
+        "category": category,
+        "severity": "high",
+        "title": "Prepayment only",
+        "description": "Description",
+        "what_to_do": "Be careful",
+    }
+
+
+def build_analysis(safe_score: int = 70, risk_signals: Sequence[dict] = ()) -> dict:
+    """Build a valid current-version analysis payload."""
+    return {
+        "ai_summary": ["line 1", "line 2", "line 3"],
+        "risk_signals": list(risk_signals),
+        "cautions": [],
+        "safe_indicators": [],
+        "price_analysis": {"price_assessment": "Fair price"},
+        "safety_checklist": [],
+        "safe_score": safe_score,
+        "recommendation": "Proceed with caution",
+        "emotional_support": "Take your time",
+    }
+
+
+def build_create(
+    input_text: str = "급처분 양도해요",
+    safe_score: int = 70,
+    risk_signals: Sequence[dict] = (),
+    **kwargs,
+) -> TradeSafetyCheckCreate:
+    """Build a TradeSafetyCheckCreate with the given score and signals."""
+    return TradeSafetyCheckCreate(
+        input_text=input_text,
+        llm_analysis=build_analysis(safe_score, risk_signals),
+        safe_score=safe_score,
+        **kwargs,
+    )
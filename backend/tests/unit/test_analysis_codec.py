@@ -0,0 +1,208 @@
+"""Unit tests for compressed storage of llm_analysis payloads."""
+
+import unittest
+
+from tests.unit.helpers import create_db_session
+from trade_safety.analysis_codec import (
+    ZSTD_AVAILABLE,
+    AnalysisCodec,
+    benchmark,
+    dumps_analysis,
+)
+from trade_safety.analysis_storage import rewrite_analyses, train_dictionaries
+from trade_safety.models import DBTradeSafetyCheck
+from trade_safety.repositories.analysis_dictionary_repository import (
+    DatabaseAnalysisDictionaryManager,
+)
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.schemas import TradeSafetyCheckCreate
+from trade_safety.settings import AnalysisCodecSettings
+
+
+def _analysis(n: int) -> dict:
+    """Build an analysis sharing most of its text with the others."""
+    return {
+        "ai_summary": [
+            f"판매자가 선입금을 요구합니다 (게시글 {n})",
+            "가격이 시세보다 낮습니다",
+            "직거래를 권장합니다",
+        ],
+        "risk_signals": [
+            {
+                "category": "payment",
+                "severity": "high",
+                "title": "Prepayment only",
+                "description": f"The seller asks for a bank transfer of {n * 1000} "
+                "KRW before shipping",
+                "what_to_do": "Use an escrow service or meet in person.",
+            }
+        ],
+        "cautions": [],
+        "safe_indicators": [],
+        "price_analysis": {
+            "price_assessment": "The price is lower than typical market prices",
+            "offered_price": 10000 + n * 37,
+            "currency": "KRW",
+        },
+        "safety_checklist": [
+            "Check the seller's trade history",
+            "Ask for a photo with today's date",
+        ],
+        "safe_score": n % 100,
+        "recommendation": "Proceed with caution",
+        "emotional_support": "It's okay to take your time and ask questions.",
+    }
+
+
+def _build_create(n: int) -> TradeSafetyCheckCreate:
+    """Build a TradeSafetyCheckCreate written in Korean."""
+    return TradeSafetyCheckCreate(
+        input_text=f"포카 양도 {n}",
+        output_language="KO",
+        llm_analysis=_analysis(n),
+        safe_score=n % 100,
+    )
+
+
+def _settings(compress: bool = True) -> AnalysisCodecSettings:
+    """Codec settings sized for a few dozen test analyses."""
+    return AnalysisCodecSettings(
+        compress=compress,
+        dictionary_size=4096,
+        training_samples=60,
+        min_training_samples=20,
+    )
+
+
+@unittest.skipUnless(ZSTD_AVAILABLE, "zstandard is not installed")
+class TestAnalysisCodec(unittest.TestCase):
+    """Test encoding, decoding and dictionary training."""
+
+    def setUp(self):
+        """Set up a database for the dictionaries."""
+        self.session = create_db_session()
+        self.codec = AnalysisCodec(
+            DatabaseAnalysisDictionaryManager(self.session), _settings()
+        )
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def test_round_trip_without_dictionary(self):
+        """Languages without a dictionary should still round-trip."""
+        frame = self.codec.encode(_analysis(1), "KO")
+
+        self.assertEqual(self.codec.decode(frame), _analysis(1))
+        self.assertEqual(self.codec.load(None, frame), _analysis(1))
+        self.assertEqual(self.codec.load(_analysis(2), None), _analysis(2))
+
+    def test_dictionary_shrinks_frames(self):
+        """A trained dictionary should compress better than plain zstd."""
+        # Given
+        plain_frame = self.codec.encode(_analysis(500), "KO")
+        dict_id = self.codec.train("KO", [_analysis(n) for n in range(60)])
+
+        # When
+        frame = self.codec.encode(_analysis(500), "KO")
+
+        # Then: Smaller, and readable by another codec of the same database
+        self.assertLess(len(frame), len(plain_frame) / 2)
+        self.assertLess(len(plain_frame), len(dumps_analysis(_analysis(500))))
+        other_codec = AnalysisCodec(
+            DatabaseAnalysisDictionaryManager(self.session), _settings()
+        )
+        self.assertEqual(other_codec.decode(frame), _analysis(500))
+        self.assertEqual(other_codec.dictionaries.latest_id("KO"), dict_id)
+        self.assertIsNone(other_codec.dictionaries.latest_id("EN"))
+
+    def test_invalid_input_is_rejected(self):
+        """Too few samples and corrupt frames should raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.codec.train("KO", [_analysis(1)])
+        with self.assertRaises(ValueError):
+            self.codec.decode(b"not a zstd frame")
+        with self.assertRaises(ValueError):
+            self.codec.load(None, None)
+
+
+@unittest.skipUnless(ZSTD_AVAILABLE, "zstandard is not installed")
+class TestCompressedStorage(unittest.TestCase):
+    """Test that checks read the same however their analysis is stored."""
+
+    def setUp(self):
+        """Set up a database for each test."""
+        self.session = create_db_session()
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def _manager(self, compress: bool) -> DatabaseTradeSafetyCheckManager:
+        codec = AnalysisCodec(
+            DatabaseAnalysisDictionaryManager(self.session), _settings(compress)
+        )
+        return DatabaseTradeSafetyCheckManager(self.session, analysis_codec=codec)
+
+    def test_manager_writes_and_reads_compressed(self):
+        """With compression on, rows should store a frame and read back as usual."""
+        # Given
+        manager = self._manager(compress=True)
+
+        # When
+        created = manager.create(_build_create(7))
+
+        # Then
+        db_check = self.session.get(DBTradeSafetyCheck, created.id)
+        assert db_check is not None
+        self.assertIsNone(db_check.llm_analysis)
+        self.assertIsNotNone(db_check.llm_analysis_zstd)
+        self.assertEqual(db_check.max_risk_severity, "high")
+
+        fetched = self._manager(compress=False).get_by_id(created.id)
+        assert fetched is not None
+        self.assertEqual(fetched.llm_analysis, created.llm_analysis)
+        self.assertEqual(fetched.llm_analysis.safe_score, 7)
+        observations = list(manager.iter_price_observations())
+        self.assertEqual(observations[0][2:], (10259, "KRW"))
+
+    def test_migration_tool_round_trip(self):
+        """Stored JSON rows should be compressed, benchmarked and restored."""
+        # Given: JSON rows written before compression was enabled
+        json_manager = self._manager(compress=False)
+        check_ids = [json_manager.create(_build_create(n)).id for n in range(30)]
+        codec = json_manager.analysis_codec
+
+        # When
+        trained = train_dictionaries(self.session, codec)
+        while rewrite_analyses(self.session, codec, compress=True, batch_size=8):
+            pass
+
+        # Then
+        self.assertEqual(list(trained), ["KO"])
+        db_check = self.session.get(DBTradeSafetyCheck, check_ids[3])
+        assert db_check is not None
+        self.assertIsNone(db_check.llm_analysis)
+        check = json_manager.get_by_id(check_ids[3])
+        assert check is not None
+        self.assertEqual(check.llm_analysis.safe_score, 3)
+
+        result = benchmark(codec, "KO", [_analysis(n) for n in range(100, 110)])
+        self.assertEqual(result.dict_id, trained["KO"])
+        self.assertGreater(result.ratio, 3)
+        self.assertLess(result.stored_bytes, result.zstd_bytes)
+
+        # When: Decompressed again (before downgrading)
+        rewritten = rewrite_analyses(self.session, codec, compress=False)
+
+        # Then
+        self.assertEqual(rewritten, 30)
+        self.session.refresh(db_check)
+        self.assertEqual(db_check.llm_analysis, _analysis(3))
+        self.assertIsNone(db_check.llm_analysis_zstd)
+
+
+if __name__ == "__main__":
+    unittest.main()
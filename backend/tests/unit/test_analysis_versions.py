@@ -0,0 +1,63 @@
+"""Unit tests for stored analysis schema versioning."""
+
+import unittest
+
+from tests.unit.helpers import build_analysis
+from trade_safety.analysis_versions import (
+    ANALYSIS_SCHEMA_VERSION,
+    LEGACY_ANALYSIS_SCHEMA_VERSION,
+    is_current,
+    upgrade_analysis,
+)
+from trade_safety.schemas import TradeSafetyAnalysis
+
+
+class TestUpgradeAnalysis(unittest.TestCase):
+    """Test lazy upgrade of stored analysis payloads."""
+
+    def test_current_payload_returned_without_copy(self):
+        """Current payloads should skip the upgrade chain entirely."""
+        payload = build_analysis()
+
+        result = upgrade_analysis(payload, ANALYSIS_SCHEMA_VERSION)
+
+        self.assertIs(result, payload)
+        self.assertTrue(is_current(ANALYSIS_SCHEMA_VERSION))
+
+    def test_legacy_payload_renames_risk_score(self):
+        """Legacy payloads storing risk_score should be readable as safe_score."""
+        payload = build_analysis()
+        payload["risk_score"] = payload.pop("safe_score")
+
+        result = upgrade_analysis(payload, LEGACY_ANALYSIS_SCHEMA_VERSION)
+
+        self.assertEqual(result["safe_score"], 70)
+        self.assertNotIn("risk_score", result)
+        self.assertEqual(TradeSafetyAnalysis(**result).safe_score, 70)
+
+    def test_legacy_payload_is_not_mutated(self):
+        """Upgrading should never mutate the stored (ORM-tracked) payload."""
+        payload = build_analysis()
+        payload["risk_score"] = payload.pop("safe_score")
+
+        upgrade_analysis(payload, LEGACY_ANALYSIS_SCHEMA_VERSION)
+
+        self.assertIn("risk_score", payload)
+        self.assertNotIn("safe_score", payload)
+
+    def test_legacy_payload_with_safe_score_unchanged(self):
+        """Legacy rows written after the column rename already use safe_score."""
+        payload = build_analysis()
+
+        result = upgrade_analysis(payload, LEGACY_ANALYSIS_SCHEMA_VERSION)
+
+        self.assertEqual(result, payload)
+
+    def test_future_version_raises(self):
+        """Payloads from a newer deployment should fail loudly."""
+        with self.assertRaises(ValueError):
+            upgrade_analysis(build_analysis(), ANALYSIS_SCHEMA_VERSION + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Unit tests for author reputation aggregates and prompt notes."""
+
+import unittest
+from datetime import datetime
+
+from tests.unit.helpers import create_db_session
+from trade_safety.author_reputation import author_reputation_note, normalize_author
+from trade_safety.repositories.author_reputation_repository import (
+    DatabaseAuthorReputationManager,
+)
+from trade_safety.schemas import Platform
+from trade_safety.settings import AuthorReputationSettings
+
+
+class TestNormalizeAuthor(unittest.TestCase):
+    """Test username normalization."""
+
+    def test_strips_prefixes_and_case(self):
+        """Display forms of one account should share a key."""
+        for author in ("Seller_123", "@seller_123", "u/Seller_123", " /u/SELLER_123 "):
+            self.assertEqual(normalize_author(author), "seller_123")
+
+
+class TestDatabaseAuthorReputationManager(unittest.TestCase):
+    """Test reputation aggregates against in-memory SQLite."""
+
+    def setUp(self):
+        """Set up an isolated database for each test."""
+        self.session = create_db_session()
+        self.reputations = DatabaseAuthorReputationManager(
+            self.session, AuthorReputationSettings(risky_score_threshold=40)
+        )
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def test_get_unknown_author(self):
+        """Authors never checked should have no reputation."""
+        self.assertIsNone(self.reputations.get(Platform.TWITTER, "nobody"))
+
+    def test_record_check_aggregates_scores(self):
+        """Checks should update counts, minimum, average and last seen."""
+        # Given
+        self.reputations.record_check(
+            Platform.TWITTER, "@Seller123", 80, datetime(2026, 10, 1)
+        )
+        self.reputations.record_check(
+            Platform.TWITTER, "seller123", 20, datetime(2026, 10, 5)
+        )
+
+        # When
+        reputation = self.reputations.get(Platform.TWITTER, "SELLER123")
+
+        # Then
+        assert reputation is not None
+        self.assertEqual(reputation.check_count, 2)
+        self.assertEqual(reputation.risky_check_count, 1)
+        self.assertEqual(reputation.min_safe_score, 20)
+        self.assertEqual(reputation.avg_safe_score, 50)
+        self.assertEqual(reputation.first_seen_at, datetime(2026, 10, 1))
+        self.assertEqual(reputation.last_seen_at, datetime(2026, 10, 5))
+
+    def test_authors_are_separated_by_platform(self):
+        """The same username on another platform is another account."""
+        self.reputations.record_check(Platform.TWITTER, "seller123", 10)
+
+        self.assertIsNone(self.reputations.get(Platform.REDDIT, "seller123"))
+
+    def test_record_review_counts_risky_reviews(self):
+        """Expert reviews should be counted separately from checks."""
+        self.reputations.record_check(Platform.REDDIT, "seller123", 15)
+
+        self.reputations.record_review(Platform.REDDIT, "seller123", 15)
+        self.reputations.record_review(Platform.REDDIT, "seller123", 90)
+
+        reputation = self.reputations.get(Platform.REDDIT, "seller123")
+        assert reputation is not None
+        self.assertEqual(reputation.check_count, 1)
+        self.assertEqual(reputation.reviewed_count, 2)
+        self.assertEqual(reputation.reviewed_risky_count, 1)
+
+
+class TestAuthorReputationNote(unittest.TestCase):
+    """Test the prompt note built from an author's history."""
+
+    def setUp(self):
+        """Set up one author with a risky check."""
+        self.session = create_db_session()
+        self.reputations = DatabaseAuthorReputationManager(self.session)
+        self.reputations.record_check(
+            Platform.TWITTER, "seller123", 10, datetime(2026, 10, 1)
+        )
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def test_note_summarizes_history(self):
+        """Known authors should be described with their scores."""
+        reputation = self.reputations.get(Platform.TWITTER, "seller123")
+
+        note = author_reputation_note(
+            reputation, risky_score_threshold=40, min_checks=1
+        )
+
+        assert note is not None
+        self.assertIn("checked 1 time(s)", note)
+        self.assertIn("lowest safety score 10", note)
+        self.assertIn("last seen 2026-10-01", note)
+        self.assertNotIn("HIGH", note)
+
+    def test_confirmed_risk_is_flagged_high(self):
+        """Expert-confirmed risky authors should be reported as HIGH severity."""
+        self.reputations.record_review(Platform.TWITTER, "seller123", 10)
+        reputation = self.reputations.get(Platform.TWITTER, "seller123")
+
+        note = author_reputation_note(
+            reputation, risky_score_threshold=40, min_checks=1
+        )
+
+        assert note is not None
+        self.assertIn("confirmed 1 as risky", note)
+        self.assertIn("HIGH severity seller risk signal", note)
+
+    def test_no_note_without_enough_history(self):
+        """Unknown authors or too few checks should not produce a note."""
+        reputation = self.reputations.get(Platform.TWITTER, "seller123")
+
+        self.assertIsNone(
+            author_reputation_note(reputation, risky_score_threshold=40, min_checks=2)
+        )
+        self.assertIsNone(
+            author_reputation_note(None, risky_score_threshold=40, min_checks=1)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Unit tests for MicroBatcher."""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from trade_safety.batching import MicroBatcher
+from trade_safety.post_cache import PostUnavailableError
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test grouping of concurrent lookups into batch calls."""
+
+    def setUp(self):
+        """Set up a batch function recording its calls."""
+        self.calls: list[list[str]] = []
+        self.calls_lock = threading.Lock()
+
+    def _fetch_batch(self, keys: list[str]) -> dict:
+        """Echo keys upper-cased, reporting "missing" as a per-key error."""
+        with self.calls_lock:
+            self.calls.append(keys)
+        return {
+            key: (KeyError(key) if key == "missing" else key.upper()) for key in keys
+        }
+
+    def test_concurrent_lookups_share_one_batch(self):
+        """Lookups submitted within the window should be fetched together."""
+        # Given: Batcher with a generous window
+        batcher = MicroBatcher(self._fetch_batch, window_seconds=0.05)
+
+        # When: Three concurrent callers (two asking for the same key)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(batcher.fetch, ["a", "b", "a"]))
+
+        # Then: One batch call with deduplicated keys, results mapped back
+        self.assertEqual(results, ["A", "B", "A"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(sorted(self.calls[0]), ["a", "b"])
+
+    def test_full_batch_flushes_immediately(self):
+        """Reaching max_batch_size should flush without waiting for the window."""
+        batcher = MicroBatcher(self._fetch_batch, max_batch_size=2, window_seconds=60)
+
+        first = batcher.submit("a")
+        second = batcher.submit("b")
+
+        self.assertEqual(first.result(timeout=1), "A")
+        self.assertEqual(second.result(timeout=1), "B")
+        self.assertEqual(self.calls, [["a", "b"]])
+
+    def test_per_key_error_only_fails_its_caller(self):
+        """A per-key error should not affect other keys of the batch."""
+        batcher = MicroBatcher(self._fetch_batch, window_seconds=60)
+
+        ok = batcher.submit("a")
+        missing = batcher.submit("missing")
+        batcher.flush()
+
+        self.assertEqual(ok.result(timeout=1), "A")
+        with self.assertRaises(KeyError):
+            missing.result(timeout=1)
+
+    def test_key_without_result_is_unavailable(self):
+        """A key missing from the batch response should fail as unavailable."""
+
+        def omit_b(keys: list[str]) -> dict:
+            return {key: key.upper() for key in keys if key != "b"}
+
+        batcher = MicroBatcher(omit_b, window_seconds=60)
+        found = batcher.submit("a")
+        omitted = batcher.submit("b")
+        batcher.flush()
+
+        self.assertEqual(found.result(timeout=1), "A")
+        with self.assertRaises(PostUnavailableError) as context:
+            omitted.result(timeout=1)
+        self.assertIsInstance(context.exception, ValueError)
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_batch_error_fails_all_callers(self):
+        """A failing batch call should propagate to every caller."""
+
+        def fail(keys: list[str]) -> dict:
+            raise ValueError("Twitter API error: 429")
+
+        batcher = MicroBatcher(fail, window_seconds=60)
+        futures = [batcher.submit("a"), batcher.submit("b")]
+        batcher.flush()
+
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
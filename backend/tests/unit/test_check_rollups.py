@@ -0,0 +1,161 @@
+"""Unit tests for the analytics rollups of trade safety checks."""
+
+import unittest
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from tests.unit.helpers import build_create, build_risk_signal, create_db_session
+from trade_safety.models import DBCheckRollup
+from trade_safety.repositories.check_rollup_repository import (
+    ALL_CATEGORIES,
+    DatabaseCheckRollupManager,
+    bucket_start,
+    rollup_keys,
+)
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.schemas import (
+    Platform,
+    RiskCategory,
+    StatsDimension,
+    StatsGranularity,
+    TradeSafetyCheckCreate,
+)
+
+SINCE = datetime(2026, 10, 1)
+
+
+def _build_create(
+    safe_score: int, categories: tuple[str, ...] = (), **kwargs
+) -> TradeSafetyCheckCreate:
+    """Build a TradeSafetyCheckCreate with the given score and signals."""
+    return build_create(
+        safe_score=safe_score,
+        risk_signals=[build_risk_signal(category) for category in categories],
+        **kwargs,
+    )
+
+
+class TestRollupKeys(unittest.TestCase):
+    """Test the rollup rows a check counts towards."""
+
+    def test_bucket_start_truncates_to_utc(self):
+        """Aware times should be converted to naive UTC bucket starts."""
+        moment = datetime(2026, 10, 19, 14, 35, 10, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            bucket_start(moment, StatsGranularity.HOUR), datetime(2026, 10, 19, 14)
+        )
+        self.assertEqual(
+            bucket_start(moment, StatsGranularity.DAY), datetime(2026, 10, 19)
+        )
+
+    def test_keys_per_granularity_and_distinct_category(self):
+        """Repeated categories should count once; 100 falls in the top bucket."""
+        keys = rollup_keys(
+            datetime(2026, 10, 19, 14, 35), None, "ko", 100, ["payment", "payment"]
+        )
+
+        self.assertEqual(len(keys), 4)
+        self.assertEqual({key[4] for key in keys}, {80})
+        self.assertEqual({key[5] for key in keys}, {ALL_CATEGORIES, "payment"})
+        self.assertEqual({key[2] for key in keys}, {""})
+
+
+class TestDatabaseCheckRollupManager(unittest.TestCase):
+    """Test rollups maintained by check creation and read by queries."""
+
+    def setUp(self):
+        """Set up an isolated database for each test."""
+        self.session = create_db_session()
+        self.manager = DatabaseTradeSafetyCheckManager(self.session)
+        self.rollups: DatabaseCheckRollupManager = self.manager.check_rollups
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def test_create_increments_existing_rows(self):
+        """Checks in the same bucket should share rollup rows."""
+        self.manager.create(_build_create(10, output_language="en"))
+        self.manager.create(_build_create(15, output_language="en"))
+
+        row_count = self.session.scalar(
+            select(func.count()).select_from(  # pylint: disable=not-callable
+                DBCheckRollup
+            )
+        )
+        stats = self.rollups.query(StatsGranularity.DAY, since=SINCE)
+
+        self.assertEqual(row_count, 2)
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].check_count, 2)
+        self.assertEqual(stats[0].avg_safe_score, 12.5)
+
+    def test_high_risk_checks_per_language_and_platform(self):
+        """High-risk counts should be grouped by the requested dimensions."""
+        # Given
+        self.manager.create(_build_create(10, output_language="ko"))
+        self.manager.create(
+            _build_create(
+                25, output_language="ko", platform=Platform.TWITTER, author="seller"
+            )
+        )
+        self.manager.create(_build_create(30, output_language="en"))
+        self.manager.create(_build_create(90, output_language="ko"))
+
+        # When
+        stats = self.rollups.query(
+            StatsGranularity.DAY,
+            since=SINCE,
+            group_by=[StatsDimension.OUTPUT_LANGUAGE, StatsDimension.PLATFORM],
+            max_safe_score=40,
+        )
+
+        # Then
+        counts = {
+            (bucket.output_language, bucket.platform): bucket.check_count
+            for bucket in stats
+        }
+        self.assertEqual(
+            counts, {("en", None): 1, ("ko", None): 1, ("ko", Platform.TWITTER): 1}
+        )
+
+    def test_group_by_risk_category(self):
+        """Checks should be counted under each category of their signals."""
+        self.manager.create(_build_create(10, ("payment", "seller")))
+        self.manager.create(_build_create(20, ("payment",)))
+        self.manager.create(_build_create(80))
+
+        by_category = self.rollups.query(
+            StatsGranularity.HOUR,
+            since=SINCE,
+            group_by=[StatsDimension.RISK_CATEGORY],
+        )
+        payment_only = self.rollups.query(
+            StatsGranularity.HOUR, since=SINCE, risk_category=RiskCategory.PAYMENT
+        )
+
+        self.assertEqual(
+            {bucket.risk_category: bucket.check_count for bucket in by_category},
+            {RiskCategory.PAYMENT: 2, RiskCategory.SELLER: 1},
+        )
+        self.assertEqual(payment_only[0].check_count, 2)
+        self.assertEqual(payment_only[0].avg_safe_score, 15)
+
+    def test_query_excludes_buckets_outside_period(self):
+        """Buckets before `since` or from `until` on should not be returned."""
+        self.manager.create(_build_create(50))
+
+        self.assertEqual(
+            self.rollups.query(StatsGranularity.DAY, since=datetime(2099, 1, 1)), []
+        )
+        self.assertEqual(
+            self.rollups.query(StatsGranularity.DAY, since=SINCE, until=SINCE), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
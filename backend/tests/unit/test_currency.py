@@ -0,0 +1,219 @@
+"""Unit tests for currency normalization and the FX rate table."""
+
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import requests
+
+from trade_safety.currency import (
+    BUNDLED_RATES_AS_OF,
+    CurrencyConverter,
+    FXRateTable,
+    normalize_currency,
+)
+from trade_safety.settings import CurrencySettings
+
+RATES_URL = "https://fx.example.com/latest"
+
+
+def _rates_response(base: str, rates: dict[str, float]) -> MagicMock:
+    """Build a mocked rate API response."""
+    response = MagicMock()
+    response.json.return_value = {"base": base, "rates": rates}
+    return response
+
+
+class _FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: datetime):
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestNormalizeCurrency(unittest.TestCase):
+    """Test currency code normalization."""
+
+    def test_normalize_currency(self):
+        """Symbols, words and codes should map to ISO 4217 codes."""
+        self.assertEqual(normalize_currency("₩"), "KRW")
+        self.assertEqual(normalize_currency("usd"), "USD")
+        self.assertEqual(normalize_currency("Yen"), "JPY")
+        self.assertIsNone(normalize_currency("points"))
+        self.assertIsNone(normalize_currency(None))
+
+
+class TestCurrencyConverter(unittest.TestCase):
+    """Test conversions with bundled and file-backed rate tables."""
+
+    def setUp(self):
+        """Set up a converter on the bundled rates."""
+        self.converter = CurrencyConverter(CurrencySettings())
+
+    def test_to_usd_and_cross_rates(self):
+        """Amounts should convert to USD and between currencies via USD."""
+        krw_rate = self.converter.rate("KRW")
+        assert krw_rate is not None
+
+        self.assertAlmostEqual(self.converter.to_usd(krw_rate * 10, "원") or 0, 10)
+        self.assertAlmostEqual(self.converter.convert(5, "USD", "USD") or 0, 5)
+        self.assertIsNone(self.converter.to_usd(100, "points"))
+        self.assertIsNone(self.converter.convert(100, "USD", "XYZ"))
+
+    def test_to_usd_many_matches_scalar_conversion(self):
+        """Vectorized conversion should equal per-row to_usd, NaN if unknown."""
+        amounts = [15000, 20, 3000, 7, 12]
+        currencies = ["KRW", "$", "yen", None, "XYZ"]
+
+        converted = self.converter.to_usd_many(amounts, currencies)
+
+        expected = [
+            self.converter.to_usd(amount, currency)
+            for amount, currency in zip(amounts, currencies)
+        ]
+        np.testing.assert_allclose(
+            converted,
+            [np.nan if value is None else value for value in expected],
+        )
+
+    def test_to_usd_many_rejects_mismatched_lengths(self):
+        """Each amount needs a currency."""
+        with self.assertRaises(ValueError):
+            self.converter.to_usd_many([1, 2], ["USD"])
+
+    def test_rates_are_read_from_file(self):
+        """A rate file should take precedence over the bundled rates."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "rates.json"
+            table = FXRateTable(
+                as_of=datetime(2026, 10, 18, tzinfo=timezone.utc),
+                rates={"USD": 1.0, "KRW": 1000.0},
+            )
+            path.write_text(table.model_dump_json(), encoding="utf-8")
+
+            converter = CurrencyConverter(CurrencySettings(rates_path=str(path)))
+
+        self.assertEqual(converter.to_usd(15000, "KRW"), 15)
+        self.assertIsNone(converter.rate("JPY"))
+
+
+class TestRateRefresh(unittest.TestCase):
+    """Test refreshing stale rate tables."""
+
+    def setUp(self):
+        """Set up a temporary rate file and a clock past the bundled rates."""
+        self.directory = tempfile.mkdtemp()
+        self.path = Path(self.directory) / "rates.json"
+        self.clock = _FakeClock(datetime(2026, 10, 19, tzinfo=timezone.utc))
+        self.http_get = MagicMock()
+
+    def tearDown(self):
+        """Remove the rate file."""
+        shutil.rmtree(self.directory)
+
+    def _build_converter(self, **kwargs) -> CurrencyConverter:
+        settings = CurrencySettings(
+            rates_path=str(self.path), rates_url=RATES_URL, **kwargs
+        )
+        return CurrencyConverter(settings, http_get=self.http_get, clock=self.clock)
+
+    def test_refresh_rebases_and_persists_rates(self):
+        """Rates quoted against another base should be stored per 1 USD."""
+        # Given
+        self.http_get.return_value = _rates_response(
+            "EUR", {"USD": 1.25, "KRW": 1500.0}
+        )
+        converter = self._build_converter()
+
+        # When
+        refreshed = converter.refresh()
+
+        # Then
+        self.assertTrue(refreshed)
+        self.assertAlmostEqual(converter.rate("KRW") or 0, 1200)
+        self.assertAlmostEqual(converter.rate("EUR") or 0, 0.8)
+        stored = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertAlmostEqual(stored["rates"]["KRW"], 1200)
+
+    def test_failed_refresh_keeps_current_rates(self):
+        """Offline refreshes should fall back to the rates already loaded."""
+        self.http_get.side_effect = requests.exceptions.ConnectionError("offline")
+        converter = self._build_converter()
+        before = converter.rate("KRW")
+
+        self.assertFalse(converter.refresh())
+        self.assertEqual(converter.rate("KRW"), before)
+        self.assertEqual(converter.table.as_of, BUNDLED_RATES_AS_OF)
+
+    def test_fresh_file_from_another_process_is_reused(self):
+        """A rate file refreshed by another worker should not be fetched again."""
+        converter = self._build_converter()
+        table = FXRateTable(
+            as_of=datetime.fromtimestamp(self.clock.now, tz=timezone.utc),
+            rates={"USD": 1.0, "KRW": 1300.0},
+        )
+        self.path.write_text(table.model_dump_json(), encoding="utf-8")
+
+        self.assertTrue(converter.refresh())
+        self.assertEqual(converter.rate("KRW"), 1300)
+        self.http_get.assert_not_called()
+
+    def test_reads_do_not_wait_for_a_running_fetch(self):
+        """Rate lookups should use the current table while a fetch is slow."""
+        # Given: A background refresh stuck in the rate API call (no rate
+        # file, so the refresh thread never touches the temporary directory)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_get(*_args, **_kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return _rates_response("USD", {"USD": 1.0, "KRW": 1300.0})
+
+        self.http_get.side_effect = slow_get
+        converter = CurrencyConverter(
+            CurrencySettings(rates_url=RATES_URL),
+            http_get=self.http_get,
+            clock=self.clock,
+        )
+        before = converter.rate("KRW")
+        self.assertTrue(started.wait(timeout=5))
+
+        # When
+        reader = threading.Thread(target=converter.to_usd, args=(100, "KRW"))
+        reader.start()
+        reader.join(timeout=1)
+
+        # Then: Read returned at once; a second refresh was not started
+        self.assertFalse(reader.is_alive())
+        self.assertFalse(converter.refresh())
+        self.assertEqual(converter.rate("KRW"), before)
+        release.set()
+
+    def test_fresh_table_is_not_refreshed(self):
+        """Reads within the refresh interval should not start a fetch."""
+        converter = self._build_converter(refresh_interval_hours=24 * 365)
+
+        converter.to_usd(100, "KRW")
+
+        self.http_get.assert_not_called()
+
+    def test_no_url_never_refreshes(self):
+        """Without a rate URL the bundled rates are used as-is."""
+        converter = CurrencyConverter(CurrencySettings(), http_get=self.http_get)
+
+        self.assertFalse(converter.refresh())
+        converter.to_usd(100, "KRW")
+        self.http_get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Unit tests for sharing expert advice between checks of the same post."""
+
+import unittest
+from datetime import datetime
+
+from tests.unit.helpers import build_create, create_db_session
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.near_duplicates import NearDuplicateIndex
+from trade_safety.repositories.expert_advice_repository import (
+    DatabaseExpertAdviceManager,
+)
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.schemas import TradeSafetyCheckUpdate
+from trade_safety.settings import ExpertAdviceSettings, NearDuplicateSettings
+
+SCAM_TEMPLATE = (
+    "급처분합니다!! 방탄 포카 양도해요. 공구 실패해서 정가 이하로 드려요. "
+    "선입금 필수, 계좌이체만 가능합니다. 택포 15000원 DM 주세요"
+)
+EDITED_TEMPLATE = (
+    "급처분합니다!! 방탄 포카 양도해요. 공구 실패해서 정가 이하로 드려요. "
+    "선입금 필수, 계좌이체만 가능해요. 택포 16000원 DM 주세요"
+)
+REVIEWED_AT = datetime(2026, 10, 19, 12, 0)
+
+
+def _review(advice: str, expert_id: str = "expert-1") -> TradeSafetyCheckUpdate:
+    """Build the update an expert sends when reviewing a check."""
+    return TradeSafetyCheckUpdate(
+        expert_advice=advice,
+        expert_reviewed=True,
+        expert_reviewed_at=REVIEWED_AT,
+        expert_reviewed_by=expert_id,
+    )
+
+
+class TestExpertAdviceSharing(unittest.TestCase):
+    """Test advice fan-out on review and reuse for new checks."""
+
+    def setUp(self):
+        """Set up an isolated database for each test."""
+        self.session = create_db_session()
+        self.manager = DatabaseTradeSafetyCheckManager(self.session)
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def test_review_fans_out_to_identical_checks(self):
+        """Checks of the same normalized input should receive the advice."""
+        # Given: The same post checked three times (once with other spacing)
+        reviewed = self.manager.create(build_create(SCAM_TEMPLATE))
+        same = self.manager.create(build_create(SCAM_TEMPLATE))
+        respaced = self.manager.create(build_create(f"  {SCAM_TEMPLATE.upper()} "))
+        other = self.manager.create(build_create("세븐틴 앨범 교환 원해요"))
+
+        # When
+        self.manager.update(reviewed.id, _review("Known scam template"))
+
+        # Then
+        for check_id in (same.id, respaced.id):
+            check = self.manager.get_by_id(check_id)
+            assert check is not None
+            self.assertTrue(check.expert_reviewed)
+            self.assertEqual(check.expert_advice, "Known scam template")
+            self.assertEqual(check.expert_reviewed_by, "expert-1")
+            self.assertEqual(check.expert_advice_source_id, reviewed.id)
+        untouched = self.manager.get_by_id(other.id)
+        assert untouched is not None
+        self.assertFalse(untouched.expert_reviewed)
+        self.assertEqual(self.manager.review_queue.pending_count(), 1)
+
+    def test_new_check_gets_known_advice(self):
+        """A check created after the review should carry the advice."""
+        reviewed = self.manager.create(build_create(SCAM_TEMPLATE))
+        self.manager.update(reviewed.id, _review("Known scam template"))
+
+        check = self.manager.create(build_create(SCAM_TEMPLATE))
+
+        self.assertTrue(check.expert_reviewed)
+        self.assertEqual(check.expert_advice, "Known scam template")
+        self.assertEqual(check.expert_reviewed_at, REVIEWED_AT)
+        self.assertEqual(check.expert_advice_source_id, reviewed.id)
+
+    def test_edited_advice_replaces_copies_only(self):
+        """Copies should follow the latest advice; direct reviews are kept."""
+        # Given
+        first = self.manager.create(build_create(SCAM_TEMPLATE))
+        second = self.manager.create(build_create(SCAM_TEMPLATE))
+        copy = self.manager.create(build_create(SCAM_TEMPLATE))
+        self.manager.update(first.id, _review("Advice A"))
+
+        # When: Another expert reviews a copy directly, then A is edited
+        self.manager.update(second.id, _review("Advice B", "expert-2"))
+        self.manager.update(first.id, _review("Advice A, edited"))
+
+        # Then
+        second_check = self.manager.get_by_id(second.id)
+        copy_check = self.manager.get_by_id(copy.id)
+        assert second_check is not None and copy_check is not None
+        self.assertEqual(second_check.expert_advice, "Advice B")
+        self.assertIsNone(second_check.expert_advice_source_id)
+        self.assertEqual(copy_check.expert_advice, "Advice A, edited")
+        advice = self.manager.expert_advice.get(compute_input_hash(SCAM_TEMPLATE))
+        assert advice is not None
+        self.assertEqual(advice.expert_advice, "Advice A, edited")
+
+    def test_near_duplicates_when_enabled(self):
+        """Near duplicates above the threshold should receive the advice."""
+        # Given
+        index = NearDuplicateIndex(NearDuplicateSettings())
+        manager = DatabaseTradeSafetyCheckManager(
+            self.session,
+            near_duplicate_index=index,
+            expert_advice=DatabaseExpertAdviceManager(
+                self.session,
+                ExpertAdviceSettings(
+                    near_duplicates=True, near_duplicate_threshold=0.6
+                ),
+            ),
+        )
+        reviewed = manager.create(build_create(SCAM_TEMPLATE))
+        edited = manager.create(build_create(EDITED_TEMPLATE))
+
+        # When
+        manager.update(reviewed.id, _review("Known scam template"))
+
+        # Then
+        check = manager.get_by_id(edited.id)
+        assert check is not None
+        self.assertEqual(check.expert_advice, "Known scam template")
+        self.assertEqual(
+            index.query(EDITED_TEMPLATE)[0].expert_advice, "Known scam template"
+        )
+
+    def test_disabled_propagation(self):
+        """With propagation off, advice should stay on the reviewed check."""
+        manager = DatabaseTradeSafetyCheckManager(
+            self.session,
+            expert_advice=DatabaseExpertAdviceManager(
+                self.session, ExpertAdviceSettings(propagate=False)
+            ),
+        )
+        reviewed = manager.create(build_create(SCAM_TEMPLATE))
+        same = manager.create(build_create(SCAM_TEMPLATE))
+
+        manager.update(reviewed.id, _review("Known scam template"))
+
+        check = manager.get_by_id(same.id)
+        assert check is not None
+        self.assertFalse(check.expert_reviewed)
+        self.assertFalse(manager.create(build_create(SCAM_TEMPLATE)).expert_reviewed)
+
+
+if __name__ == "__main__":
+    unittest.main()
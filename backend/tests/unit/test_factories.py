@@ -1,17 +1,23 @@
 """Tests for TradeSafetyCheckManagerFactory."""
 
+import time
 import unittest
 import warnings
+from unittest.mock import patch
 
 from aioia_core.factories import BaseRepositoryFactory
 from aioia_core.models import Base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from tests.unit.helpers import build_create
 from trade_safety.factories import TradeSafetyCheckManagerFactory
+from trade_safety.near_duplicates import NearDuplicateIndex
 from trade_safety.repositories.trade_safety_repository import (
     DatabaseTradeSafetyCheckManager,
 )
+from trade_safety.settings import NearDuplicateSettings
 
 
 def _create_db_session_factory() -> sessionmaker:
@@ -21,6 +27,17 @@ def _create_db_session_factory() -> sessionmaker:
     return sessionmaker(bind=engine)
 
 
+def _create_shared_db_session_factory() -> sessionmaker:
+    """Create in-memory SQLite session factory usable from other threads."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
 class TestTradeSafetyCheckManagerFactory(unittest.TestCase):
     """Tests for TradeSafetyCheckManagerFactory."""
 
@@ -74,3 +91,30 @@ class TestTradeSafetyCheckManagerFactory(unittest.TestCase):
         self.assertTrue(
             any(issubclass(w.category, DeprecationWarning) for w in caught_warnings)
         )
+
+    def test_start_index_builds_builds_near_duplicate_index_in_background(self):
+        """Stored checks should be indexed without any request building it."""
+        # Given: A stored check and an unbuilt near-duplicate index
+        db_session_factory = _create_shared_db_session_factory()
+        with db_session_factory() as session:
+            check = DatabaseTradeSafetyCheckManager(session).create(
+                build_create(
+                    input_text="급처분 포카 양도합니다 선입금만 가능 DM 주세요"
+                )
+            )
+        index = NearDuplicateIndex(NearDuplicateSettings())
+        factory = TradeSafetyCheckManagerFactory(db_session_factory)
+
+        # When
+        with patch(
+            "trade_safety.factories.get_near_duplicate_index", return_value=index
+        ):
+            factory.start_index_builds()
+        deadline = time.monotonic() + 5
+        while not index.is_ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Then
+        self.assertTrue(index.is_ready)
+        duplicates = index.query("급처분 포카 양도합니다 선입금만 가능 DM 주세요")
+        self.assertEqual([duplicate.check_id for duplicate in duplicates], [check.id])
@@ -0,0 +1,28 @@
+"""Unit tests for inter-process file locks."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from trade_safety.file_locks import lock_file
+
+
+class TestLockFile(unittest.TestCase):
+    """Test lock_file."""
+
+    def test_non_blocking_lock_fails_while_held_and_succeeds_after_close(self):
+        """A held lock should be refused without waiting, then free on close."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "index.lock"
+            with open(path, "ab") as holder:
+                self.assertTrue(lock_file(holder))
+
+                with open(path, "ab") as other:
+                    self.assertFalse(lock_file(other, blocking=False))
+
+            with open(path, "ab") as other:
+                self.assertTrue(lock_file(other, blocking=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+"""Unit tests for the perceptual-hash image fingerprint index."""
+
+import io
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from trade_safety.image_fingerprints import (
+    BKTree,
+    ImageFingerprint,
+    ImageFingerprintIndex,
+    compute_dhash,
+    dhash_from_pixels,
+    hamming_distance,
+    image_reuse_note,
+)
+from trade_safety.image_proxy import ImageProxy, ProxiedImage
+from trade_safety.settings import ImageFingerprintSettings
+
+
+def _fingerprint(image_url: str, value: int) -> ImageFingerprint:
+    return ImageFingerprint(image_url=image_url, dhash=f"{value:016x}")
+
+
+class TestDHash(unittest.TestCase):
+    """Test difference hashing of downscaled pixels."""
+
+    def test_bits_follow_horizontal_gradient(self):
+        """Pixels brighter than their right neighbour should set bits."""
+        descending = [list(range(9, 0, -1))] * 8
+        ascending = [list(range(9))] * 8
+
+        self.assertEqual(dhash_from_pixels(descending), 2**64 - 1)
+        self.assertEqual(dhash_from_pixels(ascending), 0)
+
+    def test_small_edit_changes_few_bits(self):
+        """A locally edited image should stay within a small Hamming distance."""
+        rng = random.Random(7)
+        rows = [[rng.randint(0, 255) for _ in range(9)] for _ in range(8)]
+        edited = [row[:] for row in rows]
+        edited[3][4] = 255 - edited[3][4]
+
+        distance = hamming_distance(dhash_from_pixels(rows), dhash_from_pixels(edited))
+
+        self.assertLessEqual(distance, 2)
+
+    def test_compute_dhash_survives_resizing_and_reencoding(self):
+        """A downscaled re-encode of a photo should keep nearly the same hash."""
+        rng = random.Random(7)
+        image = Image.new("L", (9, 8))
+        image.putdata([rng.randint(0, 255) for _ in range(72)])
+        image = image.resize((360, 320), Image.Resampling.NEAREST)
+        original, copy = io.BytesIO(), io.BytesIO()
+        image.save(original, format="PNG")
+        image.resize((180, 160)).save(copy, format="JPEG", quality=70)
+
+        distance = hamming_distance(
+            compute_dhash(original.getvalue()), compute_dhash(copy.getvalue())
+        )
+
+        self.assertLessEqual(distance, 6)
+
+    def test_compute_dhash_rejects_undecodable_data(self):
+        """Bytes that are not an image should raise ValueError."""
+        with self.assertRaises(ValueError):
+            compute_dhash(b"not-an-image")
+
+
+class TestBKTree(unittest.TestCase):
+    """Test BK-tree range search over Hamming distance."""
+
+    def test_search_matches_brute_force(self):
+        """Range search should return exactly the hashes a linear scan finds."""
+        # Given: Random hashes plus near-copies of a few of them
+        rng = random.Random(42)
+        keys = [rng.getrandbits(64) for _ in range(500)]
+        keys += [key ^ (1 << rng.randrange(64)) for key in keys[:50]]
+        tree: BKTree[int] = BKTree()
+        for position, key in enumerate(keys):
+            tree.add(key, position)
+
+        for query in keys[:20]:
+            # When
+            found = {
+                value
+                for _, _, values in tree.search(query, max_distance=6)
+                for value in values
+            }
+
+            # Then
+            expected = {
+                position
+                for position, key in enumerate(keys)
+                if hamming_distance(query, key) <= 6
+            }
+            self.assertEqual(found, expected)
+
+    def test_identical_hashes_share_node(self):
+        """Values stored under the same hash should all be returned."""
+        tree: BKTree[str] = BKTree()
+        tree.add(0xABC, "first")
+        tree.add(0xABC, "second")
+
+        self.assertEqual(
+            tree.search(0xABC, max_distance=0), [(0, 0xABC, ["first", "second"])]
+        )
+        self.assertEqual(len(tree), 2)
+
+    def test_search_empty_tree(self):
+        """Searching an empty tree should return no matches."""
+        self.assertEqual(BKTree().search(0, max_distance=6), [])
+
+
+class TestImageFingerprintIndex(unittest.TestCase):
+    """Test fingerprinting, matching and persistence of post images."""
+
+    def setUp(self):
+        """Set up an index with a mocked image proxy and hasher."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = Path(self.temp_dir) / "fingerprints.jsonl"
+        self.image_proxy = MagicMock(spec=ImageProxy)
+        self.image_proxy.is_allowed.side_effect = lambda url: "twimg" in url
+        self.image_proxy.get_thumbnail.side_effect = lambda url: ProxiedImage(
+            content_hash="h", content_type="image/jpeg", data=url.encode()
+        )
+        self.hashes = {
+            b"https://pbs.twimg.com/a.jpg": 0xF0F0,
+            b"https://pbs.twimg.com/a-recompressed.jpg": 0xF0F1,
+            b"https://pbs.twimg.com/other.jpg": 0x0F0F_0000_FFFF_0000,
+        }
+        self.index = self._make_index()
+
+    def tearDown(self):
+        """Remove the index file."""
+        shutil.rmtree(self.temp_dir)
+
+    def _make_index(self) -> ImageFingerprintIndex:
+        return ImageFingerprintIndex(
+            ImageFingerprintSettings(max_distance=6, index_path=str(self.index_path)),
+            image_proxy=self.image_proxy,
+            hasher=self.hashes.__getitem__,
+        )
+
+    def test_fingerprint_skips_disallowed_images(self):
+        """Images the proxy does not serve should not be fingerprinted."""
+        fingerprints = self.index.fingerprint_images(
+            ["https://pbs.twimg.com/a.jpg", "https://evil.example.com/a.jpg"]
+        )
+
+        self.assertEqual(
+            fingerprints, [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)]
+        )
+
+    def test_matches_reused_photo_from_other_post(self):
+        """A re-encoded copy of an earlier post's photo should match."""
+        # Given: Photo recorded for an earlier post
+        self.index.add("post-1", [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)])
+
+        # When: New post uses a slightly different encoding of the same photo
+        matches = self.index.find_matches(
+            [_fingerprint("https://pbs.twimg.com/a-recompressed.jpg", 0xF0F1)],
+            exclude_post_key="post-2",
+        )
+
+        # Then
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].matched_post_key, "post-1")
+        self.assertEqual(matches[0].distance, 1)
+
+    def test_ignores_same_post_and_distant_photos(self):
+        """Re-checking a post or unrelated photos should not match."""
+        self.index.add("post-1", [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)])
+
+        same_post = self.index.find_matches(
+            [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)],
+            exclude_post_key="post-1",
+        )
+        unrelated = self.index.find_matches(
+            [_fingerprint("https://pbs.twimg.com/other.jpg", 0x0F0F_0000_FFFF_0000)],
+            exclude_post_key="post-2",
+        )
+
+        self.assertEqual(same_post, [])
+        self.assertEqual(unrelated, [])
+
+    def test_add_skips_known_sightings(self):
+        """Recording the same post twice should not duplicate sightings."""
+        fingerprints = [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)]
+
+        self.index.add("post-1", fingerprints)
+        self.index.add("post-1", fingerprints)
+
+        self.assertEqual(len(self.index), 1)
+
+    def test_sightings_persist_across_restarts(self):
+        """Sightings should be reloaded from the index file."""
+        self.index.add("post-1", [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)])
+
+        reloaded = self._make_index()
+
+        self.assertEqual(len(reloaded), 1)
+        self.assertEqual(
+            len(
+                reloaded.find_matches(
+                    [_fingerprint("https://pbs.twimg.com/b.jpg", 0xF0F0)]
+                )
+            ),
+            1,
+        )
+
+    def test_image_reuse_note(self):
+        """Matches should be summarized for the prompt; no matches, no note."""
+        self.index.add("post-1", [_fingerprint("https://pbs.twimg.com/a.jpg", 0xF0F0)])
+        matches = self.index.find_matches(
+            [_fingerprint("https://pbs.twimg.com/b.jpg", 0xF0F0)]
+        )
+
+        note = image_reuse_note(matches)
+
+        assert note is not None
+        self.assertIn("1 earlier trade post", note)
+        self.assertIsNone(image_reuse_note([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+"""Unit tests for ImageProxy."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import requests
+from PIL import Image
+
+from trade_safety.image_proxy import ImageFetchError, ImageProxy
+from trade_safety.settings import ImageProxySettings
+
+IMAGE_URL = "https://pbs.twimg.com/media/img1.jpg"
+
+
+def _jpeg(color: str = "red", size: tuple[int, int] = (8, 8)) -> bytes:
+    """Encode a solid-color JPEG image."""
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+
+def _mock_response(
+    content: bytes, content_type: str = "image/jpeg", status_code: int = 200
+) -> MagicMock:
+    """Build a streamed image response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Content-Type": content_type}
+    response.iter_content.return_value = [content]
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status_code} error"
+        )
+    return response
+
+
+def _mock_redirect(location: str, status_code: int = 302) -> MagicMock:
+    """Build a redirect response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Location": location}
+    return response
+
+
+class TestImageProxy(unittest.TestCase):
+    """Test fetching, caching and eviction of proxied images."""
+
+    def setUp(self):
+        """Set up a proxy over a temporary cache directory."""
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.http_get = MagicMock(return_value=_mock_response(_jpeg()))
+        self.proxy = self._make_proxy()
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.cache_dir)
+
+    def _make_proxy(self, **overrides) -> ImageProxy:
+        overrides.setdefault("prewarm_workers", 0)
+        settings = ImageProxySettings(cache_dir=str(self.cache_dir), **overrides)
+        return ImageProxy(settings, http_get=self.http_get)
+
+    # ==============================================
+    # URL Validation Tests
+    # ==============================================
+
+    def test_rejects_disallowed_host(self):
+        """Only images on allowed CDN hosts should be proxied."""
+        with self.assertRaises(ValueError) as context:
+            self.proxy.get_thumbnail("https://evil.example.com/a.jpg")
+
+        self.assertNotIsInstance(context.exception, ImageFetchError)
+        self.http_get.assert_not_called()
+
+    def test_rejects_non_https_url(self):
+        """Plain http URLs should be rejected even on allowed hosts."""
+        self.assertFalse(self.proxy.is_allowed("http://pbs.twimg.com/media/a.jpg"))
+
+    def test_allows_subdomains_of_allowed_hosts(self):
+        """Subdomains of allowed hosts should be allowed."""
+        proxy = self._make_proxy(allowed_hosts=["redd.it"])
+
+        self.assertTrue(proxy.is_allowed("https://i.redd.it/abc.png"))
+
+    # ==============================================
+    # Caching Tests
+    # ==============================================
+
+    def test_fetches_once_and_serves_from_cache(self):
+        """Repeated requests for an image should fetch it only once."""
+        first = self.proxy.get_thumbnail(IMAGE_URL)
+        second = self.proxy.get_thumbnail(IMAGE_URL)
+
+        self.assertEqual(first, second)
+        self.http_get.assert_called_once()
+
+    def test_cache_shared_across_instances(self):
+        """A proxy over the same directory (another worker) should hit the cache."""
+        self.proxy.get_thumbnail(IMAGE_URL)
+
+        other = self._make_proxy()
+        other.get_thumbnail(IMAGE_URL)
+
+        self.http_get.assert_called_once()
+
+    def test_identical_images_share_one_file(self):
+        """Identical images under different URLs should be stored once."""
+        self.proxy.get_thumbnail(IMAGE_URL)
+        self.proxy.get_thumbnail("https://i.redd.it/same.jpg")
+
+        image_files = list(self.cache_dir.glob("img_*"))
+        self.assertEqual(len(image_files), 1)
+
+    def test_resizes_to_thumbnail(self):
+        """Images should be resized into WebP thumbnails."""
+        self.http_get.return_value = _mock_response(_jpeg(size=(2000, 1000)))
+        proxy = self._make_proxy(thumbnail_size=200)
+
+        image = proxy.get_thumbnail(IMAGE_URL)
+
+        self.assertEqual(image.content_type, "image/webp")
+        with Image.open(io.BytesIO(image.data)) as thumbnail:
+            self.assertEqual(thumbnail.size, (200, 100))
+
+    # ==============================================
+    # Fetch Error Tests
+    # ==============================================
+
+    def test_undecodable_image_raises(self):
+        """Responses claiming to be images but failing to decode should raise."""
+        self.http_get.return_value = _mock_response(b"not-a-jpeg")
+
+        with self.assertRaises(ImageFetchError):
+            self.proxy.get_thumbnail(IMAGE_URL)
+
+    def test_non_image_response_raises(self):
+        """Non-image responses should not be cached or served."""
+        self.http_get.return_value = _mock_response(b"<html>", "text/html")
+
+        with self.assertRaises(ImageFetchError):
+            self.proxy.get_thumbnail(IMAGE_URL)
+
+    def test_oversized_image_raises(self):
+        """Images over max_source_bytes should be rejected while streaming."""
+        self.http_get.return_value = _mock_response(b"x" * 101)
+        proxy = self._make_proxy(max_source_bytes=100)
+
+        with self.assertRaises(ImageFetchError):
+            proxy.get_thumbnail(IMAGE_URL)
+
+    def test_follows_redirect_to_allowed_host(self):
+        """Redirects between allowed hosts should be followed."""
+        self.http_get.side_effect = [
+            _mock_redirect("https://i.redd.it/moved.jpg"),
+            _mock_response(_jpeg()),
+        ]
+
+        self.proxy.get_thumbnail(IMAGE_URL)
+
+        self.assertEqual(
+            [call.args[0] for call in self.http_get.call_args_list],
+            [IMAGE_URL, "https://i.redd.it/moved.jpg"],
+        )
+        self.assertFalse(self.http_get.call_args.kwargs["allow_redirects"])
+
+    def test_redirect_to_disallowed_host_raises(self):
+        """A redirect off the allowed hosts should not be followed."""
+        self.http_get.return_value = _mock_redirect("http://169.254.169.254/latest")
+
+        with self.assertRaises(ImageFetchError):
+            self.proxy.get_thumbnail(IMAGE_URL)
+
+        self.http_get.assert_called_once()
+
+    def test_upstream_error_raises(self):
+        """HTTP errors from the CDN should raise ImageFetchError."""
+        self.http_get.return_value = _mock_response(b"", status_code=404)
+
+        with self.assertRaises(ImageFetchError):
+            self.proxy.get_thumbnail(IMAGE_URL)
+
+    # ==============================================
+    # LRU Eviction Tests
+    # ==============================================
+
+    def test_evicts_least_recently_used(self):
+        """Over budget, the least recently used image should be evicted."""
+        # Given: Two cached images filling the budget, a used last
+        url_a, url_b, url_c = (f"https://i.redd.it/{name}.jpg" for name in "abc")
+        for url, color in ((url_a, "red"), (url_b, "green")):
+            self.http_get.return_value = _mock_response(_jpeg(color))
+            self.proxy.get_thumbnail(url)
+        used = sum(path.stat().st_size for path in self.cache_dir.iterdir())
+        for path in self.cache_dir.iterdir():
+            os.utime(path, (1000, 1000))
+        proxy = self._make_proxy(max_cache_bytes=used * 5 // 4)
+        proxy.get_thumbnail(url_a)  # Refreshes a's LRU position
+
+        # When: A third image exceeds the budget
+        self.http_get.return_value = _mock_response(_jpeg("blue"))
+        proxy.get_thumbnail(url_c)
+
+        # Then: b was evicted, a and c are served from the cache
+        self.http_get.reset_mock()
+        proxy.get_thumbnail(url_a)
+        proxy.get_thumbnail(url_c)
+        self.http_get.assert_not_called()
+        proxy.get_thumbnail(url_b)
+        self.http_get.assert_called_once()
+
+    # ==============================================
+    # Pre-warming Tests
+    # ==============================================
+
+    def test_prewarm_builds_thumbnails(self):
+        """Pre-warming should cache allowed images and skip disallowed ones."""
+        proxy = self._make_proxy(prewarm_workers=1)
+
+        proxy.prewarm([IMAGE_URL, "https://evil.example.com/a.jpg"])
+        assert proxy._executor is not None
+        proxy._executor.shutdown(wait=True)
+
+        self.http_get.assert_called_once()
+        self.assertTrue(list(self.cache_dir.glob("img_*")))
+
+
+if __name__ == "__main__":
+    unittest.main()
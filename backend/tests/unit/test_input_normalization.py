@@ -0,0 +1,67 @@
+"""Unit tests for check input normalization and hashing."""
+
+import unittest
+
+from trade_safety.input_normalization import (
+    compute_input_hash,
+    normalize_input,
+    normalize_text,
+    normalize_url,
+)
+
+
+class TestInputNormalization(unittest.TestCase):
+    """Test normalization used for the input_hash deduplication index."""
+
+    def test_normalize_url_drops_query_fragment_and_trailing_slash(self):
+        """Tracking parameters should not change the normalized URL."""
+        url = "https://www.Reddit.com/r/kpop/comments/abc/title/?utm_source=share#top"
+
+        result = normalize_url(url)
+
+        self.assertEqual(result, "https://reddit.com/r/kpop/comments/abc/title")
+
+    def test_normalize_text_collapses_whitespace_and_case(self):
+        """Whitespace and case differences should not change normalized text."""
+        result = normalize_text("  WTS   포카\n\n양도해요  ")
+
+        self.assertEqual(result, "wts 포카 양도해요")
+
+    def test_normalize_text_applies_nfkc(self):
+        """Full-width characters should normalize to their ASCII forms."""
+        self.assertEqual(normalize_text("ＷＴＳ　１２３"), "wts 123")
+
+    def test_normalize_input_dispatches_on_url(self):
+        """URLs and text should use their respective normalizers."""
+        self.assertEqual(
+            normalize_input(" https://example.com/trade/1?ref=abc "),
+            "https://example.com/trade/1",
+        )
+        self.assertEqual(normalize_input("Hello  World"), "hello world")
+
+    def test_normalize_input_uses_canonical_post_key(self):
+        """Supported post URLs should normalize to their platform + post id key."""
+        self.assertEqual(
+            normalize_input("https://mobile.twitter.com/user/status/1?s=20"),
+            "twitter:1",
+        )
+        self.assertEqual(
+            compute_input_hash("https://redd.it/abc"),
+            compute_input_hash("https://old.reddit.com/r/x/comments/abc/title/"),
+        )
+
+    def test_compute_input_hash_is_stable_for_equivalent_inputs(self):
+        """Equivalent inputs should produce the same hash."""
+        self.assertEqual(
+            compute_input_hash("급처분  양도해요"),
+            compute_input_hash("급처분 양도해요\n"),
+        )
+        self.assertNotEqual(
+            compute_input_hash("급처분 양도해요"),
+            compute_input_hash("급처분 구해요"),
+        )
+        self.assertEqual(len(compute_input_hash("text")), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Unit tests for the MinHash/LSH near-duplicate index."""
+
+import unittest
+from datetime import datetime, timezone
+
+from trade_safety.near_duplicates import (
+    IndexedCheck,
+    MinHasher,
+    NearDuplicateIndex,
+    near_duplicate_note,
+)
+from trade_safety.settings import NearDuplicateSettings
+
+SCAM_TEMPLATE = (
+    "급처분합니다!! 방탄 포카 양도해요. 공구 실패해서 정가 이하로 드려요. "
+    "선입금 필수, 계좌이체만 가능합니다. 택포 15000원 DM 주세요"
+)
+EDITED_TEMPLATE = (
+    "급처분합니다!! 방탄 포카 양도해요. 공구 실패해서 정가 이하로 드려요. "
+    "선입금 필수, 계좌이체만 가능해요. 택포 16000원 DM 주세요"
+)
+UNRELATED_POST = "세븐틴 앨범 미개봉 교환 원해요. 직거래 선호하고 반값택배 가능합니다."
+
+
+def _entry(check_id: str, safe_score: int = 20, **kwargs) -> IndexedCheck:
+    return IndexedCheck(
+        check_id=check_id,
+        output_language="en",
+        safe_score=safe_score,
+        created_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+        **kwargs,
+    )
+
+
+class TestMinHasher(unittest.TestCase):
+    """Test MinHash signatures."""
+
+    def setUp(self):
+        """Set up a hasher with a long signature for stable estimates."""
+        self.hasher = MinHasher(num_perm=256, shingle_size=5)
+
+    def test_similarity_estimates_jaccard(self):
+        """Signature similarity should approximate shingle Jaccard similarity."""
+        left = self.hasher.shingles(SCAM_TEMPLATE)
+        right = self.hasher.shingles(EDITED_TEMPLATE)
+        jaccard = len(left & right) / len(left | right)
+
+        signature = self.hasher.signature(SCAM_TEMPLATE)
+        edited_signature = self.hasher.signature(EDITED_TEMPLATE)
+        assert signature is not None and edited_signature is not None
+
+        estimate = MinHasher.similarity(signature, edited_signature)
+
+        self.assertAlmostEqual(estimate, jaccard, delta=0.1)
+
+    def test_signature_ignores_case_and_whitespace(self):
+        """Normalized-equal texts should have identical signatures."""
+        first = self.hasher.signature("Proof  Photo\nDM me")
+        second = self.hasher.signature("proof photo dm me")
+
+        assert first is not None and second is not None
+        self.assertEqual(MinHasher.similarity(first, second), 1.0)
+
+    def test_signature_of_empty_text(self):
+        """Empty text has no shingles and no signature."""
+        self.assertIsNone(self.hasher.signature("   "))
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test LSH queries, incremental updates and rebuilds."""
+
+    def setUp(self):
+        """Set up an index with default banding."""
+        self.index = NearDuplicateIndex(NearDuplicateSettings())
+
+    def test_finds_edited_template(self):
+        """A lightly edited scam template should match the original."""
+        self.index.add(_entry("scam-1", safe_score=15), SCAM_TEMPLATE)
+        self.index.add(_entry("other"), UNRELATED_POST)
+
+        duplicates = self.index.query(EDITED_TEMPLATE)
+
+        self.assertEqual([duplicate.check_id for duplicate in duplicates], ["scam-1"])
+        self.assertEqual(duplicates[0].safe_score, 15)
+        self.assertGreaterEqual(duplicates[0].similarity, 0.6)
+
+    def test_unrelated_post_has_no_duplicates(self):
+        """Unrelated posts should not be reported."""
+        self.index.add(_entry("scam-1"), SCAM_TEMPLATE)
+
+        self.assertEqual(self.index.query(UNRELATED_POST), [])
+
+    def test_url_inputs_are_not_indexed(self):
+        """URL inputs are deduplicated by input hash, not by text."""
+        self.index.add(_entry("url-check"), "https://x.com/user/status/123")
+
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.query("https://x.com/user/status/123"), [])
+
+    def test_add_refreshes_review_metadata(self):
+        """Re-adding a check should update its expert advice."""
+        self.index.add(_entry("scam-1"), SCAM_TEMPLATE)
+
+        self.index.add(
+            _entry("scam-1", expert_advice="Known scam", expert_reviewed=True),
+            SCAM_TEMPLATE,
+        )
+
+        duplicate = self.index.query(SCAM_TEMPLATE)[0]
+        self.assertEqual(duplicate.expert_advice, "Known scam")
+        self.assertEqual(len(self.index), 1)
+
+    def test_ensure_built_loads_once(self):
+        """The index should be built from the table only on first use."""
+        calls = []
+
+        def load():
+            calls.append(1)
+            return [(_entry("scam-1"), SCAM_TEMPLATE)]
+
+        self.index.ensure_built(load)
+        self.index.ensure_built(load)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(self.index), 1)
+
+    def test_rejects_uneven_banding(self):
+        """num_perm must split evenly into bands."""
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(NearDuplicateSettings(num_perm=64, bands=10))
+
+    def test_near_duplicate_note(self):
+        """Near duplicates should be summarized with scores and expert advice."""
+        self.index.add(
+            _entry("scam-1", safe_score=15, expert_advice="Do not pay first"),
+            SCAM_TEMPLATE,
+        )
+
+        note = near_duplicate_note(self.index.query(EDITED_TEMPLATE))
+
+        assert note is not None
+        self.assertIn("earlier safety scores: 15", note)
+        self.assertIn("Do not pay first", note)
+        self.assertIsNone(near_duplicate_note([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
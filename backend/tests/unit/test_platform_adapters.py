@@ -0,0 +1,140 @@
+"""Unit tests for the platform adapter registry."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from trade_safety.platform_adapters import (
+    PlatformAdapter,
+    PlatformRegistry,
+    RedditAdapter,
+    TwitterAdapter,
+    build_default_registry,
+    get_platform_fetch_metrics,
+    get_platform_metrics,
+)
+from trade_safety.post_cache import PostUnavailableError
+from trade_safety.reddit_extract_text_service import RedditPostMetadata
+from trade_safety.schemas import Platform, PostPreview
+
+
+class TestPlatformRegistry(unittest.TestCase):
+    """Test host-suffix dispatch of URLs to adapters."""
+
+    def setUp(self):
+        """Set up registry with mocked platform services."""
+        self.twitter_service = MagicMock()
+        self.reddit_service = MagicMock()
+        self.registry = build_default_registry(
+            twitter_service=self.twitter_service, reddit_service=self.reddit_service
+        )
+
+    def test_resolve_by_host_suffix(self):
+        """Subdomains should resolve to the adapter of their parent domain."""
+        cases = {
+            "https://x.com/user/status/1": Platform.TWITTER,
+            "https://mobile.twitter.com/user/status/1": Platform.TWITTER,
+            "https://old.reddit.com/r/kpop/comments/abc": Platform.REDDIT,
+            "https://redd.it/abc": Platform.REDDIT,
+        }
+        for url, platform in cases.items():
+            adapter = self.registry.resolve(url)
+            assert adapter is not None, url
+            self.assertEqual(adapter.platform, platform, url)
+
+    def test_resolve_ignores_lookalike_hosts(self):
+        """Hosts merely ending with a platform name should not match."""
+        self.assertIsNone(self.registry.resolve("https://notx.com/user/status/1"))
+        self.assertIsNone(self.registry.resolve("https://www.instagram.com/p/ABC/"))
+
+    def test_register_duplicate_domain_raises(self):
+        """Two adapters must not claim the same domain."""
+        with self.assertRaises(ValueError):
+            self.registry.register(TwitterAdapter(MagicMock()))
+
+    def test_register_new_platform_adapter(self):
+        """New marketplaces should be added without touching the services."""
+
+        class _MarketAdapter(PlatformAdapter):
+            platform = Platform.TWITTER
+            display_name = "Market"
+            domains = frozenset({"market.example"})
+
+            def extract_post_id(self, url: str) -> str | None:
+                return url.rsplit("/", 1)[-1]
+
+            def _fetch_preview(self, url: str) -> PostPreview:
+                return PostPreview(
+                    platform=self.platform, author="a", text="t", text_preview="t"
+                )
+
+        registry = PlatformRegistry([_MarketAdapter()])
+
+        adapter = registry.resolve("https://shop.market.example/item/42")
+
+        assert adapter is not None
+        self.assertEqual(adapter.fetch_content("https://market.example/42"), "t")
+        self.assertIn("Market", registry.unsupported_url_message())
+
+    def test_unsupported_url_message_lists_platforms(self):
+        """The error message should name every registered platform."""
+        self.assertEqual(
+            self.registry.unsupported_url_message(),
+            "Unsupported URL. Currently only Twitter/X and Reddit URLs are supported.",
+        )
+
+
+class TestPlatformAdapters(unittest.TestCase):
+    """Test built-in adapters and metrics."""
+
+    def setUp(self):
+        """Start every test without recorded fetches."""
+        for platform in Platform:
+            get_platform_fetch_metrics(platform).reset()
+
+    def test_reddit_adapter_combines_title_and_text(self):
+        """Reddit content should be the title followed by the body."""
+        reddit_service = MagicMock()
+        reddit_service.fetch_metadata.return_value = RedditPostMetadata(
+            author="seller", title="[WTS] Album", text="$5 each", subreddit="kpop"
+        )
+        adapter = RedditAdapter(reddit_service)
+
+        content = adapter.fetch_content("https://redd.it/abc")
+
+        self.assertEqual(content, "[WTS] Album\n\n$5 each")
+
+    def test_metrics_count_fetches_and_failures(self):
+        """Adapters should record fetches, unavailable posts and errors."""
+        twitter_service = MagicMock()
+        adapter = TwitterAdapter(twitter_service)
+        twitter_service.fetch_tweet_content.side_effect = [
+            "ok",
+            PostUnavailableError("Tweet not found", 404),
+            ValueError("Twitter API error: 500"),
+        ]
+
+        adapter.fetch_content("https://x.com/u/status/1")
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                adapter.fetch_content("https://x.com/u/status/1")
+
+        metrics = adapter.metrics()
+        self.assertEqual(metrics.fetch_count, 3)
+        self.assertEqual(metrics.unavailable_count, 1)
+        self.assertEqual(metrics.error_count, 1)
+
+    def test_metrics_shared_by_adapters_of_a_platform(self):
+        """Adapters built per request should add up to process-wide metrics."""
+        for _ in range(2):
+            twitter_service = MagicMock()
+            twitter_service.fetch_tweet_content.return_value = "ok"
+            TwitterAdapter(twitter_service).fetch_content("https://x.com/u/status/1")
+
+        metrics = {m.platform: m for m in get_platform_metrics()}
+
+        self.assertEqual(metrics[Platform.TWITTER].fetch_count, 2)
+        self.assertEqual(metrics[Platform.REDDIT].fetch_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
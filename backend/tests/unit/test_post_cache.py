@@ -0,0 +1,218 @@
+"""Unit tests for PostCache."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from pydantic import BaseModel
+
+from trade_safety.post_cache import PostCache, PostUnavailableError
+from trade_safety.settings import PostCacheSettings, TwitterAPISettings
+from trade_safety.twitter_extract_text_service import TwitterService
+
+
+class _Post(BaseModel):
+    """Minimal post model for cache tests."""
+
+    text: str
+
+
+class _FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPostCache(unittest.TestCase):
+    """Test TTL, LRU and negative caching behavior."""
+
+    def setUp(self):
+        """Set up a cache with a controllable clock."""
+        self.clock = _FakeClock()
+        self.cache = PostCache(
+            PostCacheSettings(ttl_seconds=60, negative_ttl_seconds=10, max_entries=2),
+            clock=self.clock,
+        )
+
+    # ==============================================
+    # TTL Tests
+    # ==============================================
+
+    def test_get_returns_fresh_entry(self):
+        """Cached posts should be returned until the TTL expires."""
+        self.cache.set("twitter:1", _Post(text="양도"))
+
+        self.clock.now += 59
+        result = self.cache.get("twitter:1", _Post)
+
+        assert result is not None
+        self.assertEqual(result.text, "양도")
+
+    def test_get_expires_entry_after_ttl(self):
+        """Expired posts should be treated as a miss."""
+        self.cache.set("twitter:1", _Post(text="양도"))
+
+        self.clock.now += 60
+
+        self.assertIsNone(self.cache.get("twitter:1", _Post))
+
+    def test_lru_evicts_least_recently_used(self):
+        """The cache should stay within max_entries, evicting the oldest use."""
+        self.cache.set("twitter:1", _Post(text="a"))
+        self.cache.set("twitter:2", _Post(text="b"))
+        self.cache.get("twitter:1", _Post)
+
+        self.cache.set("twitter:3", _Post(text="c"))
+
+        self.assertIsNotNone(self.cache.get("twitter:1", _Post))
+        self.assertIsNone(self.cache.get("twitter:2", _Post))
+        self.assertIsNotNone(self.cache.get("twitter:3", _Post))
+
+    # ==============================================
+    # get_or_fetch() Tests
+    # ==============================================
+
+    def test_get_or_fetch_fetches_once(self):
+        """Repeated lookups of the same post should fetch only once."""
+        fetch = MagicMock(return_value=_Post(text="양도"))
+
+        first = self.cache.get_or_fetch("twitter:1", _Post, fetch)
+        second = self.cache.get_or_fetch("twitter:1", _Post, fetch)
+
+        self.assertEqual(first, second)
+        fetch.assert_called_once()
+
+    def test_get_or_fetch_caches_unavailable_posts(self):
+        """Deleted posts should be cached for the negative TTL."""
+        fetch = MagicMock(side_effect=PostUnavailableError("Tweet not found", 404))
+
+        for _ in range(2):
+            with self.assertRaises(PostUnavailableError) as ctx:
+                self.cache.get_or_fetch("twitter:1", _Post, fetch)
+            self.assertEqual(ctx.exception.status_code, 404)
+        fetch.assert_called_once()
+
+        # After the negative TTL, the post is fetched again
+        self.clock.now += 10
+        with self.assertRaises(PostUnavailableError):
+            self.cache.get_or_fetch("twitter:1", _Post, fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_or_fetch_does_not_cache_forbidden_posts(self):
+        """A 403 may be a transient auth problem and should not be cached."""
+        fetch = MagicMock(side_effect=PostUnavailableError("Forbidden", 403))
+
+        for _ in range(2):
+            with self.assertRaises(PostUnavailableError):
+                self.cache.get_or_fetch("reddit:abc", _Post, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_get_or_fetch_does_not_cache_other_errors(self):
+        """Transient failures (rate limits, outages) should not be cached."""
+        fetch = MagicMock(side_effect=ValueError("Twitter API error: 429"))
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                self.cache.get_or_fetch("twitter:1", _Post, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    # ==============================================
+    # Disk Tier Tests
+    # ==============================================
+
+    def test_disk_tier_shared_between_instances(self):
+        """Entries written by one process should be visible to another."""
+        with tempfile.TemporaryDirectory() as disk_path:
+            settings = PostCacheSettings(ttl_seconds=60, disk_path=disk_path)
+            PostCache(settings, clock=self.clock).set("reddit:abc", _Post(text="a"))
+
+            result = PostCache(settings, clock=self.clock).get("reddit:abc", _Post)
+
+        assert result is not None
+        self.assertEqual(result.text, "a")
+
+    def test_disk_tier_prunes_expired_then_soonest_expiring(self):
+        """The disk tier should stay within disk_max_entries."""
+        with tempfile.TemporaryDirectory() as disk_path:
+            # Given: A full disk tier whose first entries have expired
+            settings = PostCacheSettings(
+                ttl_seconds=60, disk_path=disk_path, disk_max_entries=3
+            )
+            cache = PostCache(settings, clock=self.clock)
+            cache.set("twitter:1", _Post(text="a"))
+            self.clock.now += 30
+            cache.set("twitter:2", _Post(text="b"))
+            cache.set("twitter:3", _Post(text="c"))
+            self.clock.now += 31
+
+            # When: Writing beyond the bound
+            cache.set("twitter:4", _Post(text="d"))
+
+            # Then: The expired file, then the soonest-expiring one are pruned
+            # down to 90% of the bound
+            self.assertEqual(len(list(Path(disk_path).glob("*.json"))), 2)
+            other_process = PostCache(settings, clock=self.clock)
+            self.assertIsNone(other_process.get("twitter:2", _Post))
+            self.assertIsNotNone(other_process.get("twitter:3", _Post))
+            self.assertIsNotNone(other_process.get("twitter:4", _Post))
+
+    def test_disk_tier_overwrites_are_not_counted_as_new_files(self):
+        """Rewriting the same entries should not trigger pruning."""
+        with tempfile.TemporaryDirectory() as disk_path:
+            # Given
+            settings = PostCacheSettings(
+                ttl_seconds=60, disk_path=disk_path, disk_max_entries=3
+            )
+            cache = PostCache(settings, clock=self.clock)
+
+            for key in ("twitter:1", "twitter:2", "twitter:3"):
+                cache.set(key, _Post(text="a"))
+
+            # When: A full tier's entry is refreshed
+            for n in range(3):
+                cache.set("twitter:1", _Post(text=f"b{n}"))
+
+            # Then: Nothing is pruned
+            self.assertEqual(len(list(Path(disk_path).glob("*.json"))), 3)
+
+
+class TestTwitterServiceCache(unittest.TestCase):
+    """Test TwitterService integration with PostCache."""
+
+    @patch("requests.get")
+    def test_preview_then_analyze_fetches_once(self, mock_get):
+        """Preview and analyze of the same tweet should share one API call."""
+        # Given: Twitter API response and a cache-backed service
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "data": {
+                "id": "123",
+                "text": "급처분 포카 양도합니다",
+                "created_at": "2024-01-20T10:30:00.000Z",
+            },
+            "includes": {"users": [{"id": "u1", "username": "seller123"}]},
+        }
+        mock_get.return_value = mock_response
+        service = TwitterService(
+            twitter_api=TwitterAPISettings(bearer_token="test-token"),
+            cache=PostCache(PostCacheSettings()),
+        )
+
+        # When: Preview (metadata) then analyze (content) with different URL forms
+        metadata = service.fetch_metadata("https://x.com/seller123/status/123")
+        text = service.fetch_tweet_content("https://twitter.com/i/status/123?s=20")
+
+        # Then: Single API call, same text
+        self.assertEqual(metadata.text, text)
+        mock_get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
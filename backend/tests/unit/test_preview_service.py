@@ -4,9 +4,12 @@ import unittest
 from datetime import datetime
 from unittest.mock import MagicMock
 
+from trade_safety.image_proxy import ImageProxy
+from trade_safety.post_cache import PostCache
 from trade_safety.preview_service import PreviewService
 from trade_safety.reddit_extract_text_service import RedditPostMetadata, RedditService
 from trade_safety.schemas import Platform
+from trade_safety.settings import PostCacheSettings
 from trade_safety.twitter_extract_text_service import TweetMetadata, TwitterService
 
 
@@ -189,6 +192,64 @@ class TestPreviewService(unittest.TestCase):
 
         self.assertIn("Tweet not found", str(ctx.exception))
 
+    # ==============================================
+    # Preview Cache Tests
+    # ==============================================
+
+    def test_preview_cached_for_analysis(self):
+        """Test that a built preview is cached under the canonical post key."""
+        # Given: Cache-backed preview service
+        self.twitter_service.fetch_metadata.return_value = TweetMetadata(
+            author="seller123",
+            created_at=datetime(2024, 1, 20, 10, 30),
+            text="급처분 포카 양도합니다",
+            images=[],
+        )
+        service = PreviewService(
+            twitter_service=self.twitter_service,
+            post_cache=PostCache(PostCacheSettings()),
+        )
+
+        # When: Preview, then look up another URL form of the same tweet
+        preview = service.preview("https://x.com/user/status/123")
+        cached = service.get_cached_preview("https://twitter.com/i/status/123?s=20")
+        service.preview("https://x.com/user/status/123")
+
+        # Then: Same preview returned, metadata fetched once
+        self.assertEqual(cached, preview)
+        self.twitter_service.fetch_metadata.assert_called_once()
+
+    def test_get_cached_preview_without_cache(self):
+        """Test that no preview is returned when caching is disabled."""
+        self.assertIsNone(
+            self.service.get_cached_preview("https://x.com/user/status/123")
+        )
+
+    # ==============================================
+    # Thumbnail Pre-warming Tests
+    # ==============================================
+
+    def test_preview_prewarms_thumbnails(self):
+        """Test that previewing a post pre-warms thumbnails of its images."""
+        # Given: Preview service with an image proxy
+        self.twitter_service.fetch_metadata.return_value = TweetMetadata(
+            author="seller123",
+            text="포카 양도",
+            images=["https://pbs.twimg.com/media/img1.jpg"],
+        )
+        image_proxy = MagicMock(spec=ImageProxy)
+        service = PreviewService(
+            twitter_service=self.twitter_service, image_proxy=image_proxy
+        )
+
+        # When: Preview Twitter URL
+        service.preview("https://x.com/user/status/123")
+
+        # Then: Thumbnails of the post images are pre-warmed
+        image_proxy.prewarm.assert_called_once_with(
+            ["https://pbs.twimg.com/media/img1.jpg"]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,182 @@
+"""Unit tests for the market price reference index."""
+
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from trade_safety.currency import CurrencyConverter
+from trade_safety.price_reference import (
+    OfferedPrice,
+    PriceReferenceIndex,
+    extract_item_keys,
+    extract_offered_price,
+    format_price_range,
+    group_percentiles,
+    price_reference_note,
+)
+from trade_safety.settings import CurrencySettings, PriceReferenceSettings
+
+
+class TestExtraction(unittest.TestCase):
+    """Test price, currency and item key extraction from post text."""
+
+    def test_extract_offered_price(self):
+        """Prices should be found with their currency in common notations."""
+        cases = {
+            "방탄 포카 양도 15,000원 택포": (Decimal("15000"), "KRW"),
+            "급처 1.5만원에 드려요": (Decimal("15000"), "KRW"),
+            "₩12000 DM 주세요": (Decimal("12000"), "KRW"),
+            "selling for $20 shipped": (Decimal("20"), "USD"),
+            "3000엔 교환 가능": (Decimal("3000"), "JPY"),
+            "price 25 EUR": (Decimal("25"), "EUR"),
+        }
+        for text, (amount, currency) in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(
+                    extract_offered_price(text),
+                    OfferedPrice(amount=amount, currency=currency),
+                )
+
+    def test_extract_offered_price_without_currency(self):
+        """Numbers without a currency should not be taken as prices."""
+        self.assertIsNone(extract_offered_price("포카 3장 양도해요 2024 시즌"))
+
+    def test_extract_item_keys(self):
+        """Keys should go from category + artist to category only."""
+        self.assertEqual(
+            extract_item_keys("세븐틴 앨범 미개봉"), ["album:seventeen", "album"]
+        )
+        self.assertEqual(extract_item_keys("Lightstick for sale"), ["lightstick"])
+        self.assertEqual(extract_item_keys("안녕하세요"), [])
+
+
+class TestGroupPercentiles(unittest.TestCase):
+    """Test vectorized per-group percentiles."""
+
+    def test_matches_numpy_percentile_per_group(self):
+        """Results should equal numpy.percentile applied group by group."""
+        rng = np.random.default_rng(11)
+        group_ids = rng.integers(0, 6, size=500)
+        values = rng.lognormal(mean=9, sigma=0.5, size=500)
+
+        counts, percentiles = group_percentiles(group_ids, values, group_count=6)
+
+        for group in range(6):
+            group_values = values[group_ids == group]
+            self.assertEqual(counts[group], len(group_values))
+            np.testing.assert_allclose(
+                percentiles[group], np.percentile(group_values, [10, 25, 50, 75, 90])
+            )
+
+    def test_single_value_group(self):
+        """A group with one value should have that value at every percentile."""
+        _, percentiles = group_percentiles(
+            np.array([0, 1, 1]), np.array([5.0, 1.0, 3.0]), group_count=2
+        )
+
+        np.testing.assert_allclose(percentiles[0], [5.0] * 5)
+
+
+class TestPriceReferenceIndex(unittest.TestCase):
+    """Test recording prices and looking up item distributions."""
+
+    def setUp(self):
+        """Set up an index with a low sample threshold."""
+        self.index = PriceReferenceIndex(PriceReferenceSettings(min_samples=3))
+
+    def _add_prices(self, text: str, prices: list[int], currency: str = "KRW"):
+        for position, price in enumerate(prices):
+            self.index.add(f"{text}-{position}", text, price, currency)
+
+    def test_lookup_prefers_artist_specific_key(self):
+        """An artist's own distribution should be used once it has enough samples."""
+        self._add_prices("방탄 포카 양도", [20000, 22000, 24000])
+        self._add_prices("뉴진스 포카 양도", [5000, 6000, 7000])
+
+        reference = self.index.lookup("방탄 포카 팔아요", currency="KRW")
+
+        assert reference is not None
+        self.assertEqual(reference.item_key, "photocard:bts")
+        self.assertEqual(reference.p50, 22000)
+
+    def test_lookup_falls_back_to_category(self):
+        """Artists with too few samples should use the category distribution."""
+        self._add_prices("방탄 포카 양도", [20000, 22000, 24000])
+        self._add_prices("아이브 포카 양도", [8000])
+
+        reference = self.index.lookup("아이브 포카 팔아요", currency="KRW")
+
+        assert reference is not None
+        self.assertEqual(reference.item_key, "photocard")
+        self.assertEqual(reference.sample_count, 4)
+
+    def test_lookup_is_per_currency(self):
+        """Prices in other currencies should not be mixed in."""
+        self._add_prices("방탄 포카 양도", [20000, 22000, 24000])
+
+        self.assertIsNone(self.index.lookup("방탄 포카", currency="USD"))
+
+    def test_add_skips_duplicates_and_url_inputs(self):
+        """Each check counts once; URL inputs have no item text."""
+        self.index.add("check-1", "방탄 포카 양도", 20000, "krw")
+        self.index.add("check-1", "방탄 포카 양도", 20000, "krw")
+        self.index.add("check-2", "https://x.com/user/status/1", 20000, "KRW")
+
+        self.assertEqual(len(self.index), 1)
+
+    def test_rebuild_replaces_observations(self):
+        """Rebuilding should drop previously recorded prices."""
+        self._add_prices("방탄 포카 양도", [20000, 22000, 24000])
+
+        self.index.rebuild(
+            [(f"new-{n}", "방탄 포카", Decimal(10000 + n), "KRW") for n in range(3)]
+        )
+
+        reference = self.index.lookup("방탄 포카", currency="KRW")
+        assert reference is not None
+        self.assertEqual(reference.p50, 10001)
+
+    def test_note_and_range(self):
+        """The note should place the offered price within the distribution."""
+        self._add_prices("방탄 포카 양도", [10000, 20000, 30000, 40000, 50000])
+        reference = self.index.lookup("방탄 포카", currency="KRW")
+        assert reference is not None
+
+        note = price_reference_note(
+            reference, OfferedPrice(amount=Decimal("5000"), currency="KRW")
+        )
+
+        self.assertEqual(
+            format_price_range(reference),
+            "20,000-40,000 KRW (median 30,000; 5 earlier checks)",
+        )
+        self.assertIn("around the 0th percentile", note)
+
+    def test_lookup_converts_prices_in_other_currencies(self):
+        """With a converter, prices in several currencies should be combined."""
+        # Given: Too few KRW prices, but enough prices in all currencies
+        converter = CurrencyConverter(CurrencySettings())
+        index = PriceReferenceIndex(
+            PriceReferenceSettings(min_samples=3), converter=converter
+        )
+        krw_per_usd = converter.rate("KRW")
+        assert krw_per_usd is not None
+        index.add("krw", "방탄 포카 양도", krw_per_usd * 20, "KRW")
+        index.add("usd-1", "BTS photocard", 10, "USD")
+        index.add("usd-2", "BTS photocard", 30, "USD")
+
+        # When
+        reference = index.lookup("방탄 포카", currency="KRW")
+
+        # Then
+        assert reference is not None
+        self.assertTrue(reference.cross_currency)
+        self.assertEqual(reference.currency, "KRW")
+        self.assertEqual(reference.sample_count, 3)
+        self.assertAlmostEqual(reference.p50, krw_per_usd * 20)
+        self.assertIn("in several currencies", format_price_range(reference))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""Unit tests for RateLimitScheduler."""
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from trade_safety.rate_limits import (
+    RateLimitExceededError,
+    RateLimitScheduler,
+    RequestPriority,
+)
+from trade_safety.schemas import Platform
+from trade_safety.settings import RateLimitSettings, TwitterAPISettings
+from trade_safety.twitter_extract_text_service import (
+    TWEET_ENDPOINT,
+    TWEETS_LOOKUP_ENDPOINT,
+    TwitterService,
+)
+
+
+class _FakeClock:
+    """Manually advanced clock; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _twitter_headers(limit: int, remaining: int, reset: float) -> dict:
+    """Build Twitter rate-limit response headers."""
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(reset)),
+    }
+
+
+class TestRateLimitScheduler(unittest.TestCase):
+    """Test budget tracking, priorities and waiting."""
+
+    def setUp(self):
+        """Set up a Twitter scheduler with a controllable clock."""
+        self.clock = _FakeClock()
+        self.scheduler = RateLimitScheduler(
+            Platform.TWITTER,
+            RateLimitSettings(
+                bulk_reserve_fraction=0.2,
+                interactive_max_wait_seconds=2,
+                bulk_max_wait_seconds=900,
+            ),
+            clock=self.clock,
+            sleep=self.clock.sleep,
+        )
+
+    def test_unknown_budget_allows_calls(self):
+        """Calls should pass before any rate-limit headers were seen."""
+        self.scheduler.acquire(RequestPriority.BULK)
+
+        self.assertIsNone(self.scheduler.budget().remaining)
+
+    def test_update_from_twitter_headers(self):
+        """Twitter headers should set limit, remaining and reset time."""
+        self.scheduler.update_from_headers(
+            _twitter_headers(limit=300, remaining=120, reset=self.clock.now + 600)
+        )
+
+        budget = self.scheduler.budget()
+        self.assertEqual(budget.limit, 300)
+        self.assertEqual(budget.remaining, 120)
+        self.assertEqual(
+            budget.reset_at,
+            datetime.fromtimestamp(self.clock.now + 600, tz=timezone.utc),
+        )
+
+    def test_endpoints_have_separate_buckets(self):
+        """Headers of one endpoint should not change another endpoint's budget."""
+        # Given: Single-tweet lookups are exhausted, multi-tweet lookups are not
+        self.scheduler.update_from_headers(
+            _twitter_headers(limit=900, remaining=0, reset=self.clock.now + 600),
+            TWEET_ENDPOINT,
+        )
+        self.scheduler.update_from_headers(
+            _twitter_headers(limit=300, remaining=100, reset=self.clock.now + 600),
+            TWEETS_LOOKUP_ENDPOINT,
+        )
+
+        # When/Then: Only the exhausted endpoint rejects calls
+        with self.assertRaises(RateLimitExceededError):
+            self.scheduler.acquire(RequestPriority.INTERACTIVE, TWEET_ENDPOINT)
+        self.scheduler.acquire(RequestPriority.INTERACTIVE, TWEETS_LOOKUP_ENDPOINT)
+
+        budgets = {budget.endpoint: budget for budget in self.scheduler.budgets()}
+        self.assertEqual(budgets[TWEET_ENDPOINT].remaining, 0)
+        self.assertEqual(budgets[TWEETS_LOOKUP_ENDPOINT].remaining, 99)
+
+    def test_update_from_reddit_headers(self):
+        """Reddit headers report used/remaining and seconds until reset."""
+        scheduler = RateLimitScheduler(Platform.REDDIT, clock=self.clock)
+
+        scheduler.update_from_headers(
+            {
+                "X-Ratelimit-Used": "10",
+                "X-Ratelimit-Remaining": "90.0",
+                "X-Ratelimit-Reset": "300",
+            }
+        )
+
+        budget = scheduler.budget()
+        self.assertEqual(budget.limit, 100)
+        self.assertEqual(budget.remaining, 90)
+
+    def test_bulk_yields_to_interactive_when_quota_is_low(self):
+        """Bulk calls should wait once only the interactive reserve is left."""
+        # Given: 20 of 100 requests left (exactly the 20% reserve)
+        self.scheduler.update_from_headers(
+            _twitter_headers(limit=100, remaining=20, reset=self.clock.now + 60)
+        )
+
+        # When: Interactive call goes through immediately
+        self.scheduler.acquire(RequestPriority.INTERACTIVE)
+        self.assertEqual(self.clock.slept, [])
+
+        # When: Bulk call has to wait for the window reset
+        self.scheduler.acquire(RequestPriority.BULK)
+
+        # Then: Waited until reset, bucket refilled and one token taken
+        self.assertEqual(self.clock.slept, [60])
+        self.assertEqual(self.scheduler.budget().remaining, 99)
+
+    def test_interactive_rejected_when_reset_is_far(self):
+        """Interactive calls should be rejected rather than stall for minutes."""
+        self.scheduler.update_from_headers(
+            _twitter_headers(limit=100, remaining=0, reset=self.clock.now + 600)
+        )
+
+        with self.assertRaises(RateLimitExceededError) as ctx:
+            self.scheduler.acquire(RequestPriority.INTERACTIVE)
+
+        self.assertEqual(ctx.exception.retry_after, 600)
+        self.assertEqual(self.scheduler.budget().rejected_count, 1)
+
+    def test_record_throttled_uses_retry_after(self):
+        """A 429 without rate-limit headers should honor Retry-After."""
+        retry_after = self.scheduler.record_throttled({"Retry-After": "30"})
+
+        self.assertEqual(retry_after, 30)
+        budget = self.scheduler.budget()
+        self.assertEqual(budget.remaining, 0)
+        self.assertEqual(budget.throttled_count, 1)
+
+
+class TestTwitterServiceRateLimits(unittest.TestCase):
+    """Test TwitterService integration with the scheduler."""
+
+    def setUp(self):
+        """Set up a service with its own scheduler."""
+        self.clock = _FakeClock()
+        self.scheduler = RateLimitScheduler(
+            Platform.TWITTER, clock=self.clock, sleep=self.clock.sleep
+        )
+        self.service = TwitterService(
+            twitter_api=TwitterAPISettings(bearer_token="test-token"),
+            rate_limiter=self.scheduler,
+        )
+
+    @patch("requests.get")
+    def test_response_headers_update_budget(self, mock_get):
+        """Rate-limit headers of every response should update the budget."""
+        mock_response = MagicMock()
+        mock_response.headers = _twitter_headers(
+            limit=300, remaining=299, reset=self.clock.now + 900
+        )
+        mock_response.json.return_value = {"data": {"id": "1", "text": "양도"}}
+        mock_get.return_value = mock_response
+
+        self.service.fetch_metadata("https://x.com/user/status/1")
+
+        self.assertEqual(self.scheduler.budget(TWEET_ENDPOINT).remaining, 299)
+        self.assertIsNone(self.scheduler.budget(TWEETS_LOOKUP_ENDPOINT).remaining)
+
+    @patch("requests.get")
+    def test_429_raises_rate_limit_error(self, mock_get):
+        """A 429 should mark the window exhausted and block further calls."""
+        # Given: API throttles the request
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.text = "Too Many Requests"
+        mock_response.headers = _twitter_headers(
+            limit=300, remaining=0, reset=self.clock.now + 900
+        )
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = mock_response
+        mock_response.raise_for_status.side_effect = http_error
+        mock_get.return_value = mock_response
+
+        # When/Then: 429 surfaces as RateLimitExceededError
+        with self.assertRaises(RateLimitExceededError):
+            self.service.fetch_metadata("https://x.com/user/status/1")
+
+        # Then: The next call is rejected without hitting the API
+        with self.assertRaises(RateLimitExceededError):
+            self.service.fetch_metadata("https://x.com/user/status/2")
+        mock_get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,15 @@
 """Unit tests for RedditService."""
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import requests
 
-from trade_safety.reddit_extract_text_service import RedditService
+from trade_safety.post_cache import PostUnavailableError
+from trade_safety.reddit_extract_text_service import RedditPostMetadata, RedditService
+from trade_safety.reddit_token_manager import reset_reddit_token_managers
 from trade_safety.settings import RedditAPISettings
 
 
@@ -15,6 +18,8 @@ class TestRedditService(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures before each test method."""
+        # OAuth tokens are shared process-wide; start every test without one
+        reset_reddit_token_managers()
         # Lazy validation: credentials not required at initialization
         self.service = RedditService()
         # Service with dummy credentials for API call tests
@@ -168,27 +173,26 @@ class TestRedditService(unittest.TestCase):
         mock_oauth_response.raise_for_status = MagicMock()
         mock_post.return_value = mock_oauth_response
 
-        # Mock Reddit API response
+        # Mock Reddit /api/info response (post object only, no comments)
         mock_api_response = MagicMock()
-        mock_api_response.json.return_value = [
-            {
-                "data": {
-                    "children": [
-                        {
-                            "data": {
-                                "author": "seller123",
-                                "title": "[WTS][USA] Selling my entire kpop album collection",
-                                "selftext": "Cleaning out my collection. $5 each.",
-                                "subreddit": "kpopforsale",
-                                "created_utc": 1735200000,
-                                "url": "https://i.redd.it/image.jpg",
-                            }
-                        }
-                    ]
-                }
-            },
-            {"data": {"children": []}},  # Comments listing
-        ]
+        mock_api_response.json.return_value = {
+            "data": {
+                "children": [
+                    {
+                        "kind": "t3",
+                        "data": {
+                            "id": "1ptmrbl",
+                            "author": "seller123",
+                            "title": "[WTS][USA] Selling my entire kpop album collection",
+                            "selftext": "Cleaning out my collection. $5 each.",
+                            "subreddit": "kpopforsale",
+                            "created_utc": 1735200000,
+                            "url": "https://i.redd.it/image.jpg",
+                        },
+                    }
+                ]
+            }
+        }
         mock_api_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_api_response
 
@@ -205,6 +209,9 @@ class TestRedditService(unittest.TestCase):
         self.assertEqual(metadata.subreddit, "kpopforsale")
         self.assertIsInstance(metadata.created_at, datetime)
         self.assertIn("https://i.redd.it/image.jpg", metadata.images)
+        self.assertEqual(
+            mock_get.call_args.args[0], "https://oauth.reddit.com/api/info"
+        )
 
     @patch("trade_safety.reddit_extract_text_service.requests.get")
     @patch("trade_safety.reddit_extract_text_service.requests.post")
@@ -240,6 +247,111 @@ class TestRedditService(unittest.TestCase):
 
         self.assertIn("Request timeout", str(context.exception))
 
+    # ==============================================
+    # Batch Fetch Tests
+    # ==============================================
+
+    @patch("trade_safety.reddit_extract_text_service.requests.get")
+    @patch("trade_safety.reddit_extract_text_service.requests.post")
+    def test_fetch_metadata_batch_uses_api_info(self, mock_post, mock_get):
+        """Test that many posts are fetched with one /api/info request."""
+        # Mock OAuth response
+        mock_oauth_response = MagicMock()
+        mock_oauth_response.json.return_value = {
+            "access_token": "test-token",
+            "expires_in": 3600,
+        }
+        mock_post.return_value = mock_oauth_response
+
+        # Mock /api/info listing (post "gone" is missing: deleted)
+        mock_api_response = MagicMock()
+        mock_api_response.json.return_value = {
+            "kind": "Listing",
+            "data": {
+                "children": [
+                    {
+                        "kind": "t3",
+                        "data": {
+                            "id": "abc",
+                            "author": "seller1",
+                            "title": "[WTS] Photocards",
+                            "selftext": "$5 each",
+                            "subreddit": "kpopforsale",
+                            "url": "https://i.redd.it/a.jpg",
+                        },
+                    },
+                    {
+                        "kind": "t3",
+                        "data": {"id": "def", "author": "seller2", "title": "[WTS]"},
+                    },
+                ]
+            },
+        }
+        mock_get.return_value = mock_api_response
+
+        results = self.service_with_creds.fetch_metadata_batch(["abc", "def", "gone"])
+
+        # One request with fullnames, results mapped per post
+        mock_get.assert_called_once()
+        self.assertEqual(
+            mock_get.call_args.args[0], "https://oauth.reddit.com/api/info"
+        )
+        self.assertEqual(
+            mock_get.call_args.kwargs["params"]["id"], "t3_abc,t3_def,t3_gone"
+        )
+        first, second = results["abc"], results["def"]
+        assert isinstance(first, RedditPostMetadata)
+        assert isinstance(second, RedditPostMetadata)
+        self.assertEqual(first.author, "seller1")
+        self.assertEqual(first.images, ["https://i.redd.it/a.jpg"])
+        self.assertEqual(second.author, "seller2")
+        self.assertIsInstance(results["gone"], PostUnavailableError)
+
+    @patch("trade_safety.reddit_extract_text_service.requests.get")
+    @patch("trade_safety.reddit_extract_text_service.requests.post")
+    def test_fetch_metadata_groups_concurrent_requests(self, mock_post, mock_get):
+        """Test that concurrent requests (one service each) share one request."""
+        mock_oauth_response = MagicMock()
+        mock_oauth_response.json.return_value = {
+            "access_token": "test-token",
+            "expires_in": 3600,
+        }
+        mock_post.return_value = mock_oauth_response
+        mock_api_response = MagicMock()
+        mock_api_response.json.return_value = {
+            "data": {
+                "children": [
+                    {"kind": "t3", "data": {"id": "abc", "title": "A"}},
+                    {"kind": "t3", "data": {"id": "def", "title": "B"}},
+                ]
+            }
+        }
+        mock_get.return_value = mock_api_response
+        settings = RedditAPISettings(
+            client_id="test-client-id",
+            client_secret="test-client-secret",
+            batch_window_ms=50,
+        )
+        # Token fetched up front so both requests only race on the batch
+        RedditService(reddit_api=settings)._get_access_token()
+
+        def handle_request(url: str) -> RedditPostMetadata:
+            return RedditService(reddit_api=settings).fetch_metadata(url)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(
+                pool.map(
+                    handle_request,
+                    ["https://redd.it/abc", "https://www.reddit.com/comments/def"],
+                )
+            )
+
+        mock_get.assert_called_once()
+        self.assertEqual(
+            mock_get.call_args.args[0], "https://oauth.reddit.com/api/info"
+        )
+        self.assertEqual([r.title for r in results], ["A", "B"])
+
     # ==============================================
     # Image Extraction Tests
     # ==============================================
@@ -0,0 +1,180 @@
+"""Unit tests for RedditTokenManager."""
+
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from trade_safety.reddit_extract_text_service import RedditService
+from trade_safety.reddit_token_manager import (
+    RedditTokenManager,
+    get_reddit_token_manager,
+    reset_reddit_token_managers,
+)
+from trade_safety.settings import RedditAPISettings
+
+
+def _build_settings(**kwargs) -> RedditAPISettings:
+    """Build Reddit settings with dummy credentials."""
+    return RedditAPISettings(
+        client_id="test-client-id", client_secret="test-client-secret", **kwargs
+    )
+
+
+def _token_response(token: str, expires_in: int = 3600) -> MagicMock:
+    """Build a mocked OAuth token response."""
+    response = MagicMock()
+    response.json.return_value = {"access_token": token, "expires_in": expires_in}
+    return response
+
+
+class _FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRedditTokenManager(unittest.TestCase):
+    """Test shared, single-flight token refresh."""
+
+    def setUp(self):
+        """Start every test without shared managers."""
+        reset_reddit_token_managers()
+
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_services_share_one_token(self, mock_post):
+        """Services rebuilt per request should reuse the process-wide token."""
+        mock_post.return_value = _token_response("shared-token")
+
+        first = RedditService(reddit_api=_build_settings())._get_access_token()
+        second = RedditService(reddit_api=_build_settings())._get_access_token()
+
+        self.assertEqual(first, "shared-token")
+        self.assertEqual(second, "shared-token")
+        mock_post.assert_called_once()
+
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_concurrent_refresh_is_single_flight(self, mock_post):
+        """Concurrent callers without a token should trigger one fetch."""
+
+        # Given: Slow token endpoint
+        def slow_post(*_args, **_kwargs):
+            time.sleep(0.05)
+            return _token_response("token")
+
+        mock_post.side_effect = slow_post
+        manager = RedditTokenManager(_build_settings())
+
+        # When: Eight callers ask for a token at once
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = list(pool.map(lambda _: manager.get_token(), range(8)))
+
+        # Then: One fetch served everyone
+        self.assertEqual(tokens, ["token"] * 8)
+        mock_post.assert_called_once()
+
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_token_renewed_in_background_before_expiry(self, mock_post):
+        """Within the renewal window the old token is served while renewing."""
+        # Given: Token expiring in 3600-60s
+        clock = _FakeClock()
+        manager = RedditTokenManager(
+            _build_settings(token_renew_before_seconds=300), clock=clock
+        )
+        mock_post.return_value = _token_response("old-token")
+        manager.get_token()
+
+        # When: Inside the renewal window
+        mock_post.return_value = _token_response("new-token")
+        clock.now += 3600 - 60 - 100
+        token = manager.get_token()
+
+        # Then: Old token returned immediately, new one fetched in background
+        self.assertEqual(token, "old-token")
+        for _ in range(100):
+            if manager.get_token() == "new-token":
+                break
+            time.sleep(0.01)
+        self.assertEqual(manager.get_token(), "new-token")
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_expired_token_refetched(self, mock_post):
+        """Expired tokens should be fetched again synchronously."""
+        clock = _FakeClock()
+        manager = RedditTokenManager(_build_settings(), clock=clock)
+        mock_post.return_value = _token_response("old-token")
+        manager.get_token()
+
+        mock_post.return_value = _token_response("new-token")
+        clock.now += 3600
+
+        self.assertEqual(manager.get_token(), "new-token")
+
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_shared_token_file_reused_across_processes(self, mock_post):
+        """A token persisted by one worker should be reused by another."""
+        mock_post.return_value = _token_response("file-token")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            settings = _build_settings(token_cache_dir=cache_dir)
+            RedditTokenManager(settings).get_token()
+
+            # A fresh manager simulates another worker process
+            token = RedditTokenManager(settings).get_token()
+
+        self.assertEqual(token, "file-token")
+        mock_post.assert_called_once()
+
+    @patch("trade_safety.reddit_extract_text_service.requests.get")
+    @patch("trade_safety.reddit_token_manager.requests.post")
+    def test_rejected_token_not_reused_from_shared_file(self, mock_post, mock_get):
+        """A 401 should drop the token from memory and the shared token file."""
+        # Given: A token persisted to the shared file, then revoked by Reddit
+        mock_post.side_effect = [
+            _token_response("revoked-token"),
+            _token_response("new-token"),
+        ]
+        unauthorized = MagicMock(status_code=401, text="Unauthorized", headers={})
+        unauthorized.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=unauthorized
+        )
+        mock_get.return_value = unauthorized
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            settings = _build_settings(token_cache_dir=cache_dir)
+            manager = get_reddit_token_manager(settings)
+            manager.get_token()
+
+            # When: The API rejects the token
+            with self.assertRaises(ValueError):
+                RedditService(reddit_api=settings).fetch_metadata("https://redd.it/abc")
+
+            # Then: A new token is fetched, and other workers pick it up
+            self.assertEqual(manager.get_token(), "new-token")
+            other_worker = RedditTokenManager(settings).get_token()
+
+        self.assertEqual(other_worker, "new-token")
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_get_reddit_token_manager_per_credentials(self):
+        """Different credentials should never share a manager."""
+        first = get_reddit_token_manager(_build_settings())
+        same = get_reddit_token_manager(_build_settings())
+        other = get_reddit_token_manager(
+            RedditAPISettings(client_id="other", client_secret="secret")
+        )
+
+        self.assertIs(first, same)
+        self.assertIsNot(first, other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Unit tests for retention and archival of trade safety checks."""
+
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from tests.unit.helpers import build_create, build_risk_signal, create_db_session
+from trade_safety.analysis_codec import ZSTD_AVAILABLE, AnalysisCodec
+from trade_safety.models import DBRiskSignal, DBTradeSafetyCheck
+from trade_safety.repositories.analysis_dictionary_repository import (
+    DatabaseAnalysisDictionaryManager,
+)
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.retention import (
+    CheckArchiver,
+    add_months,
+    is_partition_table,
+    month_start,
+    partition_name,
+)
+from trade_safety.schemas import TradeSafetyCheckCreate
+from trade_safety.settings import AnalysisCodecSettings, RetentionSettings
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _build_create(input_text: str) -> TradeSafetyCheckCreate:
+    """Build a TradeSafetyCheckCreate with one risk signal."""
+    return build_create(input_text, safe_score=30, risk_signals=[build_risk_signal()])
+
+
+class TestMonthHelpers(unittest.TestCase):
+    """Test month arithmetic used for partition bounds."""
+
+    def test_month_start_converts_to_utc(self):
+        """Aware times should be bucketed by their UTC month."""
+        kst_new_year = datetime.fromisoformat("2026-01-01T05:00:00+09:00")
+
+        self.assertEqual(month_start(kst_new_year), datetime(2025, 12, 1))
+
+    def test_add_months_crosses_years(self):
+        """Shifting should wrap around year boundaries both ways."""
+        self.assertEqual(add_months(datetime(2026, 11, 1), 3), datetime(2027, 2, 1))
+        self.assertEqual(add_months(datetime(2026, 1, 1), -13), datetime(2024, 12, 1))
+        self.assertEqual(
+            partition_name(datetime(2026, 2, 1)), "trade_safety_checks_p202602"
+        )
+
+    def test_is_partition_table(self):
+        """Month, default and legacy partitions should be told apart from other tables."""
+        self.assertTrue(is_partition_table("trade_safety_checks_p202602"))
+        self.assertTrue(is_partition_table("trade_safety_checks_default"))
+        self.assertTrue(is_partition_table("trade_safety_checks_legacy"))
+        self.assertFalse(is_partition_table("trade_safety_checks"))
+        self.assertFalse(is_partition_table("trade_safety_check_rollups"))
+
+
+class TestCheckArchiver(unittest.TestCase):
+    """Test archival of expired months on SQLite (batched deletes)."""
+
+    def setUp(self):
+        """Set up a database and an archive directory for each test."""
+        self.session = create_db_session()
+        self.manager = DatabaseTradeSafetyCheckManager(self.session)
+        self.archive_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Close the session and remove archives."""
+        self.session.close()
+        shutil.rmtree(self.archive_dir)
+
+    def _create_at(self, input_text: str, created_at: datetime) -> str:
+        check = self.manager.create(_build_create(input_text))
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        assert db_check is not None
+        db_check.created_at = created_at
+        self.session.commit()
+        return check.id
+
+    def _archiver(self, months: int | None) -> CheckArchiver:
+        settings = RetentionSettings(
+            months=months, archive_dir=self.archive_dir, batch_size=2
+        )
+        return CheckArchiver(self.session, settings, clock=lambda: NOW)
+
+    def test_archives_and_deletes_expired_months(self):
+        """Expired months should be written to JSONL files, then deleted."""
+        # Given: Three checks in March, one in May, one in the retention period
+        march = [
+            self._create_at(f"march {n}", datetime(2026, 3, 2 + n)) for n in range(3)
+        ]
+        may = self._create_at("may", datetime(2026, 5, 31, 23, 59))
+        kept = self._create_at("kept", datetime(2026, 7, 1))
+
+        # When: The current month and three full months before it are kept
+        archived = self._archiver(months=3).archive_expired()
+
+        # Then
+        self.assertEqual(
+            [(result.month, result.check_count) for result in archived],
+            [
+                (datetime(2026, 3, 1), 3),
+                (datetime(2026, 4, 1), 0),
+                (datetime(2026, 5, 1), 1),
+                (datetime(2026, 6, 1), 0),
+            ],
+        )
+        self.assertIsNone(archived[1].path)
+        self.assertFalse(archived[0].dropped_partition)
+
+        assert archived[0].path is not None
+        with gzip.open(archived[0].path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["id"] for line in lines], march)
+        self.assertEqual(lines[0]["llm_analysis"]["safe_score"], 30)
+        self.assertEqual(lines[0]["created_at"], "2026-03-02T00:00:00")
+
+        remaining = self.session.scalars(select(DBTradeSafetyCheck.id)).all()
+        self.assertEqual(remaining, [kept])
+        signal_count = self.session.scalar(
+            select(func.count()).select_from(  # pylint: disable=not-callable
+                DBRiskSignal
+            )
+        )
+        self.assertEqual(signal_count, 1)
+        self.assertNotIn(may, remaining)
+        self.assertEqual(
+            sorted(path.name for path in Path(self.archive_dir).iterdir()),
+            [
+                "trade_safety_checks_2026_03.jsonl.gz",
+                "trade_safety_checks_2026_05.jsonl.gz",
+            ],
+        )
+
+    @unittest.skipUnless(ZSTD_AVAILABLE, "zstandard is not installed")
+    def test_archives_decode_compressed_analyses(self):
+        """Archive lines should hold the JSON of compressed analyses."""
+        self.manager = DatabaseTradeSafetyCheckManager(
+            self.session,
+            analysis_codec=AnalysisCodec(
+                DatabaseAnalysisDictionaryManager(self.session),
+                AnalysisCodecSettings(compress=True),
+            ),
+        )
+        self._create_at("march", datetime(2026, 3, 2))
+
+        archived = self._archiver(months=3).archive_expired()
+
+        assert archived[0].path is not None
+        with gzip.open(archived[0].path, "rt", encoding="utf-8") as f:
+            line = json.loads(f.readline())
+        self.assertEqual(line["llm_analysis"]["safe_score"], 30)
+        self.assertNotIn("llm_analysis_zstd", line)
+
+    def test_rerun_is_a_no_op(self):
+        """Once archived, a month should not be archived again."""
+        self._create_at("march", datetime(2026, 3, 2))
+        archiver = self._archiver(months=3)
+        archiver.archive_expired()
+
+        self.assertEqual(archiver.archive_expired(), [])
+
+    def test_disabled_retention_keeps_everything(self):
+        """Without a retention period nothing should be archived."""
+        self._create_at("old", datetime(2020, 1, 1))
+        archiver = self._archiver(months=None)
+
+        self.assertEqual(archiver.archive_expired(), [])
+        self.assertEqual(archiver.ensure_partitions(), [])
+        self.assertEqual(
+            self.session.scalar(
+                select(func.count()).select_from(  # pylint: disable=not-callable
+                    DBTradeSafetyCheck
+                )
+            ),
+            1,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Unit tests for the prioritized expert review queue."""
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from aioia_core.models import Base
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tests.unit.helpers import build_create, create_db_session
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.models import DBTradeSafetyCheck
+from trade_safety.repositories.review_queue_repository import DatabaseReviewQueueManager
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.review_queue import review_priority
+from trade_safety.schemas import Platform, TradeSafetyCheckUpdate
+
+
+class TestReviewPriority(unittest.TestCase):
+    """Test the review priority formula."""
+
+    def test_priority_grows_with_risk(self):
+        """Lower scores, severe signals, repeat authors and copies rank higher."""
+        base = review_priority(60)
+
+        self.assertGreater(review_priority(20), base)
+        self.assertGreater(review_priority(60, "high"), review_priority(60, "medium"))
+        self.assertGreater(review_priority(60, author_risky_checks=1), base)
+        self.assertGreater(review_priority(60, duplicate_count=1), base)
+
+    def test_bonuses_are_capped(self):
+        """A flood of duplicates should not outrank a much riskier check."""
+        self.assertEqual(
+            review_priority(60, duplicate_count=1000),
+            review_priority(60, duplicate_count=6),
+        )
+        self.assertGreater(
+            review_priority(0, "high"), review_priority(70, "high", 100, 100)
+        )
+
+
+class TestDatabaseReviewQueueManager(unittest.TestCase):
+    """Test claiming and releasing checks against in-memory SQLite."""
+
+    def setUp(self):
+        """Set up an isolated database for each test."""
+        self.session = create_db_session()
+        self.manager = DatabaseTradeSafetyCheckManager(self.session)
+        self.queue = self.manager.review_queue
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def _priority(self, check_id: str) -> int:
+        db_check = self.session.get(DBTradeSafetyCheck, check_id)
+        assert db_check is not None
+        return db_check.review_priority
+
+    def test_create_computes_priority(self):
+        """Duplicates and repeat risky authors should raise the priority."""
+        # Given
+        first = self.manager.create(
+            build_create(safe_score=20, platform=Platform.TWITTER, author="seller123")
+        )
+
+        # When: Same post checked again
+        second = self.manager.create(
+            build_create(safe_score=20, platform=Platform.TWITTER, author="seller123")
+        )
+
+        # Then
+        self.assertEqual(self._priority(first.id), review_priority(20))
+        self.assertEqual(
+            self._priority(second.id),
+            review_priority(20, author_risky_checks=1, duplicate_count=1),
+        )
+
+    def test_create_reuses_duplicate_count_of_reuse_lookup(self):
+        """The reuse lookup should count copies once for the next create."""
+        # Given: Two earlier copies of a post
+        first = self.manager.create(build_create(safe_score=20, output_language="en"))
+        self.manager.create(build_create(safe_score=20, output_language="en"))
+        statements: list[str] = []
+
+        def record(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        engine = self.session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+
+        # When: The post is looked up for reuse, then checked again
+        reusable = self.manager.find_reusable_check(
+            compute_input_hash(first.input_text),
+            "en",
+            since=datetime(2000, 1, 1),
+        )
+        third = self.manager.create(build_create(safe_score=20, output_language="en"))
+        event.remove(engine, "before_cursor_execute", record)
+
+        # Then: Counted by the lookup only
+        self.assertIsNotNone(reusable)
+        self.assertEqual(sum("count(" in sql.lower() for sql in statements), 1)
+        self.assertEqual(
+            self._priority(third.id), review_priority(20, duplicate_count=2)
+        )
+
+    def test_claims_highest_priority_first(self):
+        """The riskiest check should be served first, then the next one."""
+        safe = self.manager.create(build_create("safe", safe_score=90))
+        risky = self.manager.create(build_create("risky", safe_score=10))
+
+        first = self.queue.claim_next("expert-1")
+        second = self.queue.claim_next("expert-2")
+
+        assert first is not None and second is not None
+        self.assertEqual(first.check_id, risky.id)
+        self.assertEqual(second.check_id, safe.id)
+        self.assertIsNone(self.queue.claim_next("expert-3"))
+
+    def test_reviewed_checks_leave_the_queue(self):
+        """Reviewed checks should never be claimed."""
+        check = self.manager.create(build_create(safe_score=10))
+        self.manager.update(
+            check.id, TradeSafetyCheckUpdate(expert_advice="ok", expert_reviewed=True)
+        )
+
+        self.assertIsNone(self.queue.claim_next("expert-1"))
+        self.assertEqual(self.queue.pending_count(), 0)
+
+    def test_expired_lease_returns_to_queue(self):
+        """A check whose lease expired should be claimable again."""
+        check = self.manager.create(build_create(safe_score=10))
+        self.queue.claim_next("expert-1")
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        assert db_check is not None
+        db_check.review_claimed_until = datetime(2000, 1, 1)
+        self.session.commit()
+
+        claim = self.queue.claim_next("expert-2")
+
+        assert claim is not None
+        self.assertEqual(claim.check_id, check.id)
+        self.assertEqual(claim.claimed_by, "expert-2")
+
+    def test_release_by_holder_only(self):
+        """Only the expert holding the lease can release it."""
+        check = self.manager.create(build_create(safe_score=10))
+        self.queue.claim_next("expert-1")
+
+        self.assertFalse(self.queue.release(check.id, "expert-2"))
+        self.assertTrue(self.queue.release(check.id, "expert-1"))
+        claim = self.queue.claim_next("expert-2")
+        assert claim is not None
+        self.assertEqual(claim.check_id, check.id)
+
+
+class TestConcurrentClaims(unittest.TestCase):
+    """Test that concurrent experts never claim the same check."""
+
+    def setUp(self):
+        """Set up a file database shared by several sessions."""
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(
+            f"sqlite:///{self.path}", connect_args={"timeout": 30}
+        )
+        Base.metadata.create_all(self.engine)
+        self.session_factory = sessionmaker(bind=self.engine)
+
+    def tearDown(self):
+        """Remove the database file."""
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def test_claims_are_distinct(self):
+        """Every claim should get a different check."""
+        # Given: 12 pending checks
+        with self.session_factory() as session:
+            manager = DatabaseTradeSafetyCheckManager(session)
+            for n in range(12):
+                manager.create(build_create(f"post {n}", safe_score=n))
+
+        # When: Four experts claim three checks each at the same time
+        def claim_three(expert_id: str) -> list[str]:
+            with self.session_factory() as session:
+                queue = DatabaseReviewQueueManager(session)
+                claims = [queue.claim_next(expert_id) for _ in range(3)]
+                return [claim.check_id for claim in claims if claim]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(claim_three, [f"e{n}" for n in range(4)]))
+
+        # Then
+        claimed = [check_id for result in results for check_id in result]
+        self.assertEqual(len(claimed), len(set(claimed)))
+        self.assertGreaterEqual(len(claimed), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
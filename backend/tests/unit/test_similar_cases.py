@@ -0,0 +1,221 @@
+"""Unit tests for the embedding-based similar-case index."""
+
+import sys
+import tempfile
+import unittest
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+
+from trade_safety.near_duplicates import IndexedCheck
+from trade_safety.settings import SimilarCaseSettings
+from trade_safety.similar_cases import (
+    HashingEmbedder,
+    SimilarCaseIndex,
+    TextEmbedder,
+    build_embedder,
+    format_similar_case,
+)
+
+SCAM_POST = "급처분 방탄 포카 양도해요 선입금 필수 계좌이체만 가능 DM 주세요"
+SIMILAR_POST = "방탄 포카 급처분 양도 선입금만 받아요 계좌이체 DM"
+UNRELATED_POST = "세븐틴 앨범 미개봉 교환 원해요 직거래 선호"
+
+
+def _entry(check_id: str, reviewed: bool = True, **kwargs) -> IndexedCheck:
+    return IndexedCheck(
+        check_id=check_id,
+        output_language="en",
+        safe_score=kwargs.pop("safe_score", 10),
+        expert_reviewed=reviewed,
+        created_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+        **kwargs,
+    )
+
+
+class CountingEmbedder(TextEmbedder):
+    """Hashing embedder that records how many texts it embedded."""
+
+    def __init__(self) -> None:
+        self.inner = HashingEmbedder(dimensions=64)
+        self.embedded: list[str] = []
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def dimensions(self) -> int:
+        return self.inner.dimensions
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.embedded.extend(texts)
+        return self.inner.embed(texts)
+
+
+class TestHashingEmbedder(unittest.TestCase):
+    """Test the offline hashing embedder."""
+
+    def test_vectors_are_unit_length_and_deterministic(self):
+        """Embeddings should be normalized and stable across instances."""
+        first = HashingEmbedder(dimensions=128).embed([SCAM_POST, ""])
+        second = HashingEmbedder(dimensions=128).embed([SCAM_POST])
+
+        self.assertEqual(first.shape, (2, 128))
+        self.assertAlmostEqual(float(np.linalg.norm(first[0])), 1.0, places=5)
+        self.assertFalse(first[1].any())
+        np.testing.assert_array_equal(first[0], second[0])
+
+    def test_similar_texts_score_higher(self):
+        """Reworded posts should be closer than unrelated ones."""
+        scam, similar, unrelated = HashingEmbedder().embed(
+            [SCAM_POST, SIMILAR_POST, UNRELATED_POST]
+        )
+
+        self.assertGreater(float(scam @ similar), float(scam @ unrelated))
+
+
+class TestSimilarCaseIndex(unittest.TestCase):
+    """Test top-k queries, incremental indexing and the sidecar files."""
+
+    def setUp(self):
+        """Set up an in-memory index."""
+        self.settings = SimilarCaseSettings(dimensions=256, min_similarity=0.3)
+        self.index = SimilarCaseIndex(self.settings)
+
+    def test_query_returns_reviewed_similar_case(self):
+        """A reworded scam should retrieve the reviewed original."""
+        self.index.add(
+            [
+                (_entry("scam-1", expert_advice="Seller vanished"), SCAM_POST),
+                (_entry("other", safe_score=80), UNRELATED_POST),
+            ]
+        )
+
+        cases = self.index.query(SIMILAR_POST)
+
+        self.assertEqual(cases[0].check_id, "scam-1")
+        self.assertEqual(cases[0].expert_advice, "Seller vanished")
+        self.assertEqual(cases[0].excerpt, SCAM_POST)
+        self.assertNotIn("other", [case.check_id for case in cases])
+
+    def test_reviewed_only_skips_unreviewed_and_url_checks(self):
+        """Only expert-reviewed text inputs should be indexed by default."""
+        added = self.index.add(
+            [
+                (_entry("unreviewed", reviewed=False), SCAM_POST),
+                (_entry("url"), "https://x.com/user/status/123"),
+            ]
+        )
+
+        self.assertEqual(added, 0)
+        self.assertEqual(self.index.query(SCAM_POST), [])
+
+    def test_batched_block_query_matches_brute_force(self):
+        """Top-k over several blocks should equal a full sort of all scores."""
+        # Given: Random texts spread over many small blocks
+        rng = np.random.default_rng(3)
+        texts = ["".join(rng.choice(list("가나다라마바사"), 40)) for _ in range(60)]
+        for position, text in enumerate(texts):
+            self.index.add([(_entry(f"check-{position}"), text)])
+        settings = SimilarCaseSettings(dimensions=256, min_similarity=-1.0, top_k=5)
+        self.index.settings = settings
+        queries = texts[:4]
+
+        # When: Blocks are scored a few rows at a time
+        with patch("trade_safety.similar_cases._QUERY_BLOCK_ROWS", 7):
+            results = self.index.query_batch(queries)
+
+        # Then: Same best scores as a full sort (ties may come in any order)
+        embedder = HashingEmbedder(dimensions=256)
+        scores = embedder.embed(queries) @ embedder.embed(texts).T
+        for query_scores, cases in zip(scores, results):
+            np.testing.assert_allclose(
+                [case.similarity for case in cases],
+                np.sort(query_scores)[::-1][:5],
+                rtol=1e-5,
+            )
+            self.assertEqual(cases[0].check_id, f"check-{np.argmax(query_scores)}")
+
+    def test_add_refreshes_metadata_without_embedding_again(self):
+        """Re-adding an indexed check should only update its metadata."""
+        embedder = CountingEmbedder()
+        index = SimilarCaseIndex(self.settings, embedder=embedder)
+        index.add([(_entry("scam-1"), SCAM_POST)])
+
+        index.add([(_entry("scam-1", expert_advice="Confirmed scam"), SCAM_POST)])
+
+        self.assertEqual(len(embedder.embedded), 1)
+        self.assertEqual(index.query(SCAM_POST)[0].expert_advice, "Confirmed scam")
+
+    def test_sidecar_index_is_memory_mapped_and_synced_incrementally(self):
+        """A restarted index should load from disk and embed only new checks."""
+        with tempfile.TemporaryDirectory() as index_dir:
+            # Given: One case persisted by an earlier process
+            settings = SimilarCaseSettings(
+                dimensions=64, min_similarity=0.3, index_dir=index_dir
+            )
+            SimilarCaseIndex(settings, embedder=CountingEmbedder()).add(
+                [(_entry("scam-1", expert_advice="Seller vanished"), SCAM_POST)]
+            )
+
+            # When: Restarted index syncs with the table
+            embedder = CountingEmbedder()
+            restarted = SimilarCaseIndex(settings, embedder=embedder)
+            restarted.ensure_synced(
+                lambda: [
+                    (_entry("scam-1", expert_advice="Seller vanished"), SCAM_POST),
+                    (_entry("other"), UNRELATED_POST),
+                ]
+            )
+
+            # Then: Only the new check was embedded; both are queryable
+            self.assertTrue(restarted.is_ready)
+            self.assertIsInstance(restarted._blocks[0], np.memmap)
+            self.assertEqual(embedder.embedded, [UNRELATED_POST])
+            self.assertEqual(len(restarted), 2)
+            self.assertEqual(restarted.query(SIMILAR_POST)[0].check_id, "scam-1")
+
+    def test_processes_sharing_the_sidecar_index_allocate_distinct_rows(self):
+        """Cases appended by another process should be read, not overwritten."""
+        with tempfile.TemporaryDirectory() as index_dir:
+            # Given: Two worker processes sharing one sidecar index
+            settings = SimilarCaseSettings(
+                dimensions=64, min_similarity=0.3, index_dir=index_dir
+            )
+            first = SimilarCaseIndex(settings, embedder=CountingEmbedder())
+            second = SimilarCaseIndex(settings, embedder=CountingEmbedder())
+
+            # When: Each indexes a different check
+            first.add([(_entry("scam-1"), SCAM_POST)])
+            second.add([(_entry("other"), UNRELATED_POST)])
+
+            # Then: Both see both cases in their own rows
+            self.assertEqual(first.query(SIMILAR_POST)[0].check_id, "scam-1")
+            self.assertEqual(second.query(SIMILAR_POST)[0].check_id, "scam-1")
+            self.assertEqual(first.query(UNRELATED_POST)[0].check_id, "other")
+            restarted = SimilarCaseIndex(settings, embedder=CountingEmbedder())
+            self.assertEqual(restarted._row_ids, ["scam-1", "other"])
+
+    def test_sentence_transformer_model_without_extra_raises_value_error(self):
+        """A configured model should fail clearly when the extra is missing."""
+        settings = SimilarCaseSettings(embedding_model="all-MiniLM-L6-v2")
+
+        with patch.dict(sys.modules, {"sentence_transformers": None}):
+            with self.assertRaisesRegex(ValueError, "embeddings"):
+                build_embedder(settings)
+
+    def test_format_similar_case(self):
+        """Cases should render as one-line few-shot examples."""
+        self.index.add([(_entry("scam-1", expert_advice="Do not pay"), SCAM_POST)])
+
+        example = format_similar_case(self.index.query(SCAM_POST)[0])
+
+        self.assertIn("safety score 10/100 (100% similar)", example)
+        self.assertIn("Expert advice: Do not pay", example)
+
+
+if __name__ == "__main__":
+    unittest.main()
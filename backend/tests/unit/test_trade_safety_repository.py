@@ -0,0 +1,403 @@
+"""Unit tests for DatabaseTradeSafetyCheckManager."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from tests.unit.helpers import build_analysis, build_create, create_db_session
+from trade_safety.analysis_versions import (
+    ANALYSIS_SCHEMA_VERSION,
+    LEGACY_ANALYSIS_SCHEMA_VERSION,
+)
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.models import DBRiskSignal, DBTradeSafetyCheck
+from trade_safety.near_duplicates import NearDuplicateIndex
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+    decode_cursor,
+    encode_cursor,
+    promoted_fields,
+)
+from trade_safety.schemas import CheckListFilters, Platform, TradeSafetyCheckUpdate
+from trade_safety.settings import NearDuplicateSettings
+
+
+class TestDatabaseTradeSafetyCheckManager(unittest.TestCase):
+    """Test DatabaseTradeSafetyCheckManager against in-memory SQLite."""
+
+    def setUp(self):
+        """Set up an isolated database for each test."""
+        self.session = create_db_session()
+        self.manager = DatabaseTradeSafetyCheckManager(self.session)
+
+    def tearDown(self):
+        """Close the session."""
+        self.session.close()
+
+    def _insert_legacy_check(self) -> str:
+        """Insert a row as stored before schema versioning existed."""
+        legacy_analysis = build_analysis(safe_score=40)
+        legacy_analysis["risk_score"] = legacy_analysis.pop("safe_score")
+        now = datetime.now(timezone.utc)
+        db_check = DBTradeSafetyCheck(
+            id="legacy-check",
+            input_text="legacy post",
+            llm_analysis=legacy_analysis,
+            safe_score=40,
+            schema_version=LEGACY_ANALYSIS_SCHEMA_VERSION,
+            created_at=now,
+            updated_at=now,
+        )
+        self.session.add(db_check)
+        self.session.commit()
+        return db_check.id
+
+    # ==============================================
+    # Schema Version Tests
+    # ==============================================
+
+    def test_create_stores_current_schema_version(self):
+        """New checks should be written with the current schema version."""
+        check = self.manager.create(build_create())
+
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        assert db_check is not None
+        self.assertEqual(db_check.schema_version, ANALYSIS_SCHEMA_VERSION)
+
+    def test_get_by_id_upgrades_legacy_row_lazily(self):
+        """Legacy rows should be readable without rewriting the stored row."""
+        check_id = self._insert_legacy_check()
+
+        check = self.manager.get_by_id(check_id)
+
+        assert check is not None
+        self.assertEqual(check.llm_analysis.safe_score, 40)
+        db_check = self.session.get(DBTradeSafetyCheck, check_id)
+        assert db_check is not None
+        self.assertEqual(db_check.schema_version, LEGACY_ANALYSIS_SCHEMA_VERSION)
+
+    def test_upgrade_stale_analyses_rewrites_rows(self):
+        """Background upgrade should rewrite stale rows to the current version."""
+        check_id = self._insert_legacy_check()
+        self.manager.create(build_create())
+
+        upgraded = self.manager.upgrade_stale_analyses(batch_size=10)
+
+        self.assertEqual(upgraded, 1)
+        self.assertEqual(self.manager.upgrade_stale_analyses(batch_size=10), 0)
+        db_check = self.session.get(DBTradeSafetyCheck, check_id)
+        assert db_check is not None
+        self.assertEqual(db_check.schema_version, ANALYSIS_SCHEMA_VERSION)
+        assert db_check.llm_analysis is not None
+        self.assertEqual(db_check.llm_analysis["safe_score"], 40)
+        self.assertNotIn("risk_score", db_check.llm_analysis)
+
+    # ==============================================
+    # Deduplication Tests
+    # ==============================================
+
+    def test_create_populates_input_hash(self):
+        """Input hash should be computed from the normalized input on insert."""
+        check = self.manager.create(build_create(input_text="급처분  양도해요"))
+
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        assert db_check is not None
+        self.assertEqual(db_check.input_hash, compute_input_hash("급처분 양도해요"))
+
+    def test_find_reusable_check_matches_hash_and_language(self):
+        """Recent checks of the same input and language should be reusable."""
+        created = self.manager.create(build_create(output_language="en"))
+        since = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        found = self.manager.find_reusable_check(
+            input_hash=compute_input_hash("급처분 양도해요"),
+            output_language="en",
+            since=since,
+        )
+        other_language = self.manager.find_reusable_check(
+            input_hash=compute_input_hash("급처분 양도해요"),
+            output_language="ko",
+            since=since,
+        )
+
+        assert found is not None
+        self.assertEqual(found.id, created.id)
+        self.assertIsNone(other_language)
+
+    def test_find_reusable_check_ignores_expired_checks(self):
+        """Checks older than the reuse window should not be reused."""
+        self.manager.create(build_create(output_language="en"))
+
+        found = self.manager.find_reusable_check(
+            input_hash=compute_input_hash("급처분 양도해요"),
+            output_language="en",
+            since=datetime.now(timezone.utc) + timedelta(minutes=1),
+        )
+
+        self.assertIsNone(found)
+
+    # ==============================================
+    # Near-Duplicate Index Tests
+    # ==============================================
+
+    def test_create_and_update_keep_index_current(self):
+        """Created and reviewed checks should be reflected in the index."""
+        # Given: Manager wired to a near-duplicate index
+        index = NearDuplicateIndex(NearDuplicateSettings())
+        manager = DatabaseTradeSafetyCheckManager(
+            self.session, near_duplicate_index=index
+        )
+        post = "급처분 포카 양도합니다 선입금만 가능 DM 주세요"
+
+        # When: Check is created, then reviewed by an expert
+        check = manager.create(build_create(input_text=post))
+        manager.update(
+            check.id,
+            TradeSafetyCheckUpdate(expert_advice="Known scam", expert_reviewed=True),
+        )
+
+        # Then
+        duplicates = index.query(post)
+        self.assertEqual([duplicate.check_id for duplicate in duplicates], [check.id])
+        self.assertEqual(duplicates[0].expert_advice, "Known scam")
+
+    def test_iter_indexed_checks_streams_index_fields(self):
+        """Rebuild rows should carry the check metadata and input text."""
+        check = self.manager.create(build_create(output_language="en"))
+
+        rows = list(self.manager.iter_indexed_checks(batch_size=1))
+
+        self.assertEqual(len(rows), 1)
+        entry, input_text = rows[0]
+        self.assertEqual(entry.check_id, check.id)
+        self.assertEqual(entry.output_language, "en")
+        self.assertEqual(entry.safe_score, 70)
+        self.assertEqual(input_text, "급처분 양도해요")
+
+    def test_iter_price_observations_streams_offered_prices(self):
+        """Rebuild rows should carry prices of analyses that have one."""
+        priced = build_create(input_text="방탄 포카 15000원")
+        priced.llm_analysis["price_analysis"].update(
+            offered_price=15000.0, currency="KRW"
+        )
+        check = self.manager.create(priced)
+        self.manager.create(build_create())
+
+        rows = list(self.manager.iter_price_observations(batch_size=1))
+
+        self.assertEqual(
+            rows, [(check.id, "방탄 포카 15000원", Decimal("15000.0"), "KRW")]
+        )
+
+    def test_create_stores_offered_price_in_usd(self):
+        """Offered prices should be stored with their USD equivalent."""
+        priced = build_create(input_text="selling for 20 EUR")
+        priced.llm_analysis["price_analysis"].update(offered_price=20.0, currency="EUR")
+
+        check = self.manager.create(priced)
+        unpriced = self.manager.create(build_create())
+
+        eur_per_usd = self.manager.currency_converter.rate("EUR")
+        assert eur_per_usd is not None
+        self.assertAlmostEqual(check.offered_price_usd or 0, 20 / eur_per_usd)
+        self.assertIsNone(unpriced.offered_price_usd)
+
+    # ==============================================
+    # Promoted Field Tests
+    # ==============================================
+
+    def _create_with_signals(self, *signals: tuple[str, str]):
+        create = build_create()
+        create.llm_analysis["risk_signals"] = [
+            {
+                "category": category,
+                "severity": severity,
+                "title": "Signal",
+                "description": "Description",
+                "what_to_do": "Be careful",
+            }
+            for category, severity in signals
+        ]
+        return self.manager.create(create)
+
+    def test_promoted_fields(self):
+        """Currency and the highest severity should be copied from the analysis."""
+        fields = promoted_fields(
+            {
+                "price_analysis": {"currency": "krw"},
+                "risk_signals": [
+                    {"category": "payment", "severity": "low"},
+                    {"category": "seller", "severity": "medium"},
+                ],
+            }
+        )
+
+        self.assertEqual(fields, {"currency": "KRW", "max_risk_severity": "medium"})
+        self.assertEqual(
+            promoted_fields({}), {"currency": None, "max_risk_severity": None}
+        )
+
+    def test_create_stores_risk_signal_rows(self):
+        """Each risk signal should get an indexed row with the check."""
+        check = self._create_with_signals(("payment", "high"), ("price", "low"))
+
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        signals = self.session.query(DBRiskSignal).filter_by(check_id=check.id).all()
+
+        assert db_check is not None
+        self.assertEqual(db_check.max_risk_severity, "high")
+        self.assertEqual(
+            sorted((signal.category, signal.severity) for signal in signals),
+            [("payment", "high"), ("price", "low")],
+        )
+
+    def test_list_filters_by_risk_signal(self):
+        """risk_category and risk_severity filters should use the signal table."""
+        # Given
+        payment = self._create_with_signals(("payment", "high"))
+        seller = self._create_with_signals(("seller", "medium"))
+        self._create_with_signals()
+
+        # When
+        by_category, _ = self.manager.get_all(
+            filters=[{"field": "risk_category", "operator": "eq", "value": "payment"}]
+        )
+        by_severity, total = self.manager.get_all(
+            filters=[
+                {
+                    "field": "risk_severity",
+                    "operator": "in",
+                    "value": ["high", "medium"],
+                }
+            ]
+        )
+        combined, _ = self.manager.get_all(
+            filters=[
+                {"field": "risk_category", "operator": "eq", "value": "seller"},
+                {"field": "max_risk_severity", "operator": "eq", "value": "high"},
+            ]
+        )
+
+        # Then
+        self.assertEqual([check.id for check in by_category], [payment.id])
+        self.assertEqual(total, 2)
+        self.assertEqual({check.id for check in by_severity}, {payment.id, seller.id})
+        self.assertEqual(combined, [])
+
+    # ==============================================
+    # Admin List Tests
+    # ==============================================
+
+    def _create_at(self, created_at: datetime, safe_score: int = 70, **kwargs) -> str:
+        create = build_create(**kwargs)
+        create.safe_score = safe_score
+        check = self.manager.create(create)
+        db_check = self.session.get(DBTradeSafetyCheck, check.id)
+        assert db_check is not None
+        db_check.created_at = created_at
+        self.session.commit()
+        return check.id
+
+    def test_list_summaries_pages_with_keyset_cursor(self):
+        """Pages should follow (created_at, id) order without gaps or repeats."""
+        # Given: Five checks, three sharing one timestamp
+        same_time = datetime(2026, 10, 19, 12)
+        ids = [self._create_at(same_time) for _ in range(3)]
+        ids.append(self._create_at(datetime(2026, 10, 19, 13)))
+        ids.append(self._create_at(datetime(2026, 10, 19, 11)))
+
+        # When
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = self.manager.list_summaries(limit=2, cursor=cursor)
+            pages.append([summary.id for summary in page])
+            if cursor is None:
+                break
+
+        # Then
+        listed = [check_id for page in pages for check_id in page]
+        expected = [ids[3], *sorted(ids[:3], reverse=True), ids[4]]
+        self.assertEqual(listed, expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+
+    def test_list_summaries_filters_and_projection(self):
+        """Filters should apply server-side; summaries carry no analysis."""
+        self._create_at(datetime(2026, 10, 18), safe_score=10, user_id="user-1")
+        risky = self._create_at(
+            datetime(2026, 10, 19),
+            safe_score=20,
+            user_id="user-1",
+            input_text="x" * 500,
+        )
+        self._create_at(datetime(2026, 10, 19), safe_score=90, user_id="user-1")
+        self._create_at(datetime(2026, 10, 19), safe_score=20, user_id="user-2")
+
+        page, cursor = self.manager.list_summaries(
+            CheckListFilters(
+                max_safe_score=40,
+                expert_reviewed=False,
+                user_id="user-1",
+                created_from=datetime(2026, 10, 19, tzinfo=timezone.utc),
+            )
+        )
+
+        self.assertIsNone(cursor)
+        self.assertEqual([summary.id for summary in page], [risky])
+        self.assertEqual(len(page[0].input_preview), 200)
+        self.assertFalse(hasattr(page[0], "llm_analysis"))
+
+    def test_cursor_round_trip_and_invalid_cursor(self):
+        """Cursors should decode to their position; garbage is rejected."""
+        created_at = datetime(2026, 10, 19, 12, 30, 1, 123456)
+
+        self.assertEqual(
+            decode_cursor(encode_cursor(created_at, "check-1")),
+            (created_at, "check-1"),
+        )
+        with self.assertRaises(ValueError):
+            self.manager.list_summaries(cursor="not-a-cursor")
+
+    # ==============================================
+    # Author Reputation Tests
+    # ==============================================
+
+    def test_create_records_author_reputation(self):
+        """Checks of URL inputs should count towards the author's reputation."""
+        check = self.manager.create(
+            build_create(
+                input_text="https://x.com/Seller123/status/1",
+                platform=Platform.TWITTER,
+                author="@Seller123",
+            )
+        )
+
+        reputation = self.manager.author_reputations.get(Platform.TWITTER, "seller123")
+        assert reputation is not None
+        self.assertEqual(check.author, "seller123")
+        self.assertEqual(reputation.check_count, 1)
+        self.assertEqual(reputation.min_safe_score, 70)
+
+    def test_expert_review_is_counted_once(self):
+        """Editing advice after a review should not count the review again."""
+        # Given: Check of a post by a known author
+        check = self.manager.create(
+            build_create(platform=Platform.REDDIT, author="seller123")
+        )
+
+        # When: Reviewed, then advice edited
+        self.manager.update(
+            check.id,
+            TradeSafetyCheckUpdate(expert_advice="Looks fine", expert_reviewed=True),
+        )
+        self.manager.update(check.id, TradeSafetyCheckUpdate(expert_advice="Edited"))
+
+        # Then
+        reputation = self.manager.author_reputations.get(Platform.REDDIT, "seller123")
+        assert reputation is not None
+        self.assertEqual(reputation.reviewed_count, 1)
+        self.assertEqual(reputation.reviewed_risky_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""Unit tests for TradeSafetyService.analyze_trade()."""
+
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from trade_safety.image_fingerprints import (
+    ImageFingerprint,
+    ImageFingerprintIndex,
+    ImageMatch,
+)
+from trade_safety.platform_adapters import PlatformRegistry, TwitterAdapter
+from trade_safety.price_reference import PriceReferenceIndex
+from trade_safety.schemas import (
+    Platform,
+    PostPreview,
+    PriceAnalysis,
+    TradeSafetyAnalysis,
+)
+from trade_safety.service import _ANALYSIS_WITHOUT_PRICE_RANGE, TradeSafetyService
+from trade_safety.similar_cases import SimilarCase, SimilarCaseIndex
+from trade_safety.twitter_extract_text_service import TweetMetadata
+
+
+def _build_analysis() -> TradeSafetyAnalysis:
+    """Build a minimal valid analysis returned by the mocked LLM."""
+    return TradeSafetyAnalysis(
+        ai_summary=["line 1", "line 2", "line 3"],
+        risk_signals=[],
+        cautions=[],
+        safe_indicators=[],
+        price_analysis={"price_assessment": "Fair price"},  # type: ignore[arg-type]
+        safety_checklist=[],
+        safe_score=70,
+        recommendation="Proceed with caution",
+        emotional_support="Take your time",
+    )
+
+
+class TestAnalyzeTrade(unittest.IsolatedAsyncioTestCase):
+    """Test TradeSafetyService.analyze_trade() content resolution."""
+
+    def setUp(self):
+        """Set up service with mocked LLM and platform services."""
+        self.patcher = patch("trade_safety.service.ChatOpenAI")
+        self.patcher.start()
+
+        self.service = TradeSafetyService(
+            openai_api=MagicMock(api_key="test-api-key"),
+            model_settings=MagicMock(model="gpt-4o"),
+        )
+        self.chat_model = MagicMock()
+        self.chat_model.ainvoke = AsyncMock(return_value=_build_analysis())
+        self.service.chat_model = self.chat_model
+        self.twitter_service = MagicMock()
+        self.service.registry = PlatformRegistry([TwitterAdapter(self.twitter_service)])
+
+    def tearDown(self):
+        """Clean up patches."""
+        self.patcher.stop()
+
+    async def test_analyze_url_reuses_preview(self):
+        """Test that a given preview is analyzed without fetching the URL."""
+        # Given: Preview already fetched by POST /preview
+        preview = PostPreview(
+            platform=Platform.TWITTER,
+            author="seller123",
+            text="급처분 포카 양도합니다",
+            text_preview="급처분 포카 양도합니다",
+        )
+
+        # When: Analyze the same URL with the preview
+        await self.service.analyze_trade(
+            "https://x.com/user/status/123", preview=preview
+        )
+
+        # Then: No platform fetch, preview text sent to the LLM
+        self.twitter_service.fetch_tweet_content.assert_not_called()
+        messages = self.chat_model.ainvoke.call_args.args[0]
+        self.assertIn("급처분 포카 양도합니다", messages[1].content)
+
+    async def test_analyze_url_without_preview_fetches(self):
+        """Test that the URL is fetched when no preview is available."""
+        # Given: Twitter service returns tweet text
+        self.twitter_service.fetch_tweet_content.return_value = "포카 양도"
+
+        # When
+        await self.service.analyze_trade("https://x.com/user/status/123")
+
+        # Then
+        self.twitter_service.fetch_tweet_content.assert_called_once_with(
+            "https://x.com/user/status/123"
+        )
+
+    async def test_analyze_reports_reused_photos(self):
+        """Test that reused photos are passed to the LLM as a verified signal."""
+        # Given: Fingerprint index finds the photo in an earlier post
+        image_index = MagicMock(spec=ImageFingerprintIndex)
+        image_index.fingerprint_images.return_value = [
+            ImageFingerprint(image_url="https://pbs.twimg.com/a.jpg", dhash="f0f0")
+        ]
+        image_index.find_matches.return_value = [
+            ImageMatch(
+                image_url="https://pbs.twimg.com/a.jpg",
+                matched_post_key="earlier-post",
+                matched_image_url="https://i.redd.it/a.jpg",
+                distance=1,
+                seen_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+            )
+        ]
+        self.service.image_index = image_index
+        preview = PostPreview(
+            platform=Platform.TWITTER,
+            author="seller123",
+            text="포카 양도",
+            text_preview="포카 양도",
+            images=["https://pbs.twimg.com/a.jpg"],
+        )
+
+        # When
+        await self.service.analyze_trade(
+            "https://x.com/user/status/123", preview=preview
+        )
+
+        # Then: Prompt carries the signal and the post images are recorded
+        messages = self.chat_model.ainvoke.call_args.args[0]
+        self.assertIn("Verified signals", messages[1].content)
+        self.assertIn("first seen 2026-10-01", messages[1].content)
+        image_index.add.assert_called_once()
+
+    async def test_analyze_url_with_image_index_fetches_preview(self):
+        """Test that the full post is fetched when images are fingerprinted."""
+        # Given: No cached preview, fingerprinting enabled
+        self.service.image_index = MagicMock(spec=ImageFingerprintIndex)
+        self.service.image_index.fingerprint_images.return_value = []
+        self.service.image_index.find_matches.return_value = []
+        self.twitter_service.fetch_metadata.return_value = TweetMetadata(
+            author="seller123", text="포카 양도", images=[]
+        )
+
+        # When
+        await self.service.analyze_trade("https://x.com/user/status/123")
+
+        # Then: Metadata (with images) fetched instead of text only
+        self.twitter_service.fetch_metadata.assert_called_once()
+        self.twitter_service.fetch_tweet_content.assert_not_called()
+
+    async def test_analyze_with_author_signal_fetches_post_once(self):
+        """Test that the author signal uses the post fetched for the analysis."""
+        # Given: No cached preview, author reputation looked up
+        self.twitter_service.fetch_metadata.return_value = TweetMetadata(
+            author="seller123", text="포카 양도", images=[]
+        )
+        author_signal = MagicMock(return_value="Author seller123: 3 risky checks")
+
+        # When
+        _, preview = await self.service.analyze_trade_with_preview(
+            "https://x.com/user/status/123", author_signal=author_signal
+        )
+
+        # Then: One metadata fetch serves both the author and the analysis
+        self.twitter_service.fetch_metadata.assert_called_once()
+        self.twitter_service.fetch_tweet_content.assert_not_called()
+        assert preview is not None
+        self.assertEqual(preview.author, "seller123")
+        author_signal.assert_called_once_with(preview)
+        messages = self.chat_model.ainvoke.call_args.args[0]
+        self.assertIn("Author seller123: 3 risky checks", messages[1].content)
+
+    async def test_analyze_adds_similar_cases_as_examples(self):
+        """Test that similar reviewed cases are given to the LLM as examples."""
+        # Given: Index retrieves one expert-reviewed scam
+        similar_case_index = MagicMock(spec=SimilarCaseIndex)
+        similar_case_index.query.return_value = [
+            SimilarCase(
+                check_id="scam-1",
+                output_language="en",
+                safe_score=10,
+                expert_advice="Seller vanished after payment",
+                expert_reviewed=True,
+                created_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+                excerpt="급처분 포카 선입금만",
+                similarity=0.81,
+            )
+        ]
+        self.service.similar_case_index = similar_case_index
+
+        # When
+        await self.service.analyze_trade("급처분 포카 양도 선입금만 가능")
+
+        # Then: Post content queried, example rendered in the prompt
+        similar_case_index.query.assert_called_once_with(
+            "급처분 포카 양도 선입금만 가능"
+        )
+        messages = self.chat_model.ainvoke.call_args.args[0]
+        self.assertIn("Similar past cases reviewed by our experts", messages[1].content)
+        self.assertIn("safety score 10/100 (81% similar)", messages[1].content)
+        self.assertIn("Seller vanished after payment", messages[1].content)
+
+    async def test_analyze_fills_market_price_range_from_reference(self):
+        """Test that a known item's price range is filled in, not asked of the LLM."""
+        # Given: Five earlier BTS photocard prices in KRW
+        index = PriceReferenceIndex()
+        for position, price in enumerate([10000, 20000, 30000, 40000, 50000]):
+            index.add(f"check-{position}", "방탄 포카 양도", price, "KRW")
+        self.service.price_reference_index = index
+        chat_model = MagicMock()
+        chat_model.ainvoke = AsyncMock(
+            return_value=_ANALYSIS_WITHOUT_PRICE_RANGE.model_validate(
+                _build_analysis().model_dump(exclude={"price_analysis"})
+                | {"price_analysis": {"price_assessment": "Too cheap"}}
+            )
+        )
+        self.service.chat_model_without_price_range = chat_model
+
+        # When
+        analysis = await self.service.analyze_trade("방탄 포카 급처 5000원")
+
+        # Then: LLM is not asked for a range; it comes from our data
+        self.chat_model.ainvoke.assert_not_called()
+        messages = chat_model.ainvoke.call_args.args[0]
+        self.assertIn("Price reference: 'photocard:bts'", messages[1].content)
+        self.assertNotIn(
+            "market_price_range",
+            json.dumps(_ANALYSIS_WITHOUT_PRICE_RANGE.model_json_schema()),
+        )
+        self.assertIsInstance(analysis.price_analysis, PriceAnalysis)
+        self.assertEqual(analysis.price_analysis.price_assessment, "Too cheap")
+        self.assertEqual(
+            analysis.price_analysis.market_price_range,
+            "20,000-40,000 KRW (median 30,000; 5 earlier checks)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,15 @@
 """Unit tests for TwitterService.fetch_metadata()."""
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import requests
 
+from trade_safety.post_cache import PostUnavailableError
 from trade_safety.settings import TwitterAPISettings
-from trade_safety.twitter_extract_text_service import TwitterService
+from trade_safety.twitter_extract_text_service import TweetMetadata, TwitterService
 
 
 class TestTwitterMetadata(unittest.TestCase):
@@ -176,6 +178,109 @@ class TestTwitterMetadata(unittest.TestCase):
 
         self.assertIn("Twitter Bearer Token is required", str(ctx.exception))
 
+    # ==============================================
+    # fetch_metadata_batch() Tests
+    # ==============================================
+
+    @patch("requests.get")
+    def test_fetch_metadata_batch_maps_results_and_errors(self, mock_get):
+        """Test batched lookup maps includes and per-ID errors to each tweet."""
+        # Given: /2/tweets?ids= response with two tweets and one deleted tweet
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "data": [
+                {
+                    "id": "1",
+                    "text": "포카 양도",
+                    "author_id": "u1",
+                    "attachments": {"media_keys": ["m1"]},
+                },
+                {"id": "2", "text": "앨범 판매", "author_id": "u2"},
+            ],
+            "includes": {
+                "users": [
+                    {"id": "u1", "username": "seller1"},
+                    {"id": "u2", "username": "seller2"},
+                ],
+                "media": [
+                    {"media_key": "m1", "type": "photo", "url": "https://img1.jpg"}
+                ],
+            },
+            "errors": [
+                {
+                    "resource_id": "3",
+                    "detail": "Could not find tweet with ids: [3].",
+                    "type": "https://api.twitter.com/2/problems/resource-not-found",
+                }
+            ],
+        }
+        mock_get.return_value = mock_response
+
+        # When: Fetch three tweets in one batch
+        results = self.service.fetch_metadata_batch(["1", "2", "3"])
+
+        # Then: One request, each tweet matched to its own author and media
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["params"]["ids"], "1,2,3")
+        first, second, deleted = results["1"], results["2"], results["3"]
+        assert isinstance(first, TweetMetadata)
+        assert isinstance(second, TweetMetadata)
+        self.assertEqual(first.author, "seller1")
+        self.assertEqual(first.images, ["https://img1.jpg"])
+        self.assertEqual(second.author, "seller2")
+        self.assertEqual(second.images, [])
+        self.assertIsInstance(deleted, PostUnavailableError)
+
+    @patch("requests.get")
+    def test_fetch_metadata_batch_splits_into_100_id_requests(self, mock_get):
+        """Test that more than 100 IDs are split into multiple requests."""
+        # Given: API returning no tweets
+        mock_response = MagicMock()
+        mock_response.json.return_value = {}
+        mock_get.return_value = mock_response
+
+        # When: Fetch 150 tweets
+        results = self.service.fetch_metadata_batch([str(i) for i in range(150)])
+
+        # Then: Two requests; unreturned tweets reported as not found
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(len(results), 150)
+        self.assertTrue(
+            all(isinstance(r, PostUnavailableError) for r in results.values())
+        )
+
+    @patch("requests.get")
+    def test_fetch_metadata_groups_concurrent_requests(self, mock_get):
+        """Test that concurrent requests (one service each) share one API request."""
+        # Given: API response with both tweets
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "data": [
+                {"id": "1", "text": "포카 양도", "author_id": "u1"},
+                {"id": "2", "text": "앨범 판매", "author_id": "u1"},
+            ],
+            "includes": {"users": [{"id": "u1", "username": "seller1"}]},
+        }
+        mock_get.return_value = mock_response
+        settings = TwitterAPISettings(bearer_token="test-token", batch_window_ms=50)
+
+        def handle_request(url: str) -> TweetMetadata:
+            return TwitterService(twitter_api=settings).fetch_metadata(url)
+
+        # When: Two requests fetch different tweets concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(
+                pool.map(
+                    handle_request,
+                    ["https://x.com/a/status/1", "https://x.com/a/status/2"],
+                )
+            )
+
+        # Then: Single /2/tweets?ids= request served both
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["params"]["ids"], "1,2")
+        self.assertEqual([r.text for r in results], ["포카 양도", "앨범 판매"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+"""Unit tests for social media URL canonicalization."""
+
+import unittest
+
+from trade_safety.schemas import Platform
+from trade_safety.url_canonicalization import canonicalize_url, detect_platform
+
+
+class TestCanonicalizeURL(unittest.TestCase):
+    """Test mapping of URL variants to stable platform + post id keys."""
+
+    def test_twitter_url_variants_share_key(self):
+        """All Twitter/X URL forms of the same tweet should share one key."""
+        urls = [
+            "https://x.com/u/status/1?s=20",
+            "https://twitter.com/u/status/1",
+            "https://mobile.twitter.com/u/status/1",
+            "https://www.x.com/u/status/1/photo/1",
+            "https://x.com/i/web/status/1",
+            "x.com/u/status/1",
+        ]
+
+        keys = set()
+        for url in urls:
+            post = canonicalize_url(url)
+            assert post is not None, url
+            keys.add(post.key)
+
+        self.assertEqual(keys, {"twitter:1"})
+
+    def test_reddit_url_variants_share_key(self):
+        """All Reddit URL forms of the same post should share one key."""
+        urls = [
+            "https://reddit.com/r/x/comments/abc/title",
+            "https://www.reddit.com/r/x/comments/abc/title/?utm_source=share",
+            "https://old.reddit.com/comments/abc",
+            "https://redd.it/abc",
+            "https://www.reddit.com/r/x/comments/ABC/title/",
+        ]
+
+        keys = set()
+        for url in urls:
+            post = canonicalize_url(url)
+            assert post is not None, url
+            keys.add(post.key)
+
+        self.assertEqual(keys, {"reddit:abc"})
+
+    def test_canonical_url(self):
+        """Canonical posts should expose a single canonical URL."""
+        twitter_post = canonicalize_url("https://twitter.com/u/status/123?s=20")
+        reddit_post = canonicalize_url("https://redd.it/abc")
+
+        assert twitter_post is not None
+        assert reddit_post is not None
+        self.assertEqual(twitter_post.canonical_url, "https://x.com/i/status/123")
+        self.assertEqual(
+            reddit_post.canonical_url, "https://www.reddit.com/comments/abc"
+        )
+
+    def test_non_post_urls_return_none(self):
+        """Supported hosts without a post ID should not canonicalize."""
+        self.assertIsNone(canonicalize_url("https://x.com/user/profile"))
+        self.assertIsNone(canonicalize_url("https://www.reddit.com/r/kpopforsale/"))
+        self.assertIsNone(canonicalize_url("https://www.instagram.com/p/ABC123/"))
+
+    def test_detect_platform_uses_host_not_substring(self):
+        """Hosts merely containing a platform domain should not match."""
+        self.assertEqual(
+            detect_platform("https://mobile.x.com/u/status/1"), Platform.TWITTER
+        )
+        self.assertEqual(detect_platform("https://old.reddit.com/"), Platform.REDDIT)
+        self.assertIsNone(detect_platform("https://netflix.com/title/1"))
+        self.assertIsNone(detect_platform("https://example.com/?next=x.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
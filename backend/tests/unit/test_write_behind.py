@@ -0,0 +1,390 @@
+"""Unit tests for write-behind persistence of created checks."""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from aioia_core.models import Base
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from tests.unit.helpers import build_create, build_risk_signal
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.models import DBCheckRollup, DBRiskSignal, DBTradeSafetyCheck
+from trade_safety.repositories.trade_safety_repository import (
+    DatabaseTradeSafetyCheckManager,
+)
+from trade_safety.schemas import (
+    TradeSafetyAnalysis,
+    TradeSafetyCheck,
+    TradeSafetyCheckCreate,
+    TradeSafetyCheckUpdate,
+)
+from trade_safety.settings import WriteBehindSettings
+from trade_safety.write_behind import DEAD_LETTER_FILE, PendingCheck, WriteBehindBuffer
+
+CREATED_AT = datetime(2026, 10, 19, 12, 0)
+
+
+def _build_create(input_text: str = "급처분 양도해요") -> TradeSafetyCheckCreate:
+    """Build a TradeSafetyCheckCreate with one risk signal."""
+    return build_create(input_text, safe_score=30, risk_signals=[build_risk_signal()])
+
+
+def _pending(check_id: str) -> PendingCheck:
+    """Build a pending check without a database."""
+    create = _build_create(f"post {check_id}")
+    check = TradeSafetyCheck(
+        id=check_id,
+        input_text=create.input_text,
+        llm_analysis=TradeSafetyAnalysis(**create.llm_analysis),
+        safe_score=create.safe_score,
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+    )
+    return PendingCheck(check=check, create=create)
+
+
+class TestWriteBehindBuffer(unittest.TestCase):
+    """Test queuing, backpressure, retries and the journal."""
+
+    def setUp(self):
+        """Record written batches."""
+        self.batches: list[list[str]] = []
+        self.journal_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove journals."""
+        shutil.rmtree(self.journal_dir)
+
+    def _write(self, batch: list[PendingCheck]) -> None:
+        self.batches.append([pending.check.id for pending in batch])
+
+    def test_pending_checks_are_readable_until_written(self):
+        """Checks should be served from the buffer, then written in batches."""
+        # Given
+        buffer = WriteBehindBuffer(
+            self._write, WriteBehindSettings(max_pending=10, batch_size=2)
+        )
+
+        # When
+        for check_id in ("a", "b", "c"):
+            self.assertTrue(buffer.submit(_pending(check_id)))
+
+        # Then
+        pending = buffer.get("b")
+        assert pending is not None
+        self.assertEqual(pending.input_text, "post b")
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(self.batches, [["a", "b"], ["c"]])
+        self.assertIsNone(buffer.get("b"))
+
+    def test_write_takes_one_check_ahead_of_the_buffer(self):
+        """write() should write only the given check."""
+        buffer = WriteBehindBuffer(self._write, WriteBehindSettings())
+        for check_id in "abc":
+            buffer.submit(_pending(check_id))
+
+        self.assertTrue(buffer.write("b"))
+        self.assertFalse(buffer.write("b"))
+
+        self.assertEqual(self.batches, [["b"]])
+        self.assertEqual(buffer.pending_count(), 2)
+        self.assertIsNone(buffer.get("b"))
+
+    def test_full_buffer_declines(self):
+        """Submits beyond max_pending should be declined, not queued."""
+        buffer = WriteBehindBuffer(self._write, WriteBehindSettings(max_pending=2))
+
+        results = [buffer.submit(_pending(check_id)) for check_id in "abc"]
+
+        self.assertEqual(results, [True, True, False])
+        self.assertIsNone(buffer.get("c"))
+
+    def test_failed_batch_stays_pending(self):
+        """A failed write should keep its checks pending for the next flush."""
+        # Given
+        failures = [ConnectionError("database is down")]
+
+        def flaky_write(batch: list[PendingCheck]) -> None:
+            if failures:
+                raise failures.pop()
+            self._write(batch)
+
+        buffer = WriteBehindBuffer(flaky_write, WriteBehindSettings())
+        buffer.submit(_pending("a"))
+
+        # When / Then
+        with self.assertRaises(ConnectionError):
+            buffer.flush()
+        self.assertIsNotNone(buffer.get("a"))
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(self.batches, [["a"]])
+
+    def test_failing_check_is_dead_lettered(self):
+        """A check that always fails should be split off and dropped."""
+
+        # Given
+        def write(batch: list[PendingCheck]) -> None:
+            if any(pending.check.id == "b" for pending in batch):
+                raise ValueError("cannot be stored")
+            self._write(batch)
+
+        settings = WriteBehindSettings(journal_dir=self.journal_dir)
+        buffer = WriteBehindBuffer(write, settings)
+        for check_id in "abcd":
+            buffer.submit(_pending(check_id))
+
+        # When
+        taken = buffer.flush()
+
+        # Then: The others are written, b is kept in the dead-letter file
+        self.assertEqual(taken, 4)
+        self.assertEqual(self.batches, [["a"], ["c", "d"]])
+        self.assertIsNone(buffer.get("b"))
+        with open(Path(self.journal_dir) / DEAD_LETTER_FILE, "rb") as f:
+            dead = [PendingCheck.model_validate_json(line) for line in f]
+        self.assertEqual([pending.check.id for pending in dead], ["b"])
+        buffer.close()
+
+    def test_pending_checks_are_found_by_input_hash(self):
+        """Pending checks should be looked up by input hash until written."""
+        buffer = WriteBehindBuffer(self._write, WriteBehindSettings())
+        for check_id in ("a", "b", "a2"):
+            buffer.submit(_pending(check_id))
+        input_hash = compute_input_hash("post a")
+
+        found = buffer.find_by_input_hash(input_hash)
+        buffer.flush()
+
+        self.assertEqual([check.id for check in found], ["a"])
+        self.assertEqual(buffer.find_by_input_hash(input_hash), [])
+
+    def test_background_flusher_writes_and_close_drains(self):
+        """The flusher should write on its own; close should write the rest."""
+        # Given
+        written = threading.Event()
+
+        def write(batch: list[PendingCheck]) -> None:
+            self._write(batch)
+            written.set()
+
+        buffer = WriteBehindBuffer(write, WriteBehindSettings(flush_interval_ms=1))
+        buffer.start()
+
+        # When
+        buffer.submit(_pending("a"))
+
+        # Then
+        self.assertTrue(written.wait(timeout=5))
+        buffer.close()
+        self.assertFalse(buffer.submit(_pending("b")))
+        self.assertEqual(self.batches, [["a"]])
+
+    def test_journal_of_crashed_process_is_replayed(self):
+        """Journaled checks of a dead process should be adopted and written."""
+        # Given: A process journaled two checks, then died before writing them
+        settings = WriteBehindSettings(journal_dir=self.journal_dir)
+        crashed = WriteBehindBuffer(self._write, settings)
+        crashed.submit(_pending("a"))
+        crashed.submit(_pending("b"))
+        assert crashed.journal is not None
+        crashed.journal.close()
+        directory = Path(self.journal_dir)
+        for path in directory.glob("write-behind-*"):
+            path.rename(directory / f"write-behind-99999{path.suffix}")
+        with open(directory / "write-behind-99999.jsonl", "ab") as f:
+            f.write(b'{"check": {"id": "torn')
+
+        # When: Another process starts
+        buffer = WriteBehindBuffer(self._write, settings)
+
+        # Then
+        self.assertIsNotNone(buffer.get("a"))
+        self.assertFalse((directory / "write-behind-99999.jsonl").exists())
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(self.batches, [["a", "b"]])
+        assert buffer.journal is not None
+        self.assertEqual(buffer.journal.path.stat().st_size, 0)
+        buffer.close()
+        self.assertEqual(list(directory.iterdir()), [])
+
+
+class TestWriteBehindManager(unittest.TestCase):
+    """Test create, read and update of checks created in write-behind mode."""
+
+    def setUp(self):
+        """Set up a file database shared by the request and flusher sessions."""
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = create_engine(
+            f"sqlite:///{self.path}", connect_args={"timeout": 30}
+        )
+        Base.metadata.create_all(self.engine)
+        self.session_factory = sessionmaker(bind=self.engine)
+        self.session = self.session_factory()
+
+    def tearDown(self):
+        """Remove the database file."""
+        self.session.close()
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def _write(self, batch: list[PendingCheck]) -> None:
+        with self.session_factory() as session:
+            DatabaseTradeSafetyCheckManager(session).create_many(batch)
+
+    def _manager(self, max_pending: int = 100) -> DatabaseTradeSafetyCheckManager:
+        buffer = WriteBehindBuffer(
+            self._write, WriteBehindSettings(max_pending=max_pending)
+        )
+        return DatabaseTradeSafetyCheckManager(self.session, write_behind=buffer)
+
+    def _count(self, model: type) -> int:
+        return (
+            self.session.scalar(
+                select(func.count()).select_from(model)  # pylint: disable=not-callable
+            )
+            or 0
+        )
+
+    def test_create_returns_before_write(self):
+        """A created check should be readable at once and written on flush."""
+        # Given
+        manager = self._manager()
+
+        # When
+        checks = [manager.create(_build_create(f"post {n}")) for n in range(3)]
+
+        # Then: Pending, but readable through the manager
+        self.assertEqual(self._count(DBTradeSafetyCheck), 0)
+        fetched = manager.get_by_id(checks[1].id)
+        self.assertEqual(fetched, checks[1])
+        assert fetched is not None
+        self.assertFalse(fetched.expert_reviewed)
+
+        # When
+        assert manager.write_behind is not None
+        manager.write_behind.flush()
+
+        # Then: Written as returned, with signals and rollups
+        with self.session_factory() as session:
+            stored = DatabaseTradeSafetyCheckManager(session).get_by_id(checks[1].id)
+        assert stored is not None
+        self.assertEqual(stored.created_at, checks[1].created_at)
+        self.assertEqual(stored.llm_analysis, checks[1].llm_analysis)
+        self.assertEqual(self._count(DBRiskSignal), 3)
+        all_checks = self.session.scalars(
+            select(DBCheckRollup.check_count).where(
+                DBCheckRollup.granularity == "day",
+                DBCheckRollup.risk_category == "*",
+            )
+        ).all()
+        self.assertEqual(all_checks, [3])
+
+    def test_create_resolves_review_priority_before_queueing(self):
+        """Pending copies of a post should raise the priority returned."""
+        # Given
+        manager = self._manager()
+
+        # When
+        first = manager.create(_build_create())
+        second = manager.create(_build_create())
+        assert manager.write_behind is not None
+        manager.write_behind.flush()
+
+        # Then: The second copy ranks higher, as returned and as written
+        rows = self.session.execute(
+            select(DBTradeSafetyCheck.id, DBTradeSafetyCheck.review_priority)
+        )
+        priorities = {row.id: row.review_priority for row in rows}
+        self.assertGreater(priorities[second.id], priorities[first.id])
+
+    def test_create_returns_known_advice(self):
+        """A pending check of a reviewed post should be returned with the advice."""
+        # Given: A reviewed check of the post
+        manager = self._manager()
+        reviewed = manager.create(_build_create())
+        manager.update(
+            reviewed.id,
+            TradeSafetyCheckUpdate(
+                expert_advice="Known scam template",
+                expert_reviewed=True,
+                expert_reviewed_by="expert-1",
+            ),
+        )
+
+        # When
+        check = manager.create(_build_create())
+
+        # Then: Returned with the advice, and written as returned
+        self.assertTrue(check.expert_reviewed)
+        self.assertEqual(check.expert_advice, "Known scam template")
+        self.assertEqual(check.expert_advice_source_id, reviewed.id)
+        assert manager.write_behind is not None
+        manager.write_behind.flush()
+        with self.session_factory() as session:
+            stored = DatabaseTradeSafetyCheckManager(session).get_by_id(check.id)
+        assert stored is not None
+        self.assertEqual(stored.expert_advice, check.expert_advice)
+        self.assertEqual(stored.expert_advice_source_id, reviewed.id)
+
+    def test_pending_check_is_reusable(self):
+        """A pending check of the same input should be found for reuse."""
+        manager = self._manager()
+        check = manager.create(
+            _build_create().model_copy(update={"output_language": "ko"})
+        )
+        since = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        reusable = manager.find_reusable_check(
+            compute_input_hash(check.input_text), "ko", since
+        )
+
+        self.assertEqual(reusable, check)
+        self.assertEqual(self._count(DBTradeSafetyCheck), 0)
+
+    def test_replayed_checks_are_written_once(self):
+        """Writing the same pending checks again should skip them."""
+        pending = [_pending("a"), _pending("b")]
+
+        first = DatabaseTradeSafetyCheckManager(self.session).create_many(pending)
+        replayed = DatabaseTradeSafetyCheckManager(self.session).create_many(pending)
+
+        self.assertEqual(first, ["a", "b"])
+        self.assertEqual(replayed, [])
+        self.assertEqual(self._count(DBTradeSafetyCheck), 2)
+        self.assertEqual(self._count(DBRiskSignal), 2)
+
+    def test_update_of_pending_check_writes_it_first(self):
+        """Updating a pending check should write only it, then apply the update."""
+        manager = self._manager()
+        check = manager.create(_build_create("post 1"))
+        other = manager.create(_build_create("post 2"))
+
+        updated = manager.update(check.id, TradeSafetyCheckUpdate(user_id="user-1"))
+
+        assert updated is not None
+        self.assertEqual(updated.user_id, "user-1")
+        assert manager.write_behind is not None
+        self.assertIsNotNone(manager.write_behind.get(other.id))
+        self.assertEqual(manager.write_behind.pending_count(), 1)
+
+    def test_full_buffer_writes_synchronously(self):
+        """With the buffer full, checks should be written before returning."""
+        manager = self._manager(max_pending=1)
+
+        queued = manager.create(_build_create("post 1"))
+        written = manager.create(_build_create("post 2"))
+
+        ids = self.session.scalars(select(DBTradeSafetyCheck.id)).all()
+        self.assertEqual(ids, [written.id])
+        self.assertIsNotNone(manager.get_by_id(queued.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,380 @@
+"""
+Compressed storage of llm_analysis payloads.
+
+Every check stores a few kilobytes of analysis JSON, most of it field names
+and phrasing repeated across analyses written in the same language. Each
+payload is too small for generic compression to find much to reuse, but a
+zstd dictionary trained on earlier analyses of the same output language
+holds the shared text, so a compressed row only stores what is specific to
+it.
+
+When compression is enabled, new checks keep llm_analysis NULL and store a
+zstd frame in llm_analysis_zstd. The frame header names the dictionary it was
+written with; dictionaries are stored in trade_safety_analysis_dictionaries
+and never deleted, so rows stay readable after newer dictionaries are
+trained. Reads decode either form, whether or not compression is enabled.
+
+Filters never read llm_analysis (its fields are promoted to columns), but the
+PostgreSQL GIN index on it does not cover compressed rows.
+
+Requires the zstandard package (the optional 'compression' extra); without it
+analyses are stored as JSON and reading a compressed row raises ValueError. Stored rows are migrated
+with trade_safety.analysis_storage.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from statistics import mean
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from trade_safety.settings import AnalysisCodecSettings
+
+if TYPE_CHECKING:
+    import zstandard
+
+# zstandard is optional: without it analyses are stored as JSON
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+
+logger = logging.getLogger(__name__)
+
+# Compiled dictionaries by ID, shared by every codec of the process
+_dictionaries: dict[int, "zstandard.ZstdCompressionDict"] = {}
+_dictionaries_lock = threading.Lock()
+
+# zstd compressors are not thread-safe: each thread keeps its own
+_thread_local = threading.local()
+
+
+def dumps_analysis(analysis: dict) -> bytes:
+    """Serialize an analysis to the compact JSON that gets compressed."""
+    return json.dumps(analysis, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _require_zstd() -> ModuleType:
+    if not ZSTD_AVAILABLE:
+        raise ValueError(
+            "Compressed analyses require the zstandard package "
+            "(install the 'compression' extra)"
+        )
+    return importlib.import_module("zstandard")
+
+
+class AnalysisDictionaryStore(ABC):
+    """Storage of the dictionaries analyses are compressed with."""
+
+    @abstractmethod
+    def get_data(self, dict_id: int) -> bytes | None:
+        """
+        Load the content of a dictionary.
+
+        Args:
+            dict_id: zstd dictionary ID
+
+        Returns:
+            Dictionary content, None if no such dictionary was stored
+        """
+
+    @abstractmethod
+    def latest_id(self, output_language: str) -> int | None:
+        """
+        Find the most recently trained dictionary of a language.
+
+        Args:
+            output_language: Output language of the analyses
+
+        Returns:
+            Dictionary ID, None if none was trained for the language
+        """
+
+    @abstractmethod
+    def add(
+        self, dict_id: int, output_language: str, data: bytes, sample_count: int
+    ) -> None:
+        """
+        Store a trained dictionary (again as the latest one if already stored).
+
+        Args:
+            dict_id: zstd dictionary ID the dictionary was trained with
+            output_language: Output language of the training analyses
+            data: Dictionary content
+            sample_count: Number of training analyses
+        """
+
+
+class CodecBenchmark(BaseModel):
+    """Storage size and latency of the analyses of one language"""
+
+    output_language: str = Field(description="Output language of the analyses")
+    sample_count: int = Field(description="Analyses measured")
+    dict_id: int | None = Field(description="Dictionary used (None without one)")
+    json_bytes: float = Field(description="Mean size as compact JSON")
+    zstd_bytes: float = Field(description="Mean size compressed without dictionary")
+    stored_bytes: float = Field(description="Mean size as stored by the codec")
+    ratio: float = Field(description="JSON size divided by stored size")
+    json_decode_us: float = Field(description="Mean JSON parse time (µs)")
+    encode_us: float = Field(description="Mean codec encode time (µs)")
+    decode_us: float = Field(description="Mean codec decode time (µs)")
+
+
+class AnalysisCodec:
+    """
+    Encodes analyses to zstd frames with per-language dictionaries.
+
+    Example:
+        >>> codec = AnalysisCodec(DatabaseAnalysisDictionaryManager(db_session))
+        >>> frame = codec.encode(analysis, "KO")
+        >>> codec.decode(frame) == analysis
+        True
+    """
+
+    def __init__(
+        self,
+        dictionaries: AnalysisDictionaryStore,
+        settings: AnalysisCodecSettings | None = None,
+    ):
+        """
+        Initialize AnalysisCodec.
+
+        Args:
+            dictionaries: Storage of trained dictionaries
+            settings: Codec settings (default: AnalysisCodecSettings() from
+                      environment)
+        """
+        self.dictionaries = dictionaries
+        self.settings = settings or AnalysisCodecSettings()
+        # Latest dictionary per language, looked up once per codec
+        self._latest_ids: dict[str, int | None] = {}
+        if self.settings.compress and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed: analyses are stored as JSON")
+
+    @property
+    def compresses(self) -> bool:
+        """Whether new analyses are stored compressed."""
+        return self.settings.compress and ZSTD_AVAILABLE
+
+    def store(
+        self, analysis: dict, output_language: str | None
+    ) -> tuple[dict | None, bytes | None]:
+        """
+        Column values to store an analysis with.
+
+        Args:
+            analysis: Analysis as stored
+            output_language: Language the analysis is written in
+
+        Returns:
+            (llm_analysis, llm_analysis_zstd), exactly one of them set
+        """
+        if not self.compresses:
+            return analysis, None
+        return None, self.encode(analysis, output_language)
+
+    def load(self, llm_analysis: dict | None, llm_analysis_zstd: bytes | None) -> dict:
+        """
+        Read a stored analysis from either column.
+
+        Args:
+            llm_analysis: Stored JSON analysis
+            llm_analysis_zstd: Stored compressed analysis
+
+        Returns:
+            Analysis as stored
+
+        Raises:
+            ValueError: If neither column is set or the frame cannot be decoded
+        """
+        if llm_analysis_zstd is not None:
+            return self.decode(llm_analysis_zstd)
+        if llm_analysis is None:
+            raise ValueError("Check has no stored analysis")
+        return llm_analysis
+
+    def encode(self, analysis: dict, output_language: str | None) -> bytes:
+        """
+        Compress an analysis with the latest dictionary of its language.
+
+        Languages without a trained dictionary are compressed without one.
+
+        Args:
+            analysis: Analysis as stored
+            output_language: Language the analysis is written in
+
+        Returns:
+            zstd frame naming the dictionary it was written with
+
+        Raises:
+            ValueError: If zstandard is not installed
+        """
+        _require_zstd()
+        dict_id = self._latest_id(output_language)
+        return self._compressor(dict_id).compress(dumps_analysis(analysis))
+
+    def decode(self, data: bytes) -> dict:
+        """
+        Decompress an analysis with the dictionary named in its frame.
+
+        Args:
+            data: zstd frame written by encode
+
+        Returns:
+            Analysis as stored
+
+        Raises:
+            ValueError: If zstandard is not installed, the dictionary is
+                        unknown or the frame is corrupt
+        """
+        zstd = _require_zstd()
+        try:
+            dict_id = zstd.get_frame_parameters(data).dict_id or None
+            return json.loads(self._decompressor(dict_id).decompress(data))
+        except zstd.ZstdError as e:
+            raise ValueError(f"Corrupt compressed analysis: {e}") from e
+
+    def train(self, output_language: str, samples: Sequence[dict]) -> int:
+        """
+        Train and store a dictionary for the analyses of a language.
+
+        Analyses of the language encoded afterwards use the new dictionary.
+
+        Args:
+            output_language: Language the samples are written in
+            samples: Stored analyses of the language
+
+        Returns:
+            ID of the new dictionary
+
+        Raises:
+            ValueError: If zstandard is not installed or there are too few
+                        samples to train on
+        """
+        zstd = _require_zstd()
+        if len(samples) < self.settings.min_training_samples:
+            raise ValueError(
+                f"Need at least {self.settings.min_training_samples} analyses "
+                f"to train a dictionary, got {len(samples)}"
+            )
+        try:
+            trained = zstd.train_dictionary(
+                self.settings.dictionary_size,
+                [dumps_analysis(sample) for sample in samples],
+                level=self.settings.level,
+            )
+        except zstd.ZstdError as e:
+            raise ValueError(f"Dictionary training failed: {e}") from e
+        # zstd derives the ID from the content, so an ID always names the same
+        # dictionary and compiled dictionaries can be cached by ID
+        dict_id = trained.dict_id()
+        self.dictionaries.add(
+            dict_id, output_language, trained.as_bytes(), len(samples)
+        )
+        self._latest_ids[output_language] = dict_id
+        return dict_id
+
+    def _latest_id(self, output_language: str | None) -> int | None:
+        if output_language is None:
+            return None
+        if output_language not in self._latest_ids:
+            self._latest_ids[output_language] = self.dictionaries.latest_id(
+                output_language
+            )
+        return self._latest_ids[output_language]
+
+    def _dictionary(self, dict_id: int) -> zstandard.ZstdCompressionDict:
+        with _dictionaries_lock:
+            dictionary = _dictionaries.get(dict_id)
+        if dictionary is None:
+            data = self.dictionaries.get_data(dict_id)
+            if data is None:
+                raise ValueError(f"Unknown analysis dictionary: {dict_id}")
+            with _dictionaries_lock:
+                dictionary = _dictionaries.setdefault(
+                    dict_id, _require_zstd().ZstdCompressionDict(data)
+                )
+        return dictionary
+
+    def _compressor(self, dict_id: int | None) -> zstandard.ZstdCompressor:
+        compressors = _thread_local.__dict__.setdefault("compressors", {})
+        key = (dict_id, self.settings.level)
+        if key not in compressors:
+            compressors[key] = _require_zstd().ZstdCompressor(
+                level=self.settings.level,
+                dict_data=self._dictionary(dict_id) if dict_id else None,
+            )
+        return compressors[key]
+
+    def _decompressor(self, dict_id: int | None) -> zstandard.ZstdDecompressor:
+        decompressors = _thread_local.__dict__.setdefault("decompressors", {})
+        if dict_id not in decompressors:
+            decompressors[dict_id] = _require_zstd().ZstdDecompressor(
+                dict_data=self._dictionary(dict_id) if dict_id else None
+            )
+        return decompressors[dict_id]
+
+
+def benchmark(
+    codec: AnalysisCodec, output_language: str, samples: Sequence[dict]
+) -> CodecBenchmark:
+    """
+    Measure storage size and latency of the codec on stored analyses.
+
+    Analyses a dictionary was trained on compress better than new ones, so
+    benchmark on analyses written after training for representative sizes.
+
+    Args:
+        codec: Codec to measure (with its current dictionaries)
+        output_language: Language the samples are written in
+        samples: Stored analyses of the language (at least one)
+
+    Returns:
+        Mean sizes and latencies per analysis
+
+    Raises:
+        ValueError: If zstandard is not installed or there are no samples
+    """
+    zstd = _require_zstd()
+    if not samples:
+        raise ValueError("Need at least one analysis to benchmark")
+    payloads = [dumps_analysis(sample) for sample in samples]
+    plain = zstd.ZstdCompressor(level=codec.settings.level)
+
+    started = time.perf_counter()
+    frames = [codec.encode(sample, output_language) for sample in samples]
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for frame in frames:
+        codec.decode(frame)
+    decode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for payload in payloads:
+        json.loads(payload)
+    json_decode_seconds = time.perf_counter() - started
+
+    json_bytes = mean(len(payload) for payload in payloads)
+    stored_bytes = mean(len(frame) for frame in frames)
+    return CodecBenchmark(
+        output_language=output_language,
+        sample_count=len(samples),
+        dict_id=zstd.get_frame_parameters(frames[0]).dict_id or None,
+        json_bytes=json_bytes,
+        zstd_bytes=mean(len(plain.compress(payload)) for payload in payloads),
+        stored_bytes=stored_bytes,
+        ratio=json_bytes / stored_bytes,
+        json_decode_us=json_decode_seconds / len(samples) * 1e6,
+        encode_us=encode_seconds / len(samples) * 1e6,
+        decode_us=decode_seconds / len(samples) * 1e6,
+    )
@@ -0,0 +1,186 @@
+"""
+Migration of stored llm_analysis payloads between JSON and zstd storage.
+
+Dictionaries are trained per output language on the latest stored analyses
+(see trade_safety.analysis_codec). Train before compressing so rewritten rows
+use them, and decompress every row before downgrading past the migration that
+added compressed storage (f3b7c1d5e924):
+
+    python -m trade_safety.analysis_storage train
+    python -m trade_safety.analysis_storage compress
+    python -m trade_safety.analysis_storage benchmark
+    python -m trade_safety.analysis_storage decompress
+
+Rows are rewritten in batches, one commit each, so the tool can be stopped
+and rerun at any time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+
+from aioia_core.settings import DatabaseSettings
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from trade_safety.analysis_codec import AnalysisCodec, benchmark
+from trade_safety.models import DBTradeSafetyCheck
+from trade_safety.repositories.analysis_dictionary_repository import (
+    DatabaseAnalysisDictionaryManager,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def stored_languages(db_session: Session) -> list[str]:
+    """Output languages of stored checks."""
+    languages = db_session.scalars(
+        select(DBTradeSafetyCheck.output_language)
+        .where(DBTradeSafetyCheck.output_language.is_not(None))
+        .distinct()
+        .order_by(DBTradeSafetyCheck.output_language)
+    )
+    return [language for language in languages if language is not None]
+
+
+def sample_analyses(
+    db_session: Session, codec: AnalysisCodec, output_language: str, limit: int
+) -> list[dict]:
+    """
+    Load the latest stored analyses of a language, in either storage form.
+
+    Args:
+        db_session: SQLAlchemy session
+        codec: Codec decoding compressed rows
+        output_language: Language of the analyses
+        limit: Maximum number of analyses
+
+    Returns:
+        Analyses as stored, newest first
+    """
+    rows = db_session.execute(
+        select(DBTradeSafetyCheck.llm_analysis, DBTradeSafetyCheck.llm_analysis_zstd)
+        .where(DBTradeSafetyCheck.output_language == output_language)
+        .order_by(DBTradeSafetyCheck.created_at.desc())
+        .limit(limit)
+    )
+    return [codec.load(row.llm_analysis, row.llm_analysis_zstd) for row in rows]
+
+
+def train_dictionaries(db_session: Session, codec: AnalysisCodec) -> dict[str, int]:
+    """
+    Train a dictionary per output language on its latest stored analyses.
+
+    Languages with fewer than min_training_samples analyses are skipped.
+
+    Args:
+        db_session: SQLAlchemy session
+        codec: Codec storing the dictionaries
+
+    Returns:
+        ID of the new dictionary per trained language
+    """
+    trained = {}
+    for language in stored_languages(db_session):
+        samples = sample_analyses(
+            db_session, codec, language, codec.settings.training_samples
+        )
+        if len(samples) < codec.settings.min_training_samples:
+            logger.info(
+                "Skipped dictionary training: language=%s, samples=%d",
+                language,
+                len(samples),
+            )
+            continue
+        trained[language] = codec.train(language, samples)
+        logger.info(
+            "Trained analysis dictionary: language=%s, dict_id=%d, samples=%d",
+            language,
+            trained[language],
+            len(samples),
+        )
+    return trained
+
+
+def rewrite_analyses(
+    db_session: Session, codec: AnalysisCodec, compress: bool, batch_size: int = 500
+) -> int:
+    """
+    Rewrite one batch of stored analyses into the other storage form.
+
+    Call repeatedly until it returns 0. Rows already in the target form are
+    left alone (compressing again does not switch rows to newer dictionaries).
+
+    Args:
+        db_session: SQLAlchemy session
+        codec: Codec encoding and decoding the analyses
+        compress: Compress JSON rows if True, decompress zstd rows otherwise
+        batch_size: Maximum number of rows to rewrite in this call
+
+    Returns:
+        Number of rows rewritten
+    """
+    column = DBTradeSafetyCheck.llm_analysis_zstd
+    db_checks = db_session.scalars(
+        select(DBTradeSafetyCheck)
+        .where(column.is_(None) if compress else column.is_not(None))
+        .limit(batch_size)
+    ).all()
+
+    for db_check in db_checks:
+        analysis = codec.load(db_check.llm_analysis, db_check.llm_analysis_zstd)
+        if compress:
+            db_check.llm_analysis_zstd = codec.encode(
+                analysis, db_check.output_language
+            )
+            db_check.llm_analysis = None
+        else:
+            db_check.llm_analysis = analysis
+            db_check.llm_analysis_zstd = None
+
+    db_session.commit()
+    return len(db_checks)
+
+
+def main() -> None:
+    """Train dictionaries, migrate stored analyses or benchmark the codec."""
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").split("\n\n", maxsplit=1)[0].strip()
+    )
+    parser.add_argument(
+        "command", choices=["train", "compress", "decompress", "benchmark"]
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Rows rewritten per commit"
+    )
+    parser.add_argument(
+        "--samples", type=int, default=1000, help="Analyses benchmarked per language"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+    engine = create_engine(DatabaseSettings().url)
+    with Session(engine) as session:
+        codec = AnalysisCodec(DatabaseAnalysisDictionaryManager(session))
+        if args.command == "train":
+            train_dictionaries(session, codec)
+        elif args.command == "benchmark":
+            for language in stored_languages(session):
+                samples = sample_analyses(session, codec, language, args.samples)
+                result = benchmark(codec, language, samples)
+                sys.stdout.write(result.model_dump_json() + "\n")
+        else:
+            compress = args.command == "compress"
+            total = 0
+            while rewritten := rewrite_analyses(
+                session, codec, compress, args.batch_size
+            ):
+                total += rewritten
+                logger.info("Rewrote analyses: rows=%d", total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Schema versioning for stored LLM analysis payloads.
+
+``llm_analysis`` is stored as free-form JSON, so every change to the
+TradeSafetyAnalysis schema (or the prompt producing it) can leave older rows
+unreadable. Each row records the schema version it was written with, and the
+upgraders registered here bring older payloads up to date lazily on read.
+
+Adding a new version:
+    1. Bump ANALYSIS_SCHEMA_VERSION
+    2. Register an upgrader from the previous version:
+
+        @register_upgrader(2)
+        def _add_new_field(payload: dict[str, Any]) -> dict[str, Any]:
+            payload.setdefault("new_field", None)
+            return payload
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Version written with every new analysis
+ANALYSIS_SCHEMA_VERSION = 2
+
+# Version assumed for rows stored before schema_version existed
+LEGACY_ANALYSIS_SCHEMA_VERSION = 1
+
+AnalysisUpgrader = Callable[[dict[str, Any]], dict[str, Any]]
+
+# from_version -> upgrader producing a payload of from_version + 1
+_UPGRADERS: dict[int, AnalysisUpgrader] = {}
+
+
+def register_upgrader(
+    from_version: int,
+) -> Callable[[AnalysisUpgrader], AnalysisUpgrader]:
+    """
+    Register an upgrader that converts a payload from `from_version` to the next.
+
+    Args:
+        from_version: Schema version the upgrader accepts
+
+    Returns:
+        Decorator registering the upgrader function
+
+    Raises:
+        ValueError: If an upgrader is already registered for the version
+    """
+
+    def decorator(upgrader: AnalysisUpgrader) -> AnalysisUpgrader:
+        if from_version in _UPGRADERS:
+            raise ValueError(
+                f"Upgrader already registered for analysis schema v{from_version}"
+            )
+        _UPGRADERS[from_version] = upgrader
+        return upgrader
+
+    return decorator
+
+
+def is_current(version: int) -> bool:
+    """Return True if a payload of `version` can be read without upgrading."""
+    return version == ANALYSIS_SCHEMA_VERSION
+
+
+def upgrade_analysis(payload: dict[str, Any], version: int) -> dict[str, Any]:
+    """
+    Upgrade a stored analysis payload to ANALYSIS_SCHEMA_VERSION.
+
+    Current payloads are returned as-is (no copy), so the common read path
+    costs a single integer comparison. Older payloads are deep-copied before
+    the upgrader chain runs so the ORM-tracked JSON value is never mutated.
+
+    Args:
+        payload: Stored llm_analysis JSON
+        version: Schema version the payload was written with
+
+    Returns:
+        Payload matching the current TradeSafetyAnalysis schema
+
+    Raises:
+        ValueError: If the version is newer than supported or an upgrader is missing
+    """
+    if is_current(version):
+        return payload
+
+    if version > ANALYSIS_SCHEMA_VERSION:
+        raise ValueError(
+            f"Analysis schema v{version} is newer than supported "
+            f"v{ANALYSIS_SCHEMA_VERSION}"
+        )
+
+    upgraded = copy.deepcopy(payload)
+    for from_version in range(version, ANALYSIS_SCHEMA_VERSION):
+        upgrader = _UPGRADERS.get(from_version)
+        if upgrader is None:
+            raise ValueError(
+                f"No upgrader registered for analysis schema v{from_version}"
+            )
+        upgraded = upgrader(upgraded)
+
+    logger.debug(
+        "Upgraded analysis payload: v%d -> v%d", version, ANALYSIS_SCHEMA_VERSION
+    )
+    return upgraded
+
+
+# ==============================================================================
+# Upgraders
+# ==============================================================================
+
+
+@register_upgrader(1)
+def _rename_risk_score_to_safe_score(payload: dict[str, Any]) -> dict[str, Any]:
+    """v1 -> v2: analyses stored before the risk_score rename used `risk_score`."""
+    if "risk_score" in payload and "safe_score" not in payload:
+        payload["safe_score"] = payload.pop("risk_score")
+    return payload
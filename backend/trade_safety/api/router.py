@@ -6,29 +6,73 @@ This module provides public API endpoints for trade safety analysis:
 - GET /trade-safety/{check_id}: Get detailed results (public access with check_id)
 """
 
+import asyncio
 import logging
+import math
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Annotated
+from urllib.parse import quote
 
 from aioia_core.auth import UserInfoProvider
-from aioia_core.errors import RESOURCE_NOT_FOUND, VALIDATION_ERROR, ErrorResponse
+from aioia_core.errors import (
+    EXTERNAL_SERVICE_ERROR,
+    RESOURCE_NOT_FOUND,
+    VALIDATION_ERROR,
+    ErrorResponse,
+)
 from aioia_core.fastapi import BaseCrudRouter
 from aioia_core.settings import JWTSettings, OpenAIAPISettings
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import sessionmaker
 
+from trade_safety.author_reputation import author_reputation_note
 from trade_safety.factories import TradeSafetyCheckManagerFactory
+from trade_safety.image_fingerprints import get_image_fingerprint_index
+from trade_safety.image_proxy import (
+    THUMBNAIL_CACHE_CONTROL,
+    ImageFetchError,
+    get_image_proxy,
+)
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.near_duplicates import (
+    NearDuplicate,
+    get_near_duplicate_index,
+    near_duplicate_note,
+)
+from trade_safety.platform_adapters import PlatformAdapterMetrics, get_platform_metrics
+from trade_safety.post_cache import get_post_cache
 from trade_safety.preview_service import PreviewService
+from trade_safety.price_reference import PriceReferenceIndex, get_price_reference_index
+from trade_safety.rate_limits import (
+    RateLimitBudget,
+    RateLimitExceededError,
+    get_rate_limit_budgets,
+)
 from trade_safety.repositories.trade_safety_repository import (
     DatabaseTradeSafetyCheckManager,
 )
 from trade_safety.schemas import (
+    CheckListFilters,
+    CheckStatsBucket,
+    Platform,
     PostPreview,
+    RiskCategory,
+    StatsDimension,
+    StatsGranularity,
     TradeSafetyCheck,
     TradeSafetyCheckCreate,
+    TradeSafetyCheckSummary,
     TradeSafetyCheckUpdate,
 )
 from trade_safety.service import TradeSafetyService
-from trade_safety.settings import TradeSafetyModelSettings
+from trade_safety.settings import (
+    AuthorReputationSettings,
+    TradeSafetyDedupSettings,
+    TradeSafetyModelSettings,
+)
+from trade_safety.similar_cases import SimilarCaseIndex, get_similar_case_index
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +104,47 @@ class PreviewResponse(BaseModel):
     data: PostPreview
 
 
+class RateLimitsResponse(BaseModel):
+    """Response schema for rate-limit budget metrics"""
+
+    data: list[RateLimitBudget]
+
+
+class PlatformMetricsResponse(BaseModel):
+    """Response schema for platform fetch metrics"""
+
+    data: list[PlatformAdapterMetrics]
+
+
+class CheckListQuery(CheckListFilters):
+    """Query parameters of the admin check list (page and filters)"""
+
+    limit: int = Field(20, ge=1, le=100, description="Checks per page")
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+
+
+class CheckListResponse(BaseModel):
+    """Response schema for one page of the admin check list"""
+
+    data: list[TradeSafetyCheckSummary]
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page (None on the last page)"
+    )
+
+
+class ReviewClaimResponse(BaseModel):
+    """Response schema for a claimed check of the review queue"""
+
+    data: TradeSafetyCheck
+    claimed_until: datetime = Field(description="When the lease expires (UTC)")
+
+
+class CheckStatsResponse(BaseModel):
+    """Response schema for check statistics"""
+
+    data: list[CheckStatsBucket]
+
+
 class SingleItemResponseModel(BaseModel):
     """Standard CRUD response wrapping single item in data field"""
 
@@ -93,6 +178,8 @@ class TradeSafetyRouter(
         openai_api: OpenAIAPISettings,
         model_settings: TradeSafetyModelSettings,
         system_prompt: str | None = None,
+        dedup_settings: TradeSafetyDedupSettings | None = None,
+        reputation_settings: AuthorReputationSettings | None = None,
         **kwargs,
     ):
         """
@@ -102,20 +189,35 @@ class TradeSafetyRouter(
             openai_api: OpenAI API settings
             model_settings: Model settings
             system_prompt: Optional custom system prompt (overrides default if provided)
+            dedup_settings: Settings for reusing recent analyses of the same input
+                            (default: TradeSafetyDedupSettings() from environment)
+            reputation_settings: Settings for passing the post author's history
+                                 to the LLM (default: AuthorReputationSettings()
+                                 from environment)
             **kwargs: BaseCrudRouter arguments
         """
         self.openai_api = openai_api
         self.model_settings = model_settings
         self.system_prompt = system_prompt
+        self.dedup_settings = dedup_settings or TradeSafetyDedupSettings()
+        self.reputation_settings = reputation_settings or AuthorReputationSettings()
         super().__init__(**kwargs)
 
     def _register_routes(self) -> None:
         """Register custom routes instead of standard CRUD"""
         self._register_public_create_route()
+        # Before GET /trade-safety/{check_id}, which would match "images"
+        self._register_image_proxy_route()
         self._register_public_get_route()
         self._register_preview_action()
         # Admin routes
         self._register_list_route()  # GET /trade-safety (Admin only)
+        self._register_admin_list_route()  # GET /trade-safety/admin/checks
+        self._register_rate_limits_route()  # GET /trade-safety/admin/rate-limits
+        # GET /trade-safety/admin/platform-metrics
+        self._register_platform_metrics_route()
+        self._register_stats_route()  # GET /trade-safety/admin/stats
+        self._register_review_queue_routes()  # /trade-safety/admin/review-queue
         self._register_update_route()  # PATCH /trade-safety/{id} (Admin only)
 
     def _register_public_create_route(self) -> None:
@@ -143,6 +245,10 @@ class TradeSafetyRouter(
                     "description": "Invalid authentication token",
                 },
                 422: {"model": ErrorResponse, "description": "Validation error"},
+                429: {
+                    "model": ErrorResponse,
+                    "description": "Platform API rate limit exhausted",
+                },
                 500: {"model": ErrorResponse, "description": "Internal server error"},
             },
         )
@@ -155,9 +261,14 @@ class TradeSafetyRouter(
             Create a new trade safety check.
 
             Flow:
-            1. Analyze trade using LLM (TradeSafetyService)
+            1. Reuse a recent analysis of the same input (or of an almost identical
+               text), or analyze trade using LLM (reusing the cached preview of a
+               URL instead of fetching it again, passing near-duplicates of
+               earlier posts, the post author's history and the item's reference
+               price as signals, and similar reviewed cases as examples)
             2. Convert Request + Analysis → Domain Create schema
-            3. Save to database via manager.create() (BaseManager)
+            3. Save to database via manager.create() (BaseManager), or queue it
+               for a batched write when write-behind is enabled
             4. Return full analysis for all users
             """
             logger.info(
@@ -166,37 +277,84 @@ class TradeSafetyRouter(
                 user_id is not None,
             )
 
+            output_language = request.output_language.lower()
+
             try:
-                # Step 1: Analyze trade using LLM
-                # Use custom prompt if provided, otherwise TradeSafetyService uses default
-                if self.system_prompt:
-                    service = TradeSafetyService(
-                        openai_api=self.openai_api,
-                        model_settings=self.model_settings,
-                        system_prompt=self.system_prompt,
+                # Reuse the post fetched by POST /preview (skips one API call)
+                preview = PreviewService(
+                    post_cache=get_post_cache()
+                ).get_cached_preview(request.input_text)
+
+                # Step 1: Reuse a recent analysis (index lookup) or analyze using LLM
+                reusable = self._find_reusable_check(
+                    manager, request.input_text, output_language
+                )
+                near_duplicates: list[NearDuplicate] = []
+                if not reusable:
+                    near_duplicates = await self._find_near_duplicates(
+                        request.input_text
+                    )
+                    reusable = self._find_reusable_near_duplicate(
+                        manager, near_duplicates, output_language
                     )
+                if reusable:
+                    logger.info("Reusing recent analysis: source_id=%s", reusable.id)
+                    analysis = reusable.llm_analysis
                 else:
-                    service = TradeSafetyService(
-                        openai_api=self.openai_api,
-                        model_settings=self.model_settings,
+                    similar_case_index = self._get_similar_case_index()
+                    price_reference_index = self._get_price_reference_index()
+                    # Use custom prompt if provided, otherwise TradeSafetyService uses default
+                    if self.system_prompt:
+                        service = TradeSafetyService(
+                            openai_api=self.openai_api,
+                            model_settings=self.model_settings,
+                            system_prompt=self.system_prompt,
+                            post_cache=get_post_cache(),
+                            image_index=get_image_fingerprint_index(),
+                            similar_case_index=similar_case_index,
+                            price_reference_index=price_reference_index,
+                        )
+                    else:
+                        service = TradeSafetyService(
+                            openai_api=self.openai_api,
+                            model_settings=self.model_settings,
+                            post_cache=get_post_cache(),
+                            image_index=get_image_fingerprint_index(),
+                            similar_case_index=similar_case_index,
+                            price_reference_index=price_reference_index,
+                        )
+                    note = near_duplicate_note(near_duplicates)
+                    # The author is known from the post the analysis fetches
+                    analysis, preview = await service.analyze_trade_with_preview(
+                        input_text=request.input_text,
+                        output_language=output_language,
+                        preview=preview,
+                        verified_signals=[note] if note else None,
+                        author_signal=(
+                            partial(self._author_reputation_note, manager)
+                            if self.reputation_settings.enabled
+                            else None
+                        ),
                     )
-                analysis = await service.analyze_trade(
-                    input_text=request.input_text,
-                    output_language=request.output_language,
-                )
 
                 # Step 2: Convert API Request → Domain Create schema (type-safe!)
                 create_data = TradeSafetyCheckCreate(
                     # User input fields
                     input_text=request.input_text,
+                    output_language=output_language,
+                    # Post author (counted towards its reputation on create)
+                    platform=preview.platform if preview else None,
+                    author=preview.author if preview else None,
                     # System-generated fields
                     user_id=user_id,
                     llm_analysis=analysis.model_dump(),
+                    offered_price_usd=None,  # Derived from the analysis on create
                     safe_score=analysis.safe_score,
                     expert_advice=None,
                     expert_reviewed=False,
                     expert_reviewed_at=None,
                     expert_reviewed_by=None,
+                    expert_advice_source_id=None,
                 )
 
                 # Step 3: Save via BaseManager.create()
@@ -212,6 +370,18 @@ class TradeSafetyRouter(
                 # Step 4: Return full analysis wrapped in data field
                 return SingleItemResponseModel(data=check)
 
+            except RateLimitExceededError as e:
+                # Platform API quota exhausted: ask the client to retry later
+                logger.warning("Rate limited in trade safety check: %s", e)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail={
+                        "detail": str(e),
+                        "code": EXTERNAL_SERVICE_ERROR,
+                    },
+                    headers={"Retry-After": str(math.ceil(e.retry_after))},
+                ) from e
+
             except ValueError as e:
                 # Input validation errors from service
                 logger.warning("Validation error in trade safety check: %s", e)
@@ -223,6 +393,151 @@ class TradeSafetyRouter(
                     },
                 ) from e
 
+    def _find_reusable_check(
+        self,
+        manager: DatabaseTradeSafetyCheckManager,
+        input_text: str,
+        output_language: str,
+    ) -> TradeSafetyCheck | None:
+        """
+        Find a recent analysis of the same input that can be reused.
+
+        Args:
+            manager: Trade safety check manager
+            input_text: Trade post URL or text
+            output_language: Language the analysis must be written in
+
+        Returns:
+            Reusable check if dedup is enabled and one exists, None otherwise
+        """
+        if not self.dedup_settings.enabled:
+            return None
+
+        return manager.find_reusable_check(
+            input_hash=compute_input_hash(input_text),
+            output_language=output_language,
+            since=self._reuse_since(),
+        )
+
+    def _reuse_since(self) -> datetime:
+        """Return the oldest creation time of an analysis that is still reusable."""
+        return datetime.now(timezone.utc) - timedelta(
+            hours=self.dedup_settings.reuse_window_hours
+        )
+
+    async def _find_near_duplicates(self, input_text: str) -> list[NearDuplicate]:
+        """
+        Find earlier checks of almost identical text (edited scam templates).
+
+        The process-wide index is built from the table in the background at
+        startup (see TradeSafetyCheckManagerFactory.start_index_builds) and
+        kept up to date by the manager afterwards. Until it is ready, no near
+        duplicates are found. Querying runs in a worker thread to keep the
+        event loop free.
+
+        Args:
+            input_text: Trade post text
+
+        Returns:
+            Near duplicates, most similar first (empty if the index is disabled
+            or not built yet)
+        """
+        index = get_near_duplicate_index()
+        if index is None or not index.is_ready:
+            return []
+        return await asyncio.to_thread(index.query, input_text)
+
+    def _author_reputation_note(
+        self, manager: DatabaseTradeSafetyCheckManager, preview: PostPreview
+    ) -> str | None:
+        """
+        Look up the history of the post author (primary-key lookup).
+
+        Args:
+            manager: Trade safety check manager
+            preview: Fetched post
+
+        Returns:
+            Prompt note on the author's history, None if unknown
+        """
+        reputation = manager.author_reputations.get(preview.platform, preview.author)
+        return author_reputation_note(
+            reputation,
+            risky_score_threshold=self.reputation_settings.risky_score_threshold,
+            min_checks=self.reputation_settings.min_checks,
+        )
+
+    def _get_price_reference_index(self) -> PriceReferenceIndex | None:
+        """
+        Return the process-wide price reference index, if built from the table.
+
+        The index is built in the background at startup (see
+        TradeSafetyCheckManagerFactory.start_index_builds) and kept up to date
+        by the manager afterwards. Until it is ready, the LLM estimates the
+        market price range itself.
+
+        Returns:
+            Price reference index, or None if disabled or not built yet
+        """
+        index = get_price_reference_index()
+        if index is None or not index.is_ready:
+            return None
+        return index
+
+    def _get_similar_case_index(self) -> SimilarCaseIndex | None:
+        """
+        Return the process-wide similar-case index, if synced with the table.
+
+        The index is synced in the background at startup (see
+        TradeSafetyCheckManagerFactory.start_index_builds) and kept up to date
+        by the manager afterwards. Until it is ready, checks are analyzed
+        without similar cases.
+
+        Returns:
+            Similar-case index, or None if disabled or not synced yet
+        """
+        index = get_similar_case_index()
+        if index is None or not index.is_ready:
+            return None
+        return index
+
+    def _find_reusable_near_duplicate(
+        self,
+        manager: DatabaseTradeSafetyCheckManager,
+        near_duplicates: list[NearDuplicate],
+        output_language: str,
+    ) -> TradeSafetyCheck | None:
+        """
+        Find a near duplicate similar enough to reuse its analysis.
+
+        Only analyses within the reuse window of exact-input reuse qualify, so
+        a near duplicate never outlives what an identical post would get.
+
+        Args:
+            manager: Trade safety check manager
+            near_duplicates: Near duplicates of the input, most similar first
+            output_language: Language the analysis must be written in
+
+        Returns:
+            Reusable check if dedup is enabled and one qualifies, None otherwise
+        """
+        index = get_near_duplicate_index()
+        if not self.dedup_settings.enabled or index is None:
+            return None
+
+        since = self._reuse_since()
+        for duplicate in near_duplicates:
+            created_at = duplicate.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if (
+                duplicate.similarity >= index.settings.reuse_threshold
+                and duplicate.output_language == output_language
+                and created_at >= since
+            ):
+                return manager.get_by_id(duplicate.check_id)
+        return None
+
     def _register_public_get_route(self) -> None:
         """GET /trade-safety/{check_id} - Public endpoint"""
 
@@ -282,6 +597,261 @@ class TradeSafetyRouter(
             # Return full analysis
             return SingleItemResponseModel(data=check)
 
+    def _register_image_proxy_route(self) -> None:
+        """GET /trade-safety/images - Public endpoint serving cached thumbnails"""
+
+        @self.router.get(
+            f"/{self.resource_name}/images",
+            response_class=Response,
+            summary="Get Proxied Thumbnail",
+            description="""
+            Serve a thumbnail of a post image through the image proxy.
+
+            Images are fetched from the platform CDN once, resized and cached.
+            Responses carry long-lived Cache-Control headers and the content
+            hash as ETag (If-None-Match returns 304).
+
+            **Allowed hosts**: Twitter/X and Reddit image CDNs
+            """,
+            responses={
+                200: {
+                    "content": {"image/webp": {}},
+                    "description": "Thumbnail image",
+                },
+                304: {"description": "Thumbnail not modified"},
+                422: {
+                    "model": ErrorResponse,
+                    "description": "Invalid or disallowed image URL",
+                },
+                502: {
+                    "model": ErrorResponse,
+                    "description": "Source image could not be fetched",
+                },
+            },
+        )
+        async def get_image(
+            url: str,
+            if_none_match: str | None = Header(None),
+        ):
+            """
+            Get a proxied thumbnail.
+
+            Flow:
+            1. Get the thumbnail from the disk cache, fetching it on miss
+            2. Return 304 if the client already has it, the image otherwise
+            """
+            try:
+                # Step 1: Fetching and resizing block, keep them off the event loop
+                image = await asyncio.to_thread(get_image_proxy().get_thumbnail, url)
+
+            except ImageFetchError as e:
+                logger.warning("Failed to proxy image: %s", e)
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail={
+                        "detail": str(e),
+                        "code": EXTERNAL_SERVICE_ERROR,
+                    },
+                ) from e
+
+            except ValueError as e:
+                logger.warning("Invalid image proxy request: %s", e)
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail={
+                        "detail": str(e),
+                        "code": VALIDATION_ERROR,
+                    },
+                ) from e
+
+            # Step 2: Serve with long-lived cache headers
+            etag = f'"{image.content_hash}"'
+            headers = {"Cache-Control": THUMBNAIL_CACHE_CONTROL, "ETag": etag}
+            if if_none_match == etag:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+            return Response(
+                content=image.data, media_type=image.content_type, headers=headers
+            )
+
+    def _register_rate_limits_route(self) -> None:
+        """GET /trade-safety/admin/rate-limits - Admin endpoint for API quota metrics"""
+
+        @self.router.get(
+            f"/{self.resource_name}/admin/rate-limits",
+            response_model=RateLimitsResponse,
+            summary="Get Platform API Rate Limits",
+            description="""
+            Current Twitter/Reddit API rate-limit budget of this worker process.
+
+            Budgets are tracked from rate-limit response headers; `limit` and
+            `remaining` are null until the first API response is seen.
+            Requires admin privileges.
+            """,
+        )
+        async def get_rate_limits(
+            _admin_user: None = Depends(self.get_admin_user_dep),
+        ):
+            """Return the current rate-limit budget of every platform."""
+            return RateLimitsResponse(data=get_rate_limit_budgets())
+
+    def _register_platform_metrics_route(self) -> None:
+        """GET /trade-safety/admin/platform-metrics - Admin endpoint for fetch metrics"""
+
+        @self.router.get(
+            f"/{self.resource_name}/admin/platform-metrics",
+            response_model=PlatformMetricsResponse,
+            summary="Get Platform Fetch Metrics",
+            description="""
+            Post fetches per platform in this worker process: count, deleted or
+            private posts, other failures and total time spent fetching.
+            Requires admin privileges.
+            """,
+        )
+        async def get_fetch_metrics(
+            _admin_user: None = Depends(self.get_admin_user_dep),
+        ):
+            """Return the fetch metrics of every platform."""
+            return PlatformMetricsResponse(data=get_platform_metrics())
+
+    def _register_admin_list_route(self) -> None:
+        """GET /trade-safety/admin/checks - Admin endpoint for paging through checks"""
+
+        @self.router.get(
+            f"/{self.resource_name}/admin/checks",
+            response_model=CheckListResponse,
+            summary="List Checks (Keyset Pagination)",
+            description="""
+            Checks newest first, without their analysis.
+
+            Pass `next_cursor` of a page as `cursor` to get the next one; every
+            page takes the same time however deep it is.
+            Requires admin privileges.
+            """,
+        )
+        async def list_checks(
+            query: Annotated[CheckListQuery, Query()],
+            _admin_user: None = Depends(self.get_admin_user_dep),
+            manager: DatabaseTradeSafetyCheckManager = Depends(self.get_manager_dep),
+        ):
+            """Return one page of checks matching the filters."""
+            filters = CheckListFilters(
+                **query.model_dump(exclude={"limit", "cursor"}, exclude_unset=True)
+            )
+            try:
+                checks, next_cursor = manager.list_summaries(
+                    filters, query.limit, query.cursor
+                )
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail={
+                        "detail": str(e),
+                        "code": VALIDATION_ERROR,
+                    },
+                ) from e
+            return CheckListResponse(data=checks, next_cursor=next_cursor)
+
+    def _register_review_queue_routes(self) -> None:
+        """Admin endpoints to claim and release checks of the review queue"""
+
+        @self.router.post(
+            f"/{self.resource_name}/admin/review-queue/claim",
+            response_model=ReviewClaimResponse,
+            summary="Claim Next Check to Review",
+            description="""
+            Reserve the pending check with the highest review priority for the
+            calling expert. Priority grows with risk (low score, severe
+            signals, repeat authors, duplicated posts). The check is hidden
+            from other experts until it is reviewed, released or the lease
+            expires. Returns 204 when no check is waiting.
+            Requires admin privileges.
+            """,
+            responses={204: {"description": "No check waiting for review"}},
+        )
+        async def claim_next_check(
+            expert_id: str = Depends(self.get_admin_user_dep),
+            manager: DatabaseTradeSafetyCheckManager = Depends(self.get_manager_dep),
+        ):
+            """Claim the next check of the review queue."""
+            claim = manager.review_queue.claim_next(expert_id)
+            check = manager.get_by_id(claim.check_id) if claim else None
+            if claim is None or check is None:
+                return Response(status_code=status.HTTP_204_NO_CONTENT)
+            return ReviewClaimResponse(data=check, claimed_until=claim.claimed_until)
+
+        @self.router.delete(
+            f"/{self.resource_name}/admin/review-queue/claims/{{check_id}}",
+            status_code=status.HTTP_204_NO_CONTENT,
+            summary="Release Claimed Check",
+            description="""
+            Return a check claimed by the calling expert to the review queue.
+            Requires admin privileges.
+            """,
+        )
+        async def release_check(
+            check_id: str,
+            expert_id: str = Depends(self.get_admin_user_dep),
+            manager: DatabaseTradeSafetyCheckManager = Depends(self.get_manager_dep),
+        ):
+            """Release a claim held by the calling expert."""
+            if not manager.review_queue.release(check_id, expert_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail={
+                        "detail": "No claim of this check held by the caller",
+                        "code": RESOURCE_NOT_FOUND,
+                    },
+                )
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    def _register_stats_route(self) -> None:
+        """GET /trade-safety/admin/stats - Admin endpoint for check statistics"""
+
+        @self.router.get(
+            f"/{self.resource_name}/admin/stats",
+            response_model=CheckStatsResponse,
+            summary="Get Check Statistics",
+            description="""
+            Check counts and average safety scores per hour or day.
+
+            Read from rollups maintained as checks are created, so the cost
+            depends on the number of buckets, not the number of checks.
+            Dimensions not listed in `group_by` are summed over. Use
+            `max_safe_score=40` for high-risk checks.
+            Requires admin privileges.
+            """,
+        )
+        async def get_stats(
+            granularity: StatsGranularity = StatsGranularity.DAY,
+            since: datetime | None = Query(
+                None, description="Start of the period (default: 30 days ago)"
+            ),
+            until: datetime | None = Query(
+                None, description="End of the period, exclusive (default: now)"
+            ),
+            group_by: list[StatsDimension] = Query(default=[]),
+            platform: Platform | None = None,
+            output_language: str | None = None,
+            risk_category: RiskCategory | None = None,
+            max_safe_score: int | None = Query(None, ge=0, le=100),
+            _admin_user: None = Depends(self.get_admin_user_dep),
+            manager: DatabaseTradeSafetyCheckManager = Depends(self.get_manager_dep),
+        ):
+            """Return check statistics from the rollups."""
+            buckets = manager.check_rollups.query(
+                granularity,
+                since=since or datetime.now(timezone.utc) - timedelta(days=30),
+                until=until,
+                group_by=group_by,
+                platform=platform,
+                output_language=output_language,
+                risk_category=risk_category,
+                max_safe_score=max_safe_score,
+            )
+            return CheckStatsResponse(data=buckets)
+
     def _register_preview_action(self) -> None:
         """POST /trade-safety/preview - Public endpoint for post metadata preview"""
 
@@ -299,6 +869,7 @@ class TradeSafetyRouter(
             - Full text content
             - Text preview (first 200 characters)
             - Image URLs
+            - Proxied thumbnail paths (GET /trade-safety/images)
 
             **Supported platforms**: Twitter/X only
             """,
@@ -310,6 +881,10 @@ class TradeSafetyRouter(
                     "model": ErrorResponse,
                     "description": "Invalid URL or unsupported platform",
                 },
+                429: {
+                    "model": ErrorResponse,
+                    "description": "Platform API rate limit exhausted",
+                },
                 500: {"model": ErrorResponse, "description": "Internal server error"},
             },
         )
@@ -325,8 +900,15 @@ class TradeSafetyRouter(
 
             try:
                 # Step 1: Extract metadata
-                preview_service = PreviewService()
-                preview = preview_service.preview(request.url)
+                # Shared post cache: a later analyze of the same URL skips the fetch
+                preview_service = PreviewService(
+                    post_cache=get_post_cache(), image_proxy=get_image_proxy()
+                )
+                # Blocking fetch (may wait for a rate-limit reset): keep it off the loop
+                preview = await asyncio.to_thread(preview_service.preview, request.url)
+                preview = preview.model_copy(
+                    update={"thumbnails": self._thumbnail_paths(preview.images)}
+                )
 
                 logger.info(
                     "Post preview created: platform=%s, author=%s, images=%d",
@@ -338,6 +920,18 @@ class TradeSafetyRouter(
                 # Step 2: Return preview wrapped in data field
                 return PreviewResponse(data=preview)
 
+            except RateLimitExceededError as e:
+                # Platform API quota exhausted: ask the client to retry later
+                logger.warning("Rate limited in post preview: %s", e)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail={
+                        "detail": str(e),
+                        "code": EXTERNAL_SERVICE_ERROR,
+                    },
+                    headers={"Retry-After": str(math.ceil(e.retry_after))},
+                ) from e
+
             except ValueError as e:
                 # Input validation errors from service
                 logger.warning("Validation error in post preview: %s", e)
@@ -349,6 +943,27 @@ class TradeSafetyRouter(
                     },
                 ) from e
 
+    def _thumbnail_paths(self, image_urls: list[str]) -> list[str]:
+        """
+        Build image proxy paths for image URLs.
+
+        Args:
+            image_urls: Source image URLs
+
+        Returns:
+            Paths of GET /trade-safety/images (original URL for hosts that
+            are not proxied)
+        """
+        proxy = get_image_proxy()
+        return [
+            (
+                f"/{self.resource_name}/images?url={quote(image_url, safe='')}"
+                if proxy.is_allowed(image_url)
+                else image_url
+            )
+            for image_url in image_urls
+        ]
+
 
 def create_trade_safety_router(
     openai_api: OpenAIAPISettings,
@@ -358,10 +973,15 @@ def create_trade_safety_router(
     manager_factory: TradeSafetyCheckManagerFactory,
     user_info_provider: UserInfoProvider | None,
     system_prompt: str | None = None,
+    dedup_settings: TradeSafetyDedupSettings | None = None,
+    reputation_settings: AuthorReputationSettings | None = None,
 ) -> APIRouter:
     """
     Create trade safety router with public POST and authenticated GET.
 
+    Starts building the in-memory indexes of the manager factory in the
+    background, so the first requests do not wait for table scans.
+
     Args:
         openai_api (OpenAIAPISettings): OpenAI API settings
         model_settings (TradeSafetyModelSettings): Model settings
@@ -370,14 +990,19 @@ def create_trade_safety_router(
         manager_factory (TradeSafetyCheckManagerFactory): Factory for creating manager
         user_info_provider (UserInfoProvider | None): UserInfoProvider for authentication
         system_prompt (str | None): Optional custom system prompt for trade safety analysis
+        dedup_settings (TradeSafetyDedupSettings | None): Settings for reusing recent analyses
+        reputation_settings (AuthorReputationSettings | None): Settings for author history signals
 
     Returns:
         APIRouter: Configured FastAPI router
     """
+    manager_factory.start_index_builds()
     router = TradeSafetyRouter(
         openai_api=openai_api,
         model_settings=model_settings,
         system_prompt=system_prompt,
+        dedup_settings=dedup_settings,
+        reputation_settings=reputation_settings,
         model_class=TradeSafetyCheck,
         create_schema=TradeSafetyCheckCreate,
         update_schema=TradeSafetyCheckUpdate,
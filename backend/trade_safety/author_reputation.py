@@ -0,0 +1,76 @@
+"""
+Author reputation signals for the analysis prompt.
+
+Every check of a URL input records the post author. Aggregates per
+(platform, author) are kept in their own table (see
+DatabaseAuthorReputationManager), so the history of a known seller is a
+primary-key lookup at analysis time instead of a scan over past checks, and a
+repeat offender is flagged before the LLM has read the post.
+"""
+
+from __future__ import annotations
+
+from trade_safety.schemas import AuthorReputation
+
+
+def normalize_author(author: str) -> str:
+    """
+    Normalize a username so the same account always maps to one key.
+
+    Twitter and Reddit usernames are case-insensitive; "@name" and "u/name"
+    prefixes are dropped.
+
+    Args:
+        author: Username as shown on the platform
+
+    Returns:
+        Normalized username
+
+    Example:
+        >>> normalize_author("@Seller_123")
+        'seller_123'
+        >>> normalize_author("u/Seller_123")
+        'seller_123'
+    """
+    normalized = author.strip().lower()
+    for prefix in ("@", "/u/", "u/"):
+        normalized = normalized.removeprefix(prefix)
+    return normalized
+
+
+def author_reputation_note(
+    reputation: AuthorReputation | None, risky_score_threshold: int, min_checks: int
+) -> str | None:
+    """
+    Describe an author's history as a verified signal for the analysis prompt.
+
+    Args:
+        reputation: History of the post author, if known
+        risky_score_threshold: Safety scores below this count as risky
+        min_checks: Earlier checks needed before the history is reported
+
+    Returns:
+        Prompt note, or None without enough history
+    """
+    if reputation is None or reputation.check_count < min_checks:
+        return None
+
+    note = (
+        f"Author history: posts by {reputation.author} on {reputation.platform.value} "
+        f"were checked {reputation.check_count} time(s) on our service "
+        f"(lowest safety score {reputation.min_safe_score}, average "
+        f"{reputation.avg_safe_score:.0f}; {reputation.risky_check_count} scored "
+        f"below {risky_score_threshold}; last seen {reputation.last_seen_at:%Y-%m-%d})."
+    )
+    if reputation.reviewed_risky_count:
+        note += (
+            f" Our experts reviewed {reputation.reviewed_count} of them and confirmed "
+            f"{reputation.reviewed_risky_count} as risky; report this as a HIGH "
+            "severity seller risk signal."
+        )
+    elif reputation.reviewed_count:
+        note += (
+            f" Our experts reviewed {reputation.reviewed_count} of them without "
+            "confirming a risk."
+        )
+    return note
@@ -0,0 +1,150 @@
+"""
+Micro-batching of concurrent lookups into batched API calls.
+
+Platform APIs offer batch endpoints (Twitter `/2/tweets?ids=...`, Reddit
+`/api/info?id=...`) that cost one rate-limit unit for up to 100 posts. The
+MicroBatcher collects lookups submitted by concurrent callers for a short
+window, flushes them as one batch call, and maps each result (or per-key
+error) back to the caller that asked for it. A key the batch call returns
+nothing for fails its caller with PostUnavailableError.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+from trade_safety.post_cache import PostUnavailableError
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+
+class MicroBatcher(Generic[ResultT]):
+    """
+    Collect single-key lookups for a short window and flush them as batches.
+
+    A batch is flushed when max_batch_size keys are pending or window_seconds
+    after the first pending key, whichever comes first. Duplicate keys within
+    a window share one lookup.
+
+    Example:
+        >>> batcher = MicroBatcher(service.fetch_metadata_batch, max_batch_size=100)
+        >>> metadata = batcher.fetch("123")  # blocks until its batch is flushed
+    """
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[list[str]], Mapping[str, ResultT | Exception]],
+        max_batch_size: int = 100,
+        window_seconds: float = 0.005,
+    ):
+        """
+        Initialize MicroBatcher.
+
+        Args:
+            fetch_batch: Function fetching up to max_batch_size keys in one call,
+                         returning a result or an exception per key
+            max_batch_size: Maximum keys per batch (API limit)
+            window_seconds: How long to collect keys before flushing
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive: {max_batch_size}")
+
+        self._fetch_batch = fetch_batch
+        self.max_batch_size = max_batch_size
+        self.window_seconds = window_seconds
+        self._pending: dict[str, list[Future[ResultT]]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def submit(self, key: str) -> Future[ResultT]:
+        """
+        Submit a key for the next batch.
+
+        Args:
+            key: Lookup key (e.g., tweet ID)
+
+        Returns:
+            Future resolved with the key's result or error once its batch is flushed
+        """
+        future: Future[ResultT] = Future()
+        flush_now = False
+
+        with self._lock:
+            self._pending.setdefault(key, []).append(future)
+            if len(self._pending) >= self.max_batch_size:
+                flush_now = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self.flush()
+        return future
+
+    def fetch(self, key: str, timeout: float | None = None) -> ResultT:
+        """
+        Submit a key and wait for its result.
+
+        Args:
+            key: Lookup key
+            timeout: Maximum seconds to wait (default: None, wait forever)
+
+        Returns:
+            Result for the key
+
+        Raises:
+            Exception: The per-key or batch error raised by fetch_batch
+        """
+        return self.submit(key).result(timeout=timeout)
+
+    def flush(self) -> None:
+        """Flush all pending keys now, in batches of at most max_batch_size."""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start : start + self.max_batch_size]
+            self._run_batch({key: pending[key] for key in chunk})
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _run_batch(self, batch: dict[str, list[Future[ResultT]]]) -> None:
+        """Run one batch call and resolve the futures of its keys."""
+        keys = list(batch)
+        logger.debug("Flushing micro-batch: %d keys", len(keys))
+
+        try:
+            results = self._fetch_batch(keys)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Whole-batch failure (auth, network, 429): every caller gets the error
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        for key, futures in batch.items():
+            result = results.get(key)
+            if result is None:
+                # Unavailable like a post the API reports as not found (4xx)
+                result = PostUnavailableError(
+                    f"No result returned for key: {key}", status_code=404
+                )
+            for future in futures:
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
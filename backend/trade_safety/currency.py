@@ -0,0 +1,404 @@
+"""
+Currency normalization with a local, periodically refreshed FX rate table.
+
+Trade posts quote prices in many currencies, so prices are only comparable
+across checks once converted to a common unit. Rates are kept as units per
+1 USD in a small JSON file (shared by worker processes and readable offline);
+without a file, rates bundled with the package are used. When a rate URL is
+configured, the table is refreshed in the background once it is older than
+the refresh interval, and the current table is served meanwhile.
+
+Conversions never make a network call on the request path: `to_usd` is a
+dict lookup, and `to_usd_many` converts whole columns of amounts with NumPy
+for analytics queries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import requests
+from pydantic import BaseModel, Field
+
+from trade_safety.settings import CurrencySettings
+
+logger = logging.getLogger(__name__)
+
+# Currency symbols and words mapped to ISO 4217 codes
+CURRENCY_ALIASES: dict[str, str] = {
+    "₩": "KRW",
+    "원": "KRW",
+    "won": "KRW",
+    "krw": "KRW",
+    "$": "USD",
+    "usd": "USD",
+    "달러": "USD",
+    "dollar": "USD",
+    "dollars": "USD",
+    "¥": "JPY",
+    "円": "JPY",
+    "엔": "JPY",
+    "yen": "JPY",
+    "jpy": "JPY",
+    "€": "EUR",
+    "eur": "EUR",
+    "euro": "EUR",
+    "euros": "EUR",
+    "£": "GBP",
+    "gbp": "GBP",
+    "php": "PHP",
+    "₱": "PHP",
+    "cad": "CAD",
+    "aud": "AUD",
+    "sgd": "SGD",
+}
+
+# Approximate units per 1 USD, used until a rate table has been loaded
+BUNDLED_RATES_AS_OF = datetime(2026, 10, 1, tzinfo=timezone.utc)
+BUNDLED_USD_RATES: dict[str, float] = {
+    "USD": 1.0,
+    "KRW": 1390.0,
+    "JPY": 149.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "CNY": 7.2,
+    "TWD": 32.0,
+    "HKD": 7.8,
+    "SGD": 1.34,
+    "PHP": 57.5,
+    "THB": 35.5,
+    "IDR": 16000.0,
+    "VND": 25000.0,
+    "MYR": 4.6,
+    "INR": 84.0,
+    "CAD": 1.37,
+    "AUD": 1.52,
+    "MXN": 18.5,
+    "BRL": 5.4,
+}
+
+
+class FXRateTable(BaseModel):
+    """Exchange rates as units of each currency per 1 USD"""
+
+    as_of: datetime = Field(description="When the rates were fetched")
+    rates: dict[str, float] = Field(description="ISO 4217 code -> units per 1 USD")
+
+
+def normalize_currency(currency: str | None) -> str | None:
+    """
+    Map a currency code, symbol or word to its ISO 4217 code.
+
+    Args:
+        currency: Currency as written (e.g., "krw", "₩", "원", "USD")
+
+    Returns:
+        ISO 4217 code, or None if unknown
+
+    Example:
+        >>> normalize_currency("원")
+        'KRW'
+    """
+    if not currency:
+        return None
+    cleaned = currency.strip()
+    return CURRENCY_ALIASES.get(cleaned.casefold()) or (
+        cleaned.upper()
+        if len(cleaned) == 3 and cleaned.isalpha() and cleaned.isascii()
+        else None
+    )
+
+
+def bundled_rate_table() -> FXRateTable:
+    """Return the rate table shipped with the package."""
+    return FXRateTable(as_of=BUNDLED_RATES_AS_OF, rates=dict(BUNDLED_USD_RATES))
+
+
+class CurrencyConverter:
+    """
+    Converts amounts between currencies using a cached rate table.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    get_currency_converter). Refreshes run single-flight in a daemon thread;
+    a failed refresh keeps the current rates and is retried after the next
+    refresh interval.
+
+    Example:
+        >>> converter = get_currency_converter()
+        >>> converter.to_usd(13900, "KRW")
+        10.0
+    """
+
+    def __init__(
+        self,
+        settings: CurrencySettings | None = None,
+        http_get: Callable[..., requests.Response] = requests.get,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize CurrencyConverter.
+
+        Args:
+            settings: FX settings (default: CurrencySettings() from environment)
+            http_get: HTTP GET function used to fetch rates (injectable for tests)
+            clock: Time source in epoch seconds (injectable for tests)
+        """
+        self.settings = settings or CurrencySettings()
+        self._http_get = http_get
+        self._clock = clock
+        self._table = self._read_rate_file() or bundled_rate_table()
+        # Guards the refresh state only; never held while fetching
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    @property
+    def table(self) -> FXRateTable:
+        """Current rate table (starts a background refresh when stale)."""
+        self._refresh_if_stale()
+        return self._table
+
+    def rate(self, currency: str | None) -> float | None:
+        """
+        Look up the units of a currency per 1 USD.
+
+        Args:
+            currency: Currency code, symbol or word
+
+        Returns:
+            Rate, or None if the currency is unknown
+        """
+        code = normalize_currency(currency)
+        return self.table.rates.get(code) if code else None
+
+    def to_usd(self, amount: Decimal | float, currency: str | None) -> float | None:
+        """
+        Convert an amount to USD.
+
+        Args:
+            amount: Amount in `currency`
+            currency: Currency of the amount
+
+        Returns:
+            USD equivalent, or None if the currency is unknown
+        """
+        rate = self.rate(currency)
+        return float(amount) / rate if rate else None
+
+    def convert(
+        self, amount: Decimal | float, from_currency: str, to_currency: str
+    ) -> float | None:
+        """
+        Convert an amount between two currencies (cross rate via USD).
+
+        Args:
+            amount: Amount in `from_currency`
+            from_currency: Currency of the amount
+            to_currency: Target currency
+
+        Returns:
+            Converted amount, or None if either currency is unknown
+        """
+        usd = self.to_usd(amount, from_currency)
+        target_rate = self.rate(to_currency)
+        return usd * target_rate if usd is not None and target_rate else None
+
+    def to_usd_many(
+        self, amounts: Sequence[float] | np.ndarray, currencies: Sequence[str | None]
+    ) -> np.ndarray:
+        """
+        Convert a column of amounts to USD in one vectorized pass.
+
+        Currencies are normalized once per distinct value, not per row.
+
+        Args:
+            amounts: Amounts
+            currencies: Currency of each amount (same length as amounts)
+
+        Returns:
+            USD equivalents as float64; NaN where the currency is unknown
+
+        Raises:
+            ValueError: If amounts and currencies differ in length
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        if len(values) != len(currencies):
+            raise ValueError(
+                f"Got {len(values)} amounts but {len(currencies)} currencies"
+            )
+        if values.size == 0:
+            return values
+
+        labels = np.asarray([currency or "" for currency in currencies], dtype=str)
+        distinct, inverse = np.unique(labels, return_inverse=True)
+        rates = self.table.rates
+        distinct_rates = np.array(
+            [rates.get(normalize_currency(label) or "", np.nan) for label in distinct],
+            dtype=np.float64,
+        )
+        return values / distinct_rates[inverse]
+
+    def refresh(self) -> bool:
+        """
+        Fetch the latest rates now (single-flight).
+
+        Returns:
+            True if the table was replaced, False if no URL is configured,
+            another refresh is in flight or the fetch failed (the current
+            table is kept)
+        """
+        if not self.settings.rates_url or not self._claim_refresh():
+            return False
+        return self._run_refresh()
+
+    # ==========================================
+    # Refresh Methods
+    # ==========================================
+
+    def _is_stale(self, table: FXRateTable) -> bool:
+        """Whether a table is older than the refresh interval."""
+        age = self._clock() - table.as_of.timestamp()
+        return age >= self.settings.refresh_interval_hours * 3600
+
+    def _refresh_if_stale(self) -> None:
+        """Start a background refresh of a stale table unless one is running."""
+        if not self.settings.rates_url or not self._is_stale(self._table):
+            return
+        if self._claim_refresh(retry_after=self.settings.refresh_interval_hours * 3600):
+            threading.Thread(target=self._run_refresh, daemon=True).start()
+
+    def _claim_refresh(self, retry_after: float = 0.0) -> bool:
+        """
+        Claim the single in-flight refresh.
+
+        Args:
+            retry_after: Seconds since the last attempt before trying again
+
+        Returns:
+            True if the caller must run the refresh (see _run_refresh)
+        """
+        with self._state_lock:
+            if self._refreshing or self._clock() - self._last_attempt < retry_after:
+                return False
+            self._refreshing = True
+            self._last_attempt = self._clock()
+            return True
+
+    def _run_refresh(self) -> bool:
+        """Run a claimed refresh; failures keep the current rates."""
+        try:
+            # Another worker process may have refreshed the shared file
+            table = self._read_rate_file()
+            if table is not None and not self._is_stale(table):
+                self._table = table
+                return True
+
+            try:
+                table = self._fetch_rate_table()
+            except ValueError as e:
+                logger.warning("FX rate refresh failed: %s", e)
+                return False
+            self._table = table
+            self._write_rate_file(table)
+            logger.info("Refreshed FX rates: currencies=%d", len(table.rates))
+            return True
+        finally:
+            with self._state_lock:
+                self._refreshing = False
+
+    def _fetch_rate_table(self) -> FXRateTable:
+        """
+        Fetch rates from the configured URL.
+
+        The response must be JSON with a "rates" object of units per 1 unit of
+        its "base" (or "base_code") currency; rates quoted against another
+        base are rebased to USD.
+
+        Returns:
+            FXRateTable: Rates per 1 USD
+
+        Raises:
+            ValueError: If the fetch fails or the response has no usable rates
+        """
+        assert self.settings.rates_url is not None
+        try:
+            response = self._http_get(
+                self.settings.rates_url, timeout=self.settings.fetch_timeout_seconds
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise ValueError(f"Failed to fetch FX rates: {e}") from e
+
+        rates = {
+            code: float(rate)
+            for code, rate in (payload.get("rates") or {}).items()
+            if isinstance(rate, (int, float)) and rate > 0
+        }
+        base = str(payload.get("base") or payload.get("base_code") or "USD").upper()
+        rates[base] = 1.0
+        usd_rate = rates.get("USD")
+        if not usd_rate:
+            raise ValueError(f"FX rates quoted against {base} have no USD rate")
+        return FXRateTable(
+            as_of=datetime.fromtimestamp(self._clock(), tz=timezone.utc),
+            rates={code: rate / usd_rate for code, rate in rates.items()},
+        )
+
+    # ==========================================
+    # Rate File Methods
+    # ==========================================
+
+    def _read_rate_file(self) -> FXRateTable | None:
+        """Read the rate table persisted by any worker process."""
+        if not self.settings.rates_path:
+            return None
+        path = Path(self.settings.rates_path)
+        if not path.exists():
+            return None
+        try:
+            return FXRateTable.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read FX rate file %s: %s", path, e)
+            return None
+
+    def _write_rate_file(self, table: FXRateTable) -> None:
+        """Persist the rate table atomically."""
+        if not self.settings.rates_path:
+            return
+        path = Path(self.settings.rates_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(table.model_dump(mode="json"), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The file is best-effort; memory still holds the rates
+            logger.warning("Failed to write FX rate file %s: %s", path, e)
+
+
+@lru_cache(maxsize=1)
+def get_currency_converter() -> CurrencyConverter:
+    """
+    Return the process-wide currency converter configured from the environment.
+
+    Returns:
+        CurrencyConverter
+    """
+    return CurrencyConverter(CurrencySettings())
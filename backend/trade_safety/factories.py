@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from decimal import Decimal
+from typing import cast
+
 from aioia_core.factories import BaseRepositoryFactory
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from trade_safety.near_duplicates import IndexedCheck, get_near_duplicate_index
+from trade_safety.price_reference import get_price_reference_index
 from trade_safety.repositories.trade_safety_repository import (
     DatabaseTradeSafetyCheckManager,
 )
+from trade_safety.settings import WriteBehindSettings
+from trade_safety.similar_cases import get_similar_case_index
+from trade_safety.write_behind import PendingCheck, WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+# Wait before building an index again after a failed build (e.g. database down)
+INDEX_BUILD_RETRY_SECONDS = 30.0
 
 
 class TradeSafetyCheckManagerFactory(
@@ -20,13 +37,124 @@ class TradeSafetyCheckManagerFactory(
     - create_manager(db_session=None): Deprecated alias for backward compatibility
     """
 
-    def __init__(self, db_session_factory: sessionmaker):
+    def __init__(
+        self,
+        db_session_factory: sessionmaker,
+        write_behind_settings: WriteBehindSettings | None = None,
+    ):
         """Initialize factory with session factory.
 
+        Starts the write-behind buffer shared by the managers when enabled.
+
         Args:
             db_session_factory: SQLAlchemy session factory
+            write_behind_settings: Write-behind settings (default:
+                                   WriteBehindSettings() from environment)
         """
         super().__init__(
             repository_class=DatabaseTradeSafetyCheckManager,
             db_session_factory=db_session_factory,
         )
+        settings = write_behind_settings or WriteBehindSettings()
+        self.write_behind: WriteBehindBuffer | None = None
+        if settings.enabled:
+            self.write_behind = WriteBehindBuffer(self._write_pending, settings)
+            self.write_behind.start()
+
+    def create_repository(
+        self, db_session: Session | None = None
+    ) -> DatabaseTradeSafetyCheckManager:
+        """Create a manager wired to the process-wide in-memory indexes.
+
+        Args:
+            db_session: Database session (default: None, created by the factory)
+
+        Returns:
+            DatabaseTradeSafetyCheckManager instance
+
+        Raises:
+            ValueError: If no session is given and no session factory is configured
+        """
+        if db_session is None:
+            if self.db_session_factory is None:
+                raise ValueError(
+                    "db_session is required when db_session_factory is not configured"
+                )
+            db_session = cast(Session, self.db_session_factory())
+        return DatabaseTradeSafetyCheckManager(
+            db_session,
+            near_duplicate_index=get_near_duplicate_index(),
+            similar_case_index=get_similar_case_index(),
+            price_reference_index=get_price_reference_index(),
+            write_behind=self.write_behind,
+        )
+
+    def start_index_builds(self) -> None:
+        """
+        Build the process-wide in-memory indexes in background threads.
+
+        Building an index scans the table, so it runs once at startup instead
+        of inside the first request; requests skip an index until it is ready.
+        A failed build is retried every INDEX_BUILD_RETRY_SECONDS.
+        """
+        near_duplicate_index = get_near_duplicate_index()
+        if near_duplicate_index is not None:
+            self._start_build(
+                "near-duplicate-index",
+                lambda: near_duplicate_index.ensure_built(self._iter_indexed_checks),
+            )
+        similar_case_index = get_similar_case_index()
+        if similar_case_index is not None:
+            reviewed_only = similar_case_index.settings.reviewed_only
+            self._start_build(
+                "similar-case-index",
+                lambda: similar_case_index.ensure_synced(
+                    lambda: self._iter_indexed_checks(reviewed_only=reviewed_only)
+                ),
+            )
+        price_reference_index = get_price_reference_index()
+        if price_reference_index is not None:
+            self._start_build(
+                "price-reference-index",
+                lambda: price_reference_index.ensure_built(
+                    self._iter_price_observations
+                ),
+            )
+
+    def _start_build(self, name: str, build: Callable[[], None]) -> None:
+        """Run an index build in a daemon thread, retrying until it succeeds."""
+
+        def run() -> None:
+            while True:
+                try:
+                    build()
+                    return
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.exception("Failed to build %s, retrying", name)
+                    time.sleep(INDEX_BUILD_RETRY_SECONDS)
+
+        threading.Thread(target=run, name=name, daemon=True).start()
+
+    def _iter_indexed_checks(
+        self, reviewed_only: bool = False
+    ) -> Iterator[tuple[IndexedCheck, str]]:
+        """Stream indexed fields of stored checks in a session of their own."""
+        assert self.db_session_factory is not None
+        with self.db_session_factory() as db_session:
+            yield from DatabaseTradeSafetyCheckManager(db_session).iter_indexed_checks(
+                reviewed_only=reviewed_only
+            )
+
+    def _iter_price_observations(self) -> Iterator[tuple[str, str, Decimal, str]]:
+        """Stream offered prices of stored checks in a session of their own."""
+        assert self.db_session_factory is not None
+        with self.db_session_factory() as db_session:
+            yield from DatabaseTradeSafetyCheckManager(
+                db_session
+            ).iter_price_observations()
+
+    def _write_pending(self, pending: list[PendingCheck]) -> None:
+        """Write a batch of the write-behind buffer in a session of its own."""
+        assert self.db_session_factory is not None
+        with self.db_session_factory() as db_session:
+            DatabaseTradeSafetyCheckManager(db_session).create_many(pending)
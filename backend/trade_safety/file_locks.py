@@ -0,0 +1,48 @@
+"""
+Exclusive advisory locks on open files, shared between processes.
+
+POSIX systems use flock(2); Windows locks the first byte of the file with
+msvcrt. Either way the lock is released when the file is closed, including
+when the process dies.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import BinaryIO
+
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+
+def lock_file(file: BinaryIO, blocking: bool = True) -> bool:
+    """
+    Take an exclusive lock on an open file.
+
+    Args:
+        file: File opened for writing
+        blocking: Wait until the lock is free (default: True); otherwise give
+                  up right away if another process holds it
+
+    Returns:
+        True if the lock was taken, False if it is held elsewhere and not blocking
+    """
+    if sys.platform == "win32":
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(
+                    file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+                )
+                return True
+            except OSError:
+                # LK_LOCK gives up after 10 attempts; keep waiting
+                if not blocking:
+                    return False
+    try:
+        fcntl.flock(file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
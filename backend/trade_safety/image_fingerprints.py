@@ -0,0 +1,441 @@
+"""
+Perceptual-hash index of trade photos for stolen-image detection.
+
+Scammers reuse the same "proof" photos across many posts. Each post image is
+reduced to a 64-bit difference hash (dHash), which stays nearly identical under
+re-encoding, resizing and small edits. Hashes seen in previous checks are kept
+in a BK-tree, so finding every prior photo within a small Hamming distance
+visits only a fraction of the index instead of comparing against all of it.
+
+Matches from other posts are passed to the analysis prompt as a verified
+signal, so they surface as a risk signal without an extra LLM call.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Generic, TypeVar, cast
+
+from PIL import Image
+from pydantic import BaseModel, Field
+
+from trade_safety.image_proxy import ImageProxy, get_image_proxy
+from trade_safety.settings import ImageFingerprintSettings
+
+logger = logging.getLogger(__name__)
+
+# dHash compares horizontally adjacent pixels of a (HASH_SIZE + 1) x HASH_SIZE image
+HASH_SIZE = 8
+
+ValueT = TypeVar("ValueT")
+
+
+# ==============================================================================
+# Perceptual Hashing
+# ==============================================================================
+
+
+def dhash_from_pixels(rows: Sequence[Sequence[int]]) -> int:
+    """
+    Compute a difference hash from a downscaled grayscale image.
+
+    Each bit is set when a pixel is brighter than its right neighbour.
+
+    Args:
+        rows: HASH_SIZE rows of HASH_SIZE + 1 grayscale pixel values
+
+    Returns:
+        64-bit perceptual hash
+    """
+    value = 0
+    for row in rows:
+        for left, right in zip(row, row[1:]):
+            value = (value << 1) | int(left > right)
+    return value
+
+
+def compute_dhash(image_data: bytes) -> int:
+    """
+    Compute the 64-bit difference hash of an encoded image.
+
+    Args:
+        image_data: Encoded image (JPEG, PNG, WebP, ...)
+
+    Returns:
+        64-bit perceptual hash
+
+    Raises:
+        ValueError: If the image cannot be decoded
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            small = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE))
+            pixels = list(cast(Sequence[int], small.getdata()))
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Failed to decode image: {str(e)}") from e
+
+    width = HASH_SIZE + 1
+    return dhash_from_pixels(
+        [pixels[start : start + width] for start in range(0, len(pixels), width)]
+    )
+
+
+def hamming_distance(left: int, right: int) -> int:
+    """Return the number of differing bits between two hashes."""
+    return (left ^ right).bit_count()
+
+
+# ==============================================================================
+# BK-tree
+# ==============================================================================
+
+
+class _BKNode(Generic[ValueT]):
+    """BK-tree node: one distinct hash with the values stored under it"""
+
+    __slots__ = ("key", "values", "children")
+
+    def __init__(self, key: int, value: ValueT):
+        self.key = key
+        self.values = [value]
+        self.children: dict[int, _BKNode[ValueT]] = {}
+
+
+class BKTree(Generic[ValueT]):
+    """
+    Metric tree over 64-bit hashes with Hamming distance.
+
+    Children are keyed by their distance to the parent; by the triangle
+    inequality a search within `max_distance` of a key only descends into
+    children whose edge distance is within `max_distance` of the parent's
+    distance to the key.
+
+    Example:
+        >>> tree = BKTree()
+        >>> tree.add(0b1011, "a")
+        >>> tree.search(0b1001, max_distance=1)
+        [(1, 11, ['a'])]
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tree."""
+        self._root: _BKNode[ValueT] | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Number of values stored."""
+        return self._size
+
+    def add(self, key: int, value: ValueT) -> None:
+        """
+        Store a value under a hash.
+
+        Args:
+            key: 64-bit hash
+            value: Value to return from searches matching the hash
+        """
+        self._size += 1
+        if self._root is None:
+            self._root = _BKNode(key, value)
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node.key)
+            if distance == 0:
+                node.values.append(value)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(key, value)
+                return
+            node = child
+
+    def search(
+        self, key: int, max_distance: int
+    ) -> list[tuple[int, int, list[ValueT]]]:
+        """
+        Find all stored hashes within a Hamming distance of a key.
+
+        Args:
+            key: 64-bit hash to look up
+            max_distance: Largest Hamming distance to include
+
+        Returns:
+            (distance, hash, values) of each match, closest first
+        """
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node.key)
+            if distance <= max_distance:
+                results.append((distance, node.key, list(node.values)))
+            for edge, child in node.children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+# ==============================================================================
+# Fingerprint Index
+# ==============================================================================
+
+
+class ImageFingerprint(BaseModel):
+    """Perceptual hash of one post image"""
+
+    image_url: str = Field(description="Source image URL")
+    dhash: str = Field(description="64-bit difference hash as 16 hex digits")
+
+
+class ImageSighting(BaseModel):
+    """A fingerprinted image seen in a checked post"""
+
+    post_key: str = Field(description="Input hash of the checked post")
+    image_url: str = Field(description="Source image URL")
+    dhash: str = Field(description="64-bit difference hash as 16 hex digits")
+    seen_at: datetime = Field(description="When the image was first seen")
+
+
+class ImageMatch(BaseModel):
+    """A post image matching an image seen in another post"""
+
+    image_url: str = Field(description="Image of the post being checked")
+    matched_post_key: str = Field(description="Input hash of the earlier post")
+    matched_image_url: str = Field(description="Matching image of the earlier post")
+    distance: int = Field(description="Hamming distance between the hashes")
+    seen_at: datetime = Field(description="When the matching image was seen")
+
+
+class ImageFingerprintIndex:
+    """
+    Index of image fingerprints seen in previous checks.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    get_image_fingerprint_index). With `index_path` set, sightings are appended
+    to a JSONL file and reloaded on startup; sightings recorded by other worker
+    processes become visible after their restart.
+
+    Example:
+        >>> index = get_image_fingerprint_index()
+        >>> fingerprints = index.fingerprint_images(preview.images)
+        >>> matches = index.find_matches(fingerprints, exclude_post_key=post_key)
+        >>> index.add(post_key, fingerprints)
+    """
+
+    def __init__(
+        self,
+        settings: ImageFingerprintSettings | None = None,
+        image_proxy: ImageProxy | None = None,
+        hasher: Callable[[bytes], int] = compute_dhash,
+    ):
+        """
+        Initialize ImageFingerprintIndex.
+
+        Args:
+            settings: Index settings (default: ImageFingerprintSettings() from environment)
+            image_proxy: Proxy used to fetch images (default: process-wide proxy,
+                         so fingerprinting reuses cached thumbnails)
+            hasher: Function hashing encoded images (injectable for tests)
+        """
+        self.settings = settings or ImageFingerprintSettings()
+        self._image_proxy = image_proxy
+        self._hasher = hasher
+        self._tree: BKTree[ImageSighting] = BKTree()
+        self._seen: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._index_path = (
+            Path(self.settings.index_path) if self.settings.index_path else None
+        )
+        self._load()
+
+    def __len__(self) -> int:
+        """Number of sightings in the index."""
+        return len(self._tree)
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def fingerprint_images(self, image_urls: list[str]) -> list[ImageFingerprint]:
+        """
+        Fetch and fingerprint post images.
+
+        Images that are not proxied, cannot be fetched or cannot be decoded are
+        skipped.
+
+        Args:
+            image_urls: Source image URLs
+
+        Returns:
+            Fingerprints of the images that could be hashed
+        """
+        proxy = self._image_proxy or get_image_proxy()
+        fingerprints = []
+        for image_url in image_urls:
+            if not proxy.is_allowed(image_url):
+                continue
+            try:
+                value = self._hasher(proxy.get_thumbnail(image_url).data)
+            except ValueError as e:
+                logger.warning("Failed to fingerprint image %s: %s", image_url, e)
+                continue
+            fingerprints.append(
+                ImageFingerprint(image_url=image_url, dhash=f"{value:016x}")
+            )
+        return fingerprints
+
+    def find_matches(
+        self,
+        fingerprints: list[ImageFingerprint],
+        exclude_post_key: str | None = None,
+    ) -> list[ImageMatch]:
+        """
+        Find images of other posts matching the given fingerprints.
+
+        Args:
+            fingerprints: Fingerprints of the post being checked
+            exclude_post_key: Post whose own earlier sightings are ignored
+                              (re-checking a post is not image reuse)
+
+        Returns:
+            Matches, closest first per image
+        """
+        matches: list[ImageMatch] = []
+        with self._lock:
+            for fingerprint in fingerprints:
+                results = self._tree.search(
+                    int(fingerprint.dhash, 16), self.settings.max_distance
+                )
+                for distance, _, sightings in results:
+                    matches.extend(
+                        ImageMatch(
+                            image_url=fingerprint.image_url,
+                            matched_post_key=sighting.post_key,
+                            matched_image_url=sighting.image_url,
+                            distance=distance,
+                            seen_at=sighting.seen_at,
+                        )
+                        for sighting in sightings
+                        if sighting.post_key != exclude_post_key
+                    )
+        return matches
+
+    def add(self, post_key: str, fingerprints: list[ImageFingerprint]) -> None:
+        """
+        Record the images of a checked post.
+
+        Sightings already recorded for the post are skipped.
+
+        Args:
+            post_key: Input hash of the checked post
+            fingerprints: Fingerprints of the post images
+        """
+        now = datetime.now(timezone.utc)
+        added = []
+        with self._lock:
+            for fingerprint in fingerprints:
+                sighting = ImageSighting(
+                    post_key=post_key,
+                    image_url=fingerprint.image_url,
+                    dhash=fingerprint.dhash,
+                    seen_at=now,
+                )
+                if self._insert(sighting):
+                    added.append(sighting)
+            self._append(added)
+
+    # ==========================================
+    # Storage Methods
+    # ==========================================
+
+    def _insert(self, sighting: ImageSighting) -> bool:
+        """Insert a sighting unless already known (lock held)."""
+        seen_key = (sighting.post_key, sighting.dhash)
+        if seen_key in self._seen:
+            return False
+        self._seen.add(seen_key)
+        self._tree.add(int(sighting.dhash, 16), sighting)
+        return True
+
+    def _load(self) -> None:
+        """Load persisted sightings."""
+        if self._index_path is None or not self._index_path.exists():
+            return
+        try:
+            with self._index_path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._insert(ImageSighting.model_validate_json(line))
+        except (OSError, ValueError) as e:
+            # Keep what was loaded; a truncated last line is expected after a crash
+            logger.warning(
+                "Failed to load image fingerprint index %s: %s", self._index_path, e
+            )
+        logger.info("Loaded %d image fingerprints", len(self._tree))
+
+    def _append(self, sightings: list[ImageSighting]) -> None:
+        """Append new sightings to the index file (lock held)."""
+        if self._index_path is None or not sightings:
+            return
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._index_path.open("a", encoding="utf-8") as f:
+                for sighting in sightings:
+                    f.write(sighting.model_dump_json() + "\n")
+        except OSError as e:
+            # Persistence is best-effort; memory still holds the sightings
+            logger.warning(
+                "Failed to write image fingerprint index %s: %s", self._index_path, e
+            )
+
+
+def image_reuse_note(matches: list[ImageMatch]) -> str | None:
+    """
+    Describe image matches as a verified signal for the analysis prompt.
+
+    Args:
+        matches: Matches of the post images
+
+    Returns:
+        Prompt note, or None without matches
+    """
+    if not matches:
+        return None
+
+    reused_images = {match.image_url for match in matches}
+    other_posts = {match.matched_post_key for match in matches}
+    first_seen = min(match.seen_at for match in matches)
+    return (
+        f"Image check: {len(reused_images)} of this post's photos also appeared in "
+        f"{len(other_posts)} earlier trade post(s) checked on our service "
+        f"(first seen {first_seen:%Y-%m-%d}). Photos reused across posts are a "
+        "strong sign of stolen 'proof' photos; report this as a HIGH severity "
+        "content risk signal."
+    )
+
+
+@lru_cache(maxsize=1)
+def get_image_fingerprint_index() -> ImageFingerprintIndex | None:
+    """
+    Return the process-wide fingerprint index configured from the environment.
+
+    Returns:
+        ImageFingerprintIndex, or None if disabled
+    """
+    settings = ImageFingerprintSettings()
+    if not settings.enabled:
+        return None
+    return ImageFingerprintIndex(settings)
@@ -0,0 +1,429 @@
+"""
+Image proxy and thumbnail cache for post preview images.
+
+PostPreview.images point at platform CDNs (pbs.twimg.com, i.redd.it) that are
+slow or blocked for some users. The proxy fetches an allowed image once,
+resizes it into a thumbnail, and stores it on local disk under its content
+hash. Thumbnails of a source URL never change, so they are served with
+long-lived cache headers and the content hash as ETag.
+
+Disk usage is bounded by an LRU budget: reads refresh a file's mtime and the
+least recently used files are evicted once the budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import requests
+from PIL import Image, ImageOps
+from pydantic import BaseModel, Field
+
+from trade_safety.settings import ImageProxySettings
+
+logger = logging.getLogger(__name__)
+
+# Cache-Control of proxied thumbnails (content of a source URL never changes)
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Eviction frees space down to this share of the budget to avoid evicting per write
+_EVICTION_TARGET_RATIO = 0.9
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+# Redirects are followed by hand so every hop is checked against allowed_hosts
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 3
+
+
+class ImageFetchError(ValueError):
+    """Raised when a source image cannot be fetched or decoded.
+
+    Subclasses ValueError like other fetch errors; callers can map it to an
+    upstream error instead of a validation error.
+    """
+
+
+class ProxiedImage(BaseModel):
+    """Thumbnail served by the image proxy"""
+
+    content_hash: str = Field(description="SHA-256 of the thumbnail bytes")
+    content_type: str = Field(description="MIME type of the thumbnail")
+    data: bytes = Field(description="Thumbnail bytes")
+
+
+class _IndexEntry(BaseModel):
+    """Source URL -> thumbnail mapping stored on disk"""
+
+    content_hash: str
+    content_type: str
+
+
+class ImageProxy:
+    """
+    Fetch, resize and cache preview images on local disk.
+
+    Thread-safe; a single instance is meant to be shared process-wide
+    (see get_image_proxy). Multiple worker processes may share the cache
+    directory.
+
+    Example:
+        >>> proxy = get_image_proxy()
+        >>> image = proxy.get_thumbnail("https://pbs.twimg.com/media/abc.jpg")
+        >>> image.content_type, len(image.data)
+        ('image/webp', 18342)
+    """
+
+    def __init__(
+        self,
+        settings: ImageProxySettings | None = None,
+        http_get: Callable[..., requests.Response] = requests.get,
+    ):
+        """
+        Initialize ImageProxy.
+
+        Args:
+            settings: Proxy settings (default: ImageProxySettings() from environment)
+            http_get: Function fetching source images (injectable for tests)
+        """
+        self.settings = settings or ImageProxySettings()
+        self._http_get = http_get
+        self._cache_dir = (
+            Path(self.settings.cache_dir)
+            if self.settings.cache_dir
+            else Path(tempfile.gettempdir()) / "trade_safety_images"
+        )
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._cache_bytes: int | None = None
+        self._executor = (
+            ThreadPoolExecutor(
+                max_workers=self.settings.prewarm_workers,
+                thread_name_prefix="image-prewarm",
+            )
+            if self.settings.prewarm_workers > 0
+            else None
+        )
+        logger.debug(
+            "Initialized ImageProxy: cache_dir=%s, max_cache_bytes=%d",
+            self._cache_dir,
+            self.settings.max_cache_bytes,
+        )
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def get_thumbnail(self, url: str) -> ProxiedImage:
+        """
+        Get the thumbnail of an image, fetching and caching it on miss.
+
+        Args:
+            url: Source image URL on an allowed host
+
+        Returns:
+            ProxiedImage: Thumbnail bytes, MIME type and content hash
+
+        Raises:
+            ValueError: If the URL is not an https URL on an allowed host
+            ImageFetchError: If the image cannot be fetched or decoded
+        """
+        self.validate_url(url)
+
+        cached = self._read_cached(url)
+        if cached is not None:
+            logger.debug("Image cache hit: %s", url)
+            return cached
+
+        source, _ = self._fetch_source(url)
+        data, content_type = self._make_thumbnail(source)
+        content_hash = hashlib.sha256(data).hexdigest()
+        self._store(
+            url, _IndexEntry(content_hash=content_hash, content_type=content_type), data
+        )
+
+        logger.info(
+            "Cached thumbnail: url=%s, source_bytes=%d, thumbnail_bytes=%d",
+            url,
+            len(source),
+            len(data),
+        )
+        return ProxiedImage(
+            content_hash=content_hash, content_type=content_type, data=data
+        )
+
+    def prewarm(self, urls: list[str]) -> None:
+        """
+        Build thumbnails of images in the background.
+
+        Called when a post is previewed, so the client's thumbnail requests
+        that follow are served from the cache. Disallowed and already cached
+        URLs are skipped; failures are only logged.
+
+        Args:
+            urls: Source image URLs
+        """
+        if self._executor is None:
+            return
+        for url in urls:
+            if self.is_allowed(url) and not self._index_file(url).exists():
+                self._executor.submit(self._prewarm_one, url)
+
+    def is_allowed(self, url: str) -> bool:
+        """
+        Check if a URL may be proxied (https on an allowed host).
+
+        Args:
+            url: Source image URL
+
+        Returns:
+            True if the URL may be proxied
+        """
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        return parsed.scheme == "https" and any(
+            host == allowed or host.endswith(f".{allowed}")
+            for allowed in self.settings.allowed_hosts
+        )
+
+    def validate_url(self, url: str) -> None:
+        """
+        Validate that a URL may be proxied.
+
+        Args:
+            url: Source image URL
+
+        Raises:
+            ValueError: If the URL is not an https URL on an allowed host
+        """
+        if not self.is_allowed(url):
+            raise ValueError(f"Image URL not allowed for proxying: {url[:100]}")
+
+    # ==========================================
+    # Fetch Methods
+    # ==========================================
+
+    def _prewarm_one(self, url: str) -> None:
+        """Build one thumbnail, logging failures (runs in the pre-warm pool)."""
+        try:
+            self.get_thumbnail(url)
+        except ValueError as e:
+            logger.warning("Failed to pre-warm thumbnail %s: %s", url, e)
+
+    def _fetch_source(self, url: str) -> tuple[bytes, str]:
+        """
+        Fetch a source image, enforcing the size limit while streaming.
+
+        Redirects are followed only to URLs that may be proxied themselves,
+        so an allowed host cannot point the proxy anywhere else.
+
+        Returns:
+            (image bytes, MIME type)
+
+        Raises:
+            ImageFetchError: If fetching fails, redirects to a URL that may not
+                             be proxied, the response is not an image, or it
+                             exceeds max_source_bytes
+        """
+        max_bytes = self.settings.max_source_bytes
+        try:
+            response = self._follow_redirects(url)
+            try:
+                response.raise_for_status()
+                content_type = (
+                    response.headers.get("Content-Type", "").split(";")[0].strip()
+                )
+                if not content_type.startswith("image/"):
+                    raise ImageFetchError(
+                        f"Source is not an image ({content_type or 'unknown type'})"
+                    )
+
+                buffer = bytearray()
+                for chunk in response.iter_content(chunk_size=_READ_CHUNK_BYTES):
+                    buffer.extend(chunk)
+                    if len(buffer) > max_bytes:
+                        raise ImageFetchError(
+                            f"Source image exceeds {max_bytes} bytes: {url[:100]}"
+                        )
+            finally:
+                response.close()
+        except requests.exceptions.RequestException as e:
+            raise ImageFetchError(f"Failed to fetch image: {str(e)}") from e
+
+        return bytes(buffer), content_type
+
+    def _follow_redirects(self, url: str) -> requests.Response:
+        """Request a source image, following only redirects to allowed URLs."""
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._http_get(
+                url,
+                timeout=self.settings.fetch_timeout_seconds,
+                stream=True,
+                allow_redirects=False,
+            )
+            location = response.headers.get("Location")
+            if response.status_code not in _REDIRECT_STATUSES or not location:
+                return response
+            response.close()
+            url = urljoin(url, location)
+            if not self.is_allowed(url):
+                raise ImageFetchError(
+                    f"Image redirected to a URL not allowed for proxying: {url[:100]}"
+                )
+        raise ImageFetchError(f"Too many redirects fetching image: {url[:100]}")
+
+    def _make_thumbnail(self, source: bytes) -> tuple[bytes, str]:
+        """
+        Resize an image to fit thumbnail_size, encoded as WebP.
+
+        Returns:
+            (thumbnail bytes, MIME type)
+
+        Raises:
+            ImageFetchError: If the image cannot be decoded
+        """
+        size = self.settings.thumbnail_size
+        try:
+            with Image.open(io.BytesIO(source)) as opened:
+                image = ImageOps.exif_transpose(opened)
+                image.thumbnail((size, size))
+                if image.mode not in {"RGB", "RGBA"}:
+                    image = image.convert("RGBA")
+                output = io.BytesIO()
+                image.save(output, format="WEBP", quality=80)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ImageFetchError(f"Failed to decode image: {str(e)}") from e
+
+        return output.getvalue(), "image/webp"
+
+    # ==========================================
+    # Disk Cache Methods
+    # ==========================================
+
+    def _index_file(self, url: str) -> Path:
+        """Return the index file mapping a source URL to its thumbnail."""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._cache_dir / f"url_{digest}.json"
+
+    def _image_file(self, content_hash: str) -> Path:
+        """Return the file storing a thumbnail by content hash."""
+        return self._cache_dir / f"img_{content_hash}"
+
+    def _read_cached(self, url: str) -> ProxiedImage | None:
+        """Read a cached thumbnail, refreshing its LRU position."""
+        index_file = self._index_file(url)
+        try:
+            entry = _IndexEntry.model_validate_json(
+                index_file.read_text(encoding="utf-8")
+            )
+            image_file = self._image_file(entry.content_hash)
+            data = image_file.read_bytes()
+            os.utime(index_file)
+            os.utime(image_file)
+        except FileNotFoundError:
+            # Never cached, or evicted (possibly by another worker process)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read image cache for %s: %s", url, e)
+            return None
+
+        return ProxiedImage(
+            content_hash=entry.content_hash,
+            content_type=entry.content_type,
+            data=data,
+        )
+
+    def _store(self, url: str, entry: _IndexEntry, data: bytes) -> None:
+        """Store a thumbnail and its index entry, then enforce the budget."""
+        index_json = json.dumps(entry.model_dump()).encode("utf-8")
+        try:
+            # Identical images from different URLs share one file
+            image_file = self._image_file(entry.content_hash)
+            added = 0
+            if not image_file.exists():
+                self._write_atomic(image_file, data)
+                added += len(data)
+            self._write_atomic(self._index_file(url), index_json)
+            added += len(index_json)
+        except OSError as e:
+            # The cache is best-effort; the caller still gets the thumbnail
+            logger.warning("Failed to write image cache for %s: %s", url, e)
+            return
+
+        self._account(added)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file atomically (write + rename)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _account(self, added: int) -> None:
+        """Track cache size and evict least recently used files over budget."""
+        with self._lock:
+            if self._cache_bytes is None:
+                # First write of this process: size includes the new files
+                self._cache_bytes = self._scan_cache_bytes()
+            else:
+                self._cache_bytes += added
+
+            if self._cache_bytes > self.settings.max_cache_bytes:
+                self._cache_bytes = self._evict()
+
+    def _cache_files(self) -> list[tuple[float, int, Path]]:
+        """List cache files as (mtime, size, path)."""
+        files = []
+        for path in self._cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scan_cache_bytes(self) -> int:
+        """Sum the size of all cache files."""
+        return sum(size for _, size, _ in self._cache_files())
+
+    def _evict(self) -> int:
+        """
+        Delete least recently used files until the cache fits the budget.
+
+        Returns:
+            Cache size after eviction
+        """
+        files = sorted(self._cache_files())
+        total = sum(size for _, size, _ in files)
+        target = self.settings.max_cache_bytes * _EVICTION_TARGET_RATIO
+
+        evicted = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass  # Evicted concurrently by another worker process
+            total -= size
+            evicted += 1
+
+        logger.info("Evicted %d image cache files, %d bytes remain", evicted, total)
+        return total
+
+
+@lru_cache(maxsize=1)
+def get_image_proxy() -> ImageProxy:
+    """Return the process-wide image proxy configured from the environment."""
+    return ImageProxy()
@@ -0,0 +1,91 @@
+"""
+Input normalization for trade safety checks.
+
+Computes a stable content hash for check inputs so repeated checks of the same
+post can be found with an index lookup instead of scanning `input_text`.
+Links to supported platforms hash by platform + post id, so every URL form of
+the same post (see trade_safety.url_canonicalization) shares one hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from urllib.parse import urlparse
+
+from trade_safety.url_canonicalization import canonicalize_url
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL into a canonical string.
+
+    Lowercases scheme and host, drops the "www." prefix, query string, fragment
+    and trailing slash (tracking parameters such as `?s=20` never change the post).
+
+    Args:
+        url: HTTP(S) URL
+
+    Returns:
+        Canonical URL string
+
+    Examples:
+        >>> normalize_url("https://www.Reddit.com/r/kpop/comments/abc/?utm_source=share")
+        "https://reddit.com/r/kpop/comments/abc"
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower().removeprefix("www.")
+    path = parsed.path.rstrip("/")
+    return f"{parsed.scheme.lower()}://{host}{path}"
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize free-form post text for hashing.
+
+    Applies NFKC normalization (full-width characters, compatibility jamo),
+    case folding and whitespace collapsing.
+
+    Args:
+        text: Trade post text
+
+    Returns:
+        Normalized text
+    """
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def normalize_input(input_text: str) -> str:
+    """
+    Normalize a check input (URL or text) into its canonical form.
+
+    Args:
+        input_text: Trade post URL or text
+
+    Returns:
+        Platform post key for supported post links (e.g. "twitter:123"),
+        canonical URL for other links, normalized text otherwise
+    """
+    text = input_text.strip()
+    parsed = urlparse(text)
+    if parsed.scheme in {"http", "https"} and parsed.netloc:
+        post = canonicalize_url(text)
+        return post.key if post else normalize_url(text)
+    return normalize_text(text)
+
+
+def compute_input_hash(input_text: str) -> str:
+    """
+    Compute the deduplication hash of a check input.
+
+    Args:
+        input_text: Trade post URL or text
+
+    Returns:
+        SHA-256 hex digest (64 chars) of the normalized input
+    """
+    return hashlib.sha256(normalize_input(input_text).encode("utf-8")).hexdigest()
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from trade_safety.schemas import (
+    CheckListFilters,
     TradeSafetyCheck,
     TradeSafetyCheckCreate,
+    TradeSafetyCheckSummary,
     TradeSafetyCheckUpdate,
 )
 
@@ -56,3 +59,41 @@ class TradeSafetyCheckManager(ABC):
         Returns:
             Updated trade safety check if found, None otherwise
         """
+
+    @abstractmethod
+    def find_reusable_check(
+        self, input_hash: str, output_language: str, since: datetime
+    ) -> TradeSafetyCheck | None:
+        """
+        Find the most recent check of the same input created after `since`.
+
+        Args:
+            input_hash: Hash of the normalized input
+            output_language: Language the analysis must be written in
+            since: Oldest creation time that is still reusable
+
+        Returns:
+            Most recent matching check if found, None otherwise
+        """
+
+    @abstractmethod
+    def list_summaries(
+        self,
+        filters: CheckListFilters | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[TradeSafetyCheckSummary], str | None]:
+        """
+        List checks newest first, one page at a time.
+
+        Args:
+            filters: Server-side filters
+            limit: Maximum checks per page
+            cursor: Cursor returned with the previous page (None for the first)
+
+        Returns:
+            (checks of the page, cursor of the next page or None on the last)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
@@ -1,8 +1,33 @@
 from datetime import datetime
 
-from aioia_core.models import BaseModel
-from sqlalchemy import JSON, Boolean, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from aioia_core.models import Base, BaseModel
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from trade_safety.analysis_versions import (
+    ANALYSIS_SCHEMA_VERSION,
+    LEGACY_ANALYSIS_SCHEMA_VERSION,
+)
+
+
+def _unless_postgresql(*_args, dialect, **_kwargs) -> bool:
+    """DDL condition excluding PostgreSQL."""
+    return dialect.name != "postgresql"
 
 
 class DBTradeSafetyCheck(BaseModel):
@@ -13,17 +38,62 @@ class DBTradeSafetyCheck(BaseModel):
         id (str): Primary key, unique identifier (inherited from BaseModel)
         user_id (str | None): Foreign key to user_profiles, None for guest users
         input_text (str): The trade post text or URL provided by user
-        llm_analysis (dict): LLM analysis result in JSON format
+        input_hash (str | None): Hash of the normalized input for deduplication
+        output_language (str | None): Language the analysis was written in
+        platform (str | None): Platform of the post (URL inputs only)
+        author (str | None): Normalized post author (URL inputs only)
+        llm_analysis (dict | None): LLM analysis result in JSON format (JSONB on
+            PostgreSQL), None when stored compressed
+        llm_analysis_zstd (bytes | None): llm_analysis as a zstd frame (see
+            trade_safety.analysis_codec), None when stored as JSON
+        offered_price_usd (float | None): USD equivalent of the offered price
+        currency (str | None): Currency of the offered price
+        max_risk_severity (str | None): Highest severity among the risk signals
+        review_priority (int): Expert review priority (higher is reviewed first)
+        review_claimed_by (str | None): Expert holding the review lease
+        review_claimed_until (datetime | None): When the review lease expires
+        risk_signals (list[DBRiskSignal]): Category and severity of each risk signal
+        schema_version (int): Schema version llm_analysis was written with
         safe_score (int): Safety score from 0-100 (higher is safer)
         expert_advice (str | None): Additional advice added by expert
         expert_reviewed (bool): Whether expert has reviewed this check
         expert_reviewed_at (datetime | None): When expert reviewed
         expert_reviewed_by (str | None): ID of expert who reviewed
+        expert_advice_source_id (str | None): Reviewed check the advice was
+            copied from (None if reviewed directly)
         created_at (datetime): When the check was created (inherited)
         updated_at (datetime): When the check was last updated (inherited)
     """
 
     __tablename__ = "trade_safety_checks"
+    __table_args__ = (
+        # Keyset pagination of the admin list, overall and by review status
+        Index("ix_trade_safety_checks_created_at_id", "created_at", "id"),
+        Index(
+            "ix_trade_safety_checks_expert_reviewed_created_at_id",
+            "expert_reviewed",
+            "created_at",
+            "id",
+        ),
+        # Next check of the review queue: pending checks by priority, oldest first
+        Index(
+            "ix_trade_safety_checks_review_queue",
+            text("review_priority DESC"),
+            "created_at",
+            postgresql_where=text("NOT expert_reviewed"),
+            sqlite_where=text("expert_reviewed = 0"),
+        ),
+        Index(
+            "ix_trade_safety_checks_llm_analysis",
+            "llm_analysis",
+            postgresql_using="gin",
+            postgresql_ops={"llm_analysis": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        CheckConstraint(
+            "llm_analysis IS NOT NULL OR llm_analysis_zstd IS NOT NULL",
+            name="analysis_stored",
+        ),
+    )
 
     # External user ID from parent application (no FK for open-source portability)
     user_id: Mapped[str | None] = mapped_column(
@@ -32,15 +102,203 @@ class DBTradeSafetyCheck(BaseModel):
         index=True,
     )
     input_text: Mapped[str] = mapped_column(Text, nullable=False)
-    llm_analysis: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # SHA-256 of the normalized input (see trade_safety.input_normalization)
+    input_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, index=True
+    )
+    output_language: Mapped[str | None] = mapped_column(
+        String(8), nullable=True, index=True
+    )
+    platform: Mapped[str | None] = mapped_column(String(16), nullable=True, index=True)
+    author: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    llm_analysis: Mapped[dict | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
+    llm_analysis_zstd: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Normalized from llm_analysis.price_analysis at write time for analytics
+    offered_price_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Copied from llm_analysis at write time so filters never decode the JSON
+    currency: Mapped[str | None] = mapped_column(String(3), nullable=True, index=True)
+    max_risk_severity: Mapped[str | None] = mapped_column(
+        String(8), nullable=True, index=True
+    )
+    review_priority: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    review_claimed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    review_claimed_until: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+    risk_signals: Mapped[list["DBRiskSignal"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    # Rows written before versioning existed default to the legacy version
+    schema_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=ANALYSIS_SCHEMA_VERSION,
+        server_default=str(LEGACY_ANALYSIS_SCHEMA_VERSION),
+    )
     safe_score: Mapped[int] = mapped_column(Integer, nullable=False)
 
     # Expert review fields
     expert_advice: Mapped[str | None] = mapped_column(Text, nullable=True)
     expert_reviewed: Mapped[bool] = mapped_column(
-        Boolean, nullable=False, default=False, server_default="false", index=True
+        Boolean, nullable=False, default=False, server_default="false"
     )
     expert_reviewed_at: Mapped[datetime | None] = mapped_column(
         nullable=True, default=None
     )
     expert_reviewed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Reviewed check whose advice was copied here (None if reviewed directly)
+    expert_advice_source_id: Mapped[str | None] = mapped_column(
+        String, nullable=True, index=True
+    )
+
+
+class DBRiskSignal(Base):
+    """
+    Category and severity of one risk signal of a check, for indexed filtering.
+
+    Attributes:
+        id (int): Primary key
+        check_id (str): Check the signal belongs to
+        category (str): Risk category
+        severity (str): Risk severity
+    """
+
+    __tablename__ = "trade_safety_risk_signals"
+    __table_args__ = (
+        # A partitioned PostgreSQL checks table has no unique key on id alone
+        # to reference; triggers enforce the reference there instead (see
+        # migration d9a4c2e6f813), and signal rows of dropped partitions are
+        # deleted by trade_safety.retention
+        ForeignKeyConstraint(
+            ["check_id"], ["trade_safety_checks.id"], ondelete="CASCADE"
+        ).ddl_if(callable_=_unless_postgresql),
+        Index(
+            "ix_trade_safety_risk_signals_category_severity",
+            "category",
+            "severity",
+            "check_id",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    check_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    category: Mapped[str] = mapped_column(String(16), nullable=False)
+    severity: Mapped[str] = mapped_column(String(8), nullable=False)
+
+
+class DBAuthorReputation(Base):
+    """
+    Aggregated history of a post author, updated incrementally per check.
+
+    Attributes:
+        platform (str): Platform of the author (primary key)
+        author (str): Normalized author username (primary key)
+        check_count (int): Checks of posts by the author
+        risky_check_count (int): Checks scored below the risky score threshold
+        safe_score_sum (int): Sum of safety scores (for the average)
+        min_safe_score (int | None): Lowest safety score
+        reviewed_count (int): Checks reviewed by an expert
+        reviewed_risky_count (int): Reviewed checks below the risky threshold
+        first_seen_at (datetime): When the author was first checked
+        last_seen_at (datetime): When the author was last checked
+    """
+
+    __tablename__ = "trade_safety_author_reputations"
+
+    platform: Mapped[str] = mapped_column(String(16), primary_key=True)
+    author: Mapped[str] = mapped_column(String(255), primary_key=True)
+    check_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risky_check_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    safe_score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    min_safe_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reviewed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reviewed_risky_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DBExpertAdvice(Base):
+    """
+    Latest expert advice per normalized input, attached to new checks of it.
+
+    Attributes:
+        input_hash (str): Hash of the normalized input (primary key)
+        check_id (str): Check the expert reviewed
+        expert_advice (str): Expert advice text
+        expert_reviewed_at (datetime | None): When the expert reviewed
+        expert_reviewed_by (str | None): ID of the expert who reviewed
+        updated_at (datetime): When the advice was last recorded
+    """
+
+    __tablename__ = "trade_safety_expert_advice"
+
+    input_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    check_id: Mapped[str] = mapped_column(String, nullable=False)
+    expert_advice: Mapped[str] = mapped_column(Text, nullable=False)
+    expert_reviewed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    expert_reviewed_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DBAnalysisDictionary(Base):
+    """
+    zstd dictionary trained on stored analyses of one output language.
+
+    Dictionaries are never deleted: compressed analyses name the dictionary
+    they were written with and stay readable after newer ones are trained.
+
+    Attributes:
+        dict_id (int): zstd dictionary ID written in frame headers, derived
+            from the content (primary key)
+        output_language (str): Language of the analyses it was trained on
+        data (bytes): Dictionary content
+        sample_count (int): Analyses it was trained on
+        created_at (datetime): When it was trained
+    """
+
+    __tablename__ = "trade_safety_analysis_dictionaries"
+
+    dict_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=False
+    )
+    output_language: Mapped[str] = mapped_column(String(8), nullable=False, index=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DBCheckRollup(Base):
+    """
+    Check counts per time bucket and dimension, updated incrementally per check.
+
+    Every check increments one row per granularity with risk_category "*"
+    (all checks) and one row per risk category among its signals.
+
+    Attributes:
+        granularity (str): "hour" or "day" (primary key)
+        bucket_start (datetime): Start of the UTC time bucket (primary key)
+        platform (str): Platform of the post, "" for text inputs (primary key)
+        output_language (str): Language of the analysis, "" if unknown (primary key)
+        score_bucket (int): Safety score rounded down to the bucket size (primary key)
+        risk_category (str): Risk category of a signal, "*" for all checks
+            (primary key)
+        check_count (int): Checks in the bucket
+        safe_score_sum (int): Sum of safety scores (for averages)
+    """
+
+    __tablename__ = "trade_safety_check_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    platform: Mapped[str] = mapped_column(String(16), primary_key=True)
+    output_language: Mapped[str] = mapped_column(String(8), primary_key=True)
+    score_bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    risk_category: Mapped[str] = mapped_column(String(16), primary_key=True)
+    check_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    safe_score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,362 @@
+"""
+MinHash/LSH index of near-duplicate trade post texts.
+
+Scam templates get lightly edited and reposted, so the exact input hash (see
+trade_safety.input_normalization) misses them. Each text input is reduced to
+a MinHash signature of its character shingles; signatures are split into LSH
+bands, and texts sharing any band bucket become candidates whose similarity is
+estimated from their signatures. A query touches a handful of buckets instead
+of comparing against every stored check.
+
+The index lives in memory per process. It is updated incrementally when checks
+are created or reviewed and can be rebuilt from the table at any time.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import zlib
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from trade_safety.input_normalization import normalize_text
+from trade_safety.schemas import TradeSafetyCheck
+from trade_safety.settings import NearDuplicateSettings
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Fixed seed: signatures must be identical across processes and restarts
+_PERMUTATION_SEED = 1
+
+
+class IndexedCheck(BaseModel):
+    """Check metadata kept in the near-duplicate index"""
+
+    check_id: str = Field(description="Check ID")
+    output_language: str | None = Field(None, description="Language of the analysis")
+    safe_score: int = Field(description="Safety score of the check")
+    expert_advice: str | None = Field(None, description="Expert advice, if reviewed")
+    expert_reviewed: bool = Field(False, description="Whether an expert reviewed it")
+    created_at: datetime = Field(description="When the check was created")
+
+    @classmethod
+    def from_check(cls, check: TradeSafetyCheck) -> IndexedCheck:
+        """Build index metadata from a stored check."""
+        return cls(
+            check_id=check.id,
+            output_language=check.output_language,
+            safe_score=check.safe_score,
+            expert_advice=check.expert_advice,
+            expert_reviewed=check.expert_reviewed,
+            created_at=check.created_at,
+        )
+
+
+class NearDuplicate(IndexedCheck):
+    """A stored check whose text is a near duplicate of the query"""
+
+    similarity: float = Field(description="Estimated Jaccard similarity (0-1)")
+
+
+def is_indexable(input_text: str) -> bool:
+    """Return True for text inputs (URL inputs are deduplicated by input hash)."""
+    parsed = urlparse(input_text.strip())
+    return not (parsed.scheme in {"http", "https"} and parsed.netloc)
+
+
+class MinHasher:
+    """
+    MinHash signatures of character shingles, computed with NumPy.
+
+    Example:
+        >>> hasher = MinHasher(num_perm=64, shingle_size=5)
+        >>> sig_a = hasher.signature("급처분 포카 양도합니다 DM 주세요")
+        >>> sig_b = hasher.signature("급처분 포카 양도해요 DM 주세요")
+        >>> MinHasher.similarity(sig_a, sig_b)
+        0.421875
+    """
+
+    def __init__(self, num_perm: int, shingle_size: int):
+        """
+        Initialize MinHasher.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            shingle_size: Characters per shingle
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(_PERMUTATION_SEED)
+        # a, b < 2^31 keep a * x + b below 2^64 for 32-bit x
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set[str]:
+        """
+        Split normalized text into overlapping character shingles.
+
+        Args:
+            text: Post text
+
+        Returns:
+            Set of shingles (the whole text if shorter than one shingle)
+        """
+        normalized = normalize_text(text)
+        if len(normalized) <= self.shingle_size:
+            return {normalized} if normalized else set()
+        return {
+            normalized[start : start + self.shingle_size]
+            for start in range(len(normalized) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Post text
+
+        Returns:
+            uint32 array of length num_perm, or None for empty text
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # (shingles x permutations) hash matrix, minimum per permutation
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        """Estimate Jaccard similarity as the share of equal signature slots."""
+        return float(np.count_nonzero(left == right)) / len(left)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures of stored check texts.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    get_near_duplicate_index), built in the background at startup (see
+    TradeSafetyCheckManagerFactory.start_index_builds). Checks created by
+    other worker processes are picked up by the next rebuild.
+
+    Example:
+        >>> index = get_near_duplicate_index()
+        >>> index.ensure_built(manager.iter_indexed_checks)
+        >>> index.is_ready
+        True
+        >>> duplicates = index.query("급처분 포카 양도합니다 DM 주세요")
+    """
+
+    def __init__(self, settings: NearDuplicateSettings | None = None):
+        """
+        Initialize NearDuplicateIndex.
+
+        Args:
+            settings: Index settings (default: NearDuplicateSettings() from environment)
+
+        Raises:
+            ValueError: If num_perm is not divisible by bands
+        """
+        self.settings = settings or NearDuplicateSettings()
+        if self.settings.num_perm % self.settings.bands != 0:
+            raise ValueError(
+                f"num_perm ({self.settings.num_perm}) must be divisible by "
+                f"bands ({self.settings.bands})"
+            )
+
+        self._hasher = MinHasher(self.settings.num_perm, self.settings.shingle_size)
+        self._rows_per_band = self.settings.num_perm // self.settings.bands
+        self._signatures: dict[str, np.ndarray] = {}
+        self._entries: dict[str, IndexedCheck] = {}
+        self._buckets: list[dict[bytes, set[str]]] = [
+            {} for _ in range(self.settings.bands)
+        ]
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built = False
+
+    def __len__(self) -> int:
+        """Number of indexed checks."""
+        return len(self._entries)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been built from the stored checks."""
+        return self._built
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def query(self, input_text: str) -> list[NearDuplicate]:
+        """
+        Find stored checks whose text is a near duplicate of the input.
+
+        Args:
+            input_text: Trade post text
+
+        Returns:
+            Near duplicates at or above similarity_threshold, most similar first
+            (at most max_results; empty for URL inputs)
+        """
+        if not is_indexable(input_text):
+            return []
+        signature = self._hasher.signature(input_text)
+        if signature is None:
+            return []
+
+        with self._lock:
+            candidates: set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            results = []
+            for check_id in candidates:
+                similarity = MinHasher.similarity(signature, self._signatures[check_id])
+                if similarity >= self.settings.similarity_threshold:
+                    results.append(
+                        NearDuplicate(
+                            **self._entries[check_id].model_dump(),
+                            similarity=similarity,
+                        )
+                    )
+
+        results.sort(key=lambda result: result.similarity, reverse=True)
+        return results[: self.settings.max_results]
+
+    def add(self, entry: IndexedCheck, input_text: str) -> None:
+        """
+        Index a check, or refresh the metadata of an indexed one.
+
+        Args:
+            entry: Check metadata
+            input_text: Trade post text of the check (URL inputs are skipped)
+        """
+        with self._lock:
+            if entry.check_id in self._entries:
+                # Text never changes after creation; only review fields do
+                self._entries[entry.check_id] = entry
+                return
+
+        if not is_indexable(input_text):
+            return
+        signature = self._hasher.signature(input_text)
+        if signature is None:
+            return
+
+        with self._lock:
+            self._entries[entry.check_id] = entry
+            self._signatures[entry.check_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(entry.check_id)
+
+    def add_check(self, check: TradeSafetyCheck) -> None:
+        """
+        Index a created or updated check.
+
+        Args:
+            check: Stored check
+        """
+        self.add(IndexedCheck.from_check(check), check.input_text)
+
+    def rebuild(self, rows: Iterable[tuple[IndexedCheck, str]]) -> None:
+        """
+        Rebuild the index from stored checks.
+
+        Args:
+            rows: (metadata, input_text) of every check to index
+        """
+        with self._lock:
+            self._signatures.clear()
+            self._entries.clear()
+            for buckets in self._buckets:
+                buckets.clear()
+
+        for entry, input_text in rows:
+            self.add(entry, input_text)
+
+        self._built = True
+        logger.info("Rebuilt near-duplicate index: checks=%d", len(self))
+
+    def ensure_built(
+        self, load: Callable[[], Iterable[tuple[IndexedCheck, str]]]
+    ) -> None:
+        """
+        Build the index from stored checks once per process.
+
+        Args:
+            load: Function returning (metadata, input_text) of every stored check
+        """
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                self.rebuild(load())
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        """Split a signature into one bucket key per band."""
+        rows = self._rows_per_band
+        return [
+            signature[start : start + rows].tobytes()
+            for start in range(0, len(signature), rows)
+        ]
+
+
+def near_duplicate_note(duplicates: list[NearDuplicate]) -> str | None:
+    """
+    Describe near duplicates as a verified signal for the analysis prompt.
+
+    Args:
+        duplicates: Near duplicates of the post
+
+    Returns:
+        Prompt note, or None without near duplicates
+    """
+    if not duplicates:
+        return None
+
+    scores = ", ".join(str(duplicate.safe_score) for duplicate in duplicates)
+    note = (
+        f"Seen before: this post is a near-duplicate of {len(duplicates)} earlier "
+        f"trade post(s) checked on our service (up to "
+        f"{duplicates[0].similarity:.0%} similar; earlier safety scores: {scores})."
+    )
+    advice = [
+        duplicate.expert_advice for duplicate in duplicates if duplicate.expert_advice
+    ]
+    if advice:
+        note += f" Expert advice on a near-duplicate: {advice[0]}"
+    return note
+
+
+@lru_cache(maxsize=1)
+def get_near_duplicate_index() -> NearDuplicateIndex | None:
+    """
+    Return the process-wide near-duplicate index configured from the environment.
+
+    Returns:
+        NearDuplicateIndex, or None if disabled
+    """
+    settings = NearDuplicateSettings()
+    return NearDuplicateIndex(settings) if settings.enabled else None
@@ -0,0 +1,456 @@
+"""
+Platform adapter registry for URL fetching.
+
+Each supported platform is an adapter that knows its hosts, how to extract a
+post ID, and how to fetch a post as a PostPreview (metadata) or as analysis
+text. The registry indexes adapters by host suffix, so dispatching a URL is a
+few dict lookups regardless of how many platforms are registered, and adding a
+marketplace means registering an adapter instead of extending if/else chains
+in TradeSafetyService and PreviewService.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from functools import lru_cache
+from typing import TypeVar
+
+from pydantic import BaseModel, Field
+
+from trade_safety.post_cache import PostCache, PostUnavailableError
+from trade_safety.rate_limits import RateLimitScheduler
+from trade_safety.reddit_extract_text_service import RedditService
+from trade_safety.schemas import Platform, PostPreview
+from trade_safety.twitter_extract_text_service import TwitterService
+from trade_safety.url_canonicalization import (
+    PLATFORM_DOMAINS,
+    canonicalize_url,
+    parse_host,
+)
+
+logger = logging.getLogger(__name__)
+
+# Length of PostPreview.text_preview
+PREVIEW_TEXT_LENGTH = 200
+
+ResultT = TypeVar("ResultT")
+
+
+class PlatformAdapterMetrics(BaseModel):
+    """Fetch metrics of a platform (exposed as metrics)"""
+
+    platform: Platform = Field(description="Social media platform")
+    fetch_count: int = Field(default=0, description="Fetches attempted")
+    unavailable_count: int = Field(
+        default=0, description="Fetches of deleted/private posts"
+    )
+    error_count: int = Field(default=0, description="Fetches failed for other reasons")
+    total_fetch_seconds: float = Field(default=0.0, description="Time spent fetching")
+
+
+class PlatformFetchMetrics:
+    """
+    Fetch metrics of a platform, shared by all of its adapters in the process.
+
+    Adapters are built per request (with their services), so metrics kept on
+    an adapter would only ever count one request.
+
+    Example:
+        >>> metrics = get_platform_fetch_metrics(Platform.TWITTER)
+        >>> metrics.snapshot().fetch_count
+        0
+    """
+
+    def __init__(self, platform: Platform):
+        """
+        Initialize PlatformFetchMetrics.
+
+        Args:
+            platform: Platform whose fetches are counted
+        """
+        self.platform = platform
+        self._lock = threading.Lock()
+        self._metrics = PlatformAdapterMetrics(platform=platform)
+
+    def record(self, seconds: float, outcome: str | None) -> None:
+        """
+        Record one fetch.
+
+        Args:
+            seconds: Time the fetch took
+            outcome: "unavailable", "error" or None for a successful fetch
+        """
+        with self._lock:
+            self._metrics.fetch_count += 1
+            self._metrics.total_fetch_seconds += seconds
+            if outcome == "unavailable":
+                self._metrics.unavailable_count += 1
+            elif outcome == "error":
+                self._metrics.error_count += 1
+
+    def snapshot(self) -> PlatformAdapterMetrics:
+        """Return a copy of the current metrics."""
+        with self._lock:
+            return self._metrics.model_copy()
+
+    def reset(self) -> None:
+        """Forget the recorded fetches."""
+        with self._lock:
+            self._metrics = PlatformAdapterMetrics(platform=self.platform)
+
+
+@lru_cache(maxsize=None)
+def get_platform_fetch_metrics(platform: Platform) -> PlatformFetchMetrics:
+    """Return the process-wide fetch metrics of a platform."""
+    return PlatformFetchMetrics(platform)
+
+
+def get_platform_metrics() -> list[PlatformAdapterMetrics]:
+    """Return the fetch metrics of every platform (for metrics endpoints)."""
+    return [get_platform_fetch_metrics(platform).snapshot() for platform in Platform]
+
+
+# ==============================================================================
+# Adapter Base
+# ==============================================================================
+
+
+class PlatformAdapter(ABC):
+    """
+    Base class for platform adapters.
+
+    Subclasses declare `platform`, `display_name` and `domains` and implement
+    post ID extraction and fetching. Fetches go through `fetch_preview` /
+    `fetch_content`, which record metrics.
+    """
+
+    platform: Platform
+    display_name: str
+    domains: frozenset[str]
+
+    def __init__(self) -> None:
+        """Initialize adapter metrics (process-wide per platform)."""
+        self._metrics = get_platform_fetch_metrics(self.platform)
+
+    # ==========================================
+    # Adapter Interface
+    # ==========================================
+
+    @abstractmethod
+    def extract_post_id(self, url: str) -> str | None:
+        """
+        Extract the platform post ID from a URL.
+
+        Args:
+            url: Post URL on one of the adapter's domains
+
+        Returns:
+            Post ID if the URL points to a post, None otherwise
+        """
+
+    @abstractmethod
+    def _fetch_preview(self, url: str) -> PostPreview:
+        """
+        Fetch post metadata and parse it into a PostPreview.
+
+        Args:
+            url: Post URL
+
+        Returns:
+            PostPreview: Post metadata including platform, author, text, images
+
+        Raises:
+            ValueError: If the URL is invalid or fetching fails
+        """
+
+    def _fetch_content(self, url: str) -> str:
+        """
+        Fetch the post text to analyze (default: full preview text).
+
+        Args:
+            url: Post URL
+
+        Returns:
+            Post text
+        """
+        return self._fetch_preview(url).text
+
+    @property
+    def cache(self) -> PostCache | None:
+        """Post cache used by this adapter, if any."""
+        return None
+
+    @property
+    def rate_limiter(self) -> RateLimitScheduler | None:
+        """Rate-limit scheduler used by this adapter, if any."""
+        return None
+
+    # ==========================================
+    # Instrumented Fetch Methods
+    # ==========================================
+
+    def fetch_preview(self, url: str) -> PostPreview:
+        """Fetch a post as PostPreview (see _fetch_preview), recording metrics."""
+        return self._instrumented(self._fetch_preview, url)
+
+    def fetch_content(self, url: str) -> str:
+        """Fetch the post text to analyze (see _fetch_content), recording metrics."""
+        return self._instrumented(self._fetch_content, url)
+
+    async def fetch_preview_async(self, url: str) -> PostPreview:
+        """Fetch a post as PostPreview without blocking the event loop."""
+        return await asyncio.to_thread(self.fetch_preview, url)
+
+    async def fetch_content_async(self, url: str) -> str:
+        """Fetch the post text without blocking the event loop."""
+        return await asyncio.to_thread(self.fetch_content, url)
+
+    def metrics(self) -> PlatformAdapterMetrics:
+        """Return a snapshot of the platform's fetch metrics in this process."""
+        return self._metrics.snapshot()
+
+    def _instrumented(self, fetch: Callable[[str], ResultT], url: str) -> ResultT:
+        """Run a fetch function, recording count, failures and latency."""
+        started = time.perf_counter()
+        outcome = None
+        try:
+            return fetch(url)
+        except PostUnavailableError:
+            outcome = "unavailable"
+            raise
+        except ValueError:
+            outcome = "error"
+            raise
+        finally:
+            self._metrics.record(time.perf_counter() - started, outcome)
+
+
+def _truncate_preview(text: str) -> str:
+    """Truncate text to the preview length."""
+    return text[:PREVIEW_TEXT_LENGTH] if len(text) > PREVIEW_TEXT_LENGTH else text
+
+
+# ==============================================================================
+# Built-in Adapters
+# ==============================================================================
+
+
+class TwitterAdapter(PlatformAdapter):
+    """Twitter/X adapter backed by TwitterService"""
+
+    platform = Platform.TWITTER
+    display_name = "Twitter/X"
+    domains = PLATFORM_DOMAINS[Platform.TWITTER]
+
+    def __init__(self, service: TwitterService):
+        """
+        Initialize TwitterAdapter.
+
+        Args:
+            service: TwitterService used for API calls (cache, rate limiter)
+        """
+        super().__init__()
+        self.service = service
+
+    def extract_post_id(self, url: str) -> str | None:
+        """Extract the tweet ID from a Twitter/X URL."""
+        post = canonicalize_url(url)
+        return post.post_id if post and post.platform == self.platform else None
+
+    def _fetch_preview(self, url: str) -> PostPreview:
+        """Fetch tweet metadata as PostPreview."""
+        logger.info("Detected Twitter URL, fetching metadata")
+        metadata = self.service.fetch_metadata(url)
+
+        return PostPreview(
+            platform=Platform.TWITTER,
+            author=metadata.author,
+            created_at=metadata.created_at,
+            text=metadata.text,
+            text_preview=_truncate_preview(metadata.text),
+            images=metadata.images,
+        )
+
+    def _fetch_content(self, url: str) -> str:
+        """Fetch tweet text (text-only lookup unless the service caches posts)."""
+        logger.info("Detected Twitter/X URL, using TwitterService")
+        return self.service.fetch_tweet_content(url)
+
+    @property
+    def cache(self) -> PostCache | None:
+        return self.service.cache
+
+    @property
+    def rate_limiter(self) -> RateLimitScheduler | None:
+        return self.service.rate_limiter
+
+
+class RedditAdapter(PlatformAdapter):
+    """Reddit adapter backed by RedditService"""
+
+    platform = Platform.REDDIT
+    display_name = "Reddit"
+    domains = PLATFORM_DOMAINS[Platform.REDDIT]
+
+    def __init__(self, service: RedditService):
+        """
+        Initialize RedditAdapter.
+
+        Args:
+            service: RedditService used for API calls (cache, rate limiter)
+        """
+        super().__init__()
+        self.service = service
+
+    def extract_post_id(self, url: str) -> str | None:
+        """Extract the post ID from a Reddit URL."""
+        post = canonicalize_url(url)
+        return post.post_id if post and post.platform == self.platform else None
+
+    def _fetch_preview(self, url: str) -> PostPreview:
+        """Fetch Reddit post metadata as PostPreview (title + body as text)."""
+        logger.info("Detected Reddit URL, fetching metadata")
+        metadata = self.service.fetch_metadata(url)
+
+        # Combine title and text for full content
+        full_text = (
+            f"{metadata.title}\n\n{metadata.text}" if metadata.text else metadata.title
+        )
+
+        logger.info(
+            "Fetched Reddit post: author=%s, subreddit=%s, images=%d",
+            metadata.author,
+            metadata.subreddit,
+            len(metadata.images),
+        )
+
+        return PostPreview(
+            platform=Platform.REDDIT,
+            author=metadata.author,
+            created_at=metadata.created_at,
+            text=full_text,
+            text_preview=_truncate_preview(full_text),
+            images=metadata.images,
+        )
+
+    @property
+    def cache(self) -> PostCache | None:
+        return self.service.cache
+
+    @property
+    def rate_limiter(self) -> RateLimitScheduler | None:
+        return self.service.rate_limiter
+
+
+# ==============================================================================
+# Registry
+# ==============================================================================
+
+
+class PlatformRegistry:
+    """
+    Host-suffix index of platform adapters.
+
+    Example:
+        >>> registry = build_default_registry()
+        >>> adapter = registry.resolve("https://mobile.twitter.com/u/status/1")
+        >>> adapter.platform
+        Platform.TWITTER
+    """
+
+    def __init__(self, adapters: list[PlatformAdapter] | None = None):
+        """
+        Initialize PlatformRegistry.
+
+        Args:
+            adapters: Adapters to register (default: none)
+        """
+        self._by_domain: dict[str, PlatformAdapter] = {}
+        self._adapters: list[PlatformAdapter] = []
+        for adapter in adapters or []:
+            self.register(adapter)
+
+    def register(self, adapter: PlatformAdapter) -> None:
+        """
+        Register an adapter for all of its domains.
+
+        Args:
+            adapter: Platform adapter
+
+        Raises:
+            ValueError: If one of the adapter's domains is already registered
+        """
+        for domain in adapter.domains:
+            if domain in self._by_domain:
+                raise ValueError(
+                    f"Domain {domain} already registered for "
+                    f"{self._by_domain[domain].platform.value}"
+                )
+        for domain in adapter.domains:
+            self._by_domain[domain] = adapter
+        self._adapters.append(adapter)
+
+    def resolve(self, url: str) -> PlatformAdapter | None:
+        """
+        Find the adapter for a URL by its host.
+
+        The host and each of its parent domains (mobile.twitter.com,
+        twitter.com, com) are looked up, so dispatch costs one dict lookup
+        per host label.
+
+        Args:
+            url: URL to dispatch
+
+        Returns:
+            Adapter serving the URL's host, None if no platform matches
+        """
+        host, _ = parse_host(url)
+        labels = host.split(".")
+        for start in range(len(labels)):
+            adapter = self._by_domain.get(".".join(labels[start:]))
+            if adapter is not None:
+                return adapter
+        return None
+
+    @property
+    def adapters(self) -> list[PlatformAdapter]:
+        """Registered adapters in registration order."""
+        return list(self._adapters)
+
+    def unsupported_url_message(self) -> str:
+        """Build the error message for URLs no adapter supports."""
+        names = " and ".join(adapter.display_name for adapter in self._adapters)
+        return f"Unsupported URL. Currently only {names} URLs are supported."
+
+    def metrics(self) -> list[PlatformAdapterMetrics]:
+        """Return fetch metrics of every adapter."""
+        return [adapter.metrics() for adapter in self._adapters]
+
+
+def build_default_registry(
+    twitter_service: TwitterService | None = None,
+    reddit_service: RedditService | None = None,
+    post_cache: PostCache | None = None,
+) -> PlatformRegistry:
+    """
+    Build a registry with the built-in Twitter/X and Reddit adapters.
+
+    Args:
+        twitter_service: TwitterService instance (default: None, auto-created)
+        reddit_service: RedditService instance (default: None, auto-created)
+        post_cache: Post cache for auto-created services (default: None, no caching)
+
+    Returns:
+        PlatformRegistry with Twitter/X and Reddit adapters
+    """
+    return PlatformRegistry(
+        [
+            TwitterAdapter(twitter_service or TwitterService(cache=post_cache)),
+            RedditAdapter(reddit_service or RedditService(cache=post_cache)),
+        ]
+    )
@@ -0,0 +1,352 @@
+"""
+Shared cache for fetched social media posts.
+
+The typical user flow (preview, then analyze) fetches the same post twice, and
+every fetch spends Twitter/Reddit rate-limit budget. This cache stores fetched
+post metadata keyed by canonical platform + post id (see
+trade_safety.url_canonicalization) with a TTL and an LRU size bound.
+
+Posts that are gone (404/410) are cached as negative results with a shorter
+TTL, so repeated checks of a deleted post don't hit the API either. Forbidden
+posts (403) are reported the same way but not cached: a 403 may come from a
+transient auth or permission problem rather than from the post itself.
+An optional disk tier shares entries across worker processes; its file count
+is bounded, expired and soonest-expiring files being pruned first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from trade_safety.settings import PostCacheSettings
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Status codes of posts that are gone for good (cached as negative results)
+NEGATIVE_CACHE_STATUS_CODES = frozenset({404, 410})
+
+# Pruning frees the disk tier down to this share of its bound to avoid pruning
+# per write
+_PRUNE_TARGET_RATIO = 0.9
+
+
+class PostUnavailableError(ValueError):
+    """Raised when a post is deleted, private or otherwise inaccessible.
+
+    Subclasses ValueError so existing callers keep treating it as a
+    validation error, while the cache can recognize it as a cacheable result.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _CacheEntry(BaseModel):
+    """Cached fetch result (value for hits, error for negative results)"""
+
+    expires_at: float
+    value: dict[str, Any] | None = None
+    error: str | None = None
+    status_code: int | None = None
+
+
+class PostCache:
+    """
+    TTL + LRU cache for fetched post metadata with optional disk tier.
+
+    Thread-safe; a single instance is meant to be shared process-wide
+    (see get_post_cache).
+
+    Example:
+        >>> cache = PostCache(PostCacheSettings(ttl_seconds=300))
+        >>> metadata = cache.get_or_fetch(
+        ...     "twitter:123", TweetMetadata, lambda: service.fetch_metadata(url)
+        ... )
+    """
+
+    def __init__(
+        self,
+        settings: PostCacheSettings | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize PostCache.
+
+        Args:
+            settings: Cache settings (default: PostCacheSettings() from environment)
+            clock: Time source in epoch seconds (injectable for tests)
+        """
+        self.settings = settings or PostCacheSettings()
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Disk tier files, counted on first write (approximate across processes)
+        self._disk_lock = threading.Lock()
+        self._disk_entries: int | None = None
+        self._disk_path = (
+            Path(self.settings.disk_path) if self.settings.disk_path else None
+        )
+        if self._disk_path:
+            self._disk_path.mkdir(parents=True, exist_ok=True)
+        logger.debug(
+            "Initialized PostCache: ttl=%ds, max_entries=%d, disk=%s, "
+            "disk_max_entries=%d",
+            self.settings.ttl_seconds,
+            self.settings.max_entries,
+            self._disk_path,
+            self.settings.disk_max_entries,
+        )
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def get(self, key: str, model: type[ModelT]) -> ModelT | None:
+        """
+        Get a cached post.
+
+        Args:
+            key: Canonical post key (e.g., "twitter:123")
+            model: Pydantic model the value was stored as
+
+        Returns:
+            Cached value if present and fresh, None on miss
+
+        Raises:
+            PostUnavailableError: If the post is cached as unavailable
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+
+        if entry.error is not None:
+            assert entry.status_code is not None
+            logger.debug("Post cache negative hit: %s", key)
+            raise PostUnavailableError(entry.error, entry.status_code)
+
+        logger.debug("Post cache hit: %s", key)
+        return model.model_validate(entry.value)
+
+    def set(self, key: str, value: BaseModel) -> None:
+        """
+        Cache a fetched post.
+
+        Args:
+            key: Canonical post key
+            value: Fetched post metadata
+        """
+        self._put_entry(
+            key,
+            _CacheEntry(
+                expires_at=self._clock() + self.settings.ttl_seconds,
+                value=value.model_dump(mode="json"),
+            ),
+        )
+
+    def set_unavailable(self, key: str, error: PostUnavailableError) -> None:
+        """
+        Cache a post as unavailable (negative caching).
+
+        Args:
+            key: Canonical post key
+            error: Error raised when fetching the post
+        """
+        self._put_entry(
+            key,
+            _CacheEntry(
+                expires_at=self._clock() + self.settings.negative_ttl_seconds,
+                error=str(error),
+                status_code=error.status_code,
+            ),
+        )
+
+    def get_or_fetch(
+        self, key: str, model: type[ModelT], fetch: Callable[[], ModelT]
+    ) -> ModelT:
+        """
+        Get a cached post, fetching and caching it on miss.
+
+        Args:
+            key: Canonical post key
+            model: Pydantic model of the fetched value
+            fetch: Function fetching the post from the platform API
+
+        Returns:
+            Cached or freshly fetched value
+
+        Raises:
+            PostUnavailableError: If the post is (cached as) unavailable; only
+                404/410 results are cached
+            ValueError: If fetching fails for other reasons (not cached)
+        """
+        cached = self.get(key, model)
+        if cached is not None:
+            return cached
+
+        try:
+            value = fetch()
+        except PostUnavailableError as e:
+            if e.status_code in NEGATIVE_CACHE_STATUS_CODES:
+                self.set_unavailable(key, e)
+            raise
+
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all in-memory entries (disk entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    # ==========================================
+    # Storage Methods
+    # ==========================================
+
+    def _get_entry(self, key: str) -> _CacheEntry | None:
+        """Get a fresh entry from memory, falling back to the disk tier."""
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+
+        entry = self._read_disk(key)
+        if entry is None or entry.expires_at <= now:
+            return None
+
+        # Promote disk hit to memory
+        with self._lock:
+            self._store_in_memory(key, entry)
+        return entry
+
+    def _put_entry(self, key: str, entry: _CacheEntry) -> None:
+        """Store an entry in memory and on disk."""
+        with self._lock:
+            self._store_in_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def _store_in_memory(self, key: str, entry: _CacheEntry) -> None:
+        """Store an entry, evicting least recently used ones (lock held)."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.settings.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_file(self, key: str) -> Path | None:
+        """Return the disk tier file for a key, or None without disk tier."""
+        if self._disk_path is None:
+            return None
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._disk_path / f"{digest}.json"
+
+    def _read_disk(self, key: str) -> _CacheEntry | None:
+        """Read an entry from the disk tier."""
+        path = self._disk_file(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return _CacheEntry.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            # Corrupt or concurrently replaced file: treat as miss
+            logger.warning("Failed to read post cache file %s: %s", path, e)
+            return None
+
+    def _write_disk(self, key: str, entry: _CacheEntry) -> None:
+        """
+        Write an entry to the disk tier atomically (write + rename).
+
+        The file's mtime is set to the entry's expiry, so pruning can find
+        expired files with a stat instead of reading every file.
+        """
+        path = self._disk_file(key)
+        if path is None:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.model_dump(), f)
+            os.utime(tmp_path, (entry.expires_at, entry.expires_at))
+            replaced = path.exists()
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The disk tier is best-effort; memory still holds the entry
+            logger.warning("Failed to write post cache file %s: %s", path, e)
+            return
+        self._account_disk(added=not replaced)
+
+    def _account_disk(self, added: bool) -> None:
+        """
+        Count a written file and prune the disk tier beyond its bound.
+
+        Args:
+            added: The file is new (False when it replaced an existing entry)
+        """
+        with self._disk_lock:
+            if self._disk_entries is None:
+                # First write of this process: count includes the new file
+                self._disk_entries = len(self._disk_files())
+            elif added:
+                self._disk_entries += 1
+
+            if self._disk_entries > self.settings.disk_max_entries:
+                self._disk_entries = self._prune_disk()
+
+    def _disk_files(self) -> list[tuple[float, Path]]:
+        """List disk tier files as (expires_at, path)."""
+        assert self._disk_path is not None
+        files = []
+        for path in self._disk_path.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # Pruned concurrently by another worker process
+        return files
+
+    def _prune_disk(self) -> int:
+        """
+        Delete expired files, then the soonest-expiring ones beyond the bound.
+
+        Returns:
+            Number of files left
+        """
+        now = self._clock()
+        files = sorted(self._disk_files())
+        target = self.settings.disk_max_entries * _PRUNE_TARGET_RATIO
+
+        remaining = len(files)
+        for expires_at, path in files:
+            if expires_at > now and remaining <= target:
+                break
+            path.unlink(missing_ok=True)
+            remaining -= 1
+
+        logger.info(
+            "Pruned %d post cache files, %d remain", len(files) - remaining, remaining
+        )
+        return remaining
+
+
+@lru_cache(maxsize=1)
+def get_post_cache() -> PostCache:
+    """Return the process-wide post cache configured from the environment."""
+    return PostCache()
@@ -8,8 +8,11 @@ from __future__ import annotations
 
 import logging
 
+from trade_safety.image_proxy import ImageProxy
+from trade_safety.platform_adapters import PlatformRegistry, build_default_registry
+from trade_safety.post_cache import PostCache
 from trade_safety.reddit_extract_text_service import RedditService
-from trade_safety.schemas import Platform, PostPreview
+from trade_safety.schemas import PostPreview
 from trade_safety.twitter_extract_text_service import TwitterService
 
 logger = logging.getLogger(__name__)
@@ -19,8 +22,8 @@ class PreviewService:
     """
     Service for extracting post preview metadata from social media URLs.
 
-    This service orchestrates platform-specific services (TwitterService, RedditService)
-    to extract metadata for post previews.
+    This service dispatches URLs to platform adapters (see
+    trade_safety.platform_adapters) to extract metadata for post previews.
 
     Supported platforms:
     - Twitter/X
@@ -37,6 +40,9 @@ class PreviewService:
         self,
         twitter_service: TwitterService | None = None,
         reddit_service: RedditService | None = None,
+        post_cache: PostCache | None = None,
+        registry: PlatformRegistry | None = None,
+        image_proxy: ImageProxy | None = None,
     ):
         """
         Initialize PreviewService with platform services.
@@ -44,15 +50,31 @@ class PreviewService:
         Args:
             twitter_service: TwitterService instance (default: None, auto-created)
             reddit_service: RedditService instance (default: None, auto-created)
+            post_cache: Cache for fetched posts and built previews
+                        (default: None, no caching)
+            registry: Platform adapter registry (default: built-in Twitter/X and
+                      Reddit adapters over the services above)
+            image_proxy: Image proxy pre-warming thumbnails of previewed posts
+                         (default: None, no pre-warming)
         """
-        self.twitter_service = twitter_service or TwitterService()
-        self.reddit_service = reddit_service or RedditService()
+        self.post_cache = post_cache
+        self.image_proxy = image_proxy
+        self.registry = registry or build_default_registry(
+            twitter_service=twitter_service,
+            reddit_service=reddit_service,
+            post_cache=post_cache,
+        )
         logger.debug("Initialized PreviewService")
 
     def preview(self, url: str) -> PostPreview:
         """
         Extract post preview metadata from URL.
 
+        With a post cache, the built preview is cached so the following
+        analysis of the same URL can reuse it (see get_cached_preview).
+        With an image proxy, thumbnails of the post images are built in the
+        background so the client's thumbnail requests hit the cache.
+
         Args:
             url: Social media post URL (Twitter/X, Reddit)
 
@@ -68,72 +90,73 @@ class PreviewService:
             >>> print(preview.platform)
             Platform.TWITTER
         """
-        # Check if Twitter URL
-        if TwitterService.is_twitter_url(url):
-            logger.info("Detected Twitter URL, fetching metadata")
-            twitter_metadata = self.twitter_service.fetch_metadata(url)
-
-            # Truncate text to 200 characters for preview
-            text_preview = (
-                twitter_metadata.text[:200]
-                if len(twitter_metadata.text) > 200
-                else twitter_metadata.text
-            )
-
-            preview = PostPreview(
-                platform=Platform.TWITTER,
-                author=twitter_metadata.author,
-                created_at=twitter_metadata.created_at,
-                text=twitter_metadata.text,
-                text_preview=text_preview,
-                images=twitter_metadata.images,
-            )
-
-            logger.info(
-                "Preview created: platform=%s, author=%s, images=%d",
-                preview.platform,
-                preview.author,
-                len(preview.images),
+        cache_key = self._preview_cache_key(url)
+        if self.post_cache and cache_key:
+            preview = self.post_cache.get_or_fetch(
+                cache_key, PostPreview, lambda: self._build_preview(url)
             )
+        else:
+            preview = self._build_preview(url)
 
-            return preview
+        if self.image_proxy:
+            self.image_proxy.prewarm(preview.images)
+        return preview
 
-        # Check if Reddit URL
-        if RedditService.is_reddit_url(url):
-            logger.info("Detected Reddit URL, fetching metadata")
-            reddit_metadata = self.reddit_service.fetch_metadata(url)
+    def get_cached_preview(self, url: str) -> PostPreview | None:
+        """
+        Get a recently built preview of a URL without fetching.
 
-            # Combine title and text for full content
-            full_text = (
-                f"{reddit_metadata.title}\n\n{reddit_metadata.text}"
-                if reddit_metadata.text
-                else reddit_metadata.title
-            )
+        Args:
+            url: Social media post URL in any supported form
 
-            # Truncate text to 200 characters for preview
-            text_preview = full_text[:200] if len(full_text) > 200 else full_text
+        Returns:
+            Cached PostPreview, or None if not previewed recently (or no cache)
 
-            preview = PostPreview(
-                platform=Platform.REDDIT,
-                author=reddit_metadata.author,
-                created_at=reddit_metadata.created_at,
-                text=full_text,
-                text_preview=text_preview,
-                images=reddit_metadata.images,
-            )
+        Raises:
+            PostUnavailableError: If the post was recently found unavailable
+        """
+        cache_key = self._preview_cache_key(url)
+        if not self.post_cache or not cache_key:
+            return None
+        return self.post_cache.get(cache_key, PostPreview)
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _preview_cache_key(self, url: str) -> str | None:
+        """Return the preview cache key of a supported post URL."""
+        adapter = self.registry.resolve(url)
+        post_id = adapter.extract_post_id(url) if adapter else None
+        if adapter is None or post_id is None:
+            return None
+        return f"preview:{adapter.platform.value}:{post_id}"
+
+    def _build_preview(self, url: str) -> PostPreview:
+        """
+        Fetch platform metadata and build a PostPreview.
 
-            logger.info(
-                "Preview created: platform=%s, author=%s, subreddit=%s, images=%d",
-                preview.platform,
-                preview.author,
-                reddit_metadata.subreddit,
-                len(preview.images),
-            )
+        Args:
+            url: Social media post URL (Twitter/X, Reddit)
 
-            return preview
+        Returns:
+            PostPreview: Post metadata including platform, author, text, images
 
-        # Unsupported URL
-        logger.warning("Unsupported URL: %s", url)
-        raise ValueError(
-            "Unsupported URL. Currently only Twitter/X and Reddit URLs are supported."
+        Raises:
+            ValueError: If URL is not supported or extraction fails
+        """
+        adapter = self.registry.resolve(url)
+        if adapter is None:
+            logger.warning("Unsupported URL: %s", url)
+            raise ValueError(self.registry.unsupported_url_message())
+
+        preview = adapter.fetch_preview(url)
+
+        logger.info(
+            "Preview created: platform=%s, author=%s, images=%d",
+            preview.platform,
+            preview.author,
+            len(preview.images),
         )
+
+        return preview
@@ -0,0 +1,521 @@
+"""
+Market price reference built from prices of earlier checks.
+
+`PriceAnalysis.market_price_range` used to be an LLM guess regenerated for
+every check. This index keeps the offered prices of stored analyses per item
+key (merchandise category, optionally narrowed by artist) and currency, and
+computes their percentiles for all keys at once with NumPy. Before the LLM is
+called, the offered price is extracted from the post, its item's distribution
+is looked up in a dict, and the result is passed as a verified signal for
+the price assessment. The LLM is then not asked for market_price_range, which
+is filled in deterministically instead.
+
+With a currency converter, every price is also recorded by its USD
+equivalent, so an item with few prices in the offered currency can still be
+referenced from prices quoted in other currencies.
+
+The index lives in memory per process. It is rebuilt from the table on first
+use and updated as checks are created. Item keys come from post text, so
+checks of URL inputs (whose text is not stored) are not indexed.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections.abc import Callable, Iterable
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from trade_safety.currency import (
+    CurrencyConverter,
+    get_currency_converter,
+    normalize_currency,
+)
+from trade_safety.input_normalization import normalize_text
+from trade_safety.near_duplicates import is_indexable
+from trade_safety.schemas import TradeSafetyCheck
+from trade_safety.settings import PriceReferenceSettings
+
+logger = logging.getLogger(__name__)
+
+# Currency key of the groups holding USD equivalents of prices in any currency
+ALL_CURRENCIES_USD = "*USD"
+
+# Percentiles kept per item (P10 and P90 bound the "typical" range)
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Merchandise categories and the words fans use for them
+ITEM_CATEGORIES: dict[str, tuple[str, ...]] = {
+    "photocard": ("포카", "포토카드", "photocard", "photo card", " pc "),
+    "album": ("앨범", "album", "미개봉"),
+    "lightstick": ("응원봉", "lightstick", "light stick"),
+    "season_greetings": (
+        "시즌그리팅",
+        "시그",
+        "season's greetings",
+        "seasons greetings",
+    ),
+    "concert_ticket": ("티켓", "콘서트", "ticket", "concert"),
+    "poster": ("포스터", "poster"),
+    "doll": ("인형", "doll", "plush"),
+    "keyring": ("키링", "keyring", "keychain"),
+}
+
+# Artists narrowing an item key when mentioned
+ARTISTS: dict[str, tuple[str, ...]] = {
+    "bts": ("방탄", "bts"),
+    "seventeen": ("세븐틴", "seventeen", "svt"),
+    "blackpink": ("블랙핑크", "블핑", "blackpink"),
+    "stray_kids": ("스트레이키즈", "스키즈", "stray kids", "skz"),
+    "newjeans": ("뉴진스", "newjeans"),
+    "twice": ("트와이스", "twice"),
+    "aespa": ("에스파", "aespa"),
+    "ive": ("아이브", " ive "),
+    "nct": ("엔시티", "nct"),
+    "enhypen": ("엔하이픈", "enhypen"),
+    "txt": ("투바투", "txt", "tomorrow x together"),
+    "le_sserafim": ("르세라핌", "le sserafim", "lesserafim"),
+    "ateez": ("에이티즈", "ateez"),
+}
+
+_AMOUNT = r"(\d[\d,]*(?:\.\d+)?)"
+# "15,000원", "1.5만원", "20 usd", "3000엔"
+_SUFFIX_PRICE_PATTERN = re.compile(
+    _AMOUNT + r"\s*(만)?\s*(원|won|krw|usd|달러|dollars?|円|엔|yen|jpy|euros?|eur"
+    r"|gbp|php|cad|aud|sgd)(?![a-z])"
+)
+# "₩15000", "$20", "¥3000"
+_PREFIX_PRICE_PATTERN = re.compile(r"([₩$¥€£₱])\s*" + _AMOUNT)
+
+
+class OfferedPrice(BaseModel):
+    """Price found in a trade post"""
+
+    amount: Decimal = Field(description="Offered amount")
+    currency: str = Field(description="ISO 4217 currency code")
+
+
+class PriceReference(BaseModel):
+    """Distribution of earlier offered prices of an item in one currency"""
+
+    item_key: str = Field(description="Item key, e.g. 'photocard:bts'")
+    currency: str = Field(description="ISO 4217 currency code")
+    sample_count: int = Field(description="Earlier prices in the distribution")
+    p10: float = Field(description="10th percentile")
+    p25: float = Field(description="25th percentile")
+    p50: float = Field(description="Median")
+    p75: float = Field(description="75th percentile")
+    p90: float = Field(description="90th percentile")
+    cross_currency: bool = Field(
+        default=False, description="Converted from prices in several currencies"
+    )
+
+    def percentile_of(self, amount: float) -> int:
+        """Approximate percentile rank of an amount within the distribution."""
+        points = [self.p10, self.p25, self.p50, self.p75, self.p90]
+        return int(np.interp(amount, points, PERCENTILES, left=0, right=100))
+
+
+# ==============================================================================
+# Extraction
+# ==============================================================================
+
+
+def extract_item_keys(text: str) -> list[str]:
+    """
+    Derive price reference keys from post text, most specific first.
+
+    Args:
+        text: Trade post text
+
+    Returns:
+        ["<category>:<artist>", "<category>"] when both are mentioned,
+        ["<category>"] without an artist, [] without a known category
+
+    Example:
+        >>> extract_item_keys("방탄 포카 양도해요")
+        ['photocard:bts', 'photocard']
+    """
+    normalized = f" {normalize_text(text)} "
+    category = _first_match(ITEM_CATEGORIES, normalized)
+    if category is None:
+        return []
+    artist = _first_match(ARTISTS, normalized)
+    return [f"{category}:{artist}", category] if artist else [category]
+
+
+def extract_offered_price(text: str) -> OfferedPrice | None:
+    """
+    Find the first price written in a post.
+
+    Args:
+        text: Trade post text
+
+    Returns:
+        Offered price, or None if no price with a currency is found
+
+    Example:
+        >>> extract_offered_price("급처 1.5만원에 드려요")
+        OfferedPrice(amount=Decimal('15000.0'), currency='KRW')
+    """
+    normalized = normalize_text(text)
+    match = _SUFFIX_PRICE_PATTERN.search(normalized)
+    if match:
+        amount, man, unit = match.groups()
+        multiplier = 10000 if man else 1
+    else:
+        match = _PREFIX_PRICE_PATTERN.search(normalized)
+        if not match:
+            return None
+        unit, amount = match.groups()
+        multiplier = 1
+
+    currency = normalize_currency(unit)
+    try:
+        value = Decimal(amount.replace(",", "")) * multiplier
+    except InvalidOperation:
+        return None
+    if currency is None or value <= 0:
+        return None
+    return OfferedPrice(amount=value, currency=currency)
+
+
+def _first_match(table: dict[str, tuple[str, ...]], text: str) -> str | None:
+    """Return the first key whose keywords appear in text."""
+    for key, keywords in table.items():
+        if any(keyword in text for keyword in keywords):
+            return key
+    return None
+
+
+# ==============================================================================
+# Index
+# ==============================================================================
+
+
+class PriceReferenceIndex:
+    """
+    Offered-price distributions per item key and currency.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    get_price_reference_index), built in the background at startup (see
+    TradeSafetyCheckManagerFactory.start_index_builds). Percentiles are
+    recomputed for all keys in one vectorized pass the first time they are
+    read after a change.
+
+    Example:
+        >>> index = get_price_reference_index()
+        >>> index.ensure_built(manager.iter_price_observations)
+        >>> index.is_ready
+        True
+        >>> index.lookup("방탄 포카 양도 15000원", currency="KRW")
+    """
+
+    def __init__(
+        self,
+        settings: PriceReferenceSettings | None = None,
+        converter: CurrencyConverter | None = None,
+    ):
+        """
+        Initialize PriceReferenceIndex.
+
+        Args:
+            settings: Index settings (default: PriceReferenceSettings() from environment)
+            converter: Converter for cross-currency references (default: None,
+                       prices are only compared within one currency)
+        """
+        self.settings = settings or PriceReferenceSettings()
+        self.converter = converter
+        # (item_key, currency) -> group id; observations as parallel lists
+        self._groups: dict[tuple[str, str], int] = {}
+        self._group_ids: list[int] = []
+        self._prices: list[float] = []
+        self._seen: set[str] = set()
+        self._references: dict[tuple[str, str], PriceReference] | None = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._built = False
+
+    def __len__(self) -> int:
+        """Number of indexed checks."""
+        return len(self._seen)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been built from the stored checks."""
+        return self._built
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def lookup(self, text: str, currency: str) -> PriceReference | None:
+        """
+        Find the price distribution of the item a post is about.
+
+        Args:
+            text: Trade post text
+            currency: ISO 4217 currency of the offered price
+
+        Returns:
+            Distribution of the most specific item key with at least
+            min_samples prices in the currency (or, with a converter, in all
+            currencies converted to it), None if there is none
+        """
+        item_keys = extract_item_keys(text)
+        if not item_keys:
+            return None
+        references = self._get_references()
+        min_samples = self.settings.min_samples
+        for item_key in item_keys:
+            reference = references.get((item_key, currency))
+            if reference and reference.sample_count >= min_samples:
+                return reference
+            reference = references.get((item_key, ALL_CURRENCIES_USD))
+            if reference and reference.sample_count >= min_samples:
+                converted = self._from_usd(reference, currency)
+                if converted is not None:
+                    return converted
+        return None
+
+    def add(
+        self, check_id: str, input_text: str, price: Decimal | float, currency: str
+    ) -> None:
+        """
+        Record the offered price of a check.
+
+        Args:
+            check_id: Check ID (each check is recorded once)
+            input_text: Trade post text (URL inputs are skipped)
+            price: Offered price
+            currency: Currency of the price (normalized to ISO 4217)
+        """
+        code = normalize_currency(currency)
+        if code is None or price <= 0 or not is_indexable(input_text):
+            return
+        item_keys = extract_item_keys(input_text)
+        if not item_keys:
+            return
+
+        observations = [(code, float(price))]
+        if self.converter is not None:
+            usd = self.converter.to_usd(price, code)
+            if usd is not None:
+                observations.append((ALL_CURRENCIES_USD, usd))
+
+        with self._lock:
+            if check_id in self._seen:
+                return
+            self._seen.add(check_id)
+            for item_key in item_keys:
+                for group_currency, value in observations:
+                    group = self._groups.setdefault(
+                        (item_key, group_currency), len(self._groups)
+                    )
+                    self._group_ids.append(group)
+                    self._prices.append(value)
+            self._references = None
+
+    def add_check(self, check: TradeSafetyCheck) -> None:
+        """
+        Record the offered price of a created check.
+
+        Args:
+            check: Stored check
+        """
+        price_analysis = check.llm_analysis.price_analysis
+        if price_analysis.offered_price is None or price_analysis.currency is None:
+            return
+        self.add(
+            check.id,
+            check.input_text,
+            price_analysis.offered_price,
+            price_analysis.currency,
+        )
+
+    def rebuild(self, rows: Iterable[tuple[str, str, Decimal, str]]) -> None:
+        """
+        Rebuild the index from stored checks.
+
+        Args:
+            rows: (check_id, input_text, offered_price, currency) per check
+        """
+        with self._lock:
+            self._groups.clear()
+            self._group_ids.clear()
+            self._prices.clear()
+            self._seen.clear()
+            self._references = None
+
+        for check_id, input_text, price, currency in rows:
+            self.add(check_id, input_text, price, currency)
+
+        self._built = True
+        logger.info(
+            "Rebuilt price reference index: checks=%d, items=%d",
+            len(self),
+            len(self._groups),
+        )
+
+    def ensure_built(
+        self, load: Callable[[], Iterable[tuple[str, str, Decimal, str]]]
+    ) -> None:
+        """
+        Build the index from stored checks once per process.
+
+        Args:
+            load: Function returning (check_id, input_text, offered_price,
+                  currency) of every stored check with a price
+        """
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                self.rebuild(load())
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _from_usd(
+        self, reference: PriceReference, currency: str
+    ) -> PriceReference | None:
+        """Express a USD-equivalent distribution in another currency."""
+        rate = self.converter.rate(currency) if self.converter else None
+        if not rate:
+            return None
+        return reference.model_copy(
+            update={
+                "currency": currency,
+                "cross_currency": True,
+                **{
+                    f"p{percentile}": getattr(reference, f"p{percentile}") * rate
+                    for percentile in PERCENTILES
+                },
+            }
+        )
+
+    def _get_references(self) -> dict[tuple[str, str], PriceReference]:
+        """Return percentiles per group, recomputing them after changes."""
+        with self._lock:
+            if self._references is not None:
+                return self._references
+            if not self._prices:
+                self._references = {}
+                return self._references
+
+            counts, percentiles = group_percentiles(
+                np.asarray(self._group_ids, dtype=np.int64),
+                np.asarray(self._prices, dtype=np.float64),
+                len(self._groups),
+            )
+            self._references = {
+                (item_key, currency): PriceReference(
+                    item_key=item_key,
+                    currency=currency,
+                    sample_count=int(counts[group]),
+                    p10=float(percentiles[group][0]),
+                    p25=float(percentiles[group][1]),
+                    p50=float(percentiles[group][2]),
+                    p75=float(percentiles[group][3]),
+                    p90=float(percentiles[group][4]),
+                )
+                for (item_key, currency), group in self._groups.items()
+            }
+            return self._references
+
+
+def group_percentiles(
+    group_ids: np.ndarray, values: np.ndarray, group_count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute PERCENTILES of every group in one vectorized pass.
+
+    Values are sorted once by (group, value); each group's percentiles are
+    then read from its slice with the same linear interpolation as
+    numpy.percentile, without a Python loop over groups.
+
+    Args:
+        group_ids: Group of each value (0 .. group_count - 1, every group present)
+        values: Values
+        group_count: Number of groups
+
+    Returns:
+        (counts, percentiles): values per group, and an array of shape
+        (group_count, len(PERCENTILES))
+    """
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    counts = np.bincount(group_ids, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    fractions = np.asarray(PERCENTILES, dtype=np.float64) / 100
+    positions = starts[:, None] + (counts[:, None] - 1) * fractions[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    weights = positions - lower
+    percentiles = (
+        sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * weights
+    )
+    return counts, percentiles
+
+
+def format_price_range(reference: PriceReference) -> str:
+    """
+    Describe the typical (P25-P75) price range for market_price_range.
+
+    Args:
+        reference: Price distribution
+
+    Returns:
+        Range text, e.g. "15,000-22,000 KRW (median 18,000; 24 earlier checks)"
+    """
+    source = (
+        "earlier checks in several currencies"
+        if reference.cross_currency
+        else "earlier checks"
+    )
+    return (
+        f"{reference.p25:,.0f}-{reference.p75:,.0f} {reference.currency} "
+        f"(median {reference.p50:,.0f}; {reference.sample_count} {source})"
+    )
+
+
+def price_reference_note(reference: PriceReference, offered: OfferedPrice) -> str:
+    """
+    Describe the reference price of an item as a verified signal.
+
+    Args:
+        reference: Price distribution of the item
+        offered: Price found in the post
+
+    Returns:
+        Prompt note
+    """
+    percentile = reference.percentile_of(float(offered.amount))
+    return (
+        f"Price reference: '{reference.item_key}' items in earlier checks were "
+        f"offered at {format_price_range(reference)} (10th-90th percentile "
+        f"{reference.p10:,.0f}-{reference.p90:,.0f}). The offered "
+        f"{offered.amount:,.0f} {offered.currency} is around the {percentile}th "
+        "percentile; weigh this in the price assessment."
+    )
+
+
+@lru_cache(maxsize=1)
+def get_price_reference_index() -> PriceReferenceIndex | None:
+    """
+    Return the process-wide price reference index configured from the environment.
+
+    Returns:
+        PriceReferenceIndex, or None if disabled
+    """
+    settings = PriceReferenceSettings()
+    if not settings.enabled:
+        return None
+    return PriceReferenceIndex(settings, converter=get_currency_converter())
@@ -0,0 +1,392 @@
+"""
+Rate-limit-aware scheduling of Twitter and Reddit API calls.
+
+Both platforms report the remaining quota of the current window in response
+headers. The scheduler of a platform keeps one bucket per rate-limited endpoint
+filled from those headers, so callers wait for (or are rejected before) an
+exhausted window instead of discovering it through a 429. A share of every
+window is reserved for interactive requests: bulk work yields once quota runs
+low.
+
+Twitter limits every endpoint separately (`/2/tweets/:id` and `/2/tweets`
+report their own headers); Reddit's quota is shared by all endpoints of an
+OAuth client, so Reddit calls use DEFAULT_ENDPOINT.
+
+Header formats:
+    Twitter: x-rate-limit-limit / x-rate-limit-remaining / x-rate-limit-reset
+             (reset as epoch seconds)
+    Reddit:  x-ratelimit-used / x-ratelimit-remaining / x-ratelimit-reset
+             (reset as seconds from now)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
+
+import requests
+from pydantic import BaseModel, Field
+
+from trade_safety.post_cache import PostUnavailableError
+from trade_safety.schemas import Platform
+from trade_safety.settings import RateLimitSettings
+
+logger = logging.getLogger(__name__)
+
+# Bucket of APIs whose quota is shared by all endpoints
+DEFAULT_ENDPOINT = "*"
+
+
+class RequestPriority(str, Enum):
+    """Priority of an API call"""
+
+    INTERACTIVE = "interactive"  # A user is waiting (preview, analyze)
+    BULK = "bulk"  # Batch/background work that can wait
+
+
+class RateLimitExceededError(ValueError):
+    """Raised when a call cannot be made within the allowed wait time.
+
+    Subclasses ValueError so callers keep handling it like other API errors.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitBudget(BaseModel):
+    """Current rate-limit budget of a platform endpoint (exposed as metrics)"""
+
+    platform: Platform = Field(description="Social media platform")
+    endpoint: str = Field(DEFAULT_ENDPOINT, description="Rate-limited endpoint")
+    limit: int | None = Field(None, description="Requests allowed per window")
+    remaining: int | None = Field(None, description="Requests left in the window")
+    reset_at: datetime | None = Field(None, description="When the window resets")
+    throttled_count: int = Field(0, description="429 responses received")
+    rejected_count: int = Field(0, description="Calls rejected before sending")
+
+
+class _Bucket:
+    """Rate-limit window of one endpoint (guarded by the scheduler lock)"""
+
+    def __init__(self) -> None:
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.throttled_count = 0
+        self.rejected_count = 0
+
+
+class RateLimitScheduler:
+    """
+    Token buckets of a platform's endpoints, refilled from response headers.
+
+    Until the first response of an endpoint is seen its budget is unknown and
+    calls pass. Each acquire() takes one token locally, so concurrent callers
+    don't all spend the last request of a window.
+
+    Example:
+        >>> scheduler = get_rate_limiter(Platform.TWITTER)
+        >>> scheduler.acquire(RequestPriority.BULK, "/2/tweets")  # may wait
+        >>> response = requests.get(...)
+        >>> scheduler.update_from_headers(response.headers, "/2/tweets")
+    """
+
+    def __init__(
+        self,
+        platform: Platform,
+        settings: RateLimitSettings | None = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize RateLimitScheduler.
+
+        Args:
+            platform: Platform whose API calls are scheduled
+            settings: Scheduler settings (default: RateLimitSettings() from environment)
+            clock: Time source in epoch seconds (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.platform = platform
+        self.settings = settings or RateLimitSettings()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        endpoint: str = DEFAULT_ENDPOINT,
+    ) -> None:
+        """
+        Take one request from the budget, waiting for the window reset if needed.
+
+        Bulk calls keep `bulk_reserve_fraction` of the window free for
+        interactive calls.
+
+        Args:
+            priority: Priority of the call
+            endpoint: Rate-limited endpoint the call goes to
+
+        Raises:
+            RateLimitExceededError: If the budget does not allow the call within
+                                    the maximum wait for its priority
+        """
+        max_wait = (
+            self.settings.interactive_max_wait_seconds
+            if priority == RequestPriority.INTERACTIVE
+            else self.settings.bulk_max_wait_seconds
+        )
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                bucket = self._bucket(endpoint, now)
+
+                if bucket.remaining is None or bucket.remaining > self._reserve(
+                    bucket, priority
+                ):
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+                    return
+
+                wait = max((bucket.reset_at or now) - now, 0.0)
+                if wait > max_wait:
+                    bucket.rejected_count += 1
+                    raise RateLimitExceededError(
+                        f"{self.platform.value} API rate limit exhausted "
+                        f"({priority.value}); retry in {math.ceil(wait)}s",
+                        retry_after=wait,
+                    )
+
+            logger.info(
+                "Waiting %.1fs for %s %s rate limit reset (%s)",
+                wait,
+                self.platform.value,
+                endpoint,
+                priority.value,
+            )
+            self._sleep(wait)
+
+    def update_from_headers(
+        self, headers: Mapping[str, str], endpoint: str = DEFAULT_ENDPOINT
+    ) -> None:
+        """
+        Update the budget of an endpoint from rate-limit response headers.
+
+        Args:
+            headers: Response headers (missing rate-limit headers are ignored)
+            endpoint: Rate-limited endpoint the response came from
+        """
+        parsed = self._parse_headers(headers)
+        if parsed is None:
+            return
+
+        limit, remaining, reset_at = parsed
+        with self._lock:
+            bucket = self._bucket(endpoint, self._clock())
+            bucket.limit = limit
+            bucket.remaining = remaining
+            bucket.reset_at = reset_at
+
+        logger.debug(
+            "%s %s rate limit: remaining=%d/%d, reset_in=%.0fs",
+            self.platform.value,
+            endpoint,
+            remaining,
+            limit,
+            reset_at - self._clock(),
+        )
+
+    def record_throttled(
+        self, headers: Mapping[str, str], endpoint: str = DEFAULT_ENDPOINT
+    ) -> float:
+        """
+        Record a 429 response: the endpoint's window is exhausted until its reset.
+
+        Args:
+            headers: Response headers of the 429 response
+            endpoint: Rate-limited endpoint the response came from
+
+        Returns:
+            Seconds until the window resets
+        """
+        parsed = self._parse_headers(headers)
+        now = self._clock()
+        headers = _lowercase_keys(headers)
+
+        if parsed is not None:
+            reset_at = parsed[2]
+        else:
+            retry_after = _parse_float(headers.get("retry-after"))
+            reset_at = now + (
+                retry_after
+                if retry_after is not None
+                else self.settings.default_reset_seconds
+            )
+
+        with self._lock:
+            bucket = self._bucket(endpoint, now)
+            if parsed is not None:
+                bucket.limit = parsed[0]
+            bucket.remaining = 0
+            bucket.reset_at = reset_at
+            bucket.throttled_count += 1
+
+        logger.warning(
+            "%s %s API throttled (429), window resets in %.0fs",
+            self.platform.value,
+            endpoint,
+            reset_at - now,
+        )
+        return max(reset_at - now, 0.0)
+
+    def budget(self, endpoint: str = DEFAULT_ENDPOINT) -> RateLimitBudget:
+        """Return the current budget of an endpoint for metrics."""
+        with self._lock:
+            return self._snapshot(endpoint, self._bucket(endpoint, self._clock()))
+
+    def budgets(self) -> list[RateLimitBudget]:
+        """Return the current budget of every endpoint called so far."""
+        with self._lock:
+            now = self._clock()
+            return [
+                self._snapshot(endpoint, self._bucket(endpoint, now))
+                for endpoint in sorted(self._buckets)
+            ]
+
+    def reset(self) -> None:
+        """Forget the tracked budgets and counters."""
+        with self._lock:
+            self._buckets.clear()
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _bucket(self, endpoint: str, now: float) -> _Bucket:
+        """Return an endpoint's bucket, refilled if its window has reset (lock held)."""
+        bucket = self._buckets.setdefault(endpoint, _Bucket())
+        if bucket.reset_at is not None and now >= bucket.reset_at:
+            bucket.remaining = bucket.limit
+            bucket.reset_at = None
+        return bucket
+
+    def _reserve(self, bucket: _Bucket, priority: RequestPriority) -> int:
+        """Requests of the window kept free from this priority (lock held)."""
+        if priority == RequestPriority.INTERACTIVE or bucket.limit is None:
+            return 0
+        return math.ceil(bucket.limit * self.settings.bulk_reserve_fraction)
+
+    def _snapshot(self, endpoint: str, bucket: _Bucket) -> RateLimitBudget:
+        """Build the metrics of a bucket (lock held)."""
+        return RateLimitBudget(
+            platform=self.platform,
+            endpoint=endpoint,
+            limit=bucket.limit,
+            remaining=bucket.remaining,
+            reset_at=(
+                datetime.fromtimestamp(bucket.reset_at, tz=timezone.utc)
+                if bucket.reset_at is not None
+                else None
+            ),
+            throttled_count=bucket.throttled_count,
+            rejected_count=bucket.rejected_count,
+        )
+
+    def _parse_headers(
+        self, headers: Mapping[str, str]
+    ) -> tuple[int, int, float] | None:
+        """
+        Parse (limit, remaining, reset_at epoch) from platform headers.
+
+        Returns:
+            Parsed budget, or None if the rate-limit headers are missing
+        """
+        headers = _lowercase_keys(headers)
+
+        if self.platform == Platform.TWITTER:
+            limit = _parse_float(headers.get("x-rate-limit-limit"))
+            remaining = _parse_float(headers.get("x-rate-limit-remaining"))
+            reset_epoch = _parse_float(headers.get("x-rate-limit-reset"))
+            if limit is None or remaining is None or reset_epoch is None:
+                return None
+            return int(limit), int(remaining), reset_epoch
+
+        used = _parse_float(headers.get("x-ratelimit-used"))
+        remaining = _parse_float(headers.get("x-ratelimit-remaining"))
+        reset_in = _parse_float(headers.get("x-ratelimit-reset"))
+        if used is None or remaining is None or reset_in is None:
+            return None
+        return int(used + remaining), int(remaining), self._clock() + reset_in
+
+
+def _lowercase_keys(headers: Mapping[str, str]) -> dict[str, str]:
+    """Return headers with lowercased names."""
+    return {str(name).lower(): value for name, value in headers.items()}
+
+
+def _parse_float(value: str | None) -> float | None:
+    """Parse a numeric header value, returning None if missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(platform: Platform) -> RateLimitScheduler:
+    """Return the process-wide scheduler of a platform."""
+    return RateLimitScheduler(platform)
+
+
+def api_error_from_response(
+    error_msg: str,
+    response: requests.Response,
+    rate_limiter: RateLimitScheduler,
+    endpoint: str = DEFAULT_ENDPOINT,
+) -> ValueError:
+    """
+    Map a platform API error response to the exception raised by fetchers.
+
+    Args:
+        error_msg: Error message for the exception
+        response: HTTP error response
+        rate_limiter: Scheduler of the platform (records 429 responses)
+        endpoint: Rate-limited endpoint the response came from
+
+    Returns:
+        RateLimitExceededError for 429, PostUnavailableError for 403/404/410
+        (only 404/410 are cached, see trade_safety.post_cache), ValueError
+        otherwise
+    """
+    if response.status_code == 429:
+        retry_after = rate_limiter.record_throttled(response.headers, endpoint)
+        return RateLimitExceededError(error_msg, retry_after)
+    if response.status_code in {403, 404, 410}:
+        return PostUnavailableError(error_msg, response.status_code)
+    return ValueError(error_msg)
+
+
+def get_rate_limit_budgets() -> list[RateLimitBudget]:
+    """Return the current budget of every platform endpoint (for metrics endpoints)."""
+    return [
+        budget
+        for platform in Platform
+        for budget in get_rate_limiter(platform).budgets()
+    ]
@@ -7,18 +7,42 @@ Uses Client Credentials flow for server-to-server authentication.
 
 from __future__ import annotations
 
-import base64
 import logging
-import re
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from typing import Any, cast
 
 import requests
 from pydantic import BaseModel, Field
 
+from trade_safety.batching import MicroBatcher
+from trade_safety.post_cache import PostCache, PostUnavailableError
+from trade_safety.rate_limits import (
+    RateLimitScheduler,
+    RequestPriority,
+    api_error_from_response,
+    get_rate_limiter,
+)
+from trade_safety.reddit_token_manager import (
+    RedditTokenManager,
+    get_reddit_token_manager,
+)
+from trade_safety.schemas import Platform
 from trade_safety.settings import RedditAPISettings
+from trade_safety.url_canonicalization import (
+    CanonicalPost,
+    canonicalize_url,
+    detect_platform,
+)
 
 logger = logging.getLogger(__name__)
 
+# Maximum fullnames per /api/info request
+INFO_LOOKUP_MAX_IDS = 100
+
+# Reddit fullname prefix of link (post) objects
+_LINK_FULLNAME_PREFIX = "t3_"
+
 
 # ==============================================================================
 # Data Models
@@ -29,7 +53,9 @@ class RedditPostMetadata(BaseModel):
     """Reddit post metadata for preview functionality"""
 
     author: str = Field(description="Post author username")
-    created_at: datetime | None = Field(None, description="Post creation timestamp")
+    created_at: datetime | None = Field(
+        default=None, description="Post creation timestamp"
+    )
     title: str = Field(description="Post title")
     text: str = Field(description="Post text content (selftext)")
     subreddit: str = Field(description="Subreddit name")
@@ -63,24 +89,41 @@ class RedditService:
         REDDIT_USER_AGENT: Custom User-Agent (optional)
     """
 
-    def __init__(self, reddit_api: RedditAPISettings | None = None):
+    def __init__(
+        self,
+        reddit_api: RedditAPISettings | None = None,
+        cache: PostCache | None = None,
+        rate_limiter: RateLimitScheduler | None = None,
+        token_manager: RedditTokenManager | None = None,
+    ):
         """
         Initialize RedditService with Reddit API settings.
 
         Args:
             reddit_api: Reddit API settings containing client_id and client_secret.
                         If not provided, RedditAPISettings() will load from environment.
+            cache: Post cache shared across requests (default: None, no caching)
+            rate_limiter: Rate-limit scheduler for API calls
+                          (default: process-wide Reddit scheduler)
+            token_manager: OAuth token manager
+                           (default: process-wide manager for these credentials)
 
         Note:
             Credentials are validated at API call time (lazy validation),
             not at initialization.
         """
         self.settings = reddit_api or RedditAPISettings()
-        # OAuth token cache (instance-level to avoid cross-instance conflicts)
-        self._access_token: str | None = None
-        self._token_expires_at: datetime | None = None
+        self.cache = cache
+        self.rate_limiter = rate_limiter or get_rate_limiter(Platform.REDDIT)
+        # OAuth token shared by all instances with the same credentials
+        self.token_manager = token_manager or get_reddit_token_manager(self.settings)
         logger.debug("Initialized RedditService")
 
+    @property
+    def batcher(self) -> MicroBatcher[RedditPostMetadata]:
+        """Process-wide batcher of metadata lookups (see get_reddit_batcher)."""
+        return get_reddit_batcher(self.token_manager, self.rate_limiter)
+
     # ==========================================
     # Main Methods
     # ==========================================
@@ -89,6 +132,9 @@ class RedditService:
         """
         Fetch Reddit post metadata from URL using OAuth API.
 
+        Lookups go through the process-wide micro-batcher, so concurrent
+        requests share `/api/info` calls.
+
         Args:
             reddit_url: Reddit post URL (e.g., https://reddit.com/r/sub/comments/id/title/)
 
@@ -96,6 +142,7 @@ class RedditService:
             RedditPostMetadata: Post metadata including title, text, author, images
 
         Raises:
+            PostUnavailableError: If the post is deleted or inaccessible
             ValueError: If credentials are missing, post ID extraction fails, or API fails
 
         Example:
@@ -109,14 +156,70 @@ class RedditService:
         if not post_id:
             raise ValueError(f"Could not extract post ID from URL: {reddit_url}")
 
-        # Get OAuth access token
-        access_token = self._get_access_token()
+        if self.cache:
+            key = CanonicalPost(platform=Platform.REDDIT, post_id=post_id).key
+            return self.cache.get_or_fetch(
+                key, RedditPostMetadata, lambda: self.batcher.fetch(post_id)
+            )
+
+        return self.batcher.fetch(post_id)
+
+    def fetch_metadata_batch(
+        self,
+        post_ids: list[str],
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> dict[str, RedditPostMetadata | PostUnavailableError]:
+        """
+        Fetch metadata of many posts with batched `/api/info` lookups.
+
+        Unlike `/comments/{id}.json`, `/api/info` returns only the post objects
+        (no comment trees), up to 100 per request, so a single post is looked
+        up the same way.
 
-        # Make API request
-        data = self._make_api_request(post_id, access_token)
+        Args:
+            post_ids: Reddit post IDs (without "t3_" prefix)
+            priority: Scheduling priority of the API calls
+
+        Returns:
+            Mapping of post ID to its metadata, or to PostUnavailableError for
+            posts that are missing from the response
+
+        Raises:
+            ValueError: If credentials are missing or an API call fails
+        """
+        results: dict[str, RedditPostMetadata | PostUnavailableError] = {}
+        unique_ids = list(dict.fromkeys(post_ids))
 
-        # Parse response
-        return self._parse_post_data(data)
+        access_token = self._get_access_token()
+        for start in range(0, len(unique_ids), INFO_LOOKUP_MAX_IDS):
+            chunk = unique_ids[start : start + INFO_LOOKUP_MAX_IDS]
+            listing = self._make_info_api_request(chunk, access_token, priority)
+
+            for child in listing.get("data", {}).get("children", []):
+                post_data = child.get("data", {})
+                if child.get("kind") != "t3" or "id" not in post_data:
+                    continue
+                try:
+                    results[post_data["id"]] = self._parse_post_object(post_data)
+                except (KeyError, IndexError, TypeError) as e:
+                    logger.warning(
+                        "Skipping unparsable Reddit post %s: %s", post_data["id"], e
+                    )
+
+            # Posts missing from the listing are deleted or in private subreddits
+            for post_id in chunk:
+                if post_id not in results:
+                    results[post_id] = PostUnavailableError(
+                        f"Reddit post not found or inaccessible: {post_id}",
+                        status_code=404,
+                    )
+
+        logger.info(
+            "Fetched Reddit post batch: requested=%d, found=%d",
+            len(unique_ids),
+            sum(isinstance(r, RedditPostMetadata) for r in results.values()),
+        )
+        return results
 
     # ==========================================
     # OAuth Methods
@@ -124,9 +227,7 @@ class RedditService:
 
     def _get_access_token(self) -> str:
         """
-        Get OAuth access token using Client Credentials flow.
-
-        Returns cached token if still valid, otherwise fetches new token.
+        Get OAuth access token from the shared token manager.
 
         Returns:
             str: OAuth access token
@@ -134,178 +235,162 @@ class RedditService:
         Raises:
             ValueError: If credentials are missing or token fetch fails
         """
-        # Check if cached token is still valid
-        if self._access_token and self._token_expires_at:
-            if datetime.now(timezone.utc) < self._token_expires_at:
-                logger.debug("Using cached OAuth token")
-                return self._access_token
-
-        # Validate credentials
-        if not self.settings.client_id or not self.settings.client_secret:
-            raise ValueError(
-                "Reddit API credentials required. "
-                "Set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET environment variables. "
-                "Get credentials at: https://www.reddit.com/prefs/apps"
-            )
-
-        logger.info("Fetching new Reddit OAuth token")
-
-        try:
-            # Prepare auth header (Basic Auth with client_id:client_secret)
-            credentials = f"{self.settings.client_id}:{self.settings.client_secret}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
-
-            headers = {
-                "Authorization": f"Basic {encoded_credentials}",
-                "User-Agent": self.settings.user_agent,
-            }
-            data = {"grant_type": "client_credentials"}
-
-            response = requests.post(
-                "https://www.reddit.com/api/v1/access_token",
-                headers=headers,
-                data=data,
-                timeout=10,
-            )
-            response.raise_for_status()
-
-            token_data = response.json()
-
-            # Cache token
-            access_token: str = token_data["access_token"]
-            self._access_token = access_token
-            expires_in = token_data.get("expires_in", 3600)
-            # Calculate expiration time with 60 second buffer
-            self._token_expires_at = datetime.now(timezone.utc) + timedelta(
-                seconds=expires_in - 60
-            )
-
-            logger.info("Successfully obtained Reddit OAuth token")
-            return access_token
-
-        except requests.exceptions.HTTPError as e:
-            error_msg = (
-                f"Reddit OAuth error: {e.response.status_code} - {e.response.text}"
-            )
-            logger.error(error_msg)
-            raise ValueError(error_msg) from e
-
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Failed to obtain Reddit OAuth token: {str(e)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg) from e
+        return self.token_manager.get_token()
 
     # ==========================================
     # API Request Methods
     # ==========================================
 
-    def _make_api_request(self, post_id: str, access_token: str) -> list:
+    def _make_info_api_request(
+        self,
+        post_ids: list[str],
+        access_token: str,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> dict:
+        """
+        Make Reddit `/api/info` request fetching post objects by fullname.
+
+        Args:
+            post_ids: Up to 100 Reddit post IDs (without "t3_" prefix)
+            access_token: OAuth access token
+            priority: Scheduling priority of the API call
+
+        Returns:
+            dict: API response JSON data (a Listing of t3 objects)
+
+        Raises:
+            ValueError: If API request fails
+        """
+        assert len(post_ids) <= INFO_LOOKUP_MAX_IDS
+        fullnames = ",".join(
+            f"{_LINK_FULLNAME_PREFIX}{post_id}" for post_id in post_ids
+        )
+        return self._send_request(
+            "https://oauth.reddit.com/api/info",
+            access_token,
+            f"post_ids={len(post_ids)}",
+            params={"id": fullnames, "raw_json": 1},
+            priority=priority,
+        )
+
+    def _send_request(
+        self,
+        api_url: str,
+        access_token: str,
+        target: str,
+        params: dict | None = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> Any:
         """
-        Make Reddit OAuth API request to fetch post data.
+        Send an authenticated Reddit OAuth API GET request.
+
+        The call is scheduled against the Reddit rate-limit budget, which is
+        updated from the response headers.
 
         Args:
-            post_id: Reddit post ID
+            api_url: OAuth API endpoint URL
             access_token: OAuth access token
+            target: Description of the requested posts for logs and errors
+            params: Optional query parameters
+            priority: Scheduling priority (bulk calls yield when quota is low)
 
         Returns:
-            list: API response JSON data (list of listings)
+            API response JSON data
 
         Raises:
+            PostUnavailableError: If the API responds with 403/404/410
+            RateLimitExceededError: If the rate limit is exhausted (or 429)
             ValueError: If API request fails
         """
+        self.rate_limiter.acquire(priority)
+
         try:
-            logger.debug("Making Reddit API request: post_id=%s", post_id)
+            logger.debug("Making Reddit API request: %s", target)
 
-            # Use OAuth API endpoint
-            api_url = f"https://oauth.reddit.com/comments/{post_id}.json"
             headers = {
                 "Authorization": f"Bearer {access_token}",
                 "User-Agent": self.settings.user_agent,
             }
 
-            response = requests.get(api_url, headers=headers, timeout=10)
+            response = requests.get(api_url, headers=headers, params=params, timeout=10)
+            self.rate_limiter.update_from_headers(response.headers)
             response.raise_for_status()
 
             return response.json()
 
         except requests.exceptions.Timeout as exc:
-            error_msg = f"Request timeout while fetching Reddit post: post_id={post_id}"
+            error_msg = f"Request timeout while fetching Reddit post: {target}"
             logger.error(error_msg)
             raise ValueError(error_msg) from exc
 
         except requests.exceptions.HTTPError as e:
+            # Always set by raise_for_status()
+            error_response = cast(requests.Response, e.response)
             error_msg = (
-                f"Reddit API error: {e.response.status_code} - {e.response.text}"
+                f"Reddit API error: {error_response.status_code} - "
+                f"{error_response.text}"
             )
             logger.error(error_msg)
-            raise ValueError(error_msg) from e
+            if error_response.status_code == 401:
+                # Token revoked or expired early: fetch a new one next time
+                self.token_manager.invalidate(access_token)
+            raise api_error_from_response(
+                error_msg, error_response, self.rate_limiter
+            ) from e
 
         except requests.exceptions.RequestException as e:
             error_msg = f"Failed to fetch Reddit post: {str(e)}"
             logger.error(error_msg)
             raise ValueError(error_msg) from e
 
-    def _parse_post_data(self, data: list) -> RedditPostMetadata:
+    def _parse_post_object(self, post_data: dict) -> RedditPostMetadata:
         """
-        Parse Reddit API response into RedditPostMetadata.
+        Parse a Reddit post (t3) object into RedditPostMetadata.
 
         Args:
-            data: Reddit API response (list of listings)
+            post_data: Reddit post data dict
 
         Returns:
             RedditPostMetadata: Parsed post metadata
-
-        Raises:
-            ValueError: If response structure is unexpected
         """
-        try:
-            # Reddit returns [post_listing, comments_listing]
-            post_listing = data[0]
-            post_data = post_listing["data"]["children"][0]["data"]
-
-            # Extract author
-            author = post_data.get("author", "unknown")
-
-            # Extract created_at timestamp
-            created_utc = post_data.get("created_utc")
-            created_at = (
-                datetime.fromtimestamp(created_utc, tz=timezone.utc)
-                if created_utc
-                else None
-            )
-
-            # Extract title and text
-            title = post_data.get("title", "")
-            selftext = post_data.get("selftext", "")
-
-            # Extract subreddit
-            subreddit = post_data.get("subreddit", "")
-
-            # Extract images
-            images = self._extract_images(post_data)
-
-            metadata = RedditPostMetadata(
-                author=author,
-                created_at=created_at,
-                title=title,
-                text=selftext,
-                subreddit=subreddit,
-                images=images,
-            )
-
-            logger.info(
-                "Successfully parsed Reddit post: author=%s, subreddit=%s, images=%d",
-                metadata.author,
-                metadata.subreddit,
-                len(metadata.images),
-            )
-
-            return metadata
-
-        except (KeyError, IndexError, TypeError) as e:
-            error_msg = f"Failed to parse Reddit API response: {str(e)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg) from e
+        # Extract author
+        author = post_data.get("author", "unknown")
+
+        # Extract created_at timestamp
+        created_utc = post_data.get("created_utc")
+        created_at = (
+            datetime.fromtimestamp(created_utc, tz=timezone.utc)
+            if created_utc
+            else None
+        )
+
+        # Extract title and text
+        title = post_data.get("title", "")
+        selftext = post_data.get("selftext", "")
+
+        # Extract subreddit
+        subreddit = post_data.get("subreddit", "")
+
+        # Extract images
+        images = self._extract_images(post_data)
+
+        metadata = RedditPostMetadata(
+            author=author,
+            created_at=created_at,
+            title=title,
+            text=selftext,
+            subreddit=subreddit,
+            images=images,
+        )
+
+        logger.info(
+            "Successfully parsed Reddit post: author=%s, subreddit=%s, images=%d",
+            metadata.author,
+            metadata.subreddit,
+            len(metadata.images),
+        )
+
+        return metadata
 
     def _extract_images(self, post_data: dict) -> list[str]:
         """
@@ -368,21 +453,11 @@ class RedditService:
             >>> service._extract_post_id("https://redd.it/abc123")
             "abc123"
         """
-        # Pattern for full Reddit URLs: /comments/{post_id}/
-        pattern_full = r"/comments/([a-zA-Z0-9]+)"
-        match = re.search(pattern_full, reddit_url)
-        if match:
-            post_id = match.group(1)
-            logger.debug("Extracted Reddit post ID: %s", post_id)
-            return post_id
-
-        # Pattern for short URLs: redd.it/{post_id}
-        pattern_short = r"redd\.it/([a-zA-Z0-9]+)"
-        match = re.search(pattern_short, reddit_url)
-        if match:
-            post_id = match.group(1)
-            logger.debug("Extracted Reddit post ID from short URL: %s", post_id)
-            return post_id
+        post = canonicalize_url(reddit_url)
+
+        if post and post.platform == Platform.REDDIT:
+            logger.debug("Extracted Reddit post ID: %s", post.post_id)
+            return post.post_id
 
         logger.warning("Could not extract post ID from URL: %s", reddit_url)
         return None
@@ -400,7 +475,7 @@ class RedditService:
             url: URL to check
 
         Returns:
-            True if URL is from reddit.com or redd.it, False otherwise
+            True if URL host is reddit.com or redd.it (or a subdomain), False otherwise
 
         Examples:
             >>> RedditService.is_reddit_url("https://www.reddit.com/r/kpop/comments/abc/")
@@ -410,4 +485,33 @@ class RedditService:
             >>> RedditService.is_reddit_url("https://twitter.com/user/status/123")
             False
         """
-        return "reddit.com" in url or "redd.it" in url
+        return detect_platform(url) == Platform.REDDIT
+
+
+@lru_cache(maxsize=None)
+def get_reddit_batcher(
+    token_manager: RedditTokenManager, rate_limiter: RateLimitScheduler
+) -> MicroBatcher[RedditPostMetadata]:
+    """
+    Return the process-wide metadata lookup batcher of a token manager.
+
+    RedditService is created per request; sharing the batcher is what lets
+    lookups of concurrent requests land in the same batch. The token manager
+    is process-wide per credentials (see get_reddit_token_manager), so it
+    keys the batcher without the credentials themselves.
+
+    Args:
+        token_manager: OAuth token manager of the credentials
+        rate_limiter: Rate-limit scheduler of the API calls
+
+    Returns:
+        MicroBatcher sending interactive-priority lookups
+    """
+    service = RedditService(
+        token_manager.settings, rate_limiter=rate_limiter, token_manager=token_manager
+    )
+    return MicroBatcher(
+        partial(service.fetch_metadata_batch, priority=RequestPriority.INTERACTIVE),
+        max_batch_size=INFO_LOOKUP_MAX_IDS,
+        window_seconds=token_manager.settings.batch_window_ms / 1000,
+    )
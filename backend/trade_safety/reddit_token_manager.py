@@ -0,0 +1,312 @@
+"""
+Process-wide Reddit OAuth token manager.
+
+RedditService instances are created per request, so an instance-level token
+cache fetches a new token for almost every check, and concurrent requests after
+expiry all hit `/api/v1/access_token` at once. This manager is shared per
+credentials and:
+
+- refreshes single-flight (one fetch, concurrent callers wait for it),
+- renews ahead of expiry in the background while the current token is served,
+- optionally persists the token to a file shared by all worker processes.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import cast
+
+import requests
+from pydantic import BaseModel
+
+from trade_safety.settings import RedditAPISettings
+
+logger = logging.getLogger(__name__)
+
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+
+# Tokens are considered expired this long before Reddit's expires_in
+_EXPIRY_BUFFER_SECONDS = 60
+
+
+class _CachedToken(BaseModel):
+    """OAuth token with its expiry (epoch seconds)"""
+
+    access_token: str
+    expires_at: float
+
+
+class RedditTokenManager:
+    """
+    Shared OAuth token source for RedditService (Client Credentials flow).
+
+    Example:
+        >>> manager = get_reddit_token_manager(RedditAPISettings())
+        >>> token = manager.get_token()
+    """
+
+    def __init__(
+        self,
+        settings: RedditAPISettings,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize RedditTokenManager.
+
+        Args:
+            settings: Reddit API settings (credentials, token cache options)
+            clock: Time source in epoch seconds (injectable for tests)
+        """
+        self.settings = settings
+        self._clock = clock
+        self._token: _CachedToken | None = None
+        # Token the API rejected; never reused from the shared token file
+        self._rejected_token: str | None = None
+        self._refresh_lock = threading.Lock()
+        self._renewing = False
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def get_token(self) -> str:
+        """
+        Get a valid OAuth access token.
+
+        Returns the current token when valid. Within the renewal window before
+        expiry, the current token is still returned and a background renewal
+        is started. Expired or missing tokens are fetched single-flight.
+
+        Returns:
+            str: OAuth access token
+
+        Raises:
+            ValueError: If credentials are missing or token fetch fails
+        """
+        token = self._token
+        now = self._clock()
+
+        if token and now < token.expires_at:
+            if now >= token.expires_at - self.settings.token_renew_before_seconds:
+                self._start_background_renewal()
+            logger.debug("Using cached OAuth token")
+            return token.access_token
+
+        return self._refresh(min_valid_until=now)
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Stop using a token the API rejected (e.g., after a 401).
+
+        The token is dropped from memory and from the shared token file, and
+        never read back from the file, so the next call fetches a new one.
+
+        Args:
+            access_token: The rejected token
+        """
+        self._rejected_token = access_token
+        token = self._token
+        if token and token.access_token == access_token:
+            self._token = None
+
+        shared = self._read_shared_token()
+        path = self._shared_token_file()
+        if path is not None and shared and shared.access_token == access_token:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("Failed to remove Reddit token cache %s: %s", path, e)
+
+    # ==========================================
+    # Refresh Methods
+    # ==========================================
+
+    def _refresh(self, min_valid_until: float) -> str:
+        """
+        Refresh the token single-flight.
+
+        Callers arriving while a refresh is in flight wait for it and reuse its
+        result instead of fetching again.
+
+        Args:
+            min_valid_until: Token must be valid beyond this time to be reused
+
+        Returns:
+            str: OAuth access token
+        """
+        with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            token = self._token
+            if token and token.expires_at > min_valid_until:
+                return token.access_token
+
+            # Another worker process may have refreshed the shared file
+            token = self._read_shared_token()
+            if (
+                token
+                and token.expires_at > min_valid_until
+                and token.access_token != self._rejected_token
+            ):
+                logger.debug("Using OAuth token from shared token cache")
+                self._token = token
+                return token.access_token
+
+            token = self._fetch_token()
+            self._token = token
+            self._write_shared_token(token)
+            return token.access_token
+
+    def _start_background_renewal(self) -> None:
+        """Renew the token in a background thread unless already renewing."""
+        with self._refresh_lock:
+            if self._renewing:
+                return
+            self._renewing = True
+
+        threading.Thread(target=self._renew, daemon=True).start()
+
+    def _renew(self) -> None:
+        """Background renewal; failures keep the current (still valid) token."""
+        try:
+            renew_until = self._clock() + self.settings.token_renew_before_seconds
+            self._refresh(min_valid_until=renew_until)
+        except ValueError as e:
+            logger.warning("Background Reddit OAuth token renewal failed: %s", e)
+        finally:
+            self._renewing = False
+
+    def _fetch_token(self) -> _CachedToken:
+        """
+        Fetch a new OAuth token using Client Credentials flow.
+
+        Returns:
+            _CachedToken: New token with expiry
+
+        Raises:
+            ValueError: If credentials are missing or token fetch fails
+        """
+        # Validate credentials
+        if not self.settings.client_id or not self.settings.client_secret:
+            raise ValueError(
+                "Reddit API credentials required. "
+                "Set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET environment variables. "
+                "Get credentials at: https://www.reddit.com/prefs/apps"
+            )
+
+        logger.info("Fetching new Reddit OAuth token")
+
+        try:
+            # Prepare auth header (Basic Auth with client_id:client_secret)
+            credentials = f"{self.settings.client_id}:{self.settings.client_secret}"
+            encoded_credentials = base64.b64encode(credentials.encode()).decode()
+
+            headers = {
+                "Authorization": f"Basic {encoded_credentials}",
+                "User-Agent": self.settings.user_agent,
+            }
+            data = {"grant_type": "client_credentials"}
+
+            response = requests.post(
+                REDDIT_TOKEN_URL,
+                headers=headers,
+                data=data,
+                timeout=10,
+            )
+            response.raise_for_status()
+
+            token_data = response.json()
+            expires_in = token_data.get("expires_in", 3600)
+
+            logger.info("Successfully obtained Reddit OAuth token")
+            return _CachedToken(
+                access_token=token_data["access_token"],
+                expires_at=self._clock() + expires_in - _EXPIRY_BUFFER_SECONDS,
+            )
+
+        except requests.exceptions.HTTPError as e:
+            # Always set by raise_for_status()
+            error_response = cast(requests.Response, e.response)
+            error_msg = (
+                f"Reddit OAuth error: {error_response.status_code} - "
+                f"{error_response.text}"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg) from e
+
+        except requests.exceptions.RequestException as e:
+            error_msg = f"Failed to obtain Reddit OAuth token: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg) from e
+
+    # ==========================================
+    # Shared Token Cache Methods
+    # ==========================================
+
+    def _shared_token_file(self) -> Path | None:
+        """Return the shared token file for these credentials, if configured."""
+        if not self.settings.token_cache_dir or not self.settings.client_id:
+            return None
+        # Keyed by client id so different apps never share tokens
+        digest = hashlib.sha256(self.settings.client_id.encode()).hexdigest()[:16]
+        return Path(self.settings.token_cache_dir) / f"reddit_token_{digest}.json"
+
+    def _read_shared_token(self) -> _CachedToken | None:
+        """Read the token persisted by any worker process."""
+        path = self._shared_token_file()
+        if path is None or not path.exists():
+            return None
+        try:
+            return _CachedToken.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read Reddit token cache %s: %s", path, e)
+            return None
+
+    def _write_shared_token(self, token: _CachedToken) -> None:
+        """Persist the token atomically, readable only by the owner."""
+        path = self._shared_token_file()
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(token.model_dump(), f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The shared cache is best-effort; memory still holds the token
+            logger.warning("Failed to write Reddit token cache %s: %s", path, e)
+
+
+@lru_cache(maxsize=None)
+def _get_token_manager(settings_json: str) -> RedditTokenManager:
+    """Return the manager of one settings combination (cached per process)."""
+    return RedditTokenManager(RedditAPISettings.model_validate_json(settings_json))
+
+
+def get_reddit_token_manager(settings: RedditAPISettings) -> RedditTokenManager:
+    """
+    Return the process-wide token manager for the given credentials.
+
+    Args:
+        settings: Reddit API settings
+
+    Returns:
+        RedditTokenManager shared by all RedditService instances with the same settings
+    """
+    return _get_token_manager(settings.model_dump_json())
+
+
+def reset_reddit_token_managers() -> None:
+    """Forget all process-wide token managers (tokens are fetched again)."""
+    _get_token_manager.cache_clear()
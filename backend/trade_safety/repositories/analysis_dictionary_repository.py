@@ -0,0 +1,86 @@
+"""Analysis Dictionary Repository implementation."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from trade_safety.analysis_codec import AnalysisDictionaryStore
+from trade_safety.models import DBAnalysisDictionary
+
+
+class DatabaseAnalysisDictionaryManager(AnalysisDictionaryStore):
+    """
+    Database implementation of AnalysisDictionaryStore.
+
+    Example:
+        >>> dictionaries = DatabaseAnalysisDictionaryManager(db_session)
+        >>> dictionaries.latest_id("KO")
+        1203914861
+        >>> len(dictionaries.get_data(1203914861))
+        32768
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize DatabaseAnalysisDictionaryManager.
+
+        Args:
+            db_session: SQLAlchemy session
+        """
+        self.db_session = db_session
+
+    def get_data(self, dict_id: int) -> bytes | None:
+        """
+        Load the content of a dictionary.
+
+        Args:
+            dict_id: zstd dictionary ID
+
+        Returns:
+            Dictionary content, None if no such dictionary was stored
+        """
+        db_dictionary = self.db_session.get(DBAnalysisDictionary, dict_id)
+        return db_dictionary.data if db_dictionary else None
+
+    def latest_id(self, output_language: str) -> int | None:
+        """
+        Find the most recently trained dictionary of a language.
+
+        Args:
+            output_language: Output language of the analyses
+
+        Returns:
+            Dictionary ID, None if none was trained for the language
+        """
+        return self.db_session.scalar(
+            select(DBAnalysisDictionary.dict_id)
+            .where(DBAnalysisDictionary.output_language == output_language)
+            .order_by(DBAnalysisDictionary.created_at.desc())
+            .limit(1)
+        )
+
+    def add(
+        self, dict_id: int, output_language: str, data: bytes, sample_count: int
+    ) -> None:
+        """
+        Store a trained dictionary (again as the latest one if already stored).
+
+        Args:
+            dict_id: zstd dictionary ID the dictionary was trained with
+            output_language: Output language of the training analyses
+            data: Dictionary content
+            sample_count: Number of training analyses
+        """
+        self.db_session.merge(
+            DBAnalysisDictionary(
+                dict_id=dict_id,
+                output_language=output_language,
+                data=data,
+                sample_count=sample_count,
+                created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+        )
+        self.db_session.commit()
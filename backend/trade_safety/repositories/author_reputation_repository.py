@@ -0,0 +1,200 @@
+"""Author Reputation Repository implementation."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import case, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from trade_safety.author_reputation import normalize_author
+from trade_safety.models import DBAuthorReputation
+from trade_safety.schemas import AuthorReputation, Platform
+from trade_safety.settings import AuthorReputationSettings
+
+logger = logging.getLogger(__name__)
+
+
+def _convert_db_to_model(db_reputation: DBAuthorReputation) -> AuthorReputation:
+    """Convert DBAuthorReputation to AuthorReputation with the average score."""
+    return AuthorReputation(
+        platform=Platform(db_reputation.platform),
+        author=db_reputation.author,
+        check_count=db_reputation.check_count,
+        risky_check_count=db_reputation.risky_check_count,
+        min_safe_score=db_reputation.min_safe_score,
+        avg_safe_score=(
+            db_reputation.safe_score_sum / db_reputation.check_count
+            if db_reputation.check_count
+            else None
+        ),
+        reviewed_count=db_reputation.reviewed_count,
+        reviewed_risky_count=db_reputation.reviewed_risky_count,
+        first_seen_at=db_reputation.first_seen_at,
+        last_seen_at=db_reputation.last_seen_at,
+    )
+
+
+class DatabaseAuthorReputationManager:
+    """
+    Per-(platform, author) aggregates of past checks.
+
+    Counters are incremented with a single UPDATE (inserting the row on first
+    sight), so concurrent checks of the same author never lose an increment.
+
+    Example:
+        >>> reputations = DatabaseAuthorReputationManager(db_session)
+        >>> reputations.record_check(Platform.TWITTER, "@seller123", safe_score=15)
+        >>> reputations.get(Platform.TWITTER, "seller123").check_count
+        1
+    """
+
+    def __init__(
+        self, db_session: Session, settings: AuthorReputationSettings | None = None
+    ):
+        """
+        Initialize DatabaseAuthorReputationManager.
+
+        Args:
+            db_session: SQLAlchemy session
+            settings: Reputation settings (default: AuthorReputationSettings()
+                      from environment)
+        """
+        self.db_session = db_session
+        self.settings = settings or AuthorReputationSettings()
+
+    def get(self, platform: Platform, author: str) -> AuthorReputation | None:
+        """
+        Look up an author's history by primary key.
+
+        Args:
+            platform: Platform of the author
+            author: Username (normalized before lookup)
+
+        Returns:
+            Author reputation if the author was checked before, None otherwise
+        """
+        db_reputation = self.db_session.get(
+            DBAuthorReputation, (platform.value, normalize_author(author))
+        )
+        return _convert_db_to_model(db_reputation) if db_reputation else None
+
+    def record_check(
+        self,
+        platform: Platform,
+        author: str,
+        safe_score: int,
+        seen_at: datetime | None = None,
+        commit: bool = True,
+    ) -> None:
+        """
+        Count a check of a post by the author.
+
+        Args:
+            platform: Platform of the post
+            author: Post author username
+            safe_score: Safety score of the check
+            seen_at: When the check was made (default: now)
+            commit: Commit the update (False to leave it in the caller's
+                    transaction)
+        """
+        risky = int(safe_score < self.settings.risky_score_threshold)
+        seen_at = seen_at or datetime.now(timezone.utc)
+        columns = DBAuthorReputation.__table__.c
+        self._upsert(
+            platform,
+            author,
+            increments={
+                "check_count": columns.check_count + 1,
+                "risky_check_count": columns.risky_check_count + risky,
+                "safe_score_sum": columns.safe_score_sum + safe_score,
+                "min_safe_score": case(
+                    (columns.min_safe_score.is_(None), safe_score),
+                    (columns.min_safe_score > safe_score, safe_score),
+                    else_=columns.min_safe_score,
+                ),
+                "last_seen_at": seen_at,
+            },
+            initial={
+                "check_count": 1,
+                "risky_check_count": risky,
+                "safe_score_sum": safe_score,
+                "min_safe_score": safe_score,
+                "first_seen_at": seen_at,
+                "last_seen_at": seen_at,
+            },
+            commit=commit,
+        )
+
+    def record_review(self, platform: Platform, author: str, safe_score: int) -> None:
+        """
+        Count an expert review of a check of a post by the author.
+
+        Args:
+            platform: Platform of the post
+            author: Post author username
+            safe_score: Safety score of the reviewed check
+        """
+        risky = int(safe_score < self.settings.risky_score_threshold)
+        now = datetime.now(timezone.utc)
+        columns = DBAuthorReputation.__table__.c
+        self._upsert(
+            platform,
+            author,
+            increments={
+                "reviewed_count": columns.reviewed_count + 1,
+                "reviewed_risky_count": columns.reviewed_risky_count + risky,
+            },
+            initial={
+                "reviewed_count": 1,
+                "reviewed_risky_count": risky,
+                "first_seen_at": now,
+                "last_seen_at": now,
+            },
+        )
+
+    def _upsert(
+        self,
+        platform: Platform,
+        author: str,
+        increments: dict[str, Any],
+        initial: dict[str, Any],
+        commit: bool = True,
+    ) -> None:
+        """
+        Apply increments to an author's row, inserting it on first sight.
+
+        Args:
+            platform: Platform of the author
+            author: Username (normalized before writing)
+            increments: Column expressions applied to an existing row
+            initial: Column values of a new row
+            commit: Commit the row (False to leave it in the caller's
+                    transaction)
+        """
+        key = {"platform": platform.value, "author": normalize_author(author)}
+        statement = (
+            update(DBAuthorReputation)
+            .where(
+                DBAuthorReputation.platform == key["platform"],
+                DBAuthorReputation.author == key["author"],
+            )
+            .values(**increments)
+            .execution_options(synchronize_session=False)
+        )
+
+        if self.db_session.execute(statement).rowcount == 0:  # type: ignore[attr-defined]
+            try:
+                with self.db_session.begin_nested():
+                    self.db_session.add(DBAuthorReputation(**key, **initial))
+            except IntegrityError:
+                # Inserted concurrently by another request: apply as an update
+                self.db_session.execute(statement)
+        if commit:
+            self.db_session.commit()
+        logger.debug(
+            "Recorded author reputation: %s/%s", key["platform"], key["author"]
+        )
@@ -0,0 +1,289 @@
+"""Check Rollup Repository implementation."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from trade_safety.models import DBCheckRollup
+from trade_safety.schemas import (
+    CheckStatsBucket,
+    Platform,
+    RiskCategory,
+    StatsDimension,
+    StatsGranularity,
+    TradeSafetyCheck,
+)
+
+logger = logging.getLogger(__name__)
+
+# risk_category of the rows counting every check once
+ALL_CATEGORIES = "*"
+
+# Safety scores are counted in buckets of this size (0-19, 20-39, ...)
+SCORE_BUCKET_SIZE = 20
+
+# (granularity, bucket_start, platform, output_language, score_bucket, risk_category)
+RollupKey = tuple[str, datetime, str, str, int, str]
+
+
+def bucket_start(moment: datetime, granularity: StatsGranularity) -> datetime:
+    """
+    Truncate a time to the start of its UTC bucket.
+
+    Args:
+        moment: Time (naive times are taken as UTC)
+        granularity: Bucket size
+
+    Returns:
+        Naive UTC start of the bucket
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == StatsGranularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def rollup_keys(
+    created_at: datetime,
+    platform: str | None,
+    output_language: str | None,
+    safe_score: int,
+    risk_categories: Iterable[str],
+) -> list[RollupKey]:
+    """
+    List the rollup rows a check counts towards.
+
+    Args:
+        created_at: When the check was created
+        platform: Platform of the post (None for text inputs)
+        output_language: Language of the analysis
+        safe_score: Safety score of the check
+        risk_categories: Categories of the check's risk signals (repeats allowed)
+
+    Returns:
+        One key per granularity for all checks and per distinct risk category
+    """
+    score_bucket = min(safe_score // SCORE_BUCKET_SIZE, 100 // SCORE_BUCKET_SIZE - 1)
+    categories = [ALL_CATEGORIES, *sorted(set(risk_categories))]
+    return [
+        (
+            granularity.value,
+            bucket_start(created_at, granularity),
+            platform or "",
+            output_language or "",
+            score_bucket * SCORE_BUCKET_SIZE,
+            category,
+        )
+        for granularity in StatsGranularity
+        for category in categories
+    ]
+
+
+class DatabaseCheckRollupManager:
+    """
+    Check counts per time bucket, platform, language, score bucket and risk
+    category.
+
+    Rows are incremented as checks are created, so statistics are read from
+    a number of rows proportional to the buckets asked for, never from the
+    checks table (or its JSON analyses).
+
+    Example:
+        >>> rollups = DatabaseCheckRollupManager(db_session)
+        >>> rollups.record_check(check)
+        >>> rollups.query(StatsGranularity.DAY, since=week_ago, max_safe_score=40)
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize DatabaseCheckRollupManager.
+
+        Args:
+            db_session: SQLAlchemy session
+        """
+        self.db_session = db_session
+
+    def record_check(self, check: TradeSafetyCheck) -> None:
+        """
+        Count a created check in its rollup rows.
+
+        Args:
+            check: Stored check
+        """
+        self.record_checks([check])
+
+    def record_checks(
+        self, checks: Sequence[TradeSafetyCheck], commit: bool = True
+    ) -> None:
+        """
+        Count created checks in their rollup rows, in one transaction.
+
+        Counts of checks sharing a row are added up first, so each row is
+        incremented once per call. Rows are incremented in key order so
+        concurrent calls cannot deadlock.
+
+        Args:
+            checks: Stored checks
+            commit: Commit the increments (False to leave them in the caller's
+                    transaction)
+        """
+        totals: dict[RollupKey, tuple[int, int]] = {}
+        for check in checks:
+            keys = rollup_keys(
+                check.created_at,
+                check.platform.value if check.platform else None,
+                check.output_language,
+                check.safe_score,
+                (signal.category.value for signal in check.llm_analysis.risk_signals),
+            )
+            for key in keys:
+                check_count, safe_score_sum = totals.get(key, (0, 0))
+                totals[key] = (check_count + 1, safe_score_sum + check.safe_score)
+        for key, (check_count, safe_score_sum) in sorted(totals.items()):
+            self._increment(key, check_count=check_count, safe_score_sum=safe_score_sum)
+        if commit:
+            self.db_session.commit()
+        logger.debug(
+            "Recorded check rollups: checks=%d rows=%d", len(checks), len(totals)
+        )
+
+    def query(
+        self,
+        granularity: StatsGranularity,
+        since: datetime,
+        until: datetime | None = None,
+        group_by: Sequence[StatsDimension] = (),
+        platform: Platform | None = None,
+        output_language: str | None = None,
+        risk_category: RiskCategory | None = None,
+        max_safe_score: int | None = None,
+    ) -> list[CheckStatsBucket]:
+        """
+        Aggregate check counts per time bucket.
+
+        Args:
+            granularity: Time bucket size
+            since: Start of the period (rounded down to its bucket)
+            until: End of the period, exclusive (default: now)
+            group_by: Dimensions to report separately within each bucket
+            platform: Only count checks of posts on this platform
+            output_language: Only count checks in this language
+            risk_category: Only count checks with signals in this category
+            max_safe_score: Only count checks scored below this (rounded down
+                            to a multiple of SCORE_BUCKET_SIZE)
+
+        Returns:
+            Buckets in time order; dimensions not grouped by are None
+        """
+        dimensions = [getattr(DBCheckRollup, dimension.value) for dimension in group_by]
+        statement = select(
+            DBCheckRollup.bucket_start,
+            *dimensions,
+            func.sum(DBCheckRollup.check_count).label("check_count"),
+            func.sum(DBCheckRollup.safe_score_sum).label("safe_score_sum"),
+        ).where(
+            DBCheckRollup.granularity == granularity.value,
+            DBCheckRollup.bucket_start >= bucket_start(since, granularity),
+        )
+        if until is not None:
+            statement = statement.where(
+                DBCheckRollup.bucket_start < bucket_start(until, granularity)
+            )
+        if platform is not None:
+            statement = statement.where(DBCheckRollup.platform == platform.value)
+        if output_language is not None:
+            statement = statement.where(
+                DBCheckRollup.output_language == output_language
+            )
+        if risk_category is not None:
+            statement = statement.where(
+                DBCheckRollup.risk_category == risk_category.value
+            )
+        elif StatsDimension.RISK_CATEGORY in group_by:
+            statement = statement.where(DBCheckRollup.risk_category != ALL_CATEGORIES)
+        else:
+            statement = statement.where(DBCheckRollup.risk_category == ALL_CATEGORIES)
+        if max_safe_score is not None:
+            statement = statement.where(
+                DBCheckRollup.score_bucket + SCORE_BUCKET_SIZE <= max_safe_score
+            )
+
+        rows = self.db_session.execute(
+            statement.group_by(DBCheckRollup.bucket_start, *dimensions).order_by(
+                DBCheckRollup.bucket_start, *dimensions
+            )
+        ).all()
+        return [_to_stats_bucket(row._mapping) for row in rows]
+
+    def _increment(self, key: RollupKey, check_count: int, safe_score_sum: int) -> None:
+        """
+        Add counts to a rollup row, inserting it on first use.
+
+        Args:
+            key: Primary key of the row
+            check_count: Checks to add
+            safe_score_sum: Safety scores to add
+        """
+        granularity, start, platform, language, score_bucket, category = key
+        columns = DBCheckRollup.__table__.c
+        statement = (
+            update(DBCheckRollup)
+            .where(
+                DBCheckRollup.granularity == granularity,
+                DBCheckRollup.bucket_start == start,
+                DBCheckRollup.platform == platform,
+                DBCheckRollup.output_language == language,
+                DBCheckRollup.score_bucket == score_bucket,
+                DBCheckRollup.risk_category == category,
+            )
+            .values(
+                check_count=columns.check_count + check_count,
+                safe_score_sum=columns.safe_score_sum + safe_score_sum,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        if self.db_session.execute(statement).rowcount == 0:  # type: ignore[attr-defined]
+            try:
+                with self.db_session.begin_nested():
+                    self.db_session.add(
+                        DBCheckRollup(
+                            granularity=granularity,
+                            bucket_start=start,
+                            platform=platform,
+                            output_language=language,
+                            score_bucket=score_bucket,
+                            risk_category=category,
+                            check_count=check_count,
+                            safe_score_sum=safe_score_sum,
+                        )
+                    )
+            except IntegrityError:
+                # Inserted concurrently by another request: apply as an update
+                self.db_session.execute(statement)
+
+
+def _to_stats_bucket(row: Any) -> CheckStatsBucket:
+    """Convert an aggregated rollup row to CheckStatsBucket."""
+    platform = row.get("platform")
+    category = row.get("risk_category")
+    return CheckStatsBucket(
+        bucket_start=row["bucket_start"],
+        platform=Platform(platform) if platform else None,
+        output_language=row.get("output_language") or None,
+        score_bucket=row.get("score_bucket"),
+        risk_category=(
+            RiskCategory(category) if category and category != ALL_CATEGORIES else None
+        ),
+        check_count=row["check_count"],
+        avg_safe_score=row["safe_score_sum"] / row["check_count"],
+    )
@@ -0,0 +1,164 @@
+"""Expert Advice Repository implementation."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Collection
+from datetime import datetime, timezone
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from trade_safety.models import DBExpertAdvice, DBTradeSafetyCheck
+from trade_safety.schemas import ExpertAdvice, TradeSafetyCheck
+from trade_safety.settings import ExpertAdviceSettings
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseExpertAdviceManager:
+    """
+    Shares the advice of an expert review with every check of the same post.
+
+    The same post is often checked dozens of times, but an expert reviews
+    one check. The advice is copied to the other checks of the same
+    normalized input (and optionally to near duplicates) with one bulk
+    UPDATE, and kept per input hash so checks created later get it too.
+
+    Checks reviewed directly by an expert are never overwritten; advice copied
+    from an earlier review is replaced by the latest one.
+
+    Example:
+        >>> advice = DatabaseExpertAdviceManager(db_session)
+        >>> advice.record(input_hash, reviewed_check)
+        >>> advice.propagate(reviewed_check, input_hash)
+        ['0b6f...', '4c1e...']
+    """
+
+    def __init__(
+        self, db_session: Session, settings: ExpertAdviceSettings | None = None
+    ):
+        """
+        Initialize DatabaseExpertAdviceManager.
+
+        Args:
+            db_session: SQLAlchemy session
+            settings: Advice sharing settings (default: ExpertAdviceSettings()
+                      from environment)
+        """
+        self.db_session = db_session
+        self.settings = settings or ExpertAdviceSettings()
+
+    def get(self, input_hash: str) -> ExpertAdvice | None:
+        """
+        Look up the latest expert advice on a normalized input.
+
+        Args:
+            input_hash: Hash of the normalized input (see compute_input_hash)
+
+        Returns:
+            Advice if an expert reviewed a check of the input, None otherwise
+        """
+        db_advice = self.db_session.get(DBExpertAdvice, input_hash)
+        return ExpertAdvice.model_validate(db_advice) if db_advice else None
+
+    def get_many(self, input_hashes: Collection[str]) -> dict[str, ExpertAdvice]:
+        """
+        Look up the latest expert advice on several inputs in one query.
+
+        Args:
+            input_hashes: Hashes of normalized inputs
+
+        Returns:
+            Advice per input hash, for inputs an expert reviewed
+        """
+        db_advice = self.db_session.scalars(
+            select(DBExpertAdvice).where(DBExpertAdvice.input_hash.in_(input_hashes))
+        )
+        return {
+            advice.input_hash: ExpertAdvice.model_validate(advice)
+            for advice in db_advice
+        }
+
+    def record(self, input_hash: str, check: TradeSafetyCheck) -> None:
+        """
+        Keep the advice of a reviewed check for future checks of its input.
+
+        Args:
+            input_hash: Hash of the normalized input of the check
+            check: Check reviewed by an expert, with advice
+        """
+        values = {
+            "check_id": check.id,
+            "expert_advice": check.expert_advice,
+            "expert_reviewed_at": check.expert_reviewed_at,
+            "expert_reviewed_by": check.expert_reviewed_by,
+            "updated_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        statement = (
+            update(DBExpertAdvice)
+            .where(DBExpertAdvice.input_hash == input_hash)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+        if self.db_session.execute(statement).rowcount == 0:  # type: ignore[attr-defined]
+            try:
+                with self.db_session.begin_nested():
+                    self.db_session.add(DBExpertAdvice(input_hash=input_hash, **values))
+            except IntegrityError:
+                # Recorded concurrently by another review: the latest one wins
+                self.db_session.execute(statement)
+        self.db_session.commit()
+
+    def propagate(
+        self,
+        check: TradeSafetyCheck,
+        input_hash: str,
+        near_duplicate_ids: Collection[str] = (),
+    ) -> list[str]:
+        """
+        Copy the advice of a reviewed check to other checks of the same post.
+
+        Args:
+            check: Check reviewed by an expert, with advice
+            input_hash: Hash of the normalized input of the check
+            near_duplicate_ids: Near duplicates of the check to include
+
+        Returns:
+            IDs of the checks that received the advice
+        """
+        same_post = DBTradeSafetyCheck.input_hash == input_hash
+        if near_duplicate_ids:
+            same_post = or_(same_post, DBTradeSafetyCheck.id.in_(near_duplicate_ids))
+
+        check_ids = list(
+            self.db_session.scalars(
+                update(DBTradeSafetyCheck)
+                .where(
+                    same_post,
+                    DBTradeSafetyCheck.id != check.id,
+                    or_(
+                        DBTradeSafetyCheck.expert_reviewed.is_(False),
+                        DBTradeSafetyCheck.expert_advice_source_id.is_not(None),
+                    ),
+                )
+                .values(
+                    expert_advice=check.expert_advice,
+                    expert_reviewed=True,
+                    expert_reviewed_at=check.expert_reviewed_at,
+                    expert_reviewed_by=check.expert_reviewed_by,
+                    expert_advice_source_id=check.id,
+                    review_claimed_by=None,
+                    review_claimed_until=None,
+                )
+                .returning(DBTradeSafetyCheck.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+        self.db_session.commit()
+        logger.info(
+            "Propagated expert advice: source_id=%s checks=%d", check.id, len(check_ids)
+        )
+        return check_ids
@@ -0,0 +1,152 @@
+"""Expert Review Queue Repository implementation."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import ColumnElement, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from trade_safety.models import DBTradeSafetyCheck
+from trade_safety.schemas import ReviewClaim
+from trade_safety.settings import ReviewQueueSettings
+
+logger = logging.getLogger(__name__)
+
+# Candidates tried per claim when a concurrent claim wins the race (SQLite)
+CLAIM_ATTEMPTS = 5
+
+
+def _utcnow() -> datetime:
+    """Current time as naive UTC, as stored in DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _claimable(now: datetime) -> list[ColumnElement[bool]]:
+    """Conditions of pending checks whose lease is free or expired."""
+    return [
+        DBTradeSafetyCheck.expert_reviewed.is_(False),
+        or_(
+            DBTradeSafetyCheck.review_claimed_until.is_(None),
+            DBTradeSafetyCheck.review_claimed_until <= now,
+        ),
+    ]
+
+
+class DatabaseReviewQueueManager:
+    """
+    Queue of unreviewed checks, served highest review priority first.
+
+    The next check is read from a partial index on pending checks ordered by
+    (review_priority DESC, created_at). Claiming reserves it for one expert
+    for a lease period; expired leases return the check to the queue.
+
+    On PostgreSQL the candidate row is locked with FOR UPDATE SKIP LOCKED, so
+    concurrent claims take different checks without waiting on each other.
+    SQLite has no row locks; there the claim is a conditional UPDATE and a
+    lost race moves on to the next candidate.
+
+    Example:
+        >>> queue = DatabaseReviewQueueManager(db_session)
+        >>> claim = queue.claim_next("expert-1")
+        >>> queue.release(claim.check_id, "expert-1")
+        True
+    """
+
+    def __init__(
+        self, db_session: Session, settings: ReviewQueueSettings | None = None
+    ):
+        """
+        Initialize DatabaseReviewQueueManager.
+
+        Args:
+            db_session: SQLAlchemy session
+            settings: Queue settings (default: ReviewQueueSettings() from environment)
+        """
+        self.db_session = db_session
+        self.settings = settings or ReviewQueueSettings()
+
+    def claim_next(self, expert_id: str) -> ReviewClaim | None:
+        """
+        Reserve the highest-priority pending check for an expert.
+
+        Args:
+            expert_id: ID of the expert claiming a check
+
+        Returns:
+            The claim, or None if no pending check is available
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            now = _utcnow()
+            check_id = self.db_session.execute(
+                select(DBTradeSafetyCheck.id)
+                .where(*_claimable(now))
+                .order_by(
+                    DBTradeSafetyCheck.review_priority.desc(),
+                    DBTradeSafetyCheck.created_at,
+                )
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if check_id is None:
+                self.db_session.rollback()
+                return None
+
+            claimed_until = now + timedelta(minutes=self.settings.lease_minutes)
+            result = self.db_session.execute(
+                update(DBTradeSafetyCheck)
+                .where(DBTradeSafetyCheck.id == check_id, *_claimable(now))
+                .values(review_claimed_by=expert_id, review_claimed_until=claimed_until)
+                .execution_options(synchronize_session=False)
+            )
+            self.db_session.commit()
+            if result.rowcount == 1:  # type: ignore[attr-defined]
+                logger.info(
+                    "Review claimed: check_id=%s expert=%s", check_id, expert_id
+                )
+                return ReviewClaim(
+                    check_id=check_id,
+                    claimed_by=expert_id,
+                    claimed_until=claimed_until,
+                )
+        return None
+
+    def release(self, check_id: str, expert_id: str) -> bool:
+        """
+        Return a claimed check to the queue before its lease expires.
+
+        Args:
+            check_id: Claimed check
+            expert_id: Expert holding the lease
+
+        Returns:
+            True if the expert held the lease, False otherwise
+        """
+        result = self.db_session.execute(
+            update(DBTradeSafetyCheck)
+            .where(
+                DBTradeSafetyCheck.id == check_id,
+                DBTradeSafetyCheck.review_claimed_by == expert_id,
+            )
+            .values(review_claimed_by=None, review_claimed_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.db_session.commit()
+        return result.rowcount == 1  # type: ignore[attr-defined]
+
+    def pending_count(self) -> int:
+        """
+        Count unreviewed checks (claimed or not).
+
+        Returns:
+            Number of checks waiting for an expert
+        """
+        return (
+            self.db_session.scalar(
+                select(func.count()).where(  # pylint: disable=not-callable
+                    DBTradeSafetyCheck.expert_reviewed.is_(False)
+                )
+            )
+            or 0
+        )
@@ -2,39 +2,269 @@
 
 from __future__ import annotations
 
+import base64
+import json
+import logging
+from collections.abc import Collection, Iterator, Sequence
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from functools import partial
+from typing import Any
+from uuid import uuid4
+
 from aioia_core.managers import BaseManager
+from aioia_core.types import CrudFilter, is_logical_filter
+from sqlalchemy import ColumnElement, Select, and_, func, insert, or_, select
 from sqlalchemy.orm import Session
 
+from trade_safety.analysis_codec import AnalysisCodec
+from trade_safety.analysis_versions import ANALYSIS_SCHEMA_VERSION, upgrade_analysis
+from trade_safety.author_reputation import normalize_author
+from trade_safety.currency import (
+    CurrencyConverter,
+    get_currency_converter,
+    normalize_currency,
+)
+from trade_safety.input_normalization import compute_input_hash
 from trade_safety.managers import TradeSafetyCheckManager
-from trade_safety.models import DBTradeSafetyCheck
+from trade_safety.models import DBRiskSignal, DBTradeSafetyCheck
+from trade_safety.near_duplicates import IndexedCheck, NearDuplicateIndex
+from trade_safety.price_reference import PriceReferenceIndex
+from trade_safety.repositories.analysis_dictionary_repository import (
+    DatabaseAnalysisDictionaryManager,
+)
+from trade_safety.repositories.author_reputation_repository import (
+    DatabaseAuthorReputationManager,
+)
+from trade_safety.repositories.check_rollup_repository import DatabaseCheckRollupManager
+from trade_safety.repositories.expert_advice_repository import (
+    DatabaseExpertAdviceManager,
+)
+from trade_safety.repositories.review_queue_repository import DatabaseReviewQueueManager
+from trade_safety.review_queue import (
+    DUPLICATE_PRIORITY,
+    MAX_DUPLICATE_PRIORITY,
+    review_priority,
+)
 from trade_safety.schemas import (
+    CheckListFilters,
+    ExpertAdvice,
+    Platform,
+    RiskSeverity,
     TradeSafetyAnalysis,
     TradeSafetyCheck,
     TradeSafetyCheckCreate,
+    TradeSafetyCheckSummary,
     TradeSafetyCheckUpdate,
 )
+from trade_safety.similar_cases import SimilarCaseIndex
+from trade_safety.write_behind import PendingCheck, WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+# Severities from lowest to highest
+_SEVERITY_ORDER = [
+    RiskSeverity.LOW.value,
+    RiskSeverity.MEDIUM.value,
+    RiskSeverity.HIGH.value,
+]
+
+# Characters of input_text returned by the admin list
+INPUT_PREVIEW_CHARS = 200
+
+# Earlier copies of an input counted for the review priority (more add nothing)
+_MAX_COUNTED_DUPLICATES = MAX_DUPLICATE_PRIORITY // DUPLICATE_PRIORITY
 
+# List filter fields answered from the risk signal table
+_SIGNAL_FILTER_COLUMNS = {
+    "risk_category": DBRiskSignal.category,
+    "risk_severity": DBRiskSignal.severity,
+}
 
-def _convert_db_to_model(db_check: DBTradeSafetyCheck) -> TradeSafetyCheck:
-    """Convert DBTradeSafetyCheck to TradeSafetyCheck with type-safe llm_analysis."""
+
+def _convert_db_to_model(
+    db_check: DBTradeSafetyCheck, codec: AnalysisCodec
+) -> TradeSafetyCheck:
+    """Convert DBTradeSafetyCheck to TradeSafetyCheck with type-safe llm_analysis.
+
+    Compressed analyses are decoded with `codec`. Rows written with an older
+    analysis schema are upgraded in memory; the stored row is left untouched
+    (see upgrade_stale_analyses for rewriting).
+    """
+    llm_analysis = upgrade_analysis(
+        codec.load(db_check.llm_analysis, db_check.llm_analysis_zstd),
+        db_check.schema_version,
+    )
     return TradeSafetyCheck(
         id=db_check.id,
         user_id=db_check.user_id,
         input_text=db_check.input_text,
-        llm_analysis=TradeSafetyAnalysis(**db_check.llm_analysis),
+        output_language=db_check.output_language,
+        platform=Platform(db_check.platform) if db_check.platform else None,
+        author=db_check.author,
+        llm_analysis=TradeSafetyAnalysis(**llm_analysis),
+        offered_price_usd=db_check.offered_price_usd,
         safe_score=db_check.safe_score,
         expert_advice=db_check.expert_advice,
         expert_reviewed=db_check.expert_reviewed,
         expert_reviewed_at=db_check.expert_reviewed_at,
         expert_reviewed_by=db_check.expert_reviewed_by,
+        expert_advice_source_id=db_check.expert_advice_source_id,
         created_at=db_check.created_at,
         updated_at=db_check.updated_at,
     )
 
 
-def _convert_to_db_model(schema: TradeSafetyCheckCreate) -> dict:
+def offered_price_usd(
+    llm_analysis: dict | None, converter: CurrencyConverter
+) -> float | None:
+    """
+    Compute the USD equivalent of the offered price of a stored analysis.
+
+    Args:
+        llm_analysis: Analysis as stored (only price_analysis is read)
+        converter: Currency converter
+
+    Returns:
+        USD equivalent, or None without a price in a known currency
+    """
+    price_analysis = (llm_analysis or {}).get("price_analysis") or {}
+    price = price_analysis.get("offered_price")
+    if price is None or isinstance(price, bool):
+        return None
+    try:
+        return converter.to_usd(Decimal(str(price)), price_analysis.get("currency"))
+    except ArithmeticError:
+        return None
+
+
+def encode_cursor(created_at: datetime, check_id: str) -> str:
+    """
+    Encode the position after a check in the admin list.
+
+    Args:
+        created_at: Creation time of the last check of a page
+        check_id: ID of the last check of a page
+
+    Returns:
+        Opaque URL-safe cursor
+    """
+    raw = json.dumps([created_at.isoformat(), check_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor
+
+    Returns:
+        (created_at, check_id) of the last check of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, check_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(check_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _as_naive_utc(moment: datetime) -> datetime:
+    """Convert a time to naive UTC as stored in DateTime columns."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _enum_value(value: object) -> str:
+    """Return the value of an enum member, or the value itself as a string."""
+    return str(value.value if isinstance(value, Enum) else value)
+
+
+def risk_signal_rows(llm_analysis: dict | None) -> list[tuple[str, str]]:
+    """
+    Extract the category and severity of each risk signal of a stored analysis.
+
+    Args:
+        llm_analysis: Analysis as stored (only risk_signals is read)
+
+    Returns:
+        (category, severity) per signal
+    """
+    signals = (llm_analysis or {}).get("risk_signals") or []
+    return [
+        (_enum_value(signal["category"]), _enum_value(signal["severity"]))
+        for signal in signals
+        if signal.get("category") and signal.get("severity")
+    ]
+
+
+def promoted_fields(llm_analysis: dict | None) -> dict:
+    """
+    Extract the llm_analysis fields stored in their own columns for filtering.
+
+    Args:
+        llm_analysis: Analysis as stored
+
+    Returns:
+        Column values of currency and max_risk_severity
+    """
+    price_analysis = (llm_analysis or {}).get("price_analysis") or {}
+    severities = [
+        severity
+        for _, severity in risk_signal_rows(llm_analysis)
+        if severity in _SEVERITY_ORDER
+    ]
+    return {
+        "currency": normalize_currency(price_analysis.get("currency")),
+        "max_risk_severity": (
+            max(severities, key=_SEVERITY_ORDER.index) if severities else None
+        ),
+    }
+
+
+def _count_duplicates(input_hash: str) -> Select[tuple[int]]:
+    """Count stored checks of an input, up to the most that raise priority."""
+    copies = (
+        select(DBTradeSafetyCheck.id)
+        .where(DBTradeSafetyCheck.input_hash == input_hash)
+        .limit(_MAX_COUNTED_DUPLICATES)
+        .subquery()
+    )
+    return select(func.count()).select_from(copies)  # pylint: disable=not-callable
+
+
+def _convert_to_db_model(
+    schema: TradeSafetyCheckCreate,
+    converter: CurrencyConverter | None = None,
+    codec: AnalysisCodec | None = None,
+) -> dict:
     """Convert TradeSafetyCheckCreate to database dict."""
-    return schema.model_dump(exclude_unset=True)
+    data = schema.model_dump(exclude_unset=True)
+    if codec is not None:
+        data["llm_analysis"], data["llm_analysis_zstd"] = codec.store(
+            schema.llm_analysis, schema.output_language
+        )
+    data["input_hash"] = compute_input_hash(schema.input_text)
+    data.update(promoted_fields(schema.llm_analysis))
+    data["risk_signals"] = [
+        DBRiskSignal(category=category, severity=severity)
+        for category, severity in risk_signal_rows(schema.llm_analysis)
+    ]
+    data["offered_price_usd"] = offered_price_usd(
+        schema.llm_analysis, converter or get_currency_converter()
+    )
+    if schema.platform is not None:
+        data["platform"] = schema.platform.value
+    if schema.author is not None:
+        data["author"] = normalize_author(schema.author)
+    return data
 
 
 class DatabaseTradeSafetyCheckManager(
@@ -48,16 +278,700 @@ class DatabaseTradeSafetyCheckManager(
 ):
     """Database implementation of TradeSafetyCheckManager."""
 
-    def __init__(self, db_session: Session):
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        db_session: Session,
+        near_duplicate_index: NearDuplicateIndex | None = None,
+        similar_case_index: SimilarCaseIndex | None = None,
+        author_reputations: DatabaseAuthorReputationManager | None = None,
+        price_reference_index: PriceReferenceIndex | None = None,
+        currency_converter: CurrencyConverter | None = None,
+        check_rollups: DatabaseCheckRollupManager | None = None,
+        review_queue: DatabaseReviewQueueManager | None = None,
+        expert_advice: DatabaseExpertAdviceManager | None = None,
+        analysis_codec: AnalysisCodec | None = None,
+        write_behind: WriteBehindBuffer | None = None,
+    ):
         """
         Initialize DatabaseTradeSafetyCheckManager.
 
         Args:
             db_session: SQLAlchemy session
+            near_duplicate_index: Index kept up to date with created and updated
+                                  checks (default: None, no indexing)
+            similar_case_index: Embedding index of reviewed checks, kept up to
+                                date the same way (default: None, no indexing)
+            author_reputations: Per-author aggregates updated on each check and
+                                expert review (default: stored in the same session)
+            price_reference_index: Offered-price distributions updated with
+                                   created checks (default: None, no indexing)
+            currency_converter: Converter for the stored USD equivalent of the
+                                offered price (default: get_currency_converter())
+            check_rollups: Analytics rollups updated on each check (default:
+                           stored in the same session)
+            review_queue: Expert review queue of pending checks (default: in
+                          the same session)
+            expert_advice: Expert advice shared between checks of the same
+                           post (default: stored in the same session)
+            analysis_codec: Storage codec of llm_analysis (default: dictionaries
+                            in the same session, AnalysisCodecSettings() from
+                            environment)
+            write_behind: Buffer created checks are written through in
+                          batches (default: None, written synchronously)
         """
+        self.currency_converter = currency_converter or get_currency_converter()
+        self.analysis_codec = analysis_codec or AnalysisCodec(
+            DatabaseAnalysisDictionaryManager(db_session)
+        )
         super().__init__(
             db_session=db_session,
             db_model=DBTradeSafetyCheck,
-            convert_to_model=_convert_db_to_model,
-            convert_to_db_model=_convert_to_db_model,
+            convert_to_model=partial(_convert_db_to_model, codec=self.analysis_codec),
+            convert_to_db_model=partial(
+                _convert_to_db_model,
+                converter=self.currency_converter,
+                codec=self.analysis_codec,
+            ),
+        )
+        self.near_duplicate_index = near_duplicate_index
+        self.similar_case_index = similar_case_index
+        self.price_reference_index = price_reference_index
+        self.author_reputations = author_reputations or DatabaseAuthorReputationManager(
+            db_session
+        )
+        self.check_rollups = check_rollups or DatabaseCheckRollupManager(db_session)
+        self.review_queue = review_queue or DatabaseReviewQueueManager(db_session)
+        self.expert_advice = expert_advice or DatabaseExpertAdviceManager(db_session)
+        self.write_behind = write_behind
+        # Earlier copies per input hash, counted by find_reusable_check for
+        # the review priority of the check created next
+        self._duplicate_counts: dict[str, int] = {}
+
+    def create(self, schema: TradeSafetyCheckCreate) -> TradeSafetyCheck:
+        """
+        Create a check, add it to the in-memory indexes and count it towards
+        the analytics rollups and the reputation of the post author.
+
+        A check of a post an expert already reviewed gets the expert's advice.
+        The review priority is computed here unless the schema sets one. The
+        check, its rollups and the author's reputation are committed in one
+        transaction.
+
+        With write-behind, the check is returned before it is written, with
+        the same advice and review priority (copies still pending count
+        towards it); compressed storage is resolved by create_many. It is
+        written synchronously if the buffer is full.
+
+        Args:
+            schema: Trade safety check creation data with all required fields
+
+        Returns:
+            Created trade safety check
+        """
+        if schema.expert_advice is None and not schema.expert_reviewed:
+            schema = self._with_known_advice(schema)
+        if "review_priority" not in schema.model_fields_set:
+            schema = schema.model_copy(
+                update={"review_priority": self._review_priority(schema)}
+            )
+        check_id = str(uuid4())
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        if self.write_behind is not None:
+            db_check = DBTradeSafetyCheck(
+                **self._db_values(schema, check_id, now, now, encode=False)
+            )
+            check = self.convert_to_model(db_check)
+            if self.write_behind.submit(PendingCheck(check=check, create=schema)):
+                self._index_check(check)
+                return check
+
+        db_check = DBTradeSafetyCheck(**self._db_values(schema, check_id, now, now))
+        self.db_session.add(db_check)
+        self.db_session.flush()
+        check = self.convert_to_model(db_check)
+        self.check_rollups.record_checks([check], commit=False)
+        if check.platform is not None and check.author is not None:
+            self.author_reputations.record_check(
+                check.platform,
+                check.author,
+                check.safe_score,
+                check.created_at,
+                commit=False,
+            )
+        self.db_session.commit()
+        # In-memory indexes only see committed checks
+        self._index_check(check)
+        return check
+
+    def create_many(self, pending: Sequence[PendingCheck]) -> list[str]:
+        """
+        Write checks created in write-behind mode, in one transaction.
+
+        The checks are inserted with multi-row INSERTs and counted towards
+        the analytics rollups (one increment per rollup row) and the author
+        reputations in the same transaction. Checks that already exist
+        (replayed from the journal) are skipped. Advice and review priority
+        were resolved by create(); advice an expert gave on the same post
+        while a check was pending is attached here, looked up for the batch at
+        once.
+
+        Args:
+            pending: Checks returned by create() but not written yet
+
+        Returns:
+            IDs of the checks written
+        """
+        existing = set(
+            self.db_session.scalars(
+                select(DBTradeSafetyCheck.id).where(
+                    DBTradeSafetyCheck.id.in_([entry.check.id for entry in pending])
+                )
+            )
+        )
+        new = [entry for entry in pending if entry.check.id not in existing]
+        known_advice = self.expert_advice.get_many(
+            {
+                compute_input_hash(entry.create.input_text)
+                for entry in new
+                if entry.create.expert_advice is None
+                and not entry.create.expert_reviewed
+            }
+        )
+        db_checks = []
+        signal_rows: list[dict[str, Any]] = []
+        for entry in new:
+            schema = entry.create
+            if schema.expert_advice is None and not schema.expert_reviewed:
+                schema = self._with_known_advice(schema, known_advice)
+            values = self._db_values(
+                schema, entry.check.id, entry.check.created_at, entry.check.updated_at
+            )
+            # Signals of every check are inserted with one statement below
+            signal_rows.extend(
+                {
+                    "check_id": entry.check.id,
+                    "category": signal.category,
+                    "severity": signal.severity,
+                }
+                for signal in values.pop("risk_signals")
+            )
+            db_checks.append(DBTradeSafetyCheck(**values))
+        self.db_session.add_all(db_checks)
+        self.db_session.flush()
+        if signal_rows:
+            self.db_session.execute(insert(DBRiskSignal), signal_rows)
+        checks = [entry.check for entry in new]
+        self.check_rollups.record_checks(checks, commit=False)
+        for check in checks:
+            if check.platform is not None and check.author is not None:
+                self.author_reputations.record_check(
+                    check.platform,
+                    check.author,
+                    check.safe_score,
+                    check.created_at,
+                    commit=False,
+                )
+        self.db_session.commit()
+
+        logger.info(
+            "Wrote pending checks: written=%d, skipped=%d", len(new), len(existing)
+        )
+        return [check.id for check in checks]
+
+    def _db_values(
+        self,
+        schema: TradeSafetyCheckCreate,
+        check_id: str,
+        created_at: datetime,
+        updated_at: datetime,
+        encode: bool = True,
+    ) -> dict[str, Any]:
+        """Column values of a check with the given id and timestamps (with
+        llm_analysis left uncompressed unless `encode`, which may read the
+        dictionaries of the codec)."""
+        if encode:
+            values = self.convert_to_db_model(schema)
+        else:
+            values = _convert_to_db_model(schema, self.currency_converter)
+        values.update(id=check_id, created_at=created_at, updated_at=updated_at)
+        # Defaults are otherwise applied on INSERT, too late for a pending check
+        for column in DBTradeSafetyCheck.__table__.columns:
+            if column.key not in values and column.default is not None:
+                if column.default.is_scalar:
+                    values[column.key] = column.default.arg
+        return values
+
+    def get_by_id(
+        self, item_id: str, load_options: list[Any] | None = None
+    ) -> TradeSafetyCheck | None:
+        """
+        Retrieve a check by ID, including checks not written yet.
+
+        Args:
+            item_id: Unique identifier of the check
+            load_options: SQLAlchemy loader options (database reads only)
+
+        Returns:
+            Trade safety check if found, None otherwise
+        """
+        if self.write_behind is not None:
+            pending = self.write_behind.get(item_id)
+            if pending is not None:
+                return pending
+        return super().get_by_id(item_id, load_options)
+
+    def _with_known_advice(
+        self,
+        schema: TradeSafetyCheckCreate,
+        known_advice: dict[str, ExpertAdvice] | None = None,
+    ) -> TradeSafetyCheckCreate:
+        """Attach the latest expert advice on the same input (primary-key lookup,
+        or from `known_advice` when the advice of a batch was looked up at once)."""
+        if not self.expert_advice.settings.propagate:
+            return schema
+        input_hash = compute_input_hash(schema.input_text)
+        if known_advice is not None:
+            advice = known_advice.get(input_hash)
+        else:
+            advice = self.expert_advice.get(input_hash)
+        if advice is None:
+            return schema
+        return schema.model_copy(
+            update={
+                "expert_advice": advice.expert_advice,
+                "expert_reviewed": True,
+                "expert_reviewed_at": advice.expert_reviewed_at,
+                "expert_reviewed_by": advice.expert_reviewed_by,
+                "expert_advice_source_id": advice.check_id,
+            }
+        )
+
+    def _review_priority(self, schema: TradeSafetyCheckCreate) -> int:
+        """Compute the review priority of a check about to be created."""
+        author_risky_checks = 0
+        if schema.platform is not None and schema.author is not None:
+            reputation = self.author_reputations.get(schema.platform, schema.author)
+            if reputation is not None:
+                # Expert-confirmed risks count twice
+                author_risky_checks = (
+                    reputation.risky_check_count + reputation.reviewed_risky_count
+                )
+        input_hash = compute_input_hash(schema.input_text)
+        duplicate_count = self._duplicate_counts.pop(input_hash, None)
+        if duplicate_count is None:
+            duplicate_count = self.db_session.scalar(_count_duplicates(input_hash))
+        duplicate_count = duplicate_count or 0
+        if self.write_behind is not None:
+            duplicate_count += len(self.write_behind.find_by_input_hash(input_hash))
+        return review_priority(
+            schema.safe_score,
+            promoted_fields(schema.llm_analysis)["max_risk_severity"],
+            author_risky_checks=author_risky_checks,
+            duplicate_count=duplicate_count,
+        )
+
+    def update(
+        self, item_id: str, schema: TradeSafetyCheckUpdate
+    ) -> TradeSafetyCheck | None:
+        """
+        Update a check and refresh its index entries (expert advice).
+
+        A check becoming expert-reviewed is counted towards the reputation of
+        the post author (once, however often the advice is edited). New or
+        edited advice is shared with the other checks of the same post.
+
+        Args:
+            item_id: Unique identifier of the check
+            schema: Update data
+
+        Returns:
+            Updated trade safety check if found, None otherwise
+        """
+        if self.write_behind is not None:
+            # Write a pending check on its own (not the whole buffer) to update it
+            self.write_behind.write(item_id)
+        db_check = self.db_session.get(DBTradeSafetyCheck, item_id)
+        was_reviewed = db_check is not None and db_check.expert_reviewed
+        previous_advice = db_check.expert_advice if db_check is not None else None
+        if db_check is not None and "expert_advice" in schema.model_fields_set:
+            # Advice written for this check replaces advice copied from another
+            db_check.expert_advice_source_id = None
+
+        check = super().update(item_id, schema)
+        if check is not None:
+            self._index_check(check)
+            if (
+                check.expert_reviewed
+                and not was_reviewed
+                and check.platform is not None
+                and check.author is not None
+            ):
+                self.author_reputations.record_review(
+                    check.platform, check.author, check.safe_score
+                )
+            if (
+                check.expert_reviewed
+                and check.expert_advice
+                and check.expert_advice_source_id is None
+                and (not was_reviewed or check.expert_advice != previous_advice)
+            ):
+                self.share_expert_advice(check)
+        return check
+
+    def share_expert_advice(self, check: TradeSafetyCheck) -> list[str]:
+        """
+        Attach the advice of a reviewed check to the other checks of its post.
+
+        Checks with the same normalized input (and, if enabled, near
+        duplicates) are updated in bulk, and the advice is kept for checks of
+        the input created later. Copies are not counted towards the author's
+        reputation: the expert reviewed the post once.
+
+        Args:
+            check: Check reviewed by an expert, with advice
+
+        Returns:
+            IDs of the checks that received the advice
+        """
+        settings = self.expert_advice.settings
+        if not settings.propagate or not check.expert_advice:
+            return []
+
+        input_hash = compute_input_hash(check.input_text)
+        self.expert_advice.record(input_hash, check)
+        near_duplicate_ids: list[str] = []
+        if settings.near_duplicates and self.near_duplicate_index is not None:
+            near_duplicate_ids = [
+                duplicate.check_id
+                for duplicate in self.near_duplicate_index.query(check.input_text)
+                if duplicate.similarity >= settings.near_duplicate_threshold
+            ]
+        check_ids = self.expert_advice.propagate(check, input_hash, near_duplicate_ids)
+
+        if self.near_duplicate_index is not None and check_ids:
+            # Keep the advice shown with near-duplicate matches current
+            for entry, input_text in self.iter_indexed_checks(check_ids=check_ids):
+                self.near_duplicate_index.add(entry, input_text)
+        return check_ids
+
+    def list_summaries(
+        self,
+        filters: CheckListFilters | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[TradeSafetyCheckSummary], str | None]:
+        """
+        List checks newest first with keyset pagination.
+
+        Pages continue after the (created_at, id) of the previous page's last
+        check, so every page is a range scan on the (created_at, id) index
+        whatever its depth. Only summary columns are read; llm_analysis is
+        never loaded.
+
+        Args:
+            filters: Server-side filters
+            limit: Maximum checks per page
+            cursor: Cursor returned with the previous page (None for the first)
+
+        Returns:
+            (checks of the page, cursor of the next page or None on the last)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        table = DBTradeSafetyCheck
+        query = select(
+            table.id,
+            table.created_at,
+            table.user_id,
+            func.substr(table.input_text, 1, INPUT_PREVIEW_CHARS).label(
+                "input_preview"
+            ),
+            table.output_language,
+            table.platform,
+            table.author,
+            table.safe_score,
+            table.max_risk_severity,
+            table.currency,
+            table.offered_price_usd,
+            table.expert_reviewed,
+            table.expert_reviewed_at,
+        )
+        conditions = self._summary_filter_conditions(filters or CheckListFilters())
+        if cursor is not None:
+            created_at, check_id = decode_cursor(cursor)
+            conditions.append(
+                or_(
+                    table.created_at < created_at,
+                    and_(table.created_at == created_at, table.id < check_id),
+                )
+            )
+
+        rows = self.db_session.execute(
+            query.where(*conditions)
+            .order_by(table.created_at.desc(), table.id.desc())
+            .limit(limit + 1)
+        ).all()
+
+        page = [TradeSafetyCheckSummary.model_validate(row._mapping) for row in rows]
+        if len(page) <= limit:
+            return page, None
+        page = page[:limit]
+        return page, encode_cursor(page[-1].created_at, page[-1].id)
+
+    def _summary_filter_conditions(
+        self, filters: CheckListFilters
+    ) -> list[ColumnElement[bool]]:
+        """Build the conditions of the admin list filters."""
+        table = DBTradeSafetyCheck
+        conditions: list[ColumnElement[bool]] = []
+        if filters.min_safe_score is not None:
+            conditions.append(table.safe_score >= filters.min_safe_score)
+        if filters.max_safe_score is not None:
+            conditions.append(table.safe_score <= filters.max_safe_score)
+        if filters.expert_reviewed is not None:
+            conditions.append(table.expert_reviewed.is_(filters.expert_reviewed))
+        if filters.user_id is not None:
+            conditions.append(table.user_id == filters.user_id)
+        if filters.created_from is not None:
+            conditions.append(table.created_at >= _as_naive_utc(filters.created_from))
+        if filters.created_to is not None:
+            conditions.append(table.created_at < _as_naive_utc(filters.created_to))
+        if filters.platform is not None:
+            conditions.append(table.platform == filters.platform.value)
+        if filters.output_language is not None:
+            conditions.append(table.output_language == filters.output_language)
+        if filters.max_risk_severity is not None:
+            conditions.append(
+                table.max_risk_severity == filters.max_risk_severity.value
+            )
+        if filters.risk_category is not None:
+            conditions.append(
+                table.id.in_(
+                    select(DBRiskSignal.check_id).where(
+                        DBRiskSignal.category == filters.risk_category.value
+                    )
+                )
+            )
+        return conditions
+
+    def _build_filter_conditions(
+        self, filters: list[CrudFilter]
+    ) -> list[ColumnElement[bool]]:
+        """
+        Build list filter conditions, answering risk_category and
+        risk_severity filters from the indexed risk signal table.
+
+        Each such filter matches checks with at least one signal satisfying
+        it ("eq" or "in"); other fields are handled by BaseManager.
+        """
+        conditions: list[ColumnElement[bool]] = []
+        regular_filters: list[CrudFilter] = []
+        for filter_item in filters:
+            if not (
+                is_logical_filter(filter_item)
+                and filter_item["field"] in _SIGNAL_FILTER_COLUMNS
+            ):
+                regular_filters.append(filter_item)
+                continue
+
+            column = _SIGNAL_FILTER_COLUMNS[filter_item["field"]]
+            value = filter_item.get("value")
+            if filter_item["operator"] == "eq" and value is not None:
+                condition = column == value
+            elif filter_item["operator"] == "in" and value is not None:
+                condition = column.in_(value)
+            else:
+                continue
+            conditions.append(
+                DBTradeSafetyCheck.id.in_(
+                    select(DBRiskSignal.check_id).where(condition)
+                )
+            )
+        return conditions + super()._build_filter_conditions(regular_filters)
+
+    def _index_check(self, check: TradeSafetyCheck) -> None:
+        """Add a created or updated check to the configured indexes."""
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.add_check(check)
+        if self.similar_case_index is not None:
+            self.similar_case_index.add_check(check)
+        if self.price_reference_index is not None:
+            self.price_reference_index.add_check(check)
+
+    def find_reusable_check(
+        self, input_hash: str, output_language: str, since: datetime
+    ) -> TradeSafetyCheck | None:
+        """
+        Find the most recent check of the same input created after `since`.
+
+        Checks still pending in the write-behind buffer are found there first.
+        Otherwise, the same round trip counts the earlier copies of the input,
+        which create() reuses for the review priority of the next check.
+
+        Args:
+            input_hash: Hash of the normalized input (see compute_input_hash)
+            output_language: Language the analysis must be written in
+            since: Oldest creation time that is still reusable
+
+        Returns:
+            Most recent matching check if found, None otherwise
+        """
+        if self.write_behind is not None:
+            oldest = _as_naive_utc(since)
+            for check in reversed(self.write_behind.find_by_input_hash(input_hash)):
+                if (
+                    check.output_language == output_language
+                    and check.created_at >= oldest
+                ):
+                    return check
+        row = self.db_session.execute(
+            select(
+                _count_duplicates(input_hash)
+                .scalar_subquery()
+                .label("duplicate_count"),
+                select(DBTradeSafetyCheck.id)
+                .where(
+                    DBTradeSafetyCheck.input_hash == input_hash,
+                    DBTradeSafetyCheck.output_language == output_language,
+                    DBTradeSafetyCheck.created_at >= since,
+                )
+                .order_by(DBTradeSafetyCheck.created_at.desc())
+                .limit(1)
+                .scalar_subquery()
+                .label("check_id"),
+            )
+        ).one()
+        self._duplicate_counts[input_hash] = row.duplicate_count
+        if row.check_id is None:
+            return None
+        db_check = self.db_session.get(DBTradeSafetyCheck, row.check_id)
+        return self.convert_to_model(db_check) if db_check else None
+
+    def iter_indexed_checks(
+        self,
+        batch_size: int = 1000,
+        reviewed_only: bool = False,
+        check_ids: Collection[str] | None = None,
+    ) -> Iterator[tuple[IndexedCheck, str]]:
+        """
+        Stream the fields of every check needed to rebuild in-memory indexes.
+
+        Only the indexed columns are loaded (llm_analysis is never parsed), in
+        batches of `batch_size` rows.
+
+        Args:
+            batch_size: Rows fetched per round trip
+            reviewed_only: Only stream checks reviewed by an expert
+            check_ids: Only stream these checks (default: None, all checks)
+
+        Yields:
+            (index metadata, input_text) per check
+        """
+        query = select(
+            DBTradeSafetyCheck.id,
+            DBTradeSafetyCheck.input_text,
+            DBTradeSafetyCheck.output_language,
+            DBTradeSafetyCheck.safe_score,
+            DBTradeSafetyCheck.expert_advice,
+            DBTradeSafetyCheck.expert_reviewed,
+            DBTradeSafetyCheck.created_at,
+        )
+        if reviewed_only:
+            query = query.where(DBTradeSafetyCheck.expert_reviewed.is_(True))
+        if check_ids is not None:
+            query = query.where(DBTradeSafetyCheck.id.in_(check_ids))
+        rows = self.db_session.execute(query.execution_options(yield_per=batch_size))
+        for row in rows:
+            entry = IndexedCheck(
+                check_id=row.id,
+                output_language=row.output_language,
+                safe_score=row.safe_score,
+                expert_advice=row.expert_advice,
+                expert_reviewed=row.expert_reviewed,
+                created_at=row.created_at,
+            )
+            yield entry, row.input_text
+
+    def iter_price_observations(
+        self, batch_size: int = 1000
+    ) -> Iterator[tuple[str, str, Decimal, str]]:
+        """
+        Stream the offered prices of stored analyses.
+
+        Rows are read in batches of `batch_size`; only the price fields of
+        llm_analysis are used (the analysis is decoded but not validated).
+
+        Args:
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            (check_id, input_text, offered_price, currency) per check with a price
+        """
+        rows = self.db_session.execute(
+            select(
+                DBTradeSafetyCheck.id,
+                DBTradeSafetyCheck.input_text,
+                DBTradeSafetyCheck.llm_analysis,
+                DBTradeSafetyCheck.llm_analysis_zstd,
+            ).execution_options(yield_per=batch_size)
+        )
+        for row in rows:
+            llm_analysis = self.analysis_codec.load(
+                row.llm_analysis, row.llm_analysis_zstd
+            )
+            price_analysis = llm_analysis.get("price_analysis") or {}
+            price = price_analysis.get("offered_price")
+            currency = price_analysis.get("currency")
+            if isinstance(price, (int, float)) and currency:
+                yield row.id, row.input_text, Decimal(str(price)), currency
+
+    def upgrade_stale_analyses(self, batch_size: int = 500) -> int:
+        """
+        Rewrite one batch of rows stored with an older analysis schema.
+
+        Reads never require this (upgrades are applied lazily on read), but
+        rewriting stale rows in the background keeps them on the fast path.
+        Call repeatedly until it returns 0.
+
+        Args:
+            batch_size: Maximum number of rows to rewrite in this call
+
+        Returns:
+            Number of rows rewritten
+        """
+        stale_checks = (
+            self.db_session.execute(
+                select(DBTradeSafetyCheck)
+                .where(DBTradeSafetyCheck.schema_version < ANALYSIS_SCHEMA_VERSION)
+                .limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+
+        for db_check in stale_checks:
+            upgraded = upgrade_analysis(
+                self.analysis_codec.load(
+                    db_check.llm_analysis, db_check.llm_analysis_zstd
+                ),
+                db_check.schema_version,
+            )
+            # Validate before persisting so a broken upgrader never corrupts rows
+            (
+                db_check.llm_analysis,
+                db_check.llm_analysis_zstd,
+            ) = self.analysis_codec.store(
+                TradeSafetyAnalysis(**upgraded).model_dump(), db_check.output_language
+            )
+            db_check.schema_version = ANALYSIS_SCHEMA_VERSION
+
+        self.db_session.commit()
+
+        logger.info(
+            "Upgraded stale analyses: rows=%d, target_version=%d",
+            len(stale_checks),
+            ANALYSIS_SCHEMA_VERSION,
         )
+        return len(stale_checks)
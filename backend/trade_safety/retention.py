@@ -0,0 +1,480 @@
+"""
+Monthly partitions, retention and archival of trade safety checks.
+
+On PostgreSQL, trade_safety_checks is range-partitioned by created_at into one
+partition per month plus a default partition (see migration d9a4c2e6f813).
+New checks are inserted into the current month's partition, whose indexes
+stay the size of a month of checks, and the retention period bounds how many
+partitions a lookup by id probes. Checks created before partitioning stay in
+the legacy partition (the former table), whose months are archived with
+batched deletes; it is dropped once all of them have expired. On SQLite the
+table is not partitioned.
+
+Months older than the retention period are archived: their rows are streamed
+to a gzipped JSONL file, with compressed analyses decoded (written to a temporary file, fsync'ed and renamed
+into place) and then removed. A PostgreSQL month partition is detached and
+dropped, which leaves no dead rows behind for vacuum; elsewhere the rows are
+deleted in batches. Analytics rollups and shared expert advice are kept, so
+statistics and advice outlive the archived checks.
+
+Run periodically (e.g., daily) to create upcoming partitions and archive:
+
+    python -m trade_safety.retention
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from aioia_core.settings import DatabaseSettings
+from pydantic import BaseModel, Field
+from sqlalchemy import Connection, create_engine, delete, func, select, text
+from sqlalchemy.orm import Session
+
+from trade_safety.analysis_codec import AnalysisCodec
+from trade_safety.models import DBRiskSignal, DBTradeSafetyCheck
+from trade_safety.repositories.analysis_dictionary_repository import (
+    DatabaseAnalysisDictionaryManager,
+)
+from trade_safety.settings import RetentionSettings
+
+logger = logging.getLogger(__name__)
+
+CHECKS_TABLE = "trade_safety_checks"
+DEFAULT_PARTITION = f"{CHECKS_TABLE}_default"
+LEGACY_PARTITION = f"{CHECKS_TABLE}_legacy"
+_PARTITION_PATTERN = re.compile(rf"^{CHECKS_TABLE}_p(\d{{4}})(\d{{2}})$")
+_UPPER_BOUND_PATTERN = re.compile(r"TO \('([^']+)'\)")
+
+
+class ArchivedMonth(BaseModel):
+    """Result of archiving one month of checks"""
+
+    month: datetime = Field(description="First day of the archived month (UTC)")
+    path: str | None = Field(None, description="Archive file (None without checks)")
+    check_count: int = Field(description="Checks written to the archive")
+    dropped_partition: bool = Field(
+        description="Whether a partition was dropped instead of deleting rows"
+    )
+
+
+# ==============================================================================
+# Partition Helpers
+# ==============================================================================
+
+
+def month_start(moment: datetime) -> datetime:
+    """
+    Truncate a time to the first day of its UTC month.
+
+    Args:
+        moment: Time (naive times are taken as UTC)
+
+    Returns:
+        Naive UTC start of the month
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Shift the first day of a month by a number of months.
+
+    Args:
+        month: First day of a month
+        months: Months to add (negative to go back)
+
+    Returns:
+        First day of the shifted month
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding the checks of a month."""
+    return f"{CHECKS_TABLE}_p{month:%Y%m}"
+
+
+def is_partition_table(name: str) -> bool:
+    """Whether a table is a month, default or legacy partition of the checks table."""
+    return (
+        name in (DEFAULT_PARTITION, LEGACY_PARTITION)
+        or _PARTITION_PATTERN.match(name) is not None
+    )
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether trade_safety_checks is a partitioned PostgreSQL table."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:table))"
+            ),
+            {"table": CHECKS_TABLE},
+        ).scalar()
+    )
+
+
+def partition_months(connection: Connection) -> list[datetime]:
+    """
+    List the months that have a partition (PostgreSQL only).
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        First day of each partitioned month, oldest first
+    """
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": CHECKS_TABLE},
+    ).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_PATTERN.match(name)
+        if match:
+            months.append(datetime(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def legacy_partition_end(connection: Connection) -> datetime | None:
+    """
+    Upper bound of the legacy partition (PostgreSQL only).
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        First day of the first month after the legacy partition, None if the
+        legacy partition does not exist
+    """
+    bound = connection.execute(
+        text(
+            "SELECT pg_get_expr(relpartbound, oid) FROM pg_class "
+            "WHERE oid = to_regclass(:table) AND relispartition"
+        ),
+        {"table": LEGACY_PARTITION},
+    ).scalar()
+    match = _UPPER_BOUND_PATTERN.search(bound or "")
+    return datetime.fromisoformat(match.group(1)) if match else None
+
+
+def ensure_partitions(
+    connection: Connection, first_month: datetime, last_month: datetime
+) -> list[str]:
+    """
+    Create the missing month partitions of a range of months (PostgreSQL only).
+
+    Checks of a month that landed in the default partition (because its
+    partition did not exist yet) are moved into the new partition. Months of
+    the legacy partition get no partition of their own.
+
+    Args:
+        connection: Database connection (the caller commits)
+        first_month: First day of the first month
+        last_month: First day of the last month (inclusive)
+
+    Returns:
+        Names of the created partitions
+    """
+    existing = set(partition_months(connection))
+    created = []
+    month = max(first_month, legacy_partition_end(connection) or first_month)
+    while month <= last_month:
+        if month not in existing:
+            _create_partition(connection, month)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def _create_partition(connection: Connection, month: datetime) -> None:
+    """Create one month partition, moving its rows out of the default partition."""
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_month = "created_at >= :start AND created_at < :end"
+    connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE moving_checks AS "
+            f"SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"
+        ),
+        bounds,
+    )
+    connection.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"), bounds
+    )
+    connection.execute(
+        text(
+            f"CREATE TABLE {partition_name(month)} PARTITION OF {CHECKS_TABLE} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+            f"TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+    )
+    connection.execute(text(f"INSERT INTO {CHECKS_TABLE} SELECT * FROM moving_checks"))
+    connection.execute(text("DROP TABLE moving_checks"))
+
+
+def _json_default(value: object) -> str:
+    """Serialize values json cannot (timestamps) for archive lines."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot archive value of type {type(value).__name__}")
+
+
+# ==============================================================================
+# Archiver
+# ==============================================================================
+
+
+class CheckArchiver:
+    """
+    Applies the retention policy to trade_safety_checks.
+
+    Example:
+        >>> archiver = CheckArchiver(db_session, RetentionSettings(months=12))
+        >>> archiver.ensure_partitions()
+        ['trade_safety_checks_p202701']
+        >>> [archived.path for archived in archiver.archive_expired()]
+        ['archive/trade_safety_checks_2025_09.jsonl.gz']
+    """
+
+    def __init__(
+        self,
+        db_session: Session,
+        settings: RetentionSettings | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        analysis_codec: AnalysisCodec | None = None,
+    ):
+        """
+        Initialize CheckArchiver.
+
+        Args:
+            db_session: SQLAlchemy session
+            settings: Retention settings (default: RetentionSettings() from environment)
+            clock: Current time (injectable for tests)
+            analysis_codec: Codec decoding compressed analyses for the archive
+                            (default: dictionaries in the same session)
+        """
+        self.db_session = db_session
+        self.settings = settings or RetentionSettings()
+        self._clock = clock
+        self.analysis_codec = analysis_codec or AnalysisCodec(
+            DatabaseAnalysisDictionaryManager(db_session)
+        )
+
+    def ensure_partitions(self) -> list[str]:
+        """
+        Create partitions for the current month and the months ahead.
+
+        Returns:
+            Names of the created partitions (empty unless partitioned)
+        """
+        connection = self.db_session.connection()
+        if not is_partitioned(connection):
+            return []
+        this_month = month_start(self._clock())
+        created = ensure_partitions(
+            connection,
+            this_month,
+            add_months(this_month, self.settings.partitions_ahead),
+        )
+        self.db_session.commit()
+        if created:
+            logger.info("Created check partitions: %s", ", ".join(created))
+        return created
+
+    def archive_expired(self) -> list[ArchivedMonth]:
+        """
+        Archive and remove every month older than the retention period.
+
+        Returns:
+            One result per archived month, oldest first (empty if retention
+            is disabled)
+        """
+        if self.settings.months is None:
+            return []
+        cutoff = add_months(month_start(self._clock()), -self.settings.months)
+
+        months: set[datetime] = set()
+        oldest = self.db_session.scalar(select(func.min(DBTradeSafetyCheck.created_at)))
+        month = month_start(oldest) if oldest is not None else cutoff
+        while month < cutoff:
+            months.add(month)
+            month = add_months(month, 1)
+        connection = self.db_session.connection()
+        if is_partitioned(connection):
+            # Empty partitions of expired months are dropped too
+            months.update(m for m in partition_months(connection) if m < cutoff)
+
+        archived = [self._archive_month(month) for month in sorted(months)]
+        if is_partitioned(self.db_session.connection()):
+            self._drop_expired_legacy_partition(cutoff)
+        return archived
+
+    def _drop_expired_legacy_partition(self, cutoff: datetime) -> None:
+        """Drop the legacy partition once all of its months have been archived."""
+        connection = self.db_session.connection()
+        end = legacy_partition_end(connection)
+        if end is None or end > cutoff:
+            return
+        connection.execute(
+            text(f"ALTER TABLE {CHECKS_TABLE} DETACH PARTITION {LEGACY_PARTITION}")
+        )
+        connection.execute(text(f"DROP TABLE {LEGACY_PARTITION}"))
+        self.db_session.commit()
+        logger.info("Dropped legacy check partition: %s", LEGACY_PARTITION)
+
+    def _archive_month(self, month: datetime) -> ArchivedMonth:
+        """Archive one month of checks, then drop its partition or delete its rows."""
+        connection = self.db_session.connection()
+        name = partition_name(month)
+        has_partition = is_partitioned(connection) and month in partition_months(
+            connection
+        )
+        if has_partition:
+            # Block writes (not reads) to the month until it is dropped
+            connection.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+
+        path, count = self._write_archive(month)
+
+        if has_partition:
+            connection.execute(
+                text(
+                    f"DELETE FROM {DBRiskSignal.__tablename__} "
+                    f"WHERE check_id IN (SELECT id FROM {name})"
+                )
+            )
+            connection.execute(
+                text(f"ALTER TABLE {CHECKS_TABLE} DETACH PARTITION {name}")
+            )
+            connection.execute(text(f"DROP TABLE {name}"))
+            self.db_session.commit()
+        else:
+            self._delete_month(month)
+
+        logger.info(
+            "Archived checks: month=%s checks=%d path=%s dropped_partition=%s",
+            f"{month:%Y-%m}",
+            count,
+            path,
+            has_partition,
+        )
+        return ArchivedMonth(
+            month=month,
+            path=str(path) if path else None,
+            check_count=count,
+            dropped_partition=has_partition,
+        )
+
+    def _write_archive(self, month: datetime) -> tuple[Path | None, int]:
+        """
+        Stream the checks of a month to a gzipped JSONL file.
+
+        Args:
+            month: First day of the month
+
+        Returns:
+            (archive path, checks written); no file is left without checks
+        """
+        table = DBTradeSafetyCheck.__table__
+        rows = self.db_session.execute(
+            select(table)
+            .where(
+                table.c.created_at >= month,
+                table.c.created_at < add_months(month, 1),
+            )
+            .order_by(table.c.created_at, table.c.id)
+            .execution_options(yield_per=self.settings.batch_size)
+        )
+
+        directory = Path(self.settings.archive_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{CHECKS_TABLE}_{month:%Y_%m}.jsonl.gz"
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        count = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with gzip.GzipFile(fileobj=f, mode="wb") as archive:
+                    for row in rows:
+                        # Archives are self-contained: no dictionary is needed
+                        values = dict(row._mapping)
+                        values["llm_analysis"] = self.analysis_codec.load(
+                            values["llm_analysis"], values.pop("llm_analysis_zstd")
+                        )
+                        line = json.dumps(
+                            values,
+                            default=_json_default,
+                            ensure_ascii=False,
+                        )
+                        archive.write(line.encode("utf-8") + b"\n")
+                        count += 1
+                f.flush()
+                os.fsync(f.fileno())
+            if count == 0:
+                os.remove(tmp_path)
+                return None, 0
+            # A rerun after a failed removal rewrites the same complete file
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path, count
+
+    def _delete_month(self, month: datetime) -> None:
+        """Delete the checks of a month (and their signal rows) in batches."""
+        while True:
+            check_ids = list(
+                self.db_session.scalars(
+                    select(DBTradeSafetyCheck.id)
+                    .where(
+                        DBTradeSafetyCheck.created_at >= month,
+                        DBTradeSafetyCheck.created_at < add_months(month, 1),
+                    )
+                    .limit(self.settings.batch_size)
+                )
+            )
+            if not check_ids:
+                return
+            self.db_session.execute(
+                delete(DBRiskSignal)
+                .where(DBRiskSignal.check_id.in_(check_ids))
+                .execution_options(synchronize_session=False)
+            )
+            self.db_session.execute(
+                delete(DBTradeSafetyCheck)
+                .where(DBTradeSafetyCheck.id.in_(check_ids))
+                .execution_options(synchronize_session=False)
+            )
+            self.db_session.commit()
+
+
+def main() -> None:
+    """Create upcoming partitions and archive expired months."""
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    engine = create_engine(DatabaseSettings().url)
+    with Session(engine) as session:
+        archiver = CheckArchiver(session)
+        archiver.ensure_partitions()
+        archiver.archive_expired()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Review priority of checks waiting for an expert.
+
+Experts used to find unreviewed checks in the generic list. Each check now
+gets a priority when it is stored, and the queue (see
+DatabaseReviewQueueManager) serves the highest-priority pending check from
+an index, so triage is a single indexed read instead of scrolling.
+
+Priority grows with risk:
+
+- a low safety score (100 - safe_score),
+- the highest risk signal severity,
+- earlier risky checks of the same author (repeat offenders),
+- earlier checks of the same input (posts going viral).
+
+Expert advice on one copy of a viral post reaches its duplicates anyway, so
+only the newest copy carries the duplicate bonus.
+"""
+
+from __future__ import annotations
+
+from trade_safety.schemas import RiskSeverity
+
+# Priority added for the highest risk signal severity
+SEVERITY_PRIORITY = {
+    RiskSeverity.HIGH.value: 30,
+    RiskSeverity.MEDIUM.value: 10,
+    RiskSeverity.LOW.value: 0,
+}
+
+# Priority per earlier risky check of the author, and its cap
+REPEAT_AUTHOR_PRIORITY = 10
+MAX_REPEAT_AUTHOR_PRIORITY = 30
+
+# Priority per earlier check of the same input, and its cap
+DUPLICATE_PRIORITY = 5
+MAX_DUPLICATE_PRIORITY = 30
+
+
+def review_priority(
+    safe_score: int,
+    max_risk_severity: str | None = None,
+    author_risky_checks: int = 0,
+    duplicate_count: int = 0,
+) -> int:
+    """
+    Compute the review priority of a check (higher is reviewed first).
+
+    Args:
+        safe_score: Safety score of the check
+        max_risk_severity: Highest severity among its risk signals
+        author_risky_checks: Earlier risky checks of the post author
+        duplicate_count: Earlier checks of the same input
+
+    Returns:
+        Priority from 0 to 190
+
+    Example:
+        >>> review_priority(20, "high", author_risky_checks=1)
+        120
+    """
+    return (
+        (100 - safe_score)
+        + SEVERITY_PRIORITY.get(max_risk_severity or "", 0)
+        + min(author_risky_checks * REPEAT_AUTHOR_PRIORITY, MAX_REPEAT_AUTHOR_PRIORITY)
+        + min(duplicate_count * DUPLICATE_PRIORITY, MAX_DUPLICATE_PRIORITY)
+    )
@@ -43,15 +43,16 @@ class RiskSignal(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class PriceAnalysis(BaseModel):
-    """Analysis of trade price"""
+class PriceAssessment(BaseModel):
+    """Assessment of the offered price (PriceAnalysis without the market range)"""
 
-    market_price_range: str | None = Field(
-        None, description="Typical market price range"
+    offered_price: Decimal | None = Field(
+        default=None, description="Price offered in trade"
     )
-    offered_price: Decimal | None = Field(None, description="Price offered in trade")
     currency: str | None = Field(
-        None, max_length=3, description="ISO 4217 currency code (e.g., USD, KRW, JPY)"
+        default=None,
+        max_length=3,
+        description="ISO 4217 currency code (e.g., USD, KRW, JPY)",
     )
     price_assessment: str = Field(description="Assessment of price fairness")
     warnings: list[str] = Field(
@@ -88,6 +89,14 @@ class PriceAnalysis(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PriceAnalysis(PriceAssessment):
+    """Analysis of trade price"""
+
+    market_price_range: str | None = Field(
+        default=None, description="Typical market price range"
+    )
+
+
 class TradeSafetyAnalysis(BaseModel):
     """Complete LLM analysis of a trade"""
 
@@ -97,10 +106,10 @@ class TradeSafetyAnalysis(BaseModel):
         description="AI-generated 3-line summary of the trade analysis",
     )
     translation: str | None = Field(
-        None, description="Translation of trade post if not in English"
+        default=None, description="Translation of trade post if not in English"
     )
     nuance_explanation: str | None = Field(
-        None, description="Explanation of Korean slang/nuances"
+        default=None, description="Explanation of Korean slang/nuances"
     )
     risk_signals: list[RiskSignal] = Field(
         default_factory=list, description="Identified risk signals"
@@ -136,20 +145,36 @@ class TradeSafetyCheckBase(BaseModel):
 
     # User input fields
     input_text: str = Field(description="Trade post URL or text")
+    output_language: str | None = Field(
+        default=None, description="Language of the analysis results"
+    )
+
+    # Post author (URL inputs only)
+    platform: Platform | None = Field(default=None, description="Platform of the post")
+    author: str | None = Field(default=None, description="Post author username")
 
     # System-generated fields
-    user_id: str | None = Field(None, description="User ID (None for guest)")
+    user_id: str | None = Field(default=None, description="User ID (None for guest)")
+    offered_price_usd: float | None = Field(
+        default=None, description="USD equivalent of the offered price"
+    )
     safe_score: int = Field(
         ge=0, le=100, description="Overall safety score (higher is safer)"
     )
 
     # Expert review fields
-    expert_advice: str | None = Field(None, description="Expert advice text")
+    expert_advice: str | None = Field(default=None, description="Expert advice text")
     expert_reviewed: bool = Field(default=False, description="Whether expert reviewed")
     expert_reviewed_at: datetime | None = Field(
-        None, description="Expert review timestamp"
+        default=None, description="Expert review timestamp"
+    )
+    expert_reviewed_by: str | None = Field(
+        default=None, description="Expert reviewer ID"
+    )
+    expert_advice_source_id: str | None = Field(
+        default=None,
+        description="Reviewed check the advice was copied from (None if reviewed directly)",
     )
-    expert_reviewed_by: str | None = Field(None, description="Expert reviewer ID")
 
 
 class TradeSafetyCheckCreate(TradeSafetyCheckBase):
@@ -158,6 +183,9 @@ class TradeSafetyCheckCreate(TradeSafetyCheckBase):
     llm_analysis: dict[str, Any] = Field(
         description="LLM analysis result serialized to dict for DB storage"
     )
+    review_priority: int = Field(
+        default=0, description="Expert review priority (higher is reviewed first)"
+    )
 
 
 class TradeSafetyCheck(TradeSafetyCheckBase):
@@ -191,6 +219,143 @@ class TradeSafetyCheckUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ExpertAdvice(BaseModel):
+    """Latest expert advice on a normalized input, reused for its new checks"""
+
+    input_hash: str = Field(description="Hash of the normalized input")
+    check_id: str = Field(description="Check the expert reviewed")
+    expert_advice: str = Field(description="Expert advice text")
+    expert_reviewed_at: datetime | None = Field(
+        default=None, description="Expert review timestamp"
+    )
+    expert_reviewed_by: str | None = Field(
+        default=None, description="Expert reviewer ID"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuthorReputation(BaseModel):
+    """History of a post author across earlier checks"""
+
+    platform: Platform = Field(description="Social media platform")
+    author: str = Field(description="Normalized author username")
+    check_count: int = Field(description="Checks of posts by the author")
+    risky_check_count: int = Field(
+        description="Checks scored below the risky score threshold"
+    )
+    min_safe_score: int | None = Field(default=None, description="Lowest safety score")
+    avg_safe_score: float | None = Field(
+        default=None, description="Average safety score"
+    )
+    reviewed_count: int = Field(description="Checks reviewed by an expert")
+    reviewed_risky_count: int = Field(
+        description="Expert-reviewed checks scored below the risky score threshold"
+    )
+    first_seen_at: datetime = Field(description="When the author was first checked")
+    last_seen_at: datetime = Field(description="When the author was last checked")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CheckListFilters(BaseModel):
+    """Server-side filters of the admin check list"""
+
+    min_safe_score: int | None = Field(
+        default=None, ge=0, le=100, description="Lowest score"
+    )
+    max_safe_score: int | None = Field(
+        default=None, ge=0, le=100, description="Highest score"
+    )
+    expert_reviewed: bool | None = Field(default=None, description="Review status")
+    user_id: str | None = Field(default=None, description="User who created the check")
+    created_from: datetime | None = Field(
+        default=None, description="Created at or after"
+    )
+    created_to: datetime | None = Field(default=None, description="Created before")
+    platform: Platform | None = Field(default=None, description="Platform of the post")
+    output_language: str | None = Field(default=None, description="Analysis language")
+    risk_category: RiskCategory | None = Field(
+        default=None, description="Has a risk signal in this category"
+    )
+    max_risk_severity: RiskSeverity | None = Field(
+        default=None, description="Highest severity among the risk signals"
+    )
+
+
+class TradeSafetyCheckSummary(BaseModel):
+    """Check fields shown in the admin list (without the analysis)"""
+
+    id: str
+    created_at: datetime
+    user_id: str | None = Field(default=None, description="User ID (None for guest)")
+    input_preview: str = Field(description="Start of the trade post URL or text")
+    output_language: str | None = Field(default=None, description="Analysis language")
+    platform: Platform | None = Field(default=None, description="Platform of the post")
+    author: str | None = Field(default=None, description="Post author username")
+    safe_score: int = Field(description="Overall safety score (higher is safer)")
+    max_risk_severity: RiskSeverity | None = Field(
+        default=None, description="Highest severity among the risk signals"
+    )
+    currency: str | None = Field(
+        default=None, description="Currency of the offered price"
+    )
+    offered_price_usd: float | None = Field(
+        default=None, description="USD equivalent of the offered price"
+    )
+    expert_reviewed: bool = Field(description="Whether expert reviewed")
+    expert_reviewed_at: datetime | None = Field(
+        default=None, description="Expert review timestamp"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewClaim(BaseModel):
+    """Lease of a pending check by the expert reviewing it"""
+
+    check_id: str = Field(description="Claimed check")
+    claimed_by: str = Field(description="Expert holding the lease")
+    claimed_until: datetime = Field(description="When the lease expires (UTC)")
+
+
+class StatsGranularity(str, Enum):
+    """Time bucket size of check statistics"""
+
+    HOUR = "hour"
+    DAY = "day"
+
+
+class StatsDimension(str, Enum):
+    """Dimension check statistics can be grouped by"""
+
+    PLATFORM = "platform"
+    OUTPUT_LANGUAGE = "output_language"
+    SCORE_BUCKET = "score_bucket"
+    RISK_CATEGORY = "risk_category"
+
+
+class CheckStatsBucket(BaseModel):
+    """Check counts of one time bucket and group"""
+
+    bucket_start: datetime = Field(description="Start of the UTC time bucket")
+    platform: Platform | None = Field(
+        default=None, description="Platform (None for text inputs or when not grouped)"
+    )
+    output_language: str | None = Field(
+        default=None, description="Analysis language (None if unknown or not grouped)"
+    )
+    score_bucket: int | None = Field(
+        default=None,
+        description="Lowest safety score of the bucket (None if not grouped)",
+    )
+    risk_category: RiskCategory | None = Field(
+        default=None, description="Risk category of signals (None for all checks)"
+    )
+    check_count: int = Field(description="Checks in the bucket")
+    avg_safe_score: float = Field(description="Average safety score")
+
+
 # ==============================================================================
 # Post Preview Models (for URL metadata extraction)
 # ==============================================================================
@@ -201,11 +366,17 @@ class PostPreview(BaseModel):
 
     platform: Platform = Field(description="Social media platform")
     author: str = Field(description="Post author username")
-    created_at: datetime | None = Field(None, description="Post creation timestamp")
+    created_at: datetime | None = Field(
+        default=None, description="Post creation timestamp"
+    )
     text: str = Field(description="Full post text content")
     text_preview: str = Field(description="Truncated preview (first 200 chars)")
     images: list[str] = Field(
         default_factory=list, description="Image URLs from the post"
     )
+    thumbnails: list[str] = Field(
+        default_factory=list,
+        description="Proxied thumbnail paths of the images (same order as images)",
+    )
 
     model_config = ConfigDict(from_attributes=True)
@@ -10,26 +10,58 @@ assess price fairness, and provide actionable safety recommendations.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable
 from urllib.parse import urlparse
 
 from aioia_core.settings import OpenAIAPISettings
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
-
+from pydantic import Field, create_model
+
+from trade_safety.image_fingerprints import ImageFingerprintIndex, image_reuse_note
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.platform_adapters import PlatformAdapter, build_default_registry
+from trade_safety.post_cache import PostCache
+from trade_safety.price_reference import (
+    OfferedPrice,
+    PriceReference,
+    PriceReferenceIndex,
+    extract_offered_price,
+    format_price_range,
+    price_reference_note,
+)
 from trade_safety.prompts import TRADE_SAFETY_SYSTEM_PROMPT
 from trade_safety.reddit_extract_text_service import RedditService
-from trade_safety.schemas import TradeSafetyAnalysis
+from trade_safety.schemas import (
+    PostPreview,
+    PriceAnalysis,
+    PriceAssessment,
+    TradeSafetyAnalysis,
+)
 from trade_safety.settings import (
     ALLOWED_LANGUAGES,
     RedditAPISettings,
     TradeSafetyModelSettings,
     TwitterAPISettings,
 )
+from trade_safety.similar_cases import (
+    SimilarCase,
+    SimilarCaseIndex,
+    format_similar_case,
+)
 from trade_safety.twitter_extract_text_service import TwitterService
 
 logger = logging.getLogger(__name__)
 
+# LLM output schema when the market price range comes from our own price data
+_ANALYSIS_WITHOUT_PRICE_RANGE = create_model(
+    "TradeSafetyAnalysis",
+    __base__=TradeSafetyAnalysis,
+    price_analysis=(PriceAssessment, Field(description="Price analysis")),
+)
+
 
 # ==============================================================================
 # Trade Safety Analysis Service
@@ -74,6 +106,10 @@ class TradeSafetyService:
         twitter_api: TwitterAPISettings | None = None,
         reddit_api: RedditAPISettings | None = None,
         system_prompt: str = TRADE_SAFETY_SYSTEM_PROMPT,
+        post_cache: PostCache | None = None,
+        image_index: ImageFingerprintIndex | None = None,
+        similar_case_index: SimilarCaseIndex | None = None,
+        price_reference_index: PriceReferenceIndex | None = None,
     ):
         """
         Initialize TradeSafetyService with LLM configuration.
@@ -86,6 +122,15 @@ class TradeSafetyService:
             reddit_api: Reddit API settings (client_id, client_secret). If not provided,
                         will try REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET env vars.
             system_prompt: System prompt for trade safety analysis (default: TRADE_SAFETY_SYSTEM_PROMPT)
+            post_cache: Cache for fetched posts, shared with preview (default: None, no caching)
+            image_index: Fingerprint index matching post images against earlier
+                         checks (default: None, no image reuse detection)
+            similar_case_index: Embedding index of expert-reviewed checks whose
+                                closest cases are given to the LLM as examples
+                                (default: None, no retrieval)
+            price_reference_index: Offered-price distributions of earlier checks
+                                   used for the market price range
+                                   (default: None, estimated by the LLM)
 
         Note:
             Temperature is hardcoded to 0.7 for balanced analytical reasoning.
@@ -110,9 +155,19 @@ class TradeSafetyService:
             TradeSafetyAnalysis,
             strict=True,  # Enforce enum constraints and schema validation
         )
+        # Used when the market price range comes from our own price data
+        self.chat_model_without_price_range = base_model.with_structured_output(
+            _ANALYSIS_WITHOUT_PRICE_RANGE,
+            strict=True,
+        )
         self.system_prompt = system_prompt
-        self.twitter_service = TwitterService(twitter_api=twitter_api)
-        self.reddit_service = RedditService(reddit_api=reddit_api)
+        self.image_index = image_index
+        self.similar_case_index = similar_case_index
+        self.price_reference_index = price_reference_index
+        self.registry = build_default_registry(
+            twitter_service=TwitterService(twitter_api=twitter_api, cache=post_cache),
+            reddit_service=RedditService(reddit_api=reddit_api, cache=post_cache),
+        )
 
     # ==========================================
     # Main Analysis Method
@@ -122,20 +177,27 @@ class TradeSafetyService:
         self,
         input_text: str,
         output_language: str = "en",
+        preview: PostPreview | None = None,
+        verified_signals: list[str] | None = None,
     ) -> TradeSafetyAnalysis:
         """
         Analyze a trade post for safety issues using LLM.
 
         This method orchestrates the complete analysis workflow:
         1. Validate input parameters
-        2. Build system and user prompts
-        3. Call LLM for analysis
-        4. Parse and structure the response
-        5. Handle errors with fallback analysis
+        2. Resolve post content and collect verified signals (e.g., reused photos)
+           and similar expert-reviewed cases, and look up the item's reference price
+        3. Build system and user prompts
+        4. Call LLM for analysis
+        5. Parse and structure the response
 
         Args:
             input_text: Trade post text or URL to analyze
             output_language: Language for analysis results (default: "en")
+            preview: Already-fetched preview of the URL in input_text
+                     (default: None, content is fetched from the platform)
+            verified_signals: Facts established by our own checks to pass to
+                              the LLM (e.g., near-duplicates of earlier posts)
 
         Returns:
             TradeSafetyAnalysis: Complete analysis including:
@@ -157,33 +219,114 @@ class TradeSafetyService:
             >>> print(f"Safety: {analysis.safe_score}/100")
             Safety: 75/100
         """
+        analysis, _ = await self.analyze_trade_with_preview(
+            input_text=input_text,
+            output_language=output_language,
+            preview=preview,
+            verified_signals=verified_signals,
+        )
+        return analysis
+
+    async def analyze_trade_with_preview(
+        self,
+        input_text: str,
+        output_language: str = "en",
+        preview: PostPreview | None = None,
+        verified_signals: list[str] | None = None,
+        author_signal: Callable[[PostPreview], str | None] | None = None,
+    ) -> tuple[TradeSafetyAnalysis, PostPreview | None]:
+        """
+        Analyze a trade post like analyze_trade, also returning the fetched post.
+
+        With author_signal, URL posts are fetched with their metadata instead
+        of text only, so the author is known from the one fetch the analysis
+        makes anyway.
+
+        Args:
+            input_text: Trade post text or URL to analyze
+            output_language: Language for analysis results (default: "en")
+            preview: Already-fetched preview of the URL in input_text
+                     (default: None, content is fetched from the platform)
+            verified_signals: Facts established by our own checks to pass to
+                              the LLM (e.g., near-duplicates of earlier posts)
+            author_signal: Function returning a verified signal on the author
+                           of a fetched post (e.g., their reputation), if any
+
+        Returns:
+            (analysis, preview of the post, None for text inputs or text-only
+            fetches)
+
+        Raises:
+            ValueError: If input validation fails
+            Exception: If LLM generation fails unexpectedly
+        """
         # Step 1: Validate input
         self._validate_input(input_text, output_language)
 
         # Step 2: Validate URL
         is_url = self._is_url(input_text)
-        if is_url:
+        if is_url and preview:
+            logger.info("URL detected, reusing preview of: %s", input_text[:100])
+            content = preview.text
+        elif is_url and (self.image_index is not None or author_signal is not None):
+            # Images or the author are looked up: fetch the post, not text only
+            logger.info("URL detected, fetching post from: %s", input_text[:100])
+            preview = await self._fetch_url_preview(input_text)
+            content = preview.text
+        elif is_url:
             logger.info("URL detected, fetching content from: %s", input_text[:100])
-            content = self._fetch_url_content(input_text)
+            content = await self._fetch_url_content(input_text)
             logger.info("Fetched content length: %d chars", len(content))
         else:
             logger.info("Text input detected, using as-is")
             content = input_text
 
+        verified_signals = list(verified_signals or [])
+        if preview and author_signal is not None:
+            note = author_signal(preview)
+            if note:
+                verified_signals.append(note)
+        if preview and self.image_index is not None:
+            note = await asyncio.to_thread(
+                self._detect_image_reuse, self.image_index, input_text, preview
+            )
+            if note:
+                verified_signals.append(note)
+
+        # With a reference, the LLM assesses the price against it but does not
+        # produce the market price range, which is filled in from our data
+        price_reference = self._lookup_price_reference(content)
+        if price_reference:
+            verified_signals.append(price_reference_note(*price_reference))
+
+        similar_cases: list[SimilarCase] = []
+        if self.similar_case_index is not None:
+            similar_cases = await asyncio.to_thread(
+                self.similar_case_index.query, content
+            )
+
         logger.info(
-            "Starting trade analysis: text_length=%d",
+            "Starting trade analysis: text_length=%d, verified_signals=%d, "
+            "similar_cases=%d",
             len(content),
+            len(verified_signals),
+            len(similar_cases),
         )
 
         # Step 3: Build prompts
         system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(content, output_language)
+        user_prompt = self._build_user_prompt(
+            content, output_language, verified_signals, similar_cases
+        )
 
         # Step 4: Call LLM with structured output
         # with_structured_output uses OpenAI's Structured Outputs feature,
         # which guarantees the response adheres to the TradeSafetyAnalysis schema
         logger.debug("Calling LLM for trade analysis (%d chars)", len(user_prompt))
-        analysis = await self.chat_model.ainvoke(
+        chat_model = (
+            self.chat_model_without_price_range if price_reference else self.chat_model
+        )
+        analysis = await chat_model.ainvoke(
             [
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=user_prompt),
@@ -196,6 +339,17 @@ class TradeSafetyService:
                 f"Unexpected response type: {type(analysis)} (expected TradeSafetyAnalysis)"
             )
 
+        if price_reference:
+            analysis = TradeSafetyAnalysis(
+                **{
+                    **dict(analysis),
+                    "price_analysis": PriceAnalysis(
+                        **dict(analysis.price_analysis),
+                        market_price_range=format_price_range(price_reference[0]),
+                    ),
+                }
+            )
+
         logger.info(
             "Trade analysis completed successfully: safe_score=%d, signals=%d, cautions=%d, safe=%d",
             analysis.safe_score,
@@ -204,7 +358,7 @@ class TradeSafetyService:
             len(analysis.safe_indicators),
         )
 
-        return analysis
+        return analysis, preview
 
     # ==========================================
     # Prompt Building Methods
@@ -230,6 +384,8 @@ class TradeSafetyService:
         self,
         input_text: str,
         output_language: str,
+        verified_signals: list[str] | None = None,
+        similar_cases: list[SimilarCase] | None = None,
     ) -> str:
         """
         Build user prompt with trade post content.
@@ -237,6 +393,9 @@ class TradeSafetyService:
         Args:
             input_text: Trade post text/URL
             output_language: Language for analysis results
+            verified_signals: Facts established by our own checks (not claims
+                              made in the post), e.g. reused photos
+            similar_cases: Expert-reviewed past cases given as examples
 
         Returns:
             The input text to be analyzed
@@ -245,6 +404,20 @@ class TradeSafetyService:
                 IMPORTANT: Write ALL field values (translation, nuance_explanation, titles, descriptions, recommendations, emotional_support) in {output_language}. Do NOT mix languages.
                 Trade post to analyze: {input_text}"""
 
+        if verified_signals:
+            signal_lines = "\n".join(f"- {signal}" for signal in verified_signals)
+            prompt += f"""
+                Verified signals from our own checks (facts, not claims made in the post):
+{signal_lines}"""
+
+        if similar_cases:
+            case_lines = "\n".join(
+                f"- {format_similar_case(case)}" for case in similar_cases
+            )
+            prompt += f"""
+                Similar past cases reviewed by our experts (examples for calibration, not facts about this post; judge this post on its own content):
+{case_lines}"""
+
         logger.debug(
             "Built user prompt: text_length=%d",
             len(prompt),
@@ -309,9 +482,84 @@ class TradeSafetyService:
         logger.debug("Not a URL, treating as text")
         return False
 
-    def _fetch_url_content(self, url: str) -> str:
+    def _lookup_price_reference(
+        self, content: str
+    ) -> tuple[PriceReference, OfferedPrice] | None:
+        """
+        Look up the reference price of the item offered in a post.
+
+        Args:
+            content: Post text
+
+        Returns:
+            (reference distribution, offered price), or None if the post has no
+            price or the item has too few earlier prices in its currency
+        """
+        if self.price_reference_index is None:
+            return None
+        offered = extract_offered_price(content)
+        if offered is None:
+            return None
+        reference = self.price_reference_index.lookup(content, offered.currency)
+        if reference is None:
+            return None
+        logger.info(
+            "Price reference found: item=%s, samples=%d",
+            reference.item_key,
+            reference.sample_count,
+        )
+        return reference, offered
+
+    def _detect_image_reuse(
+        self, image_index: ImageFingerprintIndex, input_text: str, preview: PostPreview
+    ) -> str | None:
         """
-        Fetch content from URL.
+        Match post images against earlier checks and record them.
+
+        Args:
+            image_index: Fingerprint index
+            input_text: Trade post URL (identifies the post)
+            preview: Fetched post with image URLs
+
+        Returns:
+            Prompt note describing reused photos, None if none were found
+        """
+        if not preview.images:
+            return None
+
+        post_key = compute_input_hash(input_text)
+        fingerprints = image_index.fingerprint_images(preview.images)
+        matches = image_index.find_matches(fingerprints, exclude_post_key=post_key)
+        image_index.add(post_key, fingerprints)
+
+        if matches:
+            logger.info(
+                "Reused photos detected: images=%d, matches=%d",
+                len(fingerprints),
+                len(matches),
+            )
+        return image_reuse_note(matches)
+
+    async def _fetch_url_preview(self, url: str) -> PostPreview:
+        """
+        Fetch a post with its metadata via the platform adapter serving its host.
+
+        Args:
+            url: URL of the post
+
+        Returns:
+            PostPreview: Post metadata including text and image URLs
+
+        Raises:
+            ValueError: If URL fetch fails or returns error status
+        """
+        adapter = self._resolve_adapter(url)
+        logger.info("Fetching %s post", adapter.display_name)
+        return await adapter.fetch_preview_async(url)
+
+    async def _fetch_url_content(self, url: str) -> str:
+        """
+        Fetch content from URL via the platform adapter serving its host.
 
         Args:
             url: URL to fetch content from
@@ -322,26 +570,22 @@ class TradeSafetyService:
         Raises:
             ValueError: If URL fetch fails or returns error status
         """
+        adapter = self._resolve_adapter(url)
+        logger.info("Fetching %s content", adapter.display_name)
+        return await adapter.fetch_content_async(url)
 
-        # X(트위터) URL인지 먼저 판별
-        if TwitterService.is_twitter_url(url):
-            logger.info("Detected Twitter/X URL, using TwitterService")
-            return self.twitter_service.fetch_tweet_content(url)
-
-        # Reddit URL인지 판별
-        if RedditService.is_reddit_url(url):
-            logger.info("Detected Reddit URL, using RedditService")
-            metadata = self.reddit_service.fetch_metadata(url)
-            # Combine title and text for analysis
-            content = (
-                f"{metadata.title}\n\n{metadata.text}"
-                if metadata.text
-                else metadata.title
-            )
-            return content
+    def _resolve_adapter(self, url: str) -> PlatformAdapter:
+        """
+        Find the platform adapter serving a URL.
 
-        logger.warning("Unsupported URL type: %s", url)
-        raise ValueError(
-            "Unsupported URL. Currently only Twitter/X and Reddit URLs are supported. "
-            "Please paste the text content directly instead of the URL."
-        )
+        Raises:
+            ValueError: If no supported platform serves the URL
+        """
+        adapter = self.registry.resolve(url)
+        if adapter is None:
+            logger.warning("Unsupported URL type: %s", url)
+            raise ValueError(
+                f"{self.registry.unsupported_url_message()} "
+                "Please paste the text content directly instead of the URL."
+            )
+        return adapter
@@ -11,9 +11,11 @@ class TwitterAPISettings(BaseSettings):
 
     Environment variables:
         TWITTER_BEARER_TOKEN: Twitter API Bearer Token
+        TWITTER_BATCH_WINDOW_MS: Micro-batching window of metadata lookups (default: 5)
     """
 
     bearer_token: str | None = None
+    batch_window_ms: int = 5
 
     class Config:
         env_prefix = "TWITTER_"
@@ -26,11 +28,19 @@ class RedditAPISettings(BaseSettings):
         REDDIT_CLIENT_ID: Reddit API Client ID
         REDDIT_CLIENT_SECRET: Reddit API Client Secret
         REDDIT_USER_AGENT: Reddit API User Agent
+        REDDIT_BATCH_WINDOW_MS: Micro-batching window of metadata lookups (default: 5)
+        REDDIT_TOKEN_RENEW_BEFORE_SECONDS: Renew OAuth tokens in the background
+            this long before expiry (default: 300)
+        REDDIT_TOKEN_CACHE_DIR: Directory for an OAuth token file shared by
+            worker processes (default: None, in-memory only)
     """
 
     client_id: str | None = None
     client_secret: str | None = None
     user_agent: str = "trade-safety/1.0"
+    batch_window_ms: int = 5
+    token_renew_before_seconds: int = 300
+    token_cache_dir: str | None = None
 
     class Config:
         env_prefix = "REDDIT_"
@@ -48,3 +58,372 @@ class TradeSafetyModelSettings(BaseSettings):
 
     class Config:
         env_prefix = "TRADE_SAFETY_"
+
+
+class TradeSafetyDedupSettings(BaseSettings):
+    """
+    Settings for reusing recent analyses of the same input.
+
+    Environment variables:
+        TRADE_SAFETY_DEDUP_ENABLED: Reuse recent analyses (default: true)
+        TRADE_SAFETY_DEDUP_REUSE_WINDOW_HOURS: How long an analysis stays reusable
+    """
+
+    enabled: bool = True
+    reuse_window_hours: int = 24
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_DEDUP_"
+
+
+class PostCacheSettings(BaseSettings):
+    """
+    Settings for the shared social media post cache.
+
+    Environment variables:
+        TRADE_SAFETY_POST_CACHE_TTL_SECONDS: Lifetime of fetched posts (default: 600)
+        TRADE_SAFETY_POST_CACHE_NEGATIVE_TTL_SECONDS: Lifetime of 404/410 results
+        TRADE_SAFETY_POST_CACHE_MAX_ENTRIES: In-memory entry limit (LRU eviction)
+        TRADE_SAFETY_POST_CACHE_DISK_PATH: Directory for the optional disk tier
+        TRADE_SAFETY_POST_CACHE_DISK_MAX_ENTRIES: File limit of the disk tier;
+            expired, then soonest-expiring files are pruned beyond it
+            (default: 10000)
+    """
+
+    ttl_seconds: int = 600
+    negative_ttl_seconds: int = 60
+    max_entries: int = 1024
+    disk_path: str | None = None
+    disk_max_entries: int = 10000
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_POST_CACHE_"
+
+
+class RateLimitSettings(BaseSettings):
+    """
+    Settings for rate-limit-aware scheduling of Twitter/Reddit API calls.
+
+    Environment variables:
+        TRADE_SAFETY_RATE_LIMIT_BULK_RESERVE_FRACTION: Share of each window kept
+            for interactive requests (default: 0.2)
+        TRADE_SAFETY_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS: Longest wait for an
+            interactive request before rejecting it (default: 2)
+        TRADE_SAFETY_RATE_LIMIT_BULK_MAX_WAIT_SECONDS: Longest wait for a bulk
+            request before rejecting it (default: 900)
+        TRADE_SAFETY_RATE_LIMIT_DEFAULT_RESET_SECONDS: Assumed window reset after
+            a 429 without rate-limit headers (default: 60)
+    """
+
+    bulk_reserve_fraction: float = 0.2
+    interactive_max_wait_seconds: float = 2.0
+    bulk_max_wait_seconds: float = 900.0
+    default_reset_seconds: float = 60.0
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_RATE_LIMIT_"
+
+
+class ImageProxySettings(BaseSettings):
+    """
+    Settings for the preview image proxy and thumbnail cache.
+
+    Environment variables:
+        TRADE_SAFETY_IMAGE_PROXY_CACHE_DIR: Thumbnail cache directory
+            (default: None, "trade_safety_images" in the system temp directory)
+        TRADE_SAFETY_IMAGE_PROXY_MAX_CACHE_BYTES: Disk budget of the cache;
+            least recently used thumbnails are evicted beyond it (default: 256 MiB)
+        TRADE_SAFETY_IMAGE_PROXY_THUMBNAIL_SIZE: Longest thumbnail edge in pixels
+        TRADE_SAFETY_IMAGE_PROXY_MAX_SOURCE_BYTES: Largest source image fetched
+        TRADE_SAFETY_IMAGE_PROXY_FETCH_TIMEOUT_SECONDS: Source image fetch timeout
+        TRADE_SAFETY_IMAGE_PROXY_ALLOWED_HOSTS: JSON list of image hosts that may
+            be proxied (subdomains match too)
+        TRADE_SAFETY_IMAGE_PROXY_PREWARM_WORKERS: Threads pre-warming thumbnails
+            of previewed posts (default: 4, 0 disables pre-warming)
+    """
+
+    cache_dir: str | None = None
+    max_cache_bytes: int = 256 * 1024 * 1024
+    thumbnail_size: int = 480
+    max_source_bytes: int = 10 * 1024 * 1024
+    fetch_timeout_seconds: float = 10.0
+    allowed_hosts: list[str] = [
+        "pbs.twimg.com",
+        "i.redd.it",
+        "preview.redd.it",
+        "external-preview.redd.it",
+        "i.imgur.com",
+    ]
+    prewarm_workers: int = 4
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_IMAGE_PROXY_"
+
+
+class ImageFingerprintSettings(BaseSettings):
+    """
+    Settings for perceptual-hash detection of reused trade photos.
+
+    Environment variables:
+        TRADE_SAFETY_IMAGE_FINGERPRINT_ENABLED: Fingerprint post images
+            (default: false; every image of a checked post is downloaded while
+            the check is created, and URL checks fetch the full post)
+        TRADE_SAFETY_IMAGE_FINGERPRINT_MAX_DISTANCE: Largest Hamming distance
+            between 64-bit hashes counted as the same photo (default: 6)
+        TRADE_SAFETY_IMAGE_FINGERPRINT_INDEX_PATH: JSONL file persisting seen
+            fingerprints across restarts (default: None, in-memory only)
+    """
+
+    enabled: bool = False
+    max_distance: int = 6
+    index_path: str | None = None
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_IMAGE_FINGERPRINT_"
+
+
+class NearDuplicateSettings(BaseSettings):
+    """
+    Settings for the MinHash/LSH index of near-duplicate trade posts.
+
+    Environment variables:
+        TRADE_SAFETY_NEAR_DUP_ENABLED: Look up near-duplicate checks (default: true)
+        TRADE_SAFETY_NEAR_DUP_SHINGLE_SIZE: Characters per shingle (default: 5)
+        TRADE_SAFETY_NEAR_DUP_NUM_PERM: MinHash signature length (default: 128)
+        TRADE_SAFETY_NEAR_DUP_BANDS: LSH bands; NUM_PERM must be divisible by it
+            (default: 32)
+        TRADE_SAFETY_NEAR_DUP_SIMILARITY_THRESHOLD: Lowest estimated Jaccard
+            similarity reported as a near duplicate (default: 0.6)
+        TRADE_SAFETY_NEAR_DUP_REUSE_THRESHOLD: Similarity from which the analysis
+            of a near duplicate is reused instead of calling the LLM (default: 0.95)
+        TRADE_SAFETY_NEAR_DUP_MAX_RESULTS: Near duplicates returned per query
+    """
+
+    enabled: bool = True
+    shingle_size: int = 5
+    num_perm: int = 128
+    bands: int = 32
+    similarity_threshold: float = 0.6
+    reuse_threshold: float = 0.95
+    max_results: int = 5
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_NEAR_DUP_"
+
+
+class SimilarCaseSettings(BaseSettings):
+    """
+    Settings for embedding-based retrieval of similar expert-reviewed checks.
+
+    Environment variables:
+        TRADE_SAFETY_SIMILAR_CASES_ENABLED: Retrieve similar past cases (default: true)
+        TRADE_SAFETY_SIMILAR_CASES_EMBEDDING_MODEL: "hashing" for the built-in
+            offline embedder, or a sentence-transformers model name (needs
+            the embeddings extra) (default: hashing)
+        TRADE_SAFETY_SIMILAR_CASES_DIMENSIONS: Vector size of the hashing
+            embedder (default: 256)
+        TRADE_SAFETY_SIMILAR_CASES_INDEX_DIR: Directory of the memory-mapped
+            sidecar index (default: None, in-memory only)
+        TRADE_SAFETY_SIMILAR_CASES_TOP_K: Cases added to the prompt (default: 3)
+        TRADE_SAFETY_SIMILAR_CASES_MIN_SIMILARITY: Lowest cosine similarity of a
+            retrieved case (default: 0.35)
+        TRADE_SAFETY_SIMILAR_CASES_REVIEWED_ONLY: Index only expert-reviewed
+            checks (default: true)
+        TRADE_SAFETY_SIMILAR_CASES_EXCERPT_CHARS: Post text kept per case
+            (default: 280)
+    """
+
+    enabled: bool = True
+    embedding_model: str = "hashing"
+    dimensions: int = 256
+    index_dir: str | None = None
+    top_k: int = 3
+    min_similarity: float = 0.35
+    reviewed_only: bool = True
+    excerpt_chars: int = 280
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_SIMILAR_CASES_"
+
+
+class AuthorReputationSettings(BaseSettings):
+    """
+    Settings for per-author reputation aggregated from past checks.
+
+    Environment variables:
+        TRADE_SAFETY_REPUTATION_ENABLED: Look up the post author's history before
+            analysis (default: true)
+        TRADE_SAFETY_REPUTATION_RISKY_SCORE_THRESHOLD: Safety scores below this
+            count as risky checks (default: 40)
+        TRADE_SAFETY_REPUTATION_MIN_CHECKS: Earlier checks needed before the
+            history is passed to the LLM (default: 1)
+    """
+
+    enabled: bool = True
+    risky_score_threshold: int = 40
+    min_checks: int = 1
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_REPUTATION_"
+
+
+class PriceReferenceSettings(BaseSettings):
+    """
+    Settings for the market price reference built from past checks.
+
+    Environment variables:
+        TRADE_SAFETY_PRICE_REFERENCE_ENABLED: Look up reference prices before
+            analysis (default: true)
+        TRADE_SAFETY_PRICE_REFERENCE_MIN_SAMPLES: Earlier prices of an item (in
+            one currency) needed before its distribution is used (default: 5)
+    """
+
+    enabled: bool = True
+    min_samples: int = 5
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_PRICE_REFERENCE_"
+
+
+class CurrencySettings(BaseSettings):
+    """
+    Settings for currency normalization with a cached FX rate table.
+
+    Environment variables:
+        TRADE_SAFETY_FX_RATES_PATH: JSON file holding the rate table, shared by
+            worker processes (default: None, bundled rates in memory)
+        TRADE_SAFETY_FX_RATES_URL: URL returning {"base": ..., "rates": {...}}
+            JSON to refresh rates from (default: None, never refresh)
+        TRADE_SAFETY_FX_REFRESH_INTERVAL_HOURS: Refresh rates older than this
+            (default: 24)
+        TRADE_SAFETY_FX_FETCH_TIMEOUT_SECONDS: Timeout of a rate fetch (default: 5)
+    """
+
+    rates_path: str | None = None
+    rates_url: str | None = None
+    refresh_interval_hours: float = 24
+    fetch_timeout_seconds: float = 5
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_FX_"
+
+
+class ReviewQueueSettings(BaseSettings):
+    """
+    Settings for the prioritized expert review queue.
+
+    Environment variables:
+        TRADE_SAFETY_REVIEW_QUEUE_LEASE_MINUTES: How long a claimed check is
+            reserved for the expert who claimed it (default: 15)
+    """
+
+    lease_minutes: int = 15
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_REVIEW_QUEUE_"
+
+
+class ExpertAdviceSettings(BaseSettings):
+    """
+    Settings for sharing expert advice between checks of the same post.
+
+    Environment variables:
+        TRADE_SAFETY_EXPERT_ADVICE_PROPAGATE: Attach a review's advice to other
+            checks of the same normalized input and to future ones (default: true)
+        TRADE_SAFETY_EXPERT_ADVICE_NEAR_DUPLICATES: Also attach it to near
+            duplicates found by the near-duplicate index (default: false)
+        TRADE_SAFETY_EXPERT_ADVICE_NEAR_DUPLICATE_THRESHOLD: Lowest estimated
+            Jaccard similarity of a near duplicate receiving the advice
+            (default: 0.9)
+    """
+
+    propagate: bool = True
+    near_duplicates: bool = False
+    near_duplicate_threshold: float = 0.9
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_EXPERT_ADVICE_"
+
+
+class RetentionSettings(BaseSettings):
+    """
+    Settings for monthly partitions, retention and archival of checks.
+
+    Environment variables:
+        TRADE_SAFETY_RETENTION_MONTHS: Full months of checks kept in the
+            database before older ones are archived (default: None, keep all)
+        TRADE_SAFETY_RETENTION_ARCHIVE_DIR: Directory receiving one gzipped
+            JSONL file per archived month (default: archive)
+        TRADE_SAFETY_RETENTION_PARTITIONS_AHEAD: Monthly partitions created
+            ahead of the current month on PostgreSQL (default: 3)
+        TRADE_SAFETY_RETENTION_BATCH_SIZE: Rows streamed or deleted per round
+            trip (default: 1000)
+    """
+
+    months: int | None = None
+    archive_dir: str = "archive"
+    partitions_ahead: int = 3
+    batch_size: int = 1000
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_RETENTION_"
+
+
+class AnalysisCodecSettings(BaseSettings):
+    """
+    Settings for compressed storage of llm_analysis payloads.
+
+    Environment variables:
+        TRADE_SAFETY_ANALYSIS_CODEC_COMPRESS: Store new analyses as zstd
+            frames instead of JSON; needs the compression extra (default: false)
+        TRADE_SAFETY_ANALYSIS_CODEC_LEVEL: zstd compression level (default: 6)
+        TRADE_SAFETY_ANALYSIS_CODEC_DICTIONARY_SIZE: Size in bytes of the
+            dictionaries trained per output language (default: 32768)
+        TRADE_SAFETY_ANALYSIS_CODEC_TRAINING_SAMPLES: Latest analyses of a
+            language used to train its dictionary (default: 2000)
+        TRADE_SAFETY_ANALYSIS_CODEC_MIN_TRAINING_SAMPLES: Languages with fewer
+            analyses are compressed without a dictionary (default: 50)
+    """
+
+    compress: bool = False
+    level: int = 6
+    dictionary_size: int = 32768
+    training_samples: int = 2000
+    min_training_samples: int = 50
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_ANALYSIS_CODEC_"
+
+
+class WriteBehindSettings(BaseSettings):
+    """
+    Settings for write-behind persistence of created checks.
+
+    Environment variables:
+        TRADE_SAFETY_WRITE_BEHIND_ENABLED: Return created checks before they
+            are written and insert them in batches (default: false)
+        TRADE_SAFETY_WRITE_BEHIND_MAX_PENDING: Checks waiting to be written
+            before new ones are written synchronously (default: 1000)
+        TRADE_SAFETY_WRITE_BEHIND_BATCH_SIZE: Checks inserted per transaction
+            (default: 100)
+        TRADE_SAFETY_WRITE_BEHIND_FLUSH_INTERVAL_MS: How long the first pending
+            check waits for others to share its batch (default: 50)
+        TRADE_SAFETY_WRITE_BEHIND_RETRY_SECONDS: Delay before retrying a failed
+            batch (default: 1.0)
+        TRADE_SAFETY_WRITE_BEHIND_JOURNAL_DIR: Directory of the local journal
+            replayed after a crash (default: None, pending checks are lost
+            on a crash)
+        TRADE_SAFETY_WRITE_BEHIND_JOURNAL_FSYNC: fsync the journal before a
+            check is returned (default: true)
+    """
+
+    enabled: bool = False
+    max_pending: int = 1000
+    batch_size: int = 100
+    flush_interval_ms: int = 50
+    retry_seconds: float = 1.0
+    journal_dir: str | None = None
+    journal_fsync: bool = True
+
+    class Config:
+        env_prefix = "TRADE_SAFETY_WRITE_BEHIND_"
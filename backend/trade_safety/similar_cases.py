@@ -0,0 +1,704 @@
+"""
+Embedding index of expert-reviewed checks for similar-case retrieval.
+
+Near-duplicate detection (trade_safety.near_duplicates) only catches reposts
+of the same text. This index embeds the text of reviewed checks into unit
+vectors, so "this looks like these earlier scams" can be answered with a
+cosine top-k query, and the retrieved cases are passed to the analysis prompt
+as few-shot context.
+
+Vectors are kept in a sidecar directory next to the database instead of a
+column: a raw float32 file that is memory-mapped on startup and appended to
+as checks get reviewed, plus a JSONL file of the case metadata. Queries are
+batched matrix products over blocks of the mapped file. Worker processes
+share the directory: appends are made under a file lock, and rows appended by
+other processes are read before the next query or add.
+
+The default embedder hashes character n-grams and runs offline with NumPy
+only; a sentence-transformers model can be configured instead (optional
+dependency, installed with the `embeddings` extra).
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from pydantic import Field
+
+from trade_safety.file_locks import lock_file
+from trade_safety.input_normalization import normalize_text
+from trade_safety.near_duplicates import IndexedCheck, is_indexable
+from trade_safety.schemas import TradeSafetyCheck
+from trade_safety.settings import SimilarCaseSettings
+
+logger = logging.getLogger(__name__)
+
+HASHING_MODEL = "hashing"
+VECTORS_FILE = "vectors.f32"
+CASES_FILE = "cases.jsonl"
+LOCK_FILE = "index.lock"
+
+# Rows scored per matrix product (bounds query memory on large indexes)
+_QUERY_BLOCK_ROWS = 65536
+# In-memory blocks merged once more than this many are appended
+_MAX_BLOCKS = 16
+# Checks embedded per batch while syncing from the table
+_SYNC_BATCH_SIZE = 256
+
+
+class IndexedCase(IndexedCheck):
+    """Check metadata kept in the similar-case index"""
+
+    excerpt: str = Field(description="Beginning of the post text")
+    row: int = Field(description="Row of the check's vector in the index")
+
+
+class SimilarCase(IndexedCheck):
+    """A reviewed check similar to the post being analyzed"""
+
+    excerpt: str = Field(description="Beginning of the post text")
+    similarity: float = Field(description="Cosine similarity (-1 to 1)")
+
+
+# ==============================================================================
+# Embedders
+# ==============================================================================
+
+
+class TextEmbedder(ABC):
+    """Turns texts into L2-normalized float32 vectors."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Identifier of the model and vector size (names the sidecar index)."""
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> int:
+        """Vector size."""
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimensions) with unit rows
+            (zero rows for texts without content)
+        """
+
+
+class HashingEmbedder(TextEmbedder):
+    """
+    Offline embedder hashing character trigrams and words into signed buckets.
+
+    Captures surface similarity only, but needs no model download, so the
+    index works (and is testable) anywhere.
+
+    Example:
+        >>> embedder = HashingEmbedder(dimensions=256)
+        >>> vectors = embedder.embed(["급처분 포카 양도", "포카 급처분 양도해요"])
+        >>> float(vectors[0] @ vectors[1]) > 0.5
+        True
+    """
+
+    def __init__(self, dimensions: int = 256):
+        """
+        Initialize HashingEmbedder.
+
+        Args:
+            dimensions: Vector size
+        """
+        self._dimensions = dimensions
+
+    @property
+    def name(self) -> str:
+        """Identifier of the model and vector size."""
+        return f"{HASHING_MODEL}-{self._dimensions}"
+
+    @property
+    def dimensions(self) -> int:
+        """Vector size."""
+        return self._dimensions
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts (see TextEmbedder.embed)."""
+        vectors = np.zeros((len(texts), self._dimensions), dtype=np.float32)
+        for position, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in features),
+                dtype=np.uint32,
+                count=len(features),
+            )
+            # Low bits pick the bucket, the top bit the sign
+            signs = np.where(hashes >> 31, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[position], hashes % self._dimensions, signs)
+        return _normalize_rows(vectors)
+
+    @staticmethod
+    def _features(text: str) -> list[str]:
+        """Character trigrams and words of the normalized text."""
+        normalized = normalize_text(text)
+        trigrams = [
+            normalized[start : start + 3] for start in range(len(normalized) - 2)
+        ]
+        return trigrams + normalized.split()
+
+
+class SentenceTransformerEmbedder(TextEmbedder):
+    """
+    Embedder backed by a local sentence-transformers model.
+
+    sentence-transformers is imported only when such a model is configured, so
+    the hashing embedder works without it (or its torch dependency).
+    """
+
+    def __init__(self, model_name: str):
+        """
+        Initialize SentenceTransformerEmbedder.
+
+        Args:
+            model_name: sentence-transformers model name or local path
+
+        Raises:
+            ValueError: If sentence-transformers is not installed
+        """
+        try:
+            sentence_transformers = importlib.import_module("sentence_transformers")
+        except ImportError as e:
+            raise ValueError(
+                "sentence-transformers is required for embedding model "
+                f"'{model_name}' (install the 'embeddings' extra)"
+            ) from e
+        self._model_name = model_name
+        self._model = sentence_transformers.SentenceTransformer(model_name)
+        self._dimensions = int(self._model.get_sentence_embedding_dimension())
+
+    @property
+    def name(self) -> str:
+        """Identifier of the model and vector size."""
+        return f"{self._model_name.replace('/', '_')}-{self._dimensions}"
+
+    @property
+    def dimensions(self) -> int:
+        """Vector size."""
+        return self._dimensions
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts (see TextEmbedder.embed)."""
+        vectors = self._model.encode(list(texts), convert_to_numpy=True)
+        return _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, leaving zero rows as they are."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def build_embedder(settings: SimilarCaseSettings) -> TextEmbedder:
+    """
+    Create the embedder configured in settings.
+
+    Args:
+        settings: Similar-case settings
+
+    Returns:
+        Hashing embedder, or a sentence-transformers embedder for other models
+
+    Raises:
+        ValueError: If the model needs sentence-transformers and it is missing
+    """
+    if settings.embedding_model == HASHING_MODEL:
+        return HashingEmbedder(settings.dimensions)
+    return SentenceTransformerEmbedder(settings.embedding_model)
+
+
+# ==============================================================================
+# Index
+# ==============================================================================
+
+
+class SimilarCaseIndex:
+    """
+    Cosine top-k index over embedded check texts.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    get_similar_case_index), synced with the table in the background at
+    startup (see TradeSafetyCheckManagerFactory.start_index_builds). Worker
+    processes sharing index_dir allocate rows under a file lock, and cases
+    indexed by other processes are picked up before the next query or add.
+
+    Example:
+        >>> index = get_similar_case_index()
+        >>> index.ensure_synced(manager.iter_indexed_checks)
+        >>> index.is_ready
+        True
+        >>> cases = index.query("급처분 포카 양도합니다 선입금만 DM 주세요")
+    """
+
+    def __init__(
+        self,
+        settings: SimilarCaseSettings | None = None,
+        embedder: TextEmbedder | None = None,
+    ):
+        """
+        Initialize SimilarCaseIndex and load the sidecar index, if configured.
+
+        Args:
+            settings: Index settings (default: SimilarCaseSettings() from environment)
+            embedder: Text embedder (default: built from settings)
+        """
+        self.settings = settings or SimilarCaseSettings()
+        self._embedder = embedder or build_embedder(self.settings)
+        self._entries: dict[str, IndexedCase] = {}
+        # Check ID per vector row (None for rows without metadata after a crash)
+        self._row_ids: list[str | None] = []
+        self._blocks: list[np.ndarray] = []
+        # Bytes of the cases file read so far (complete lines only)
+        self._cases_offset = 0
+        self._row_bytes = self._embedder.dimensions * np.dtype(np.float32).itemsize
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced = False
+        # One directory per embedder: vectors of different models never mix
+        self._index_dir = (
+            Path(self.settings.index_dir) / self._embedder.name
+            if self.settings.index_dir
+            else None
+        )
+        self._load()
+
+    def __len__(self) -> int:
+        """Number of indexed cases."""
+        return len(self._entries)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been synced with the stored checks."""
+        return self._synced
+
+    # ==========================================
+    # Main Methods
+    # ==========================================
+
+    def query(self, text: str) -> list[SimilarCase]:
+        """
+        Find the indexed cases most similar to a text.
+
+        Args:
+            text: Post content
+
+        Returns:
+            Up to top_k cases at or above min_similarity, most similar first
+        """
+        return self.query_batch([text])[0]
+
+    def query_batch(
+        self, texts: Sequence[str], top_k: int | None = None
+    ) -> list[list[SimilarCase]]:
+        """
+        Find the indexed cases most similar to each of several texts.
+
+        Args:
+            texts: Post contents
+            top_k: Cases per text (default: settings.top_k)
+
+        Returns:
+            Per text, up to top_k cases at or above min_similarity, most
+            similar first
+        """
+        top_k = top_k or self.settings.top_k
+        if not texts:
+            return []
+        with self._lock:
+            self._catch_up_if_changed()
+            blocks = list(self._blocks)
+            row_ids = list(self._row_ids)
+        if not row_ids:
+            return [[] for _ in texts]
+
+        queries = self._embedder.embed(texts)
+        scores, rows = _top_k_rows(queries, blocks, top_k)
+
+        results = []
+        with self._lock:
+            for query_scores, query_rows in zip(scores, rows):
+                cases = []
+                for score, row in zip(query_scores, query_rows):
+                    check_id = row_ids[row]
+                    if check_id is None or score < self.settings.min_similarity:
+                        continue
+                    entry = self._entries[check_id]
+                    cases.append(
+                        SimilarCase(
+                            **entry.model_dump(exclude={"row"}),
+                            similarity=float(score),
+                        )
+                    )
+                results.append(cases)
+        return results
+
+    def add(self, rows: Sequence[tuple[IndexedCheck, str]]) -> int:
+        """
+        Embed and index checks, or refresh the metadata of indexed ones.
+
+        Checks are skipped when their input is a URL, or when reviewed_only is
+        set and they have not been reviewed by an expert.
+
+        Args:
+            rows: (metadata, input_text) per check
+
+        Returns:
+            Number of newly indexed checks
+        """
+        new_rows = []
+        with self._lock, self._storage_lock():
+            self._catch_up()
+            for entry, input_text in rows:
+                if entry.check_id in self._entries:
+                    self._refresh(entry)
+                elif self._accepts(entry, input_text):
+                    new_rows.append((entry, input_text))
+        if not new_rows:
+            return 0
+
+        # Embedding is the expensive part; run it without holding the lock
+        vectors = self._embedder.embed([input_text for _, input_text in new_rows])
+
+        with self._lock, self._storage_lock():
+            # Rows appended by other processes come first
+            self._catch_up()
+            added: list[tuple[IndexedCase, np.ndarray]] = []
+            for (entry, input_text), vector in zip(new_rows, vectors):
+                if entry.check_id in self._entries:  # Added concurrently
+                    continue
+                case = IndexedCase(
+                    **entry.model_dump(),
+                    excerpt=input_text[: self.settings.excerpt_chars],
+                    row=len(self._row_ids) + len(added),
+                )
+                added.append((case, vector))
+            if added:
+                self._append(
+                    [case for case, _ in added], np.stack([v for _, v in added])
+                )
+        return len(added)
+
+    def add_check(self, check: TradeSafetyCheck) -> None:
+        """
+        Index a created or updated check.
+
+        Args:
+            check: Stored check
+        """
+        self.add([(IndexedCheck.from_check(check), check.input_text)])
+
+    def sync(self, rows: Iterable[tuple[IndexedCheck, str]]) -> int:
+        """
+        Incrementally index stored checks that are not in the index yet.
+
+        Already indexed checks are not embedded again; only their metadata is
+        refreshed.
+
+        Args:
+            rows: (metadata, input_text) of stored checks
+
+        Returns:
+            Number of newly indexed checks
+        """
+        added = 0
+        batch: list[tuple[IndexedCheck, str]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= _SYNC_BATCH_SIZE:
+                added += self.add(batch)
+                batch = []
+        added += self.add(batch)
+        logger.info("Synced similar-case index: added=%d, cases=%d", added, len(self))
+        return added
+
+    def ensure_synced(
+        self, load: Callable[[], Iterable[tuple[IndexedCheck, str]]]
+    ) -> None:
+        """
+        Sync the index with stored checks once per process.
+
+        Args:
+            load: Function returning (metadata, input_text) of stored checks
+        """
+        if self._synced:
+            return
+        with self._sync_lock:
+            if not self._synced:
+                self.sync(load())
+                self._synced = True
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _accepts(self, entry: IndexedCheck, input_text: str) -> bool:
+        """Whether a check belongs in the index."""
+        if self.settings.reviewed_only and not entry.expert_reviewed:
+            return False
+        return is_indexable(input_text)
+
+    def _refresh(self, entry: IndexedCheck) -> None:
+        """Update the metadata of an indexed case (locks held, caught up)."""
+        current = self._entries[entry.check_id]
+        if IndexedCheck(**current.model_dump(exclude={"excerpt", "row"})) == entry:
+            return
+        refreshed = current.model_copy(update=entry.model_dump())
+        self._entries[entry.check_id] = refreshed
+        self._write_cases([refreshed])
+
+    # ==========================================
+    # Storage Methods
+    # ==========================================
+
+    def _append(self, cases: list[IndexedCase], vectors: np.ndarray) -> None:
+        """Add cases and their vectors (locks held, caught up)."""
+        vectors = vectors.astype(np.float32, copy=False)
+        if self._index_dir is not None:
+            try:
+                # Vectors first: rows without metadata are ignored on load.
+                # A partial row left by a crashed writer is cut off first.
+                with (self._index_dir / VECTORS_FILE).open("ab") as f:
+                    f.truncate(len(self._row_ids) * self._row_bytes)
+                    f.write(vectors.tobytes())
+            except OSError as e:
+                # Persistence is best-effort; keep serving from memory
+                logger.warning(
+                    "Failed to write similar-case index %s: %s", self._index_dir, e
+                )
+                self._index_dir = None
+        self._write_cases(cases)
+
+        for case in cases:
+            self._entries[case.check_id] = case
+            self._row_ids.append(case.check_id)
+        self._blocks.append(vectors)
+        if len(self._blocks) > _MAX_BLOCKS:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Merge vector blocks into one (lock held)."""
+        if self._index_dir is not None:
+            self._blocks = [self._map_vectors(len(self._row_ids))]
+        else:
+            self._blocks = [np.concatenate(self._blocks)]
+
+    def _map_vectors(self, row_count: int) -> np.ndarray:
+        """Memory-map the first row_count rows of the vector file."""
+        assert self._index_dir is not None
+        return np.memmap(
+            self._index_dir / VECTORS_FILE,
+            dtype=np.float32,
+            mode="r",
+            shape=(row_count, self._embedder.dimensions),
+        )
+
+    def _write_cases(self, cases: list[IndexedCase]) -> None:
+        """Append case metadata to the sidecar index (locks held, caught up)."""
+        if self._index_dir is None or not cases:
+            return
+        try:
+            with (self._index_dir / CASES_FILE).open("ab") as f:
+                # A partial line left by a crashed writer is cut off first
+                f.truncate(self._cases_offset)
+                f.write(
+                    b"".join(case.model_dump_json().encode() + b"\n" for case in cases)
+                )
+                self._cases_offset = f.tell()
+        except OSError as e:
+            logger.warning(
+                "Failed to write similar-case index %s: %s", self._index_dir, e
+            )
+
+    @contextmanager
+    def _storage_lock(self) -> Iterator[None]:
+        """Hold the sidecar index lock shared by all processes (lock held)."""
+        if self._index_dir is None:
+            yield
+            return
+        try:
+            self._index_dir.mkdir(parents=True, exist_ok=True)
+            file = (self._index_dir / LOCK_FILE).open("ab")
+        except OSError as e:
+            logger.warning(
+                "Failed to lock similar-case index %s: %s", self._index_dir, e
+            )
+            self._index_dir = None
+            yield
+            return
+        with file:
+            lock_file(file)
+            yield
+
+    def _catch_up(self) -> None:
+        """Read rows and cases appended since the last read (locks held)."""
+        if self._index_dir is None:
+            return
+        try:
+            # A partially written last row is ignored
+            row_count = _file_size(self._index_dir / VECTORS_FILE) // self._row_bytes
+            data = b""
+            if _file_size(self._index_dir / CASES_FILE) > self._cases_offset:
+                with (self._index_dir / CASES_FILE).open("rb") as f:
+                    f.seek(self._cases_offset)
+                    data = f.read()
+        except OSError as e:
+            # Appending without knowing the file ends would corrupt the index
+            logger.warning(
+                "Failed to read similar-case index %s: %s", self._index_dir, e
+            )
+            self._index_dir = None
+            return
+
+        if row_count > len(self._row_ids):
+            self._row_ids.extend([None] * (row_count - len(self._row_ids)))
+            self._blocks = [self._map_vectors(row_count)]
+        # A partially written last line is read once it is complete
+        complete = data[: data.rfind(b"\n") + 1]
+        self._cases_offset += len(complete)
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                case = IndexedCase.model_validate_json(line)
+            except ValueError as e:
+                logger.warning("Skipping unreadable similar case: %s", e)
+                continue
+            if case.row >= len(self._row_ids):
+                continue
+            # Later lines refresh the metadata of earlier ones
+            current = self._entries.get(case.check_id)
+            if current is not None and current.row != case.row:
+                self._row_ids[current.row] = None
+            self._entries[case.check_id] = case
+            self._row_ids[case.row] = case.check_id
+
+    def _catch_up_if_changed(self) -> None:
+        """Catch up if another process appended to the index (lock held)."""
+        if self._index_dir is None:
+            return
+        try:
+            changed = (
+                _file_size(self._index_dir / VECTORS_FILE) // self._row_bytes
+                > len(self._row_ids)
+                or _file_size(self._index_dir / CASES_FILE) > self._cases_offset
+            )
+        except OSError:
+            return
+        if changed:
+            with self._storage_lock():
+                self._catch_up()
+
+    def _load(self) -> None:
+        """Memory-map persisted vectors and load case metadata."""
+        if self._index_dir is None or not self._index_dir.exists():
+            return
+        with self._lock, self._storage_lock():
+            self._catch_up()
+        logger.info("Loaded %d similar cases", len(self._entries))
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file in bytes, 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _top_k_rows(
+    queries: np.ndarray, blocks: list[np.ndarray], top_k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Score queries against vector blocks and keep the best rows per query.
+
+    Args:
+        queries: Unit query vectors, shape (queries, dimensions)
+        blocks: Unit vector blocks in row order
+        top_k: Rows kept per query
+
+    Returns:
+        (scores, rows), each of shape (queries, <= top_k), best first
+    """
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    best_rows = np.empty((len(queries), 0), dtype=np.int64)
+    offset = 0
+    for block in blocks:
+        for start in range(0, len(block), _QUERY_BLOCK_ROWS):
+            scores = queries @ np.asarray(block[start : start + _QUERY_BLOCK_ROWS]).T
+            rows = np.broadcast_to(
+                np.arange(scores.shape[1]) + offset + start, scores.shape
+            )
+            # Merge this block's candidates with the best so far
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            keep = min(top_k, scores.shape[1])
+            picked = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(scores, picked, axis=1)
+            best_rows = np.take_along_axis(rows, picked, axis=1)
+        offset += len(block)
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(best_scores, order, axis=1),
+        np.take_along_axis(best_rows, order, axis=1),
+    )
+
+
+def format_similar_case(case: SimilarCase) -> str:
+    """
+    Describe a similar case as a few-shot example for the analysis prompt.
+
+    Args:
+        case: Retrieved case
+
+    Returns:
+        One-line example
+    """
+    example = (
+        f'"{case.excerpt}" -> safety score {case.safe_score}/100 '
+        f"({case.similarity:.0%} similar)"
+    )
+    if case.expert_advice:
+        example += f". Expert advice: {case.expert_advice}"
+    return example
+
+
+@lru_cache(maxsize=1)
+def get_similar_case_index() -> SimilarCaseIndex | None:
+    """
+    Return the process-wide similar-case index configured from the environment.
+
+    Returns:
+        SimilarCaseIndex, or None if disabled or the configured model is unavailable
+    """
+    settings = SimilarCaseSettings()
+    if not settings.enabled:
+        return None
+    try:
+        return SimilarCaseIndex(settings)
+    except ValueError as e:
+        logger.warning("Similar-case retrieval disabled: %s", e)
+        return None
@@ -8,16 +8,46 @@ using the official Twitter API v2.
 from __future__ import annotations
 
 import logging
-import re
 from datetime import datetime
+from functools import lru_cache, partial
+from typing import cast
 
 import requests
 from pydantic import BaseModel, Field
 
+from trade_safety.batching import MicroBatcher
+from trade_safety.post_cache import PostCache, PostUnavailableError
+from trade_safety.rate_limits import (
+    RateLimitScheduler,
+    RequestPriority,
+    api_error_from_response,
+    get_rate_limiter,
+)
+from trade_safety.schemas import Platform
 from trade_safety.settings import TwitterAPISettings
+from trade_safety.url_canonicalization import (
+    CanonicalPost,
+    canonicalize_url,
+    detect_platform,
+)
 
 logger = logging.getLogger(__name__)
 
+# Maximum tweet IDs per /2/tweets lookup request
+TWEET_LOOKUP_MAX_IDS = 100
+
+# Rate-limited endpoints (each has its own x-rate-limit-* window)
+TWEET_ENDPOINT = "/2/tweets/:id"
+TWEETS_LOOKUP_ENDPOINT = "/2/tweets"
+
+# Expansions and fields requested for tweet metadata
+_METADATA_PARAMS = {
+    "tweet.fields": "text,created_at,attachments,author_id",
+    "expansions": "author_id,attachments.media_keys",
+    "user.fields": "username",
+    "media.fields": "type,url",
+}
+
 
 # ==============================================================================
 # Data Models
@@ -28,7 +58,9 @@ class TweetMetadata(BaseModel):
     """Tweet metadata for preview functionality"""
 
     author: str = Field(description="Tweet author username")
-    created_at: datetime | None = Field(None, description="Tweet creation timestamp")
+    created_at: datetime | None = Field(
+        default=None, description="Tweet creation timestamp"
+    )
     text: str = Field(description="Tweet text content")
     images: list[str] = Field(default_factory=list, description="Image URLs from tweet")
 
@@ -59,13 +91,23 @@ class TwitterService:
         TWITTER_BEARER_TOKEN: Twitter API Bearer Token (auto-loaded via TwitterAPISettings)
     """
 
-    def __init__(self, twitter_api: TwitterAPISettings | None = None):
+    def __init__(
+        self,
+        twitter_api: TwitterAPISettings | None = None,
+        cache: PostCache | None = None,
+        rate_limiter: RateLimitScheduler | None = None,
+    ):
         """
         Initialize TwitterService with Twitter API settings.
 
         Args:
             twitter_api: Twitter API settings containing bearer_token.
                          If not provided, TwitterAPISettings() will load from environment.
+            cache: Post cache shared across requests (default: None, no caching).
+                   With a cache, fetch_tweet_content is served from cached metadata
+                   so a preview and the following analysis share one API call.
+            rate_limiter: Rate-limit scheduler for API calls
+                          (default: process-wide Twitter scheduler)
 
         Note:
             Bearer token is validated at API call time (lazy validation),
@@ -73,8 +115,17 @@ class TwitterService:
             without providing a token when using mocks.
         """
         self.settings = twitter_api or TwitterAPISettings()
+        self.cache = cache
+        self.rate_limiter = rate_limiter or get_rate_limiter(Platform.TWITTER)
         logger.debug("Initialized TwitterService")
 
+    @property
+    def batcher(self) -> MicroBatcher[TweetMetadata]:
+        """Process-wide batcher of metadata lookups (see get_tweet_batcher)."""
+        return get_tweet_batcher(
+            self.settings.bearer_token, self.settings.batch_window_ms, self.rate_limiter
+        )
+
     # ==========================================
     # Main Methods
     # ==========================================
@@ -104,13 +155,19 @@ class TwitterService:
         if not tweet_id:
             raise ValueError(f"Could not extract tweet ID from URL: {twitter_url}")
 
+        # Serve from cached metadata (shared with previews) when caching is enabled
+        if self.cache:
+            return self.fetch_metadata(twitter_url).text
+
         # Make API request
         params = {"tweet.fields": "text"}
         data = self._make_api_request(tweet_id, params)
 
         # Validate and extract text
         if "data" not in data or "text" not in data["data"]:
-            raise ValueError(f"Tweet not found or inaccessible: {tweet_id}")
+            raise PostUnavailableError(
+                f"Tweet not found or inaccessible: {tweet_id}", status_code=404
+            )
 
         tweet_text = data["data"]["text"]
         logger.info("Successfully fetched tweet: %d chars", len(tweet_text))
@@ -123,6 +180,8 @@ class TwitterService:
 
         This method retrieves comprehensive metadata including author, timestamp,
         text content, and image URLs. Used for post preview functionality.
+        Lookups go through the process-wide micro-batcher, so concurrent
+        requests share `/2/tweets?ids=...` calls.
 
         Args:
             twitter_url: Twitter/X URL (e.g., https://x.com/user/status/123456789)
@@ -144,24 +203,168 @@ class TwitterService:
         if not tweet_id:
             raise ValueError(f"Could not extract tweet ID from URL: {twitter_url}")
 
+        if self.cache:
+            key = CanonicalPost(platform=Platform.TWITTER, post_id=tweet_id).key
+            return self.cache.get_or_fetch(
+                key, TweetMetadata, lambda: self.batcher.fetch(tweet_id)
+            )
+
+        return self.batcher.fetch(tweet_id)
+
+    def fetch_metadata_batch(
+        self,
+        tweet_ids: list[str],
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> dict[str, TweetMetadata | PostUnavailableError]:
+        """
+        Fetch metadata of many tweets with batched `/2/tweets?ids=...` lookups.
+
+        A single tweet is fetched with `/2/tweets/{id}` instead, which costs
+        the same one request.
+
+        Args:
+            tweet_ids: Tweet IDs to fetch (split into requests of 100 IDs)
+            priority: Scheduling priority of the API calls
+
+        Returns:
+            Mapping of tweet ID to its metadata, or to PostUnavailableError for
+            tweets that are deleted or private
+
+        Raises:
+            ValueError: If bearer token is missing or an API call fails
+        """
+        results: dict[str, TweetMetadata | PostUnavailableError] = {}
+        unique_ids = list(dict.fromkeys(tweet_ids))
+
+        if len(unique_ids) == 1:
+            try:
+                results[unique_ids[0]] = self._fetch_metadata(unique_ids[0], priority)
+            except PostUnavailableError as e:
+                results[unique_ids[0]] = e
+            return results
+
+        for start in range(0, len(unique_ids), TWEET_LOOKUP_MAX_IDS):
+            chunk = unique_ids[start : start + TWEET_LOOKUP_MAX_IDS]
+            data = self._make_batch_api_request(chunk, _METADATA_PARAMS, priority)
+            results.update(self._parse_batch_response(data))
+
+            # IDs neither returned nor reported as errors are treated as not found
+            for tweet_id in chunk:
+                if tweet_id not in results:
+                    results[tweet_id] = PostUnavailableError(
+                        f"Tweet not found or inaccessible: {tweet_id}",
+                        status_code=404,
+                    )
+
+        logger.info(
+            "Fetched tweet metadata batch: requested=%d, found=%d",
+            len(unique_ids),
+            sum(isinstance(r, TweetMetadata) for r in results.values()),
+        )
+        return results
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _fetch_metadata(
+        self, tweet_id: str, priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> TweetMetadata:
+        """
+        Fetch tweet metadata from Twitter API v2 (uncached).
+
+        Args:
+            tweet_id: Tweet ID to fetch
+            priority: Scheduling priority of the API call
+
+        Returns:
+            TweetMetadata: Tweet metadata including author, created_at, text, and images
+
+        Raises:
+            PostUnavailableError: If the tweet is deleted or private
+            ValueError: If bearer token is missing or API call fails
+        """
         # Make API request with extended fields
-        params = {
-            "tweet.fields": "text,created_at,attachments",
-            "expansions": "author_id,attachments.media_keys",
-            "user.fields": "username",
-            "media.fields": "type,url",
-        }
-        data = self._make_api_request(tweet_id, params)
+        data = self._make_api_request(tweet_id, _METADATA_PARAMS, priority)
 
         # Validate response structure
         if "data" not in data or "text" not in data["data"]:
-            raise ValueError(f"Tweet not found or inaccessible: {tweet_id}")
+            raise PostUnavailableError(
+                f"Tweet not found or inaccessible: {tweet_id}", status_code=404
+            )
 
-        tweet_data = data["data"]
         includes = data.get("includes", {})
+        metadata = self._build_metadata(
+            data["data"], includes.get("users", []), includes.get("media", [])
+        )
+
+        logger.info(
+            "Successfully fetched tweet metadata: author=%s, images=%d",
+            metadata.author,
+            len(metadata.images),
+        )
+
+        return metadata
+
+    def _parse_batch_response(
+        self, data: dict
+    ) -> dict[str, TweetMetadata | PostUnavailableError]:
+        """
+        Map a `/2/tweets?ids=...` response to per-tweet results.
+
+        Includes (users, media) are shared by all tweets of the response, so
+        each tweet is matched to its own author and attached media.
+
+        Args:
+            data: API response JSON data
+
+        Returns:
+            Mapping of tweet ID to metadata or PostUnavailableError
+        """
+        includes = data.get("includes", {})
+        users_by_id = {user["id"]: user for user in includes.get("users", [])}
+        media_by_key = {
+            media["media_key"]: media for media in includes.get("media", [])
+        }
 
+        results: dict[str, TweetMetadata | PostUnavailableError] = {}
+        for tweet_data in data.get("data", []):
+            author = users_by_id.get(tweet_data.get("author_id"))
+            media_keys = tweet_data.get("attachments", {}).get("media_keys", [])
+            results[tweet_data["id"]] = self._build_metadata(
+                tweet_data,
+                [author] if author else [],
+                [media_by_key[key] for key in media_keys if key in media_by_key],
+            )
+
+        # Per-ID errors (deleted, suspended, protected tweets)
+        for error in data.get("errors", []):
+            tweet_id = error.get("resource_id") or error.get("value")
+            if not tweet_id:
+                continue
+            status_code = 403 if "not-authorized" in error.get("type", "") else 404
+            results[tweet_id] = PostUnavailableError(
+                error.get("detail", f"Tweet not found or inaccessible: {tweet_id}"),
+                status_code=status_code,
+            )
+
+        return results
+
+    def _build_metadata(
+        self, tweet_data: dict, users: list[dict], media_list: list[dict]
+    ) -> TweetMetadata:
+        """
+        Build TweetMetadata from a tweet object and its expansions.
+
+        Args:
+            tweet_data: Tweet object from the API response
+            users: Expanded author user objects (first one is used)
+            media_list: Expanded media objects of the tweet
+
+        Returns:
+            TweetMetadata: Tweet metadata including author, created_at, text, and images
+        """
         # Extract author username
-        users = includes.get("users", [])
         author = users[0]["username"] if users else "unknown"
 
         # Extract created_at timestamp
@@ -177,30 +380,17 @@ class TwitterService:
 
         # Extract image URLs (photos only, filter out videos)
         images = []
-        media_list = includes.get("media", [])
         for media in media_list:
             if media.get("type") == "photo" and "url" in media:
                 images.append(media["url"])
 
-        metadata = TweetMetadata(
+        return TweetMetadata(
             author=author,
             created_at=created_at,
             text=text,
             images=images,
         )
 
-        logger.info(
-            "Successfully fetched tweet metadata: author=%s, images=%d",
-            metadata.author,
-            len(metadata.images),
-        )
-
-        return metadata
-
-    # ==========================================
-    # Helper Methods
-    # ==========================================
-
     def _extract_tweet_id(self, twitter_url: str) -> str | None:
         """
         Extract tweet ID from Twitter/X URL.
@@ -218,30 +408,99 @@ class TwitterService:
             >>> service._extract_tweet_id("https://twitter.com/user/status/987654321?s=20")
             "987654321"
         """
-        # 패턴 분석
-        pattern = r"/status/(\d+)"
-        match = re.search(pattern, twitter_url)
+        post = canonicalize_url(twitter_url)
 
-        if match:
-            tweet_id = match.group(1)
-            logger.debug("Extracted tweet ID: %s", tweet_id)
-            return tweet_id
+        if post and post.platform == Platform.TWITTER:
+            logger.debug("Extracted tweet ID: %s", post.post_id)
+            return post.post_id
 
         logger.warning("Could not extract tweet ID from URL: %s", twitter_url)
         return None
 
-    def _make_api_request(self, tweet_id: str, params: dict) -> dict:
+    def _make_api_request(
+        self,
+        tweet_id: str,
+        params: dict,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> dict:
         """
-        Make Twitter API v2 request with common headers and error handling.
+        Make Twitter API v2 single-tweet lookup request (`/2/tweets/{id}`).
 
         Args:
             tweet_id: Tweet ID to fetch
             params: Query parameters for the API request
+            priority: Scheduling priority of the API call
+
+        Returns:
+            dict: API response JSON data
+
+        Raises:
+            ValueError: If API request fails
+        """
+        return self._send_request(
+            f"https://api.twitter.com/2/tweets/{tweet_id}",
+            params,
+            f"tweet_id={tweet_id}",
+            TWEET_ENDPOINT,
+            priority=priority,
+        )
+
+    def _make_batch_api_request(
+        self,
+        tweet_ids: list[str],
+        params: dict,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> dict:
+        """
+        Make Twitter API v2 multi-tweet lookup request (`/2/tweets?ids=...`).
+
+        Args:
+            tweet_ids: Up to 100 tweet IDs to fetch
+            params: Query parameters for the API request
+            priority: Scheduling priority of the API call
+
+        Returns:
+            dict: API response JSON data (`data` list plus per-ID `errors`)
+
+        Raises:
+            ValueError: If API request fails
+        """
+        assert len(tweet_ids) <= TWEET_LOOKUP_MAX_IDS
+        return self._send_request(
+            "https://api.twitter.com/2/tweets",
+            {**params, "ids": ",".join(tweet_ids)},
+            f"tweet_ids={len(tweet_ids)}",
+            TWEETS_LOOKUP_ENDPOINT,
+            priority=priority,
+        )
+
+    def _send_request(
+        self,
+        api_url: str,
+        params: dict,
+        target: str,
+        endpoint: str,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> dict:
+        """
+        Send an authenticated Twitter API v2 GET request.
+
+        The call is scheduled against the rate-limit budget of its endpoint,
+        which is updated from the response headers.
+
+        Args:
+            api_url: API endpoint URL
+            params: Query parameters
+            target: Description of the requested tweets for logs and errors
+            endpoint: Rate-limited endpoint of the URL (e.g. TWEET_ENDPOINT)
+            priority: Scheduling priority (bulk calls yield when quota is low)
 
         Returns:
             dict: API response JSON data
 
         Raises:
+            PostUnavailableError: If the API responds with 403/404/410
+            RateLimitExceededError: If the rate limit is exhausted (or 429)
             ValueError: If API request fails
         """
         # Validate bearer token
@@ -253,31 +512,38 @@ class TwitterService:
                 "Get your token at: https://developer.twitter.com/en/portal/dashboard"
             )
 
+        self.rate_limiter.acquire(priority, endpoint)
+
         try:
-            logger.debug("Making Twitter API v2 request: tweet_id=%s", tweet_id)
+            logger.debug("Making Twitter API v2 request: %s", target)
 
-            api_url = f"https://api.twitter.com/2/tweets/{tweet_id}"
             headers = {
                 "Authorization": f"Bearer {self.settings.bearer_token}",
                 "User-Agent": "v2TweetLookupPython",
             }
 
             response = requests.get(api_url, headers=headers, params=params, timeout=10)
+            self.rate_limiter.update_from_headers(response.headers, endpoint)
             response.raise_for_status()
 
             return response.json()
 
         except requests.exceptions.Timeout as exc:
-            error_msg = f"Request timeout while fetching tweet: tweet_id={tweet_id}"
+            error_msg = f"Request timeout while fetching tweet: {target}"
             logger.error(error_msg)
             raise ValueError(error_msg) from exc
 
         except requests.exceptions.HTTPError as e:
+            # Always set by raise_for_status()
+            error_response = cast(requests.Response, e.response)
             error_msg = (
-                f"Twitter API error: {e.response.status_code} - {e.response.text}"
+                f"Twitter API error: {error_response.status_code} - "
+                f"{error_response.text}"
             )
             logger.error(error_msg)
-            raise ValueError(error_msg) from e
+            raise api_error_from_response(
+                error_msg, error_response, self.rate_limiter, endpoint
+            ) from e
 
         except requests.exceptions.RequestException as e:
             error_msg = f"Failed to fetch tweet from API: {str(e)}"
@@ -297,7 +563,7 @@ class TwitterService:
             url: URL to check
 
         Returns:
-            True if URL is from twitter.com or x.com, False otherwise
+            True if URL host is twitter.com or x.com (or a subdomain), False otherwise
 
         Examples:
             >>> TwitterService.is_twitter_url("https://x.com/user/status/123")
@@ -307,4 +573,33 @@ class TwitterService:
             >>> TwitterService.is_twitter_url("https://example.com")
             False
         """
-        return "twitter.com" in url or "x.com" in url
+        return detect_platform(url) == Platform.TWITTER
+
+
+@lru_cache(maxsize=None)
+def get_tweet_batcher(
+    bearer_token: str | None, batch_window_ms: int, rate_limiter: RateLimitScheduler
+) -> MicroBatcher[TweetMetadata]:
+    """
+    Return the process-wide metadata lookup batcher of a bearer token.
+
+    TwitterService is created per request; sharing the batcher is what lets
+    lookups of concurrent requests land in the same batch.
+
+    Args:
+        bearer_token: Twitter API Bearer Token
+        batch_window_ms: How long lookups are collected before a batch is sent
+        rate_limiter: Rate-limit scheduler of the API calls
+
+    Returns:
+        MicroBatcher sending interactive-priority lookups
+    """
+    service = TwitterService(
+        TwitterAPISettings(bearer_token=bearer_token, batch_window_ms=batch_window_ms),
+        rate_limiter=rate_limiter,
+    )
+    return MicroBatcher(
+        partial(service.fetch_metadata_batch, priority=RequestPriority.INTERACTIVE),
+        max_batch_size=TWEET_LOOKUP_MAX_IDS,
+        window_seconds=batch_window_ms / 1000,
+    )
@@ -0,0 +1,134 @@
+"""
+URL canonicalization for supported social media platforms.
+
+Maps every supported URL form of a post (x.com / twitter.com / mobile hosts,
+reddit.com / old.reddit.com / redd.it, tracking query parameters, slugs) to a
+stable platform + post id key, so caches, deduplication indexes and fetchers
+all agree on what "the same post" is.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from trade_safety.schemas import Platform
+
+logger = logging.getLogger(__name__)
+
+# Registrable domains per platform; subdomains (www., mobile., old., ...) match too
+PLATFORM_DOMAINS: dict[Platform, frozenset[str]] = {
+    Platform.TWITTER: frozenset({"twitter.com", "x.com"}),
+    Platform.REDDIT: frozenset({"reddit.com", "redd.it"}),
+}
+
+# /{user}/status/{id}, /i/web/status/{id}, /{user}/statuses/{id}
+_TWEET_PATH_PATTERN = re.compile(r"/status(?:es)?/(\d+)")
+# /r/{sub}/comments/{id}/..., /comments/{id}, /user/{name}/comments/{id}
+_REDDIT_PATH_PATTERN = re.compile(r"/comments/([a-zA-Z0-9]+)")
+# redd.it/{id}
+_REDDIT_SHORT_PATH_PATTERN = re.compile(r"^/([a-zA-Z0-9]+)/?$")
+
+
+class CanonicalPost(BaseModel):
+    """Stable identity of a social media post"""
+
+    platform: Platform = Field(description="Social media platform")
+    post_id: str = Field(description="Platform-specific post ID")
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def key(self) -> str:
+        """Stable cache/index key, e.g. "twitter:123456789"."""
+        return f"{Platform(self.platform).value}:{self.post_id}"
+
+    @property
+    def canonical_url(self) -> str:
+        """Single canonical URL for the post."""
+        if self.platform == Platform.TWITTER:
+            return f"https://x.com/i/status/{self.post_id}"
+        return f"https://www.reddit.com/comments/{self.post_id}"
+
+
+def parse_host(url: str) -> tuple[str, str]:
+    """Return (lowercased host, path) of a URL, tolerating a missing scheme."""
+    text = url.strip()
+    if "://" not in text:
+        text = f"https://{text}"
+    parsed = urlparse(text)
+    return (parsed.hostname or "").lower(), parsed.path
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    """Check if host is the domain itself or one of its subdomains."""
+    return host == domain or host.endswith(f".{domain}")
+
+
+def detect_platform(url: str) -> Platform | None:
+    """
+    Detect the platform of a URL from its host.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        Platform if the host belongs to a supported platform, None otherwise
+
+    Examples:
+        >>> detect_platform("https://mobile.twitter.com/user/status/1")
+        Platform.TWITTER
+        >>> detect_platform("https://netflix.com/title/1")
+        None
+    """
+    host, _ = parse_host(url)
+    for platform, domains in PLATFORM_DOMAINS.items():
+        if any(_host_matches(host, domain) for domain in domains):
+            return platform
+    return None
+
+
+def canonicalize_url(url: str) -> CanonicalPost | None:
+    """
+    Map a supported post URL to its canonical platform + post id.
+
+    Args:
+        url: Social media post URL in any supported form
+
+    Returns:
+        CanonicalPost if the URL points to a supported post, None otherwise
+
+    Examples:
+        >>> canonicalize_url("https://x.com/user/status/123?s=20").key
+        "twitter:123"
+        >>> canonicalize_url("https://old.reddit.com/comments/abc").key
+        "reddit:abc"
+        >>> canonicalize_url("https://redd.it/abc").key
+        "reddit:abc"
+    """
+    platform = detect_platform(url)
+    if platform is None:
+        return None
+
+    host, path = parse_host(url)
+
+    if platform == Platform.TWITTER:
+        match = _TWEET_PATH_PATTERN.search(path)
+    elif _host_matches(host, "redd.it"):
+        match = _REDDIT_SHORT_PATH_PATTERN.match(path)
+    else:
+        match = _REDDIT_PATH_PATTERN.search(path)
+
+    if not match:
+        logger.debug("No post ID in %s URL: %s", platform.value, url[:100])
+        return None
+
+    post_id = match.group(1)
+    if platform == Platform.REDDIT:
+        # Reddit IDs are base36 and always lowercase
+        post_id = post_id.lower()
+
+    return CanonicalPost(platform=platform, post_id=post_id)
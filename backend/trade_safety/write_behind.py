@@ -0,0 +1,518 @@
+"""
+Write-behind persistence of created checks.
+
+The analysis of a check is complete before the check is stored, and its id is
+generated by the service, so nothing in the response depends on the INSERT.
+With write-behind enabled, the manager returns a created check right away and
+hands it to a WriteBehindBuffer, whose background thread writes pending checks
+in batches: one multi-row INSERT and one commit per batch instead of a round
+trip and several commits per request.
+
+- Read-your-writes: pending checks are served from the buffer until their
+  batch is committed, so fetching a just-created check never misses it.
+- Backpressure: at most max_pending checks wait. When the buffer is full (the
+  database is slow or down), submit() declines and the caller writes the check
+  synchronously, which slows requests down to the database's pace instead of
+  growing memory or dropping checks.
+- Durability: without a journal, checks pending when the process crashes are
+  lost. With a journal directory, each check is appended to a per-process
+  JSONL journal (fsync'ed before the check is returned), which is truncated
+  once the buffer drains. Journals of crashed processes are adopted on
+  startup and their checks written again; checks that were already inserted
+  are skipped, so replaying is idempotent.
+- Poison checks: a batch that fails for another reason than the database
+  being unreachable is split in halves until the failing checks are
+  isolated. A check that cannot be written on its own is appended to the
+  dead-letter file `write-behind-dead.jsonl` of the journal directory (or
+  logged without a journal) and dropped, so it cannot stall the checks
+  behind it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from itertools import islice
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from trade_safety.file_locks import lock_file
+from trade_safety.input_normalization import compute_input_hash
+from trade_safety.schemas import TradeSafetyCheck, TradeSafetyCheckCreate
+from trade_safety.settings import WriteBehindSettings
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PREFIX = "write-behind-"
+DEAD_LETTER_FILE = f"{JOURNAL_PREFIX}dead.jsonl"
+
+# Errors of an unreachable or overloaded database: the batch is retried as is
+_TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    OperationalError,
+    InterfaceError,
+    PoolTimeoutError,
+)
+
+
+class PendingCheck(BaseModel):
+    """Created check waiting to be written to the database"""
+
+    check: TradeSafetyCheck = Field(description="Check as returned to the client")
+    create: TradeSafetyCheckCreate = Field(description="Creation data to write")
+
+
+class WriteBehindJournal:
+    """
+    Append-only local journal of pending checks, one per process.
+
+    The journal of a process is `write-behind-<pid>.jsonl`, guarded by an
+    exclusive lock on `write-behind-<pid>.lock` held while the process lives.
+    A journal whose lock can be taken belongs to a process that is gone.
+    """
+
+    def __init__(self, directory: str | Path, fsync: bool = True):
+        """
+        Initialize WriteBehindJournal and lock it for this process.
+
+        Args:
+            directory: Directory of the journals of every process
+            fsync: fsync each appended check (survives power loss, not only a
+                   process crash)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        name = f"{JOURNAL_PREFIX}{os.getpid()}"
+        self.path = self.directory / f"{name}.jsonl"
+        self._lock_file = open(  # pylint: disable=consider-using-with
+            self.directory / f"{name}.lock", "ab"
+        )
+        if not lock_file(self._lock_file, blocking=False):
+            raise BlockingIOError(f"Write-behind journal is in use: {self.path}")
+        self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+        self.entry_count = 0
+
+    def recover(self) -> list[PendingCheck]:
+        """
+        Adopt the checks of this journal and of journals of crashed processes.
+
+        Adopted checks are moved into this journal before the other journals
+        are deleted, so a crash during recovery loses nothing.
+
+        Returns:
+            Checks journaled but possibly not written, oldest first
+        """
+        recovered = _read_journal(self.path)
+        orphans = []
+        for lock_path in sorted(self.directory.glob(f"{JOURNAL_PREFIX}*.lock")):
+            journal_path = lock_path.with_suffix(".jsonl")
+            if journal_path == self.path:
+                continue
+            with open(lock_path, "ab") as orphan_lock:
+                if not lock_file(orphan_lock, blocking=False):
+                    continue  # Journal of a live process
+                recovered.extend(_read_journal(journal_path))
+                orphans.append((lock_path, journal_path))
+
+        self.rewrite(recovered)
+        for lock_path, journal_path in orphans:
+            journal_path.unlink(missing_ok=True)
+            lock_path.unlink(missing_ok=True)
+        if recovered:
+            logger.info("Recovered journaled checks: count=%d", len(recovered))
+        return recovered
+
+    def append(self, pending: PendingCheck) -> None:
+        """Append a check (durable only once sync() returns)."""
+        self._file.write(pending.model_dump_json().encode("utf-8") + b"\n")
+        self._file.flush()
+        self.entry_count += 1
+
+    def sync(self) -> None:
+        """fsync appended checks (one fsync covers concurrent appends)."""
+        if not self.fsync:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except ValueError:
+            pass  # Replaced by rewrite(), which fsynced every pending check
+
+    def append_dead(self, dead: Sequence[PendingCheck]) -> None:
+        """
+        Append checks that cannot be written to the dead-letter file.
+
+        Args:
+            dead: Checks dropped from the buffer
+        """
+        lines = b"".join(
+            entry.model_dump_json().encode("utf-8") + b"\n" for entry in dead
+        )
+        with open(self.directory / DEAD_LETTER_FILE, "ab") as f:
+            f.write(lines)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def truncate(self) -> None:
+        """Empty the journal once every journaled check is written."""
+        self._file.truncate(0)
+        self.sync()
+        self.entry_count = 0
+
+    def rewrite(self, pending: Sequence[PendingCheck]) -> None:
+        """
+        Atomically replace the journal with the given checks.
+
+        Args:
+            pending: Checks still waiting to be written
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for entry in pending:
+                    f.write(entry.model_dump_json().encode("utf-8") + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._file.close()
+        self._file = open(self.path, "ab")  # pylint: disable=consider-using-with
+        self.entry_count = len(pending)
+
+    def close(self, remove: bool = False) -> None:
+        """
+        Close the journal and release its lock.
+
+        Args:
+            remove: Delete the journal (only when nothing is pending)
+        """
+        self._file.close()
+        if remove:
+            self.path.unlink(missing_ok=True)
+            Path(self._lock_file.name).unlink(missing_ok=True)
+        self._lock_file.close()
+
+
+def _read_journal(path: Path) -> list[PendingCheck]:
+    """Read the checks of a journal, skipping a line torn by a crash."""
+    if not path.exists():
+        return []
+    entries = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                entries.append(PendingCheck.model_validate_json(line))
+            except ValidationError:
+                logger.warning("Skipped torn journal line: path=%s", path)
+    return entries
+
+
+class WriteBehindBuffer:
+    """
+    Bounded buffer of created checks written to the database in batches.
+
+    Thread-safe; a single instance is meant to be shared process-wide (see
+    TradeSafetyCheckManagerFactory).
+
+    Example:
+        >>> buffer = WriteBehindBuffer(write_batch, WriteBehindSettings())
+        >>> buffer.start()
+        >>> buffer.submit(PendingCheck(check=check, create=schema))
+        True
+        >>> buffer.get(check.id) == check  # until its batch is committed
+        True
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[PendingCheck]], None],
+        settings: WriteBehindSettings | None = None,
+    ):
+        """
+        Initialize WriteBehindBuffer, recovering journaled checks.
+
+        Args:
+            write_batch: Writes a batch of checks in one transaction, skipping
+                         checks that already exist; raises if nothing was written
+            settings: Write-behind settings (default: WriteBehindSettings()
+                      from environment)
+        """
+        self._write_batch = write_batch
+        self.settings = settings or WriteBehindSettings()
+        self._pending: dict[str, PendingCheck] = {}
+        # Pending check IDs per input hash, oldest first
+        self._by_input_hash: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # One batch is written at a time, by the flusher, flush() or write()
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+        self.journal: WriteBehindJournal | None = None
+        if self.settings.journal_dir is not None:
+            self.journal = WriteBehindJournal(
+                self.settings.journal_dir, fsync=self.settings.journal_fsync
+            )
+            for entry in self.journal.recover():
+                self._add(entry, compute_input_hash(entry.create.input_text))
+
+    def start(self) -> None:
+        """Start the background flusher (flushed again on interpreter exit)."""
+        self._thread = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, pending: PendingCheck) -> bool:
+        """
+        Queue a created check for writing.
+
+        Args:
+            pending: Check and its creation data
+
+        Returns:
+            True once queued (and journaled), False if the buffer is full or
+            closed and the caller must write the check itself
+        """
+        input_hash = compute_input_hash(pending.create.input_text)
+        with self._lock:
+            if self._closed or len(self._pending) >= self.settings.max_pending:
+                return False
+            if self.journal is not None:
+                self.journal.append(pending)
+            self._add(pending, input_hash)
+            if len(self._pending) in (1, self.settings.batch_size):
+                self._wakeup.notify()
+        if self.journal is not None:
+            # Outside the lock so concurrent submits share one fsync
+            self.journal.sync()
+        return True
+
+    def get(self, check_id: str) -> TradeSafetyCheck | None:
+        """
+        Look up a check that is not written yet.
+
+        Args:
+            check_id: ID of the check
+
+        Returns:
+            Check as returned when it was created, None if not pending
+        """
+        with self._lock:
+            pending = self._pending.get(check_id)
+        return pending.check if pending else None
+
+    def find_by_input_hash(self, input_hash: str) -> list[TradeSafetyCheck]:
+        """
+        Look up the checks of an input that are not written yet.
+
+        Args:
+            input_hash: Hash of the normalized input (see compute_input_hash)
+
+        Returns:
+            Pending checks of the input, oldest first
+        """
+        with self._lock:
+            return [
+                self._pending[check_id].check
+                for check_id in self._by_input_hash.get(input_hash, ())
+            ]
+
+    def pending_count(self) -> int:
+        """Number of checks waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write every pending check now, in batches.
+
+        Returns:
+            Number of checks taken off the buffer (written or dead-lettered)
+
+        Raises:
+            Exception: The error of a batch the database could not be reached
+                       for (its checks stay pending)
+        """
+        total = 0
+        while written := self._write_next_batch():
+            total += written
+        return total
+
+    def write(self, check_id: str) -> bool:
+        """
+        Write one pending check now, ahead of the checks queued before it.
+
+        Waits for a batch being written (which may hold the check), but not
+        for the rest of the buffer.
+
+        Args:
+            check_id: ID of the check
+
+        Returns:
+            True if the check was written, False if it was not pending
+
+        Raises:
+            Exception: The error of the write (the check stays pending)
+        """
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending.get(check_id)
+            if pending is None:
+                return False
+            self._write_batch([pending])
+            with self._lock:
+                self._remove(pending)
+            return True
+
+    def close(self) -> None:
+        """Stop the flusher and write what is pending (kept in the journal if
+        that fails)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception(
+                "Failed to write pending checks on close: count=%d",
+                self.pending_count(),
+            )
+        if self.journal is not None:
+            self.journal.close(remove=not self._pending)
+
+    # ==========================================
+    # Helper Methods
+    # ==========================================
+
+    def _add(self, pending: PendingCheck, input_hash: str) -> None:
+        """Add a check to the pending checks (under the lock)."""
+        self._pending[pending.check.id] = pending
+        self._by_input_hash.setdefault(input_hash, []).append(pending.check.id)
+
+    def _remove(self, pending: PendingCheck) -> None:
+        """Remove a check from the pending checks (under the lock)."""
+        if self._pending.pop(pending.check.id, None) is None:
+            return
+        input_hash = compute_input_hash(pending.create.input_text)
+        check_ids = self._by_input_hash[input_hash]
+        check_ids.remove(pending.check.id)
+        if not check_ids:
+            del self._by_input_hash[input_hash]
+
+    def _run(self) -> None:
+        """Write pending checks until closed, retrying batches that failed
+        transiently."""
+        interval = self.settings.flush_interval_ms / 1000
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                # Give concurrent requests a moment to fill the batch
+                if len(self._pending) < self.settings.batch_size:
+                    self._wakeup.wait(interval)
+            try:
+                self._write_next_batch()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception(
+                    "Failed to write pending checks: count=%d", self.pending_count()
+                )
+                time.sleep(self.settings.retry_seconds)
+
+    def _write_next_batch(self) -> int:
+        """Write the oldest pending checks; returns how many were taken off the
+        buffer."""
+        with self._write_lock:
+            with self._lock:
+                batch = list(islice(self._pending.values(), self.settings.batch_size))
+            if not batch:
+                return 0
+
+            dead = self._write_or_split(batch)
+            if dead:
+                self._drop_dead(dead)
+
+            with self._lock:
+                for pending in batch:
+                    self._remove(pending)
+                if self.journal is not None:
+                    if not self._pending:
+                        self.journal.truncate()
+                    elif self.journal.entry_count > 2 * self.settings.max_pending:
+                        # Never drained under sustained load: drop written checks
+                        self.journal.rewrite(list(self._pending.values()))
+            logger.debug("Wrote pending checks: count=%d", len(batch) - len(dead))
+            return len(batch)
+
+    def _write_or_split(self, batch: list[PendingCheck]) -> list[PendingCheck]:
+        """
+        Write a batch, splitting it in halves while it fails.
+
+        Args:
+            batch: Checks to write
+
+        Returns:
+            Checks that failed to be written on their own
+
+        Raises:
+            Exception: A transient error (see _TRANSIENT_ERRORS), which leaves
+                       the whole batch pending
+        """
+        try:
+            self._write_batch(batch)
+            return []
+        except _TRANSIENT_ERRORS:
+            raise
+        except Exception:  # pylint: disable=broad-exception-caught
+            if len(batch) == 1:
+                logger.exception(
+                    "Failed to write pending check: id=%s", batch[0].check.id
+                )
+                return batch
+            logger.warning(
+                "Failed to write pending checks, splitting batch: count=%d",
+                len(batch),
+                exc_info=True,
+            )
+        middle = len(batch) // 2
+        return self._write_or_split(batch[:middle]) + self._write_or_split(
+            batch[middle:]
+        )
+
+    def _drop_dead(self, dead: list[PendingCheck]) -> None:
+        """Keep checks that cannot be written in the dead-letter file, or log
+        them without a journal."""
+        if self.journal is not None:
+            self.journal.append_dead(dead)
+            logger.error(
+                "Dropped pending checks that cannot be written: count=%d, file=%s",
+                len(dead),
+                self.journal.directory / DEAD_LETTER_FILE,
+            )
+            return
+        for entry in dead:
+            logger.error(
+                "Dropped pending check that cannot be written: %s",
+                entry.model_dump_json(),
+            )